@@ -3,8 +3,9 @@ Jain Global Slack Trading Bot - Main Application Entry Point
 
 This module serves as the main entry point for the Slack Trading Bot application.
 It initializes the Slack Bolt app, configures middleware, registers event handlers,
-and provides both Lambda and local development server capabilities with comprehensive
-monitoring, error handling, and performance metrics collection.
+and provides the HTTP and Socket Mode development servers with comprehensive
+monitoring, error handling, and performance metrics collection. The AWS Lambda
+entry point lives in lambda_entry.py.
 """
 
 import os
@@ -14,7 +15,7 @@ import logging
 import asyncio
 import threading
 import time
-from typing import Optional, Dict, Any, Callable
+from typing import Callable
 import json
 from datetime import datetime, timedelta, timezone
 from contextlib import asynccontextmanager
@@ -24,27 +25,35 @@ from dotenv import load_dotenv
 load_dotenv()
 import traceback
 from functools import wraps
-from collections import defaultdict, deque
 
 # Slack Bolt Framework
 from slack_bolt import App
-from slack_bolt.adapter.aws_lambda import SlackRequestHandler
 from slack_bolt.adapter.socket_mode import SocketModeHandler
 
 # FastAPI for web service deployment
-from fastapi import FastAPI, Request, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi import FastAPI, Request, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from slack_bolt.adapter.fastapi import SlackRequestHandler as FastAPISlackRequestHandler
+from slack_bolt.adapter.starlette.handler import to_bolt_request, to_starlette_response
 import uvicorn
+from prometheus_client import generate_latest
 
 # Application modules
 from config.settings import get_config, validate_environment
 from services.service_container import get_container, ServiceContainer
-from listeners.commands import register_command_handlers
-from listeners.actions import register_action_handlers
-from listeners.events import register_event_handlers
+from services.asset_universe import refresh_asset_universe_task
+from services.circuit_breaker import CircuitBreaker
+from services.logging_pipeline import get_logging_pipeline
+from services.loop_monitor import get_loop_monitor
+from services.slack_gateway import get_slack_gateway
+from services.modal_updates import get_modal_coalescer
+from services.metrics import PROMETHEUS_CONTENT_TYPE, get_metrics_registry
+from services.profiling import get_profiler
+from services.quote_prewarmer import get_quote_prewarmer
+from services.quote_stream import get_quote_hub
+from bolt_app import app_metrics, build_slack_app
 
 # Configure logging
 logging.basicConfig(
@@ -57,143 +66,9 @@ logger = logging.getLogger(__name__)
 config = get_config()
 service_container = get_container()
 
-# Application state and metrics
-class ApplicationMetrics:
-    """Comprehensive application metrics collection and monitoring."""
-    
-    def __init__(self):
-        self.start_time = datetime.now(timezone.utc)
-        self.request_count = 0
-        self.error_count = 0
-        self.response_times = deque(maxlen=1000)  # Keep last 1000 response times
-        self.error_types = defaultdict(int)
-        self.endpoint_metrics = defaultdict(lambda: {'count': 0, 'errors': 0, 'avg_time': 0.0})
-        self.circuit_breaker_states = {}
-        self.health_checks = {}
-        self._lock = threading.Lock()
-    
-    def record_request(self, endpoint: str, response_time: float, error: Optional[str] = None):
-        """Record request metrics."""
-        with self._lock:
-            self.request_count += 1
-            self.response_times.append(response_time)
-            
-            # Update endpoint metrics
-            endpoint_data = self.endpoint_metrics[endpoint]
-            endpoint_data['count'] += 1
-            
-            # Calculate rolling average response time
-            current_avg = endpoint_data['avg_time']
-            count = endpoint_data['count']
-            endpoint_data['avg_time'] = ((current_avg * (count - 1)) + response_time) / count
-            
-            if error:
-                self.error_count += 1
-                self.error_types[error] += 1
-                endpoint_data['errors'] += 1
-    
-    def get_metrics(self) -> Dict[str, Any]:
-        """Get current application metrics."""
-        with self._lock:
-            uptime = datetime.now(timezone.utc) - self.start_time
-            avg_response_time = sum(self.response_times) / len(self.response_times) if self.response_times else 0
-            
-            return {
-                'uptime_seconds': uptime.total_seconds(),
-                'uptime_human': str(uptime),
-                'total_requests': self.request_count,
-                'total_errors': self.error_count,
-                'error_rate': (self.error_count / self.request_count) if self.request_count > 0 else 0,
-                'average_response_time_ms': avg_response_time * 1000,
-                'recent_response_times_ms': [t * 1000 for t in list(self.response_times)[-10:]],
-                'error_types': dict(self.error_types),
-                'endpoint_metrics': dict(self.endpoint_metrics),
-                'circuit_breaker_states': dict(self.circuit_breaker_states),
-                'health_checks': dict(self.health_checks)
-            }
-    
-    def update_circuit_breaker(self, service: str, state: str, error_rate: float = 0.0):
-        """Update circuit breaker state for a service."""
-        with self._lock:
-            self.circuit_breaker_states[service] = {
-                'state': state,
-                'error_rate': error_rate,
-                'last_updated': datetime.now(timezone.utc).isoformat()
-            }
-    
-    def update_health_check(self, service: str, healthy: bool, details: Optional[str] = None):
-        """Update health check status for a service."""
-        with self._lock:
-            self.health_checks[service] = {
-                'healthy': healthy,
-                'details': details,
-                'last_checked': datetime.now(timezone.utc).isoformat()
-            }
+# Write log records from a background thread, with DEBUG sampling and PII masking
+get_logging_pipeline().install()
 
-# Global metrics instance
-app_metrics = ApplicationMetrics()
-
-class CircuitBreaker:
-    """Circuit breaker pattern implementation for external service calls."""
-    
-    def __init__(self, failure_threshold: int = 5, recovery_timeout: int = 60, expected_exception: type = Exception):
-        self.failure_threshold = failure_threshold
-        self.recovery_timeout = recovery_timeout
-        self.expected_exception = expected_exception
-        self.failure_count = 0
-        self.last_failure_time = None
-        self.state = 'CLOSED'  # CLOSED, OPEN, HALF_OPEN
-        self._lock = threading.Lock()
-    
-    def __call__(self, func: Callable) -> Callable:
-        """Decorator to wrap functions with circuit breaker logic."""
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            with self._lock:
-                if self.state == 'OPEN':
-                    if self._should_attempt_reset():
-                        self.state = 'HALF_OPEN'
-                        logger.info(f"Circuit breaker for {func.__name__} moved to HALF_OPEN")
-                    else:
-                        app_metrics.update_circuit_breaker(func.__name__, 'OPEN', 1.0)
-                        raise Exception(f"Circuit breaker is OPEN for {func.__name__}")
-                
-                try:
-                    result = func(*args, **kwargs)
-                    self._on_success(func.__name__)
-                    return result
-                except self.expected_exception as e:
-                    self._on_failure(func.__name__)
-                    raise e
-        
-        return wrapper
-    
-    def _should_attempt_reset(self) -> bool:
-        """Check if enough time has passed to attempt reset."""
-        return (
-            self.last_failure_time and
-            time.time() - self.last_failure_time >= self.recovery_timeout
-        )
-    
-    def _on_success(self, func_name: str):
-        """Handle successful function execution."""
-        self.failure_count = 0
-        if self.state == 'HALF_OPEN':
-            self.state = 'CLOSED'
-            logger.info(f"Circuit breaker for {func_name} reset to CLOSED")
-        app_metrics.update_circuit_breaker(func_name, self.state, 0.0)
-    
-    def _on_failure(self, func_name: str):
-        """Handle failed function execution."""
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-        
-        if self.failure_count >= self.failure_threshold:
-            self.state = 'OPEN'
-            logger.error(f"Circuit breaker for {func_name} opened due to {self.failure_count} failures")
-        
-        error_rate = self.failure_count / self.failure_threshold
-        app_metrics.update_circuit_breaker(func_name, self.state, error_rate)
 
 # Application lifecycle management
 class ApplicationLifecycle:
@@ -305,255 +180,7 @@ def create_slack_app() -> App:
     Raises:
         Exception: If Slack app initialization fails
     """
-    try:
-        logger.info("Initializing Slack Bolt application...")
-        
-        # Get Slack configuration
-        slack_config = config.get_slack_config()
-        
-        # Create Slack app with configuration
-        app = App(
-            token=slack_config['token'],
-            signing_secret=slack_config['signing_secret'],
-            process_before_response=True,  # Important for Lambda
-            request_verification_enabled=True
-        )
-        
-        # Register comprehensive middleware stack
-        register_middleware(app)
-        
-        # Register event handlers with error handling and service injection
-        try:
-            register_command_handlers(app, service_container)
-            logger.info("Command handlers registered successfully")
-        except Exception as e:
-            logger.error(f"Failed to register command handlers: {e}")
-            raise
-        
-        try:
-            register_action_handlers(app, service_container)
-            logger.info("Action handlers registered successfully")
-        except Exception as e:
-            logger.error(f"Failed to register action handlers: {e}")
-            raise
-        
-        # Register interactive action handlers
-        try:
-            from listeners.interactive_actions import interactive_handler
-            interactive_handler.register_handlers(app)
-            logger.info("Interactive action handlers registered successfully")
-        except Exception as e:
-            logger.error(f"Failed to register interactive action handlers: {e}")
-            raise
-        
-        try:
-            register_event_handlers(app, service_container)
-            logger.info("Event handlers registered successfully")
-        except Exception as e:
-            logger.error(f"Failed to register event handlers: {e}")
-            raise
-        
-        # Register global error handler
-        @app.error
-        def global_error_handler(error, body, logger):
-            """Global error handler for unhandled exceptions."""
-            error_id = f"error_{int(time.time())}"
-            user_id = body.get('user_id', 'unknown')
-            channel_id = body.get('channel_id', 'unknown')
-            
-            logger.error(
-                f"Global error {error_id}: {error} | "
-                f"User: {user_id} | Channel: {channel_id} | "
-                f"Body: {json.dumps(body, default=str)[:500]}"
-            )
-            
-            # Record error metrics
-            app_metrics.record_request('global_error', 0, type(error).__name__)
-            
-            # Return user-friendly error message
-            return {
-                "response_type": "ephemeral",
-                "text": f"⚠️ An unexpected error occurred. Error ID: {error_id}\n"
-                       f"Please try again or contact support if the issue persists."
-            }
-        
-        logger.info("Slack Bolt app initialized successfully")
-        app_metrics.update_health_check('slack_app', True, 'Initialized successfully')
-        return app
-        
-    except Exception as e:
-        logger.error(f"Failed to initialize Slack app: {e}")
-        logger.error(f"Stack trace: {traceback.format_exc()}")
-        app_metrics.update_health_check('slack_app', False, str(e))
-        raise
-
-def register_middleware(app: App) -> None:
-    """
-    Register comprehensive middleware stack for the Slack app including
-    request logging, performance monitoring, security validation, and error handling.
-    
-    Args:
-        app: Slack Bolt application instance
-    """
-    
-    @app.middleware
-    def request_logging_middleware(body: Dict[str, Any], next):
-        """Comprehensive request logging and audit trail middleware."""
-        start_time = time.time()
-        request_id = body.get('event_id') or body.get('trigger_id') or f"req_{int(time.time())}"
-        user_id = body.get('user_id', 'unknown')
-        event_type = body.get('type', 'unknown')
-        
-        # Log request start
-        logger.info(
-            f"[{request_id}] Request started | "
-            f"Type: {event_type} | User: {user_id} | "
-            f"Timestamp: {datetime.now(timezone.utc).isoformat()}"
-        )
-        
-        # Log request body for debugging (truncated)
-        if config.debug_mode:
-            body_str = json.dumps(body, default=str)[:1000]
-            logger.debug(f"[{request_id}] Request body: {body_str}")
-        
-        try:
-            # Call next middleware/handler
-            response = next()
-            
-            # Log successful completion
-            duration = time.time() - start_time
-            logger.info(
-                f"[{request_id}] Request completed successfully | "
-                f"Duration: {duration:.3f}s"
-            )
-            
-            return response
-            
-        except Exception as e:
-            # Log error
-            duration = time.time() - start_time
-            logger.error(
-                f"[{request_id}] Request failed | "
-                f"Duration: {duration:.3f}s | Error: {e}"
-            )
-            raise
-    
-    @app.middleware
-    def security_validation_middleware(body: Dict[str, Any], next):
-        """Security validation middleware for channel restrictions and user authorization."""
-        # Skip validation for certain event types
-        skip_validation = [
-            'url_verification',
-            'app_home_opened',
-            'tokens_revoked',
-            'app_uninstalled'
-        ]
-        
-        event_type = body.get('type')
-        if event_type in skip_validation:
-            return next()
-        
-        # Extract channel ID from various possible locations
-        channel_id = None
-        if 'channel_id' in body:
-            channel_id = body['channel_id']
-        elif 'event' in body and 'channel' in body['event']:
-            channel_id = body['event']['channel']
-        elif 'channel' in body:
-            channel_id = body['channel']
-        elif 'payload' in body and isinstance(body['payload'], dict):
-            payload = body['payload']
-            if 'channel' in payload and isinstance(payload['channel'], dict):
-                channel_id = payload['channel'].get('id')
-        
-        # Validate channel if present
-        if channel_id:
-            if not config.is_channel_approved(channel_id):
-                logger.warning(
-                    f"Request from unapproved channel: {channel_id} | "
-                    f"User: {body.get('user_id', 'unknown')} | "
-                    f"Type: {event_type}"
-                )
-                
-                # In production, block unapproved channels
-                if config.environment.value == 'production':
-                    from slack_bolt import BoltResponse
-                    return BoltResponse(
-                        status=403,
-                        body={
-                            "response_type": "ephemeral",
-                            "text": "🚫 This bot is not authorized to operate in this channel. "
-                                   "Please contact your administrator for access."
-                        }
-                    )
-        
-        # Additional security checks
-        user_id = body.get('user_id')
-        if user_id:
-            # Log user activity for audit trail
-            logger.info(f"User activity: {user_id} in channel {channel_id} - {event_type}")
-        
-        return next()
-    
-    @app.middleware
-    def performance_monitoring_middleware(body: Dict[str, Any], next):
-        """Performance monitoring and metrics collection middleware."""
-        start_time = time.time()
-        event_type = body.get('type', 'unknown')
-        
-        try:
-            response = next()
-            
-            # Record successful request metrics
-            duration = time.time() - start_time
-            app_metrics.record_request(f"slack_{event_type}", duration)
-            
-            # Log slow requests
-            if duration > 3.0:  # 3 second threshold
-                logger.warning(
-                    f"Slow request detected | Type: {event_type} | "
-                    f"Duration: {duration:.3f}s | User: {body.get('user_id', 'unknown')}"
-                )
-            
-            return response
-            
-        except Exception as e:
-            # Record error metrics
-            duration = time.time() - start_time
-            app_metrics.record_request(f"slack_{event_type}", duration, type(e).__name__)
-            raise
-    
-    @app.middleware
-    def rate_limiting_middleware(body: Dict[str, Any], next):
-        """Basic rate limiting middleware to prevent abuse."""
-        user_id = body.get('user_id')
-        if not user_id:
-            return next()
-        
-        # Simple in-memory rate limiting (in production, use Redis or similar)
-        current_time = time.time()
-        if not hasattr(rate_limiting_middleware, 'user_requests'):
-            rate_limiting_middleware.user_requests = defaultdict(list)
-        
-        user_requests = rate_limiting_middleware.user_requests[user_id]
-        
-        # Clean old requests (older than 1 minute)
-        user_requests[:] = [req_time for req_time in user_requests if current_time - req_time < 60]
-        
-        # Check rate limit (max 30 requests per minute per user)
-        if len(user_requests) >= 30:
-            logger.warning(f"Rate limit exceeded for user: {user_id}")
-            return {
-                "response_type": "ephemeral",
-                "text": "⚠️ Rate limit exceeded. Please wait a moment before trying again."
-            }
-        
-        # Record this request
-        user_requests.append(current_time)
-        
-        return next()
-    
-    logger.info("Middleware stack registered successfully")
+    return build_slack_app(service_container)
 
 # Create Slack app instance with error handling
 try:
@@ -563,109 +190,19 @@ except Exception as e:
     logger.critical(f"Failed to create Slack app instance: {e}")
     slack_app = None
 
-# Lambda handler for AWS deployment with comprehensive error handling
-@monitor_performance('lambda_handler')
-def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+def cached_environment_valid() -> bool:
     """
-    AWS Lambda handler for Slack events with comprehensive error handling,
-    performance monitoring, and graceful degradation.
+    Environment validation result as last recorded by health_check_task.
     
-    Args:
-        event: Lambda event data containing HTTP request information
-        context: Lambda context object with runtime information
-        
-    Returns:
-        Dict containing HTTP response with status code and body
-        
-    Raises:
-        Exception: Re-raises critical errors after logging
+    Probe endpoints call this instead of validate_environment() so frequent probes
+    never re-run validation; it only validates inline before the first recorded check.
     """
-    request_id = context.aws_request_id if context else f"lambda_{int(time.time())}"
-    
-    try:
-        logger.info(f"[{request_id}] Lambda handler started | Remaining time: {context.get_remaining_time_in_millis() if context else 'unknown'}ms")
-        
-        # Validate Slack app instance
-        if slack_app is None:
-            logger.error(f"[{request_id}] Slack app not initialized")
-            return {
-                'statusCode': 503,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({
-                    'error': 'Service temporarily unavailable',
-                    'request_id': request_id
-                })
-            }
-        
-        # Validate environment on cold start
-        if not validate_environment():
-            logger.error(f"[{request_id}] Environment validation failed")
-            app_metrics.update_health_check('environment', False, 'Validation failed')
-            return {
-                'statusCode': 500,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({
-                    'error': 'Environment validation failed',
-                    'request_id': request_id
-                })
-            }
-        
-        # Update health check
-        app_metrics.update_health_check('environment', True, 'Validation passed')
-        
-        # Create Slack request handler with timeout handling
-        handler = SlackRequestHandler(app=slack_app)
-        
-        # Check remaining execution time
-        if context and context.get_remaining_time_in_millis() < 5000:  # Less than 5 seconds
-            logger.warning(f"[{request_id}] Low remaining execution time: {context.get_remaining_time_in_millis()}ms")
-        
-        # Process the request
-        logger.debug(f"[{request_id}] Processing Slack request")
-        response = handler.handle(event, context)
-        
-        # Validate response
-        if not isinstance(response, dict) or 'statusCode' not in response:
-            logger.error(f"[{request_id}] Invalid response format from handler")
-            return {
-                'statusCode': 500,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({
-                    'error': 'Invalid response format',
-                    'request_id': request_id
-                })
-            }
-        
-        status_code = response.get('statusCode', 200)
-        logger.info(f"[{request_id}] Lambda request processed successfully | Status: {status_code}")
-        
-        # Add request ID to response headers
-        if 'headers' not in response:
-            response['headers'] = {}
-        response['headers']['X-Request-ID'] = request_id
-        
-        return response
-        
-    except Exception as e:
-        logger.error(f"[{request_id}] Lambda handler error: {e}")
-        logger.error(f"[{request_id}] Stack trace: {traceback.format_exc()}")
-        
-        # Update error metrics
-        app_metrics.record_request('lambda_handler', 0, type(e).__name__)
-        
-        # Return error response
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'X-Request-ID': request_id
-            },
-            'body': json.dumps({
-                'error': 'Internal server error',
-                'request_id': request_id,
-                'timestamp': datetime.now(timezone.utc).isoformat()
-            })
-        }
+    check = app_metrics.health_checks.get('environment')
+    if check is None:
+        healthy = validate_environment()
+        app_metrics.update_health_check('environment', healthy)
+        return healthy
+    return check['healthy']
 
 # Background tasks for monitoring and maintenance
 def health_check_task():
@@ -687,25 +224,6 @@ def health_check_task():
     except Exception as e:
         logger.error(f"Health check task error: {e}")
 
-def cleanup_metrics_task():
-    """Background task to clean up old metrics data."""
-    try:
-        # Reset error counts if they're getting too high
-        if app_metrics.error_count > 10000:
-            logger.info("Resetting error count metrics")
-            app_metrics.error_count = 0
-            app_metrics.error_types.clear()
-        
-        # Clean up old endpoint metrics
-        current_time = time.time()
-        for endpoint in list(app_metrics.endpoint_metrics.keys()):
-            # Reset metrics for endpoints not used in last hour
-            # This is a simple cleanup - in production, use more sophisticated logic
-            pass
-        
-    except Exception as e:
-        logger.error(f"Metrics cleanup task error: {e}")
-
 # FastAPI app for local development with comprehensive configuration
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -719,9 +237,15 @@ async def lifespan(app: FastAPI):
         await service_container.start_all_services()
         logger.info("All services started successfully")
         
+        # Watch the event loop for lag and blocking calls
+        get_loop_monitor().start()
+        
+        # Keep quotes for quick picks, held positions and watchlists cached
+        get_quote_prewarmer().start()
+        
         # Start background tasks
         lifecycle.start_background_task(health_check_task, interval=30)
-        lifecycle.start_background_task(cleanup_metrics_task, interval=300)  # 5 minutes
+        lifecycle.start_background_task(refresh_asset_universe_task, interval=3600)  # refreshes once a day
         
         # Register signal handlers
         signal.signal(signal.SIGTERM, lifecycle.initiate_shutdown)
@@ -740,6 +264,10 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("FastAPI application shutting down...")
+    get_loop_monitor().stop()
+    get_quote_prewarmer().stop()
+    get_quote_hub().stop()
+    get_slack_gateway().stop()
     
     try:
         # Stop all services
@@ -782,10 +310,11 @@ async def health_check():
     Comprehensive health check endpoint for monitoring, load balancers, and observability.
     
     Returns detailed health information including service status, metrics, and diagnostics.
+    Only reads cached results (environment validation from health_check_task, service
+    checks from the container's monitoring loop) so probes add no load.
     """
     try:
-        # Validate environment
-        env_valid = validate_environment()
+        env_valid = cached_environment_valid()
         
         # Get comprehensive metrics
         metrics = app_metrics.get_metrics()
@@ -812,7 +341,14 @@ async def health_check():
                 'average_response_time_ms': metrics['average_response_time_ms']
             },
             'health_checks': metrics['health_checks'],
-            'circuit_breakers': metrics['circuit_breaker_states']
+            'services': service_container.get_health_snapshot(),
+            'circuit_breakers': metrics['circuit_breaker_states'],
+            'event_loop': get_loop_monitor().get_status(include_stacks=config.debug_mode),
+            'slack_gateway': get_slack_gateway().get_status(),
+            'modal_updates': get_modal_coalescer().get_status(),
+            'logging': get_logging_pipeline().get_status(),
+            'quote_stream': get_quote_hub().get_status(),
+            'quote_prewarm': get_quote_prewarmer().get_status()
         }
         
         # Add detailed diagnostics in debug mode
@@ -843,30 +379,24 @@ async def health_check():
 @monitor_performance('metrics_endpoint')
 async def metrics_endpoint():
     """
-    Detailed metrics endpoint for monitoring and observability.
+    Prometheus scrape endpoint.
     
-    Returns comprehensive application metrics including performance data,
-    error rates, and service health information.
+    Exposes every metric in the shared registry (request latency histograms and
+    errors per endpoint, listener command/action/event metrics, health checks,
+    circuit breaker states) plus prometheus_client's default registry in the
+    Prometheus text format. JSON summaries remain
+    available from /health in debug mode.
     """
     try:
         if not config.debug_mode and config.environment.value == 'production':
             # In production, require authentication or restrict access
             raise HTTPException(status_code=404, detail="Not found")
         
-        metrics = app_metrics.get_metrics()
-        
-        return JSONResponse(
-            status_code=200,
-            content={
-                'timestamp': datetime.now(timezone.utc).isoformat(),
-                'application': {
-                    'name': config.app_name,
-                    'version': config.app_version,
-                    'environment': config.environment.value
-                },
-                'metrics': metrics,
-                'configuration': config.to_dict()
-            }
+        return Response(
+            # Services that predate the registry (market data, trading, risk) publish
+            # through prometheus_client's default registry; serve both in one scrape
+            content=get_metrics_registry().exposition() + generate_latest().decode('utf-8'),
+            media_type=PROMETHEUS_CONTENT_TYPE
         )
         
     except HTTPException:
@@ -875,6 +405,53 @@ async def metrics_endpoint():
         logger.error(f"Metrics endpoint error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@fastapi_app.get("/admin/profiling")
+@monitor_performance('profiling_report')
+async def profiling_report(limit: int = 20):
+    """
+    Profiling report: settings plus span breakdowns of the slowest and most recent
+    traced requests (see services/profiling.py).
+    """
+    if not config.debug_mode and config.environment.value == 'production':
+        raise HTTPException(status_code=404, detail="Not found")
+    
+    profiler = get_profiler()
+    return JSONResponse(
+        status_code=200,
+        content={
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'profiling': profiler.get_status(),
+            'slowest_requests': profiler.get_slow_requests(limit),
+            'recent_requests': profiler.get_recent_requests(limit)
+        }
+    )
+
+@fastapi_app.post("/admin/profiling")
+@monitor_performance('profiling_configure')
+async def profiling_configure(request: Request):
+    """
+    Change profiling settings at runtime.
+    
+    Body (all optional): {"enabled": bool, "sample_rate": float, "stack_sampling": bool, "reset": bool}
+    """
+    if not config.debug_mode and config.environment.value == 'production':
+        raise HTTPException(status_code=404, detail="Not found")
+    
+    try:
+        settings = await request.json()
+        profiler = get_profiler()
+        profiler.configure(
+            enabled=settings.get('enabled'),
+            sample_rate=settings.get('sample_rate'),
+            stack_sampling=settings.get('stack_sampling')
+        )
+        if settings.get('reset'):
+            profiler.reset()
+    except (ValueError, TypeError, AttributeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid profiling settings: {e}")
+    
+    return JSONResponse(status_code=200, content={'profiling': profiler.get_status()})
+
 @fastapi_app.get("/ready")
 @monitor_performance('readiness_check')
 async def readiness_check():
@@ -887,7 +464,7 @@ async def readiness_check():
         # Check if all critical components are ready
         ready = (
             slack_app is not None and
-            validate_environment() and
+            cached_environment_valid() and
             not lifecycle.is_shutting_down
         )
         
@@ -962,266 +539,66 @@ async def root():
         'debug': 'Commands should work now with better error handling'
     }
 
-@fastapi_app.post("/slack/events")
-@monitor_performance('slack_events')
-async def slack_events(request: Request, background_tasks: BackgroundTasks):
+# Slack request bodies are small; anything larger is rejected before Bolt parses it
+MAX_SLACK_BODY_BYTES = 1024 * 1024
+
+
+async def dispatch_to_bolt(request: Request, request_id: str) -> Response:
     """
-    Handle Slack events via HTTP with comprehensive error handling and monitoring.
+    Dispatch an HTTP request straight to Bolt through its Starlette/FastAPI adapter.
+    
+    Bolt verifies the signature, answers url_verification challenges and returns the
+    listener's response body as-is. The sync App runs in the threadpool so listeners
+    that call Slack or the broker do not block the event loop.
     
     Args:
         request: FastAPI request object
-        background_tasks: FastAPI background tasks for async processing
+        request_id: Request ID echoed in the X-Request-ID header
         
     Returns:
-        JSONResponse with appropriate status code and content
+        Starlette response built from the BoltResponse
     """
-    request_id = f"events_{int(time.time())}"
+    if lifecycle.is_shutting_down:
+        logger.warning(f"[{request_id}] Request rejected - application shutting down")
+        raise HTTPException(status_code=503, detail="Service unavailable - shutting down")
     
-    try:
-        logger.info(f"[{request_id}] Slack events request received")
-        
-        # Check if application is ready
-        if lifecycle.is_shutting_down:
-            logger.warning(f"[{request_id}] Request rejected - application shutting down")
-            raise HTTPException(status_code=503, detail="Service unavailable - shutting down")
-        
-        if slack_app is None:
-            logger.error(f"[{request_id}] Slack app not initialized")
-            raise HTTPException(status_code=503, detail="Service temporarily unavailable")
-        
-        # Get request body and headers
-        body = await request.body()
-        headers = dict(request.headers)
-        
-        # Parse JSON body for Slack challenge verification
-        try:
-            body_json = json.loads(body.decode('utf-8'))
-            
-            # Handle Slack URL verification challenge
-            if body_json.get('type') == 'url_verification':
-                challenge = body_json.get('challenge')
-                logger.info(f"[{request_id}] Slack URL verification challenge received")
-                print(f"🔍 SLACK CHALLENGE: Responding with challenge: {challenge}")
-                return JSONResponse(
-                    status_code=200,
-                    content={"challenge": challenge}
-                )
-        except json.JSONDecodeError:
-            # Not JSON, continue with normal processing
-            pass
-        except Exception as e:
-            logger.warning(f"[{request_id}] Error parsing JSON for challenge: {e}")
-        
-        # Validate request size
-        if len(body) > 1024 * 1024:  # 1MB limit
-            logger.warning(f"[{request_id}] Request body too large: {len(body)} bytes")
-            raise HTTPException(status_code=413, detail="Request entity too large")
-        
-        # Create Lambda-style event
-        lambda_event = {
-            'body': body.decode('utf-8'),
-            'headers': headers,
-            'httpMethod': 'POST',
-            'path': '/slack/events',
-            'queryStringParameters': dict(request.query_params) or None,
-            'isBase64Encoded': False,
-            'requestContext': {
-                'requestId': request_id,
-                'httpMethod': 'POST',
-                'path': '/slack/events'
-            }
-        }
-        
-        # Create mock Lambda context
-        class MockLambdaContext:
-            def __init__(self):
-                self.aws_request_id = request_id
-                self.function_name = 'slack-trading-bot'
-                self.function_version = config.app_version
-                self.invoked_function_arn = f"arn:aws:lambda:us-east-1:123456789012:function:slack-trading-bot"
-                self.memory_limit_in_mb = 512
-                self.remaining_time_in_millis = lambda: 30000  # 30 seconds
-            
-            def get_remaining_time_in_millis(self):
-                return 30000
-        
-        mock_context = MockLambdaContext()
-        
-        # Process with Lambda handler
-        logger.debug(f"[{request_id}] Processing with Lambda handler")
-        response = lambda_handler(lambda_event, mock_context)
-        
-        # Validate response
-        if not isinstance(response, dict):
-            logger.error(f"[{request_id}] Invalid response type from Lambda handler")
-            raise HTTPException(status_code=500, detail="Internal server error")
-        
-        status_code = response.get('statusCode', 200)
-        response_body = response.get('body', '{}')
-        response_headers = response.get('headers', {})
-        
-        # Parse response body
-        try:
-            content = json.loads(response_body) if isinstance(response_body, str) else response_body
-        except json.JSONDecodeError:
-            content = {'message': response_body}
-        
-        logger.info(f"[{request_id}] Slack events processed successfully | Status: {status_code}")
-        
-        return JSONResponse(
-            status_code=status_code,
-            content=content,
-            headers=response_headers
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[{request_id}] Slack events error: {e}")
-        logger.error(f"[{request_id}] Stack trace: {traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+    if slack_app is None:
+        logger.error(f"[{request_id}] Slack app not initialized")
+        raise HTTPException(status_code=503, detail="Service temporarily unavailable")
+    
+    body = await request.body()
+    if len(body) > MAX_SLACK_BODY_BYTES:
+        logger.warning(f"[{request_id}] Request body too large: {len(body)} bytes")
+        raise HTTPException(status_code=413, detail="Request entity too large")
+    
+    bolt_response = await run_in_threadpool(slack_app.dispatch, to_bolt_request(request, body))
+    response = to_starlette_response(bolt_response)
+    response.headers['X-Request-ID'] = request_id
+    
+    logger.info(f"[{request_id}] Slack request processed | Status: {bolt_response.status}")
+    return response
+
+
+@fastapi_app.post("/slack/events")
+@monitor_performance('slack_events')
+async def slack_events(request: Request):
+    """Handle Slack events (including url_verification challenges) via HTTP."""
+    return await dispatch_to_bolt(request, f"events_{int(time.time())}")
+
 
 @fastapi_app.post("/slack/interactive")
 @monitor_performance('slack_interactive')
-async def slack_interactive(request: Request, background_tasks: BackgroundTasks):
-    """
-    Handle Slack interactive components via HTTP with comprehensive error handling.
-    
-    Args:
-        request: FastAPI request object
-        background_tasks: FastAPI background tasks for async processing
-        
-    Returns:
-        JSONResponse with appropriate status code and content
-    """
-    request_id = f"interactive_{int(time.time())}"
-    
-    try:
-        logger.info(f"[{request_id}] Slack interactive request received")
-        
-        # Check application readiness
-        if lifecycle.is_shutting_down or slack_app is None:
-            raise HTTPException(status_code=503, detail="Service unavailable")
-        
-        # Get request data
-        body = await request.body()
-        headers = dict(request.headers)
-        
-        # Validate request size
-        if len(body) > 1024 * 1024:  # 1MB limit
-            raise HTTPException(status_code=413, detail="Request entity too large")
-        
-        # Create Lambda-style event
-        lambda_event = {
-            'body': body.decode('utf-8'),
-            'headers': headers,
-            'httpMethod': 'POST',
-            'path': '/slack/interactive',
-            'queryStringParameters': dict(request.query_params) or None,
-            'isBase64Encoded': False,
-            'requestContext': {'requestId': request_id}
-        }
-        
-        # Create mock context
-        class MockContext:
-            aws_request_id = request_id
-            get_remaining_time_in_millis = lambda: 30000
-        
-        # Process with Lambda handler
-        response = lambda_handler(lambda_event, MockContext())
-        
-        status_code = response.get('statusCode', 200)
-        response_body = response.get('body', '{}')
-        
-        try:
-            content = json.loads(response_body) if isinstance(response_body, str) else response_body
-        except json.JSONDecodeError:
-            content = {'message': response_body}
-        
-        logger.info(f"[{request_id}] Interactive request processed | Status: {status_code}")
-        
-        return JSONResponse(
-            status_code=status_code,
-            content=content,
-            headers=response.get('headers', {})
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[{request_id}] Slack interactive error: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+async def slack_interactive(request: Request):
+    """Handle Slack interactive components (buttons, modals, options) via HTTP."""
+    return await dispatch_to_bolt(request, f"interactive_{int(time.time())}")
+
 
 @fastapi_app.post("/slack/commands")
 @monitor_performance('slack_commands')
-async def slack_commands(request: Request, background_tasks: BackgroundTasks):
-    """
-    Handle Slack slash commands via HTTP with comprehensive error handling.
-    
-    Args:
-        request: FastAPI request object
-        background_tasks: FastAPI background tasks for async processing
-        
-    Returns:
-        JSONResponse with appropriate status code and content
-    """
-    request_id = f"commands_{int(time.time())}"
-    
-    try:
-        logger.info(f"[{request_id}] Slack commands request received")
-        
-        # Check application readiness
-        if lifecycle.is_shutting_down or slack_app is None:
-            raise HTTPException(status_code=503, detail="Service unavailable")
-        
-        # Get request data
-        body = await request.body()
-        headers = dict(request.headers)
-        
-        # Validate request size
-        if len(body) > 1024 * 1024:  # 1MB limit
-            raise HTTPException(status_code=413, detail="Request entity too large")
-        
-        # Create Lambda-style event
-        lambda_event = {
-            'body': body.decode('utf-8'),
-            'headers': headers,
-            'httpMethod': 'POST',
-            'path': '/slack/commands',
-            'queryStringParameters': dict(request.query_params) or None,
-            'isBase64Encoded': False,
-            'requestContext': {'requestId': request_id}
-        }
-        
-        # Create mock context
-        class MockContext:
-            aws_request_id = request_id
-            get_remaining_time_in_millis = lambda: 30000
-        
-        # Process with Lambda handler
-        response = lambda_handler(lambda_event, MockContext())
-        
-        status_code = response.get('statusCode', 200)
-        response_body = response.get('body', '{}')
-        
-        try:
-            content = json.loads(response_body) if isinstance(response_body, str) else response_body
-        except json.JSONDecodeError:
-            content = {'message': response_body}
-        
-        logger.info(f"[{request_id}] Commands request processed | Status: {status_code}")
-        
-        return JSONResponse(
-            status_code=status_code,
-            content=content,
-            headers=response.get('headers', {})
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[{request_id}] Slack commands error: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+async def slack_commands(request: Request):
+    """Handle Slack slash commands via HTTP."""
+    return await dispatch_to_bolt(request, f"commands_{int(time.time())}")
+
 
 @CircuitBreaker(failure_threshold=3, recovery_timeout=60)
 def run_socket_mode():
@@ -1250,7 +627,7 @@ def run_socket_mode():
         
         # Start background tasks
         lifecycle.start_background_task(health_check_task, interval=30)
-        lifecycle.start_background_task(cleanup_metrics_task, interval=300)
+        lifecycle.start_background_task(refresh_asset_universe_task, interval=3600)
         
         # Create and start Socket Mode handler
         handler = SocketModeHandler(slack_app, config.slack.app_token)
@@ -1479,6 +856,6 @@ if __name__ == "__main__":
     # Start the application
     main()
 
-# Export for ASGI servers and Lambda
+# Export for ASGI servers
 app = fastapi_app
 application = fastapi_app  # Alternative export name
\ No newline at end of file
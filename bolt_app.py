@@ -0,0 +1,548 @@
+"""
+Slack Bolt application factory.
+
+Builds the Bolt ``App`` with its middleware stack and listener registrations. Kept
+separate from app.py so the Lambda entry point (lambda_entry.py) can build the app
+without importing FastAPI, uvicorn or the Socket Mode adapter. The listeners, the Slack
+gateway and the quote hub, which pull in aiohttp, Redis, SQLAlchemy and numpy, are
+imported by build_slack_app rather than with this module.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+import traceback
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Union, TYPE_CHECKING
+
+from slack_bolt import App, BoltContext, BoltRequest, BoltResponse
+from slack_bolt.middleware.request_verification import RequestVerification
+from slack_sdk.signature import SignatureVerifier
+
+from config.settings import get_config
+from services.circuit_breaker import get_circuit_breaker_states
+from services.metrics import HistogramSnapshot, MetricsRegistry, get_metrics_registry
+
+if TYPE_CHECKING:
+    from services.service_container import ServiceContainer
+
+logger = logging.getLogger(__name__)
+
+config = get_config()
+
+
+class PrecomputedSignatureVerifier(SignatureVerifier):
+    """
+    Slack signature verifier that keys HMAC-SHA256 once per process.
+    
+    The stock verifier rebuilds the HMAC (key padding plus inner/outer pads) and
+    re-encodes the body for every request. Here the keyed state, already fed the
+    ``v0:`` prefix, is copied per request and only the timestamp and body are hashed.
+    """
+    
+    def __init__(self, signing_secret: str, **kwargs):
+        super().__init__(signing_secret, **kwargs)
+        self._keyed_hmac = hmac.new(signing_secret.encode('utf-8'), b'v0:', hashlib.sha256)
+    
+    def generate_signature(self, *, timestamp: str, body: Union[str, bytes]) -> Optional[str]:
+        """Generate the ``v0=`` signature for a request."""
+        if timestamp is None:
+            return None
+        if body is None:
+            body = b''
+        elif isinstance(body, str):
+            body = body.encode('utf-8')
+        
+        digest = self._keyed_hmac.copy()
+        digest.update(f"{timestamp}:".encode('utf-8'))
+        digest.update(body)
+        return f"v0={digest.hexdigest()}"
+
+
+class PrecomputedRequestVerification(RequestVerification):
+    """
+    Bolt's RequestVerification middleware backed by a PrecomputedSignatureVerifier.
+    
+    Passed to the App as ``before_authorize`` with ``request_verification_enabled=False``,
+    which puts it where Bolt's own verification runs: before authorization.
+    """
+    
+    def __init__(self, signing_secret: str, base_logger: Optional[logging.Logger] = None):
+        super().__init__(signing_secret, base_logger=base_logger)
+        self.verifier = PrecomputedSignatureVerifier(signing_secret)
+
+
+def gateway_client_middleware(context: BoltContext, next):
+    """
+    Give listeners a GatewayWebClient in place of the plain WebClient Bolt builds per request.
+    
+    Registered with ``app.use`` so it runs after authorization, and copies the client's
+    token, transport settings and retry handlers.
+    """
+    from services.slack_gateway import GatewayWebClient
+    
+    client = context.client
+    if client is not None and not isinstance(client, GatewayWebClient):
+        context['client'] = GatewayWebClient(
+            token=client.token,
+            base_url=client.base_url,
+            timeout=client.timeout,
+            ssl=client.ssl,
+            proxy=client.proxy,
+            headers=client.headers,
+            team_id=context.team_id,
+            retry_handlers=client.retry_handlers.copy() if client.retry_handlers is not None else None
+        )
+    return next()
+
+
+def _profile_label(body: Dict[str, Any]) -> str:
+    """Name a Slack request for profiling, e.g. ``/buy`` or ``block_actions:execute_trade``."""
+    if body.get('command'):
+        return body['command']
+    event_type = body.get('type', 'unknown')
+    if event_type == 'event_callback':
+        return (body.get('event') or {}).get('type', event_type)
+    if event_type == 'block_actions' and body.get('actions'):
+        return f"block_actions:{body['actions'][0].get('action_id', 'unknown')}"
+    if event_type in ('view_submission', 'view_closed'):
+        return f"{event_type}:{(body.get('view') or {}).get('callback_id', 'unknown')}"
+    return event_type
+
+
+class ProfiledApp(App):
+    """
+    Bolt App that traces sampled requests for profiling (services/profiling.py).
+    
+    Tracing wraps dispatch() because Bolt runs listeners after the global middleware
+    chain has returned, so a middleware cannot see listener time. dispatch() also sets
+    the gateway priority for the request's Slack calls and records modal state for the
+    modal update coalescer (services/modal_updates.py).
+    """
+    
+    def dispatch(self, req: BoltRequest) -> BoltResponse:
+        from services.slack_gateway import request_priority, slack_priority
+        
+        body = req.body if isinstance(req.body, dict) else {}
+        _track_view(body)
+        with slack_priority(request_priority(body)):
+            return self._dispatch_traced(req, body)
+    
+    def _dispatch_traced(self, req: BoltRequest, body: Dict[str, Any]) -> BoltResponse:
+        from services.profiling import get_profiler
+        
+        profiler = get_profiler()
+        if not profiler.enabled:
+            return super().dispatch(req)
+        
+        trace = profiler.start_request(_profile_label(body), body.get('trigger_id') or body.get('event_id'))
+        error = None
+        try:
+            response = super().dispatch(req)
+            if response.status >= 500:
+                error = f"HTTP {response.status}"
+            return response
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            profiler.finish_request(trace, error)
+
+
+def _track_view(body: Dict[str, Any]) -> None:
+    """Keep the modal coalescer's copy of a view's state current from interaction payloads."""
+    from services.modal_updates import get_modal_coalescer
+    from services.quote_stream import get_quote_hub
+    
+    view = body.get('view')
+    if not isinstance(view, dict) or not view.get('id'):
+        return
+    if body.get('type') in ('view_submission', 'view_closed'):
+        get_modal_coalescer().forget(view['id'])
+        get_quote_hub().unwatch_modal(view['id'])  # Stop auto-refreshing the closed modal
+    else:
+        get_modal_coalescer().observe(view)
+
+
+# Application state and metrics
+class ApplicationMetrics:
+    """
+    Application request, health check and circuit breaker metrics.
+    
+    Request latencies and errors are recorded in the shared metrics registry
+    (services.metrics), so recording is lock-free and everything is exported by the
+    Prometheus /metrics endpoint; get_metrics() summarizes the same data as JSON.
+    Circuit breakers (services.circuit_breaker) export their own state.
+    """
+    
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry or get_metrics_registry()
+        self.start_time = datetime.now(timezone.utc)
+        self.request_latency = self.registry.histogram(
+            'request_duration_seconds', 'Request handling latency by endpoint', ('endpoint',))
+        self.request_errors = self.registry.counter(
+            'request_errors', 'Failed requests by endpoint and error type', ('endpoint', 'error'))
+        self._health_gauge = self.registry.gauge(
+            'health_check_healthy', '1 if the last health check passed', ('check',))
+        self.registry.gauge('uptime_seconds', 'Seconds since process start').set_function(
+            lambda: (datetime.now(timezone.utc) - self.start_time).total_seconds())
+        self.health_checks = {}
+        self._lock = threading.Lock()
+    
+    def record_request(self, endpoint: str, response_time: float, error: Optional[str] = None):
+        """Record request metrics."""
+        self.request_latency.observe(response_time, endpoint)
+        if error:
+            self.request_errors.inc(endpoint, error)
+    
+    @property
+    def request_count(self) -> int:
+        return self.request_latency.snapshot().count
+    
+    @property
+    def error_count(self) -> int:
+        return int(self.request_errors.total())
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get current application metrics."""
+        uptime = datetime.now(timezone.utc) - self.start_time
+        latencies = self.request_latency.collect()
+        errors = self.request_errors.collect()
+        
+        overall = HistogramSnapshot()
+        for snapshot in latencies.values():
+            overall.merge(snapshot)
+        
+        error_types = defaultdict(int)
+        endpoint_errors = defaultdict(int)
+        for (endpoint, error), count in errors.items():
+            error_types[error] += int(count)
+            endpoint_errors[endpoint] += int(count)
+        total_errors = sum(error_types.values())
+        
+        endpoint_metrics = {
+            endpoint: {
+                'count': snapshot.count,
+                'errors': endpoint_errors.get(endpoint, 0),
+                'avg_time': snapshot.mean,
+                'p50_ms': snapshot.percentile(50) * 1000,
+                'p99_ms': snapshot.percentile(99) * 1000
+            }
+            for (endpoint,), snapshot in latencies.items()
+        }
+        
+        with self._lock:
+            health_checks = dict(self.health_checks)
+        
+        return {
+            'uptime_seconds': uptime.total_seconds(),
+            'uptime_human': str(uptime),
+            'total_requests': overall.count,
+            'total_errors': total_errors,
+            'error_rate': (total_errors / overall.count) if overall.count > 0 else 0,
+            'average_response_time_ms': overall.mean * 1000,
+            'response_time_percentiles_ms': {
+                'p50': overall.percentile(50) * 1000,
+                'p95': overall.percentile(95) * 1000,
+                'p99': overall.percentile(99) * 1000
+            },
+            'error_types': dict(error_types),
+            'endpoint_metrics': endpoint_metrics,
+            'circuit_breaker_states': get_circuit_breaker_states(),
+            'health_checks': health_checks
+        }
+    
+    def update_health_check(self, service: str, healthy: bool, details: Optional[str] = None):
+        """Update health check status for a service."""
+        with self._lock:
+            self.health_checks[service] = {
+                'healthy': healthy,
+                'details': details,
+                'last_checked': datetime.now(timezone.utc).isoformat()
+            }
+        self._health_gauge.set(1 if healthy else 0, service)
+
+# Global metrics instance
+app_metrics = ApplicationMetrics()
+
+def register_middleware(app: App) -> None:
+    """
+    Register comprehensive middleware stack for the Slack app including
+    request logging, performance monitoring, security validation, and error handling.
+    
+    Args:
+        app: Slack Bolt application instance
+    """
+    
+    @app.middleware
+    def request_logging_middleware(body: Dict[str, Any], next):
+        """Comprehensive request logging and audit trail middleware."""
+        start_time = time.time()
+        request_id = body.get('event_id') or body.get('trigger_id') or f"req_{int(time.time())}"
+        user_id = body.get('user_id', 'unknown')
+        event_type = body.get('type', 'unknown')
+        
+        # Log request start
+        logger.info(
+            f"[{request_id}] Request started | "
+            f"Type: {event_type} | User: {user_id} | "
+            f"Timestamp: {datetime.now(timezone.utc).isoformat()}"
+        )
+        
+        # Log request body for debugging (truncated)
+        if config.debug_mode:
+            body_str = json.dumps(body, default=str)[:1000]
+            logger.debug(f"[{request_id}] Request body: {body_str}")
+        
+        try:
+            # Call next middleware/handler
+            response = next()
+            
+            # Log successful completion
+            duration = time.time() - start_time
+            logger.info(
+                f"[{request_id}] Request completed successfully | "
+                f"Duration: {duration:.3f}s"
+            )
+            
+            return response
+            
+        except Exception as e:
+            # Log error
+            duration = time.time() - start_time
+            logger.error(
+                f"[{request_id}] Request failed | "
+                f"Duration: {duration:.3f}s | Error: {e}"
+            )
+            raise
+    
+    @app.middleware
+    def security_validation_middleware(body: Dict[str, Any], next):
+        """Security validation middleware for channel restrictions and user authorization."""
+        # Skip validation for certain event types
+        skip_validation = [
+            'url_verification',
+            'app_home_opened',
+            'tokens_revoked',
+            'app_uninstalled'
+        ]
+        
+        event_type = body.get('type')
+        if event_type in skip_validation:
+            return next()
+        
+        # Extract channel ID from various possible locations
+        channel_id = None
+        if 'channel_id' in body:
+            channel_id = body['channel_id']
+        elif 'event' in body and 'channel' in body['event']:
+            channel_id = body['event']['channel']
+        elif 'channel' in body:
+            channel_id = body['channel']
+        elif 'payload' in body and isinstance(body['payload'], dict):
+            payload = body['payload']
+            if 'channel' in payload and isinstance(payload['channel'], dict):
+                channel_id = payload['channel'].get('id')
+        
+        # Validate channel if present
+        if channel_id:
+            if not config.is_channel_approved(channel_id):
+                logger.warning(
+                    f"Request from unapproved channel: {channel_id} | "
+                    f"User: {body.get('user_id', 'unknown')} | "
+                    f"Type: {event_type}"
+                )
+                
+                # In production, block unapproved channels
+                if config.environment.value == 'production':
+                    from slack_bolt import BoltResponse
+                    return BoltResponse(
+                        status=403,
+                        body={
+                            "response_type": "ephemeral",
+                            "text": "🚫 This bot is not authorized to operate in this channel. "
+                                   "Please contact your administrator for access."
+                        }
+                    )
+        
+        # Additional security checks
+        user_id = body.get('user_id')
+        if user_id:
+            # Log user activity for audit trail
+            logger.info(f"User activity: {user_id} in channel {channel_id} - {event_type}")
+        
+        return next()
+    
+    @app.middleware
+    def performance_monitoring_middleware(body: Dict[str, Any], next):
+        """Performance monitoring and metrics collection middleware."""
+        start_time = time.time()
+        event_type = body.get('type', 'unknown')
+        
+        try:
+            response = next()
+            
+            # Record successful request metrics
+            duration = time.time() - start_time
+            app_metrics.record_request(f"slack_{event_type}", duration)
+            
+            # Log slow requests
+            if duration > 3.0:  # 3 second threshold
+                logger.warning(
+                    f"Slow request detected | Type: {event_type} | "
+                    f"Duration: {duration:.3f}s | User: {body.get('user_id', 'unknown')}"
+                )
+            
+            return response
+            
+        except Exception as e:
+            # Record error metrics
+            duration = time.time() - start_time
+            app_metrics.record_request(f"slack_{event_type}", duration, type(e).__name__)
+            raise
+    
+    @app.middleware
+    def rate_limiting_middleware(body: Dict[str, Any], next):
+        """Basic rate limiting middleware to prevent abuse."""
+        user_id = body.get('user_id')
+        if not user_id:
+            return next()
+        
+        # Simple in-memory rate limiting (in production, use Redis or similar)
+        current_time = time.time()
+        if not hasattr(rate_limiting_middleware, 'user_requests'):
+            rate_limiting_middleware.user_requests = defaultdict(list)
+        
+        user_requests = rate_limiting_middleware.user_requests[user_id]
+        
+        # Clean old requests (older than 1 minute)
+        user_requests[:] = [req_time for req_time in user_requests if current_time - req_time < 60]
+        
+        # Check rate limit (max 30 requests per minute per user)
+        if len(user_requests) >= 30:
+            logger.warning(f"Rate limit exceeded for user: {user_id}")
+            return {
+                "response_type": "ephemeral",
+                "text": "⚠️ Rate limit exceeded. Please wait a moment before trying again."
+            }
+        
+        # Record this request
+        user_requests.append(current_time)
+        
+        return next()
+    
+    logger.info("Middleware stack registered successfully")
+
+
+def build_slack_app(service_container: Optional['ServiceContainer'] = None) -> App:
+    """
+    Create and configure the Slack Bolt application with comprehensive middleware,
+    error handling, and monitoring capabilities.
+    
+    Args:
+        service_container: Service container for listener dependency injection
+            (defaults to the global container)
+    
+    Returns:
+        App: Configured Slack Bolt application instance
+        
+    Raises:
+        Exception: If Slack app initialization fails
+    """
+    try:
+        logger.info("Initializing Slack Bolt application...")
+        
+        from services.slack_gateway import GatewayWebClient
+        from listeners.commands import register_command_handlers
+        from listeners.actions import register_action_handlers
+        from listeners.events import register_event_handlers
+        
+        # Get Slack configuration
+        slack_config = config.get_slack_config()
+        
+        # Create Slack app with configuration
+        # Lazy startup skips the auth.test round trip; a bad token surfaces on the first API call
+        app = ProfiledApp(
+            client=GatewayWebClient(token=slack_config['token'], base_url=slack_config['api_url']),
+            signing_secret=slack_config['signing_secret'],
+            process_before_response=True,  # Important for Lambda
+            # Bolt's own verification is replaced by the precomputed-HMAC one in the same slot
+            request_verification_enabled=False,
+            before_authorize=PrecomputedRequestVerification(slack_config['signing_secret']),
+            token_verification_enabled=not config.lazy_startup
+        )
+        # Listeners' Slack calls go through the Slack gateway
+        app.use(gateway_client_middleware)
+        
+        # Register comprehensive middleware stack
+        register_middleware(app)
+        
+        # Register event handlers with error handling and service injection
+        try:
+            register_command_handlers(app, service_container)
+            logger.info("Command handlers registered successfully")
+        except Exception as e:
+            logger.error(f"Failed to register command handlers: {e}")
+            raise
+        
+        try:
+            register_action_handlers(app, service_container)
+            logger.info("Action handlers registered successfully")
+        except Exception as e:
+            logger.error(f"Failed to register action handlers: {e}")
+            raise
+        
+        # Register interactive action handlers
+        try:
+            from listeners.interactive_actions import interactive_handler
+            interactive_handler.register_handlers(app)
+            logger.info("Interactive action handlers registered successfully")
+        except Exception as e:
+            logger.error(f"Failed to register interactive action handlers: {e}")
+            raise
+        
+        try:
+            register_event_handlers(app, service_container)
+            logger.info("Event handlers registered successfully")
+        except Exception as e:
+            logger.error(f"Failed to register event handlers: {e}")
+            raise
+        
+        # Register global error handler
+        @app.error
+        def global_error_handler(error, body, logger):
+            """Global error handler for unhandled exceptions."""
+            error_id = f"error_{int(time.time())}"
+            user_id = body.get('user_id', 'unknown')
+            channel_id = body.get('channel_id', 'unknown')
+            
+            logger.error(
+                f"Global error {error_id}: {error} | "
+                f"User: {user_id} | Channel: {channel_id} | "
+                f"Body: {json.dumps(body, default=str)[:500]}"
+            )
+            
+            # Record error metrics
+            app_metrics.record_request('global_error', 0, type(error).__name__)
+            
+            # Return user-friendly error message
+            return {
+                "response_type": "ephemeral",
+                "text": f"⚠️ An unexpected error occurred. Error ID: {error_id}\n"
+                       f"Please try again or contact support if the issue persists."
+            }
+        
+        logger.info("Slack Bolt app initialized successfully")
+        app_metrics.update_health_check('slack_app', True, 'Initialized successfully')
+        return app
+        
+    except Exception as e:
+        logger.error(f"Failed to initialize Slack app: {e}")
+        logger.error(f"Stack trace: {traceback.format_exc()}")
+        app_metrics.update_health_check('slack_app', False, str(e))
+        raise
+
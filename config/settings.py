@@ -39,6 +39,7 @@ class SlackConfig:
     client_id: Optional[str] = None
     client_secret: Optional[str] = None
     oauth_redirect_url: Optional[str] = None
+    api_url: str = "https://slack.com/api/"
     
     def __post_init__(self):
         """Validate Slack configuration after initialization."""
@@ -60,6 +61,7 @@ class DatabaseConfig:
     max_overflow: int = 10
     pool_pre_ping: bool = True
     echo_sql: bool = False
+    auto_migrate: bool = True  # Create tables and run migrations when the service is constructed
     
     def __post_init__(self):
         """Validate database configuration."""
@@ -102,9 +104,16 @@ class MarketDataConfig:
     """Market data service configuration."""
     finnhub_api_key: str
     finnhub_base_url: str = "https://finnhub.io/api/v1"
-    cache_ttl_seconds: int = 60
+    cache_ttl_seconds: int = 60  # Quote cache TTL during regular trading hours
+    cache_stale_seconds: int = 120  # Modals: expired quotes still served this long while refreshed in the background
+    cache_stale_execution_seconds: int = 0  # Trade execution and pre-trade checks
+    cache_stale_app_home_seconds: int = 1800  # App Home portfolio
+    cache_ttl_extended_hours_seconds: int = 300  # Pre-market and after hours
+    cache_ttl_closed_seconds: int = 86400  # Nights, weekends and holidays
     rate_limit_per_minute: int = 60
     timeout_seconds: int = 10
+    asset_universe_path: str = "data/reference/asset_universe.json"
+    asset_universe_refresh_hours: int = 24
     
     def __post_init__(self):
         """Validate market data configuration."""
@@ -114,8 +123,17 @@ class MarketDataConfig:
         if self.rate_limit_per_minute <= 0:
             raise ValueError("Rate limit must be positive")
         
+        if min(self.cache_ttl_seconds, self.cache_ttl_extended_hours_seconds, self.cache_ttl_closed_seconds) <= 0:
+            raise ValueError("Quote cache TTLs must be positive")
+        
+        if min(self.cache_stale_seconds, self.cache_stale_execution_seconds, self.cache_stale_app_home_seconds) < 0:
+            raise ValueError("Quote cache stale windows cannot be negative")
+        
         if self.timeout_seconds <= 0:
             raise ValueError("Timeout must be positive")
+        
+        if self.asset_universe_refresh_hours <= 0:
+            raise ValueError("Asset universe refresh interval must be positive")
 
 
 @dataclass
@@ -141,11 +159,228 @@ class TradingConfig:
             raise ValueError("Maximum trade value must be positive")
 
 
+@dataclass
+class RiskConfig:
+    """Quantitative risk engine configuration."""
+    price_history_dir: str = "data/price_history"
+    sector_reference_path: str = "data/reference/sector_classification.csv"
+    var_confidence: float = 0.95
+    var_horizon_days: int = 1
+    lookback_days: int = 252
+    
+    def __post_init__(self):
+        """Validate risk configuration."""
+        if not (0.5 < self.var_confidence < 1.0):
+            raise ValueError("VaR confidence must be between 0.5 and 1.0")
+        
+        if self.var_horizon_days <= 0:
+            raise ValueError("VaR horizon must be positive")
+        
+        if self.lookback_days < 2:
+            raise ValueError("Lookback window must be at least 2 days")
+
+
+@dataclass
+class ProfilingConfig:
+    """Request profiling configuration (spans, slow-request capture, stack sampling)."""
+    enabled: bool = False
+    sample_rate: float = 0.01  # Fraction of requests traced with spans
+    slow_request_count: int = 20  # Slowest traced requests kept for the admin endpoint
+    stack_sampling: bool = False  # Sample Python stacks of traced requests
+    stack_interval_ms: float = 5.0
+    dump_dir: str = "logs/profiles"  # Collapsed-stack files for the slowest requests
+    
+    def __post_init__(self):
+        """Validate profiling configuration."""
+        if not (0.0 <= self.sample_rate <= 1.0):
+            raise ValueError("Profiling sample rate must be between 0 and 1")
+        
+        if self.slow_request_count <= 0:
+            raise ValueError("Slow request count must be positive")
+        
+        if self.stack_interval_ms <= 0:
+            raise ValueError("Stack sampling interval must be positive")
+
+
+@dataclass
+class LoopMonitorConfig:
+    """Event-loop lag monitoring and blocking-call detection."""
+    enabled: bool = True
+    interval_ms: float = 50.0  # Probe wake-up interval; lag is how late each wake-up fires
+    slow_callback_ms: float = 100.0  # Stalls longer than this are reported as blocking calls
+    capture_stacks: bool = False  # Snapshot the loop thread's stack during a stall (debug mode)
+    block_budget_ms: Optional[float] = None  # Test mode: longest stall allowed by assert_within_budget()
+    
+    def __post_init__(self):
+        """Validate loop monitor configuration."""
+        if self.interval_ms <= 0:
+            raise ValueError("Loop monitor interval must be positive")
+        
+        if self.slow_callback_ms <= 0:
+            raise ValueError("Slow callback threshold must be positive")
+        
+        if self.block_budget_ms is not None and self.block_budget_ms <= 0:
+            raise ValueError("Loop block budget must be positive")
+
+
+@dataclass
+class AssignmentStoreConfig:
+    """Persistence of user-to-account assignments."""
+    backend: str = "auto"  # auto (database when available), database, log, memory
+    log_path: str = "data/user_assignments.log"  # Append-only log used by the "log" backend
+    batch_size: int = 500  # Pending writes that trigger an immediate flush
+    flush_interval_seconds: float = 0.5  # Longest a pending write waits before it is flushed
+    
+    def __post_init__(self):
+        """Validate assignment store configuration."""
+        if self.backend not in ('auto', 'database', 'log', 'memory'):
+            raise ValueError("Assignment store backend must be auto, database, log or memory")
+        
+        if self.batch_size <= 0:
+            raise ValueError("Assignment batch size must be positive")
+        
+        if self.flush_interval_seconds <= 0:
+            raise ValueError("Assignment flush interval must be positive")
+
+
+@dataclass
+class SlackGatewayConfig:
+    """Outbound Slack Web API gateway (services/slack_gateway.py)."""
+    enabled: bool = True
+    max_connections: int = 20  # Pooled HTTP connections to the Slack API
+    max_retries: int = 3  # Retries of a rate-limited call, each after its Retry-After
+    burst_seconds: float = 6.0  # Token bucket capacity, in seconds of the method's tier rate
+    rate_scale: float = 1.0  # Multiplies every tier's rate; load tests against local stubs raise it
+    request_timeout_seconds: int = 30  # Per HTTP request
+    call_timeout_seconds: float = 2.0  # Longest a sync caller waits, queueing and retries included; under Slack's 3s ack
+    
+    def __post_init__(self):
+        """Validate Slack gateway configuration."""
+        if self.max_connections <= 0:
+            raise ValueError("Slack gateway max connections must be positive")
+        
+        if self.max_retries < 0:
+            raise ValueError("Slack gateway max retries cannot be negative")
+        
+        if self.burst_seconds <= 0 or self.rate_scale <= 0:
+            raise ValueError("Slack gateway burst and rate scale must be positive")
+        
+        if self.request_timeout_seconds <= 0 or self.call_timeout_seconds <= 0:
+            raise ValueError("Slack gateway timeouts must be positive")
+
+
+@dataclass
+class ModalUpdateConfig:
+    """Coalescing of modal views.update calls (services/modal_updates.py)."""
+    enabled: bool = True
+    debounce_ms: float = 150.0  # Updates for one view within this window collapse into the newest
+    max_views: int = 5000  # Open modals whose state and hash are tracked
+    
+    def __post_init__(self):
+        """Validate modal update configuration."""
+        if self.debounce_ms < 0:
+            raise ValueError("Modal update debounce cannot be negative")
+        
+        if self.max_views <= 0:
+            raise ValueError("Modal update max views must be positive")
+
+
+@dataclass
+class QuoteStreamConfig:
+    """Live quote streaming to open modals (services/quote_stream.py)."""
+    enabled: bool = True
+    source: str = "poll"  # poll (one shared Finnhub REST poll) or websocket (Finnhub trades stream)
+    poll_interval_seconds: float = 5.0  # Each subscribed symbol is fetched once per interval
+    websocket_url: str = "wss://ws.finnhub.io"
+    modal_refresh_seconds: float = 2.0  # Fastest an auto-refreshing modal is redrawn
+    watch_max_minutes: float = 30.0  # Auto-refresh stops after this long even if the modal stays open
+    
+    def __post_init__(self):
+        """Validate quote stream configuration."""
+        if self.source not in ('poll', 'websocket'):
+            raise ValueError("Quote stream source must be poll or websocket")
+        
+        if self.poll_interval_seconds <= 0 or self.modal_refresh_seconds <= 0:
+            raise ValueError("Quote stream intervals must be positive")
+        
+        if self.watch_max_minutes <= 0:
+            raise ValueError("Quote stream watch duration must be positive")
+
+
+@dataclass
+class QuotePrewarmConfig:
+    """Background quote cache prewarming for hot symbols (services/quote_prewarmer.py)."""
+    enabled: bool = True
+    interval_seconds: float = 60.0  # Time between refresh cycles
+    budget_fraction: float = 0.25  # Share of market_data.rate_limit_per_minute the prewarmer may spend
+    refresh_age_seconds: float = 240.0  # Re-fetch cached quotes older than this or the session's quote TTL
+    max_symbols: int = 50  # Size of the hot symbol set
+    quick_symbols: List[str] = field(default_factory=lambda: ["AAPL", "TSLA", "MSFT", "GOOGL"])  # Trade modal quick picks
+    access_half_life_minutes: float = 30.0  # How fast a symbol's recent-access score fades
+    market_status_ttl_seconds: float = 300.0  # How long a market open/closed answer is reused
+    
+    def __post_init__(self):
+        """Validate quote prewarm configuration."""
+        if self.interval_seconds <= 0 or self.refresh_age_seconds <= 0 or self.market_status_ttl_seconds <= 0:
+            raise ValueError("Quote prewarm intervals must be positive")
+        
+        if not (0.0 < self.budget_fraction <= 1.0):
+            raise ValueError("Quote prewarm budget fraction must be between 0 and 1")
+        
+        if self.max_symbols <= 0 or self.access_half_life_minutes <= 0:
+            raise ValueError("Quote prewarm symbol limit and half-life must be positive")
+
+
+@dataclass
+class SharedCacheConfig:
+    """Cache tier shared by worker processes (services/shared_cache.py)."""
+    backend: str = "auto"  # auto (redis when enabled, else none), redis, local, none
+    redis_enabled: bool = False
+    redis_url: str = "redis://localhost:6379/0"
+    local_path: str = ""  # SQLite file of the local backend; empty puts it in /dev/shm
+    l1_ttl_seconds: float = 30.0  # Longest a worker serves its own copy without rereading the shared tier
+    poll_interval_seconds: float = 0.25  # How often the local backend checks for invalidations
+    
+    def __post_init__(self):
+        """Validate shared cache configuration."""
+        if self.backend not in ('auto', 'redis', 'local', 'none'):
+            raise ValueError("Shared cache backend must be auto, redis, local or none")
+        
+        if self.l1_ttl_seconds <= 0 or self.poll_interval_seconds <= 0:
+            raise ValueError("Shared cache L1 TTL and poll interval must be positive")
+    
+    @property
+    def resolved_backend(self) -> str:
+        """Backend actually used: auto picks Redis when it is enabled."""
+        if self.backend == 'auto':
+            return 'redis' if self.redis_enabled else 'none'
+        return self.backend
+
+
+@dataclass
+class LoggingConfig:
+    """Log record pipeline (services/logging_pipeline.py)."""
+    async_enabled: bool = True  # Hand records to a background writer thread through a bounded queue
+    queue_size: int = 10000  # Records waiting for the writer; further records are dropped and counted
+    debug_sample_rates: Dict[str, float] = field(default_factory=dict)  # Logger name prefix -> fraction of DEBUG records kept
+    pii_masking: bool = True  # Mask emails, card numbers, phone numbers etc. in written messages
+    
+    def __post_init__(self):
+        """Validate logging configuration."""
+        if self.queue_size <= 0:
+            raise ValueError("Log queue size must be positive")
+        
+        for name, rate in self.debug_sample_rates.items():
+            if not (0.0 <= rate <= 1.0):
+                raise ValueError(f"Debug log sample rate for '{name}' must be between 0 and 1")
+
+
 @dataclass
 class SecurityConfig:
     """Security and compliance configuration."""
     approved_channels: List[str] = field(default_factory=list)
     session_timeout_minutes: int = 480  # 8 hours
+    session_activity_write_seconds: int = 60  # Activity newer than the shared copy by less than this stays local
     max_failed_attempts: int = 5
     audit_log_retention_days: int = 2555  # 7 years for compliance
     encryption_key_id: Optional[str] = None
@@ -155,6 +390,9 @@ class SecurityConfig:
         if self.session_timeout_minutes <= 0:
             raise ValueError("Session timeout must be positive")
         
+        if self.session_activity_write_seconds < 0:
+            raise ValueError("Session activity write interval cannot be negative")
+        
         if self.max_failed_attempts <= 0:
             raise ValueError("Max failed attempts must be positive")
         
@@ -173,11 +411,22 @@ class AppConfig:
     alpaca: AlpacaConfig
     trading: TradingConfig
     security: SecurityConfig
+    risk: RiskConfig = field(default_factory=RiskConfig)
+    profiling: ProfilingConfig = field(default_factory=ProfilingConfig)
+    loop_monitor: LoopMonitorConfig = field(default_factory=LoopMonitorConfig)
+    assignment_store: AssignmentStoreConfig = field(default_factory=AssignmentStoreConfig)
+    slack_gateway: SlackGatewayConfig = field(default_factory=SlackGatewayConfig)
+    modal_updates: ModalUpdateConfig = field(default_factory=ModalUpdateConfig)
+    log_pipeline: LoggingConfig = field(default_factory=LoggingConfig)
+    quote_stream: QuoteStreamConfig = field(default_factory=QuoteStreamConfig)
+    quote_prewarm: QuotePrewarmConfig = field(default_factory=QuotePrewarmConfig)
+    shared_cache: SharedCacheConfig = field(default_factory=SharedCacheConfig)
     
     # Application metadata
     app_name: str = "Jain Global Slack Trading Bot"
     app_version: str = "1.0.0"
     debug_mode: bool = False
+    lazy_startup: bool = False  # Construct services on first use instead of at import
     
     def __post_init__(self):
         """Perform comprehensive configuration validation."""
@@ -238,7 +487,8 @@ class AppConfig:
         """
         config = {
             'token': self.slack.bot_token,
-            'signing_secret': self.slack.signing_secret
+            'signing_secret': self.slack.signing_secret,
+            'api_url': self.slack.api_url
         }
         
         if self.slack.app_token:
@@ -271,6 +521,16 @@ class AppConfig:
             'environment': self.environment.value,
             'log_level': self.log_level.value,
             'debug_mode': self.debug_mode,
+            'lazy_startup': self.lazy_startup,
+            'profiling_enabled': self.profiling.enabled,
+            'loop_monitor_enabled': self.loop_monitor.enabled,
+            'assignment_store_backend': self.assignment_store.backend,
+            'slack_gateway_enabled': self.slack_gateway.enabled,
+            'modal_update_coalescing': self.modal_updates.enabled,
+            'async_logging_enabled': self.log_pipeline.async_enabled,
+            'quote_stream_source': self.quote_stream.source if self.quote_stream.enabled else None,
+            'quote_prewarm_enabled': self.quote_prewarm.enabled,
+            'shared_cache_backend': self.shared_cache.resolved_backend,
             'database_type': 'PostgreSQL' if self.database.database_url.startswith('postgresql') else 'SQLite',
             'trading_mock_enabled': self.trading.mock_execution_enabled,
             'approved_channels_count': len(self.security.approved_channels)
@@ -320,6 +580,11 @@ class ConfigurationManager:
             
             debug_mode = os.getenv('DEBUG_MODE', 'false').lower() == 'true'
             
+            # Lambda cold starts defer service construction and leave schema migrations to deploy time;
+            # the process is frozen between invocations, so nothing may be left for a background thread
+            on_lambda = bool(os.getenv('AWS_LAMBDA_FUNCTION_NAME'))
+            lazy_startup = os.getenv('LAZY_STARTUP', 'true' if on_lambda else 'false').lower() == 'true'
+            
             # Load Slack configuration
             slack_config = SlackConfig(
                 bot_token=self._get_required_env('SLACK_BOT_TOKEN'),
@@ -327,7 +592,8 @@ class ConfigurationManager:
                 app_token=os.getenv('SLACK_APP_TOKEN'),
                 client_id=os.getenv('SLACK_CLIENT_ID'),
                 client_secret=os.getenv('SLACK_CLIENT_SECRET'),
-                oauth_redirect_url=os.getenv('SLACK_OAUTH_REDIRECT_URL')
+                oauth_redirect_url=os.getenv('SLACK_OAUTH_REDIRECT_URL'),
+                api_url=os.getenv('SLACK_API_URL', 'https://slack.com/api/')
             )
             
             # Load database configuration
@@ -336,7 +602,8 @@ class ConfigurationManager:
                 pool_size=int(os.getenv('DB_POOL_SIZE', '5')),
                 max_overflow=int(os.getenv('DB_MAX_OVERFLOW', '10')),
                 pool_pre_ping=os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true',
-                echo_sql=os.getenv('DB_ECHO_SQL', 'false').lower() == 'true'
+                echo_sql=os.getenv('DB_ECHO_SQL', 'false').lower() == 'true',
+                auto_migrate=os.getenv('DB_AUTO_MIGRATE', 'false' if lazy_startup else 'true').lower() == 'true'
             )
             
             # Load Alpaca configuration (try new PAPER variables first, fallback to old names)
@@ -360,8 +627,15 @@ class ConfigurationManager:
                 finnhub_api_key=self._get_required_env('FINNHUB_API_KEY'),
                 finnhub_base_url=os.getenv('FINNHUB_BASE_URL', 'https://finnhub.io/api/v1'),
                 cache_ttl_seconds=int(os.getenv('MARKET_DATA_CACHE_TTL', '60')),
+                cache_stale_seconds=int(os.getenv('MARKET_DATA_CACHE_STALE_SECONDS', '120')),
+                cache_stale_execution_seconds=int(os.getenv('MARKET_DATA_CACHE_STALE_EXECUTION_SECONDS', '0')),
+                cache_stale_app_home_seconds=int(os.getenv('MARKET_DATA_CACHE_STALE_APP_HOME_SECONDS', '1800')),
+                cache_ttl_extended_hours_seconds=int(os.getenv('MARKET_DATA_CACHE_TTL_EXTENDED_HOURS', '300')),
+                cache_ttl_closed_seconds=int(os.getenv('MARKET_DATA_CACHE_TTL_CLOSED', '86400')),
                 rate_limit_per_minute=int(os.getenv('MARKET_DATA_RATE_LIMIT', '60')),
-                timeout_seconds=int(os.getenv('MARKET_DATA_TIMEOUT', '10'))
+                timeout_seconds=int(os.getenv('MARKET_DATA_TIMEOUT', '10')),
+                asset_universe_path=os.getenv('ASSET_UNIVERSE_PATH', 'data/reference/asset_universe.json'),
+                asset_universe_refresh_hours=int(os.getenv('ASSET_UNIVERSE_REFRESH_HOURS', '24'))
             )
             
             # Load trading configuration
@@ -381,11 +655,109 @@ class ConfigurationManager:
             security_config = SecurityConfig(
                 approved_channels=approved_channels,
                 session_timeout_minutes=int(os.getenv('SESSION_TIMEOUT_MINUTES', '480')),
+                session_activity_write_seconds=int(os.getenv('SESSION_ACTIVITY_WRITE_SECONDS', '60')),
                 max_failed_attempts=int(os.getenv('MAX_FAILED_ATTEMPTS', '5')),
                 audit_log_retention_days=int(os.getenv('AUDIT_LOG_RETENTION_DAYS', '2555')),
                 encryption_key_id=os.getenv('ENCRYPTION_KEY_ID')
             )
             
+            # Load risk engine configuration
+            risk_config = RiskConfig(
+                price_history_dir=os.getenv('PRICE_HISTORY_DIR', 'data/price_history'),
+                sector_reference_path=os.getenv('SECTOR_REFERENCE_PATH', 'data/reference/sector_classification.csv'),
+                var_confidence=float(os.getenv('RISK_VAR_CONFIDENCE', '0.95')),
+                var_horizon_days=int(os.getenv('RISK_VAR_HORIZON_DAYS', '1')),
+                lookback_days=int(os.getenv('RISK_LOOKBACK_DAYS', '252'))
+            )
+            
+            # Load profiling configuration
+            profiling_config = ProfilingConfig(
+                enabled=os.getenv('PROFILING_ENABLED', 'false').lower() == 'true',
+                sample_rate=float(os.getenv('PROFILING_SAMPLE_RATE', '0.01')),
+                slow_request_count=int(os.getenv('PROFILING_SLOW_REQUESTS', '20')),
+                stack_sampling=os.getenv('PROFILING_STACK_SAMPLING', 'false').lower() == 'true',
+                stack_interval_ms=float(os.getenv('PROFILING_STACK_INTERVAL_MS', '5')),
+                dump_dir=os.getenv('PROFILING_DUMP_DIR', 'logs/profiles')
+            )
+            
+            # Load event-loop monitor configuration
+            block_budget_ms = os.getenv('LOOP_BLOCK_BUDGET_MS')
+            loop_monitor_config = LoopMonitorConfig(
+                enabled=os.getenv('LOOP_MONITOR_ENABLED', 'true').lower() == 'true',
+                interval_ms=float(os.getenv('LOOP_MONITOR_INTERVAL_MS', '50')),
+                slow_callback_ms=float(os.getenv('LOOP_SLOW_CALLBACK_MS', '100')),
+                capture_stacks=os.getenv('LOOP_CAPTURE_STACKS', str(debug_mode)).lower() == 'true',
+                block_budget_ms=float(block_budget_ms) if block_budget_ms else None
+            )
+            
+            # Load user-account assignment store configuration
+            assignment_store_config = AssignmentStoreConfig(
+                backend=os.getenv('ASSIGNMENT_STORE_BACKEND', 'auto').lower(),
+                log_path=os.getenv('ASSIGNMENT_LOG_PATH', 'data/user_assignments.log'),
+                batch_size=int(os.getenv('ASSIGNMENT_BATCH_SIZE', '500')),
+                flush_interval_seconds=float(os.getenv('ASSIGNMENT_FLUSH_INTERVAL_SECONDS', '0.5'))
+            )
+            
+            # Load outbound Slack gateway configuration
+            slack_gateway_config = SlackGatewayConfig(
+                enabled=os.getenv('SLACK_GATEWAY_ENABLED', 'true').lower() == 'true',
+                max_connections=int(os.getenv('SLACK_GATEWAY_MAX_CONNECTIONS', '20')),
+                max_retries=int(os.getenv('SLACK_GATEWAY_MAX_RETRIES', '3')),
+                burst_seconds=float(os.getenv('SLACK_GATEWAY_BURST_SECONDS', '6')),
+                rate_scale=float(os.getenv('SLACK_GATEWAY_RATE_SCALE', '1')),
+                request_timeout_seconds=int(os.getenv('SLACK_GATEWAY_REQUEST_TIMEOUT', '30')),
+                call_timeout_seconds=float(os.getenv('SLACK_GATEWAY_CALL_TIMEOUT', '2'))
+            )
+            
+            # Load modal update coalescing configuration; the debounce timer is a background thread,
+            # so updates are sent immediately on Lambda by default
+            modal_update_config = ModalUpdateConfig(
+                enabled=os.getenv('MODAL_UPDATE_COALESCING', str(not on_lambda)).lower() == 'true',
+                debounce_ms=float(os.getenv('MODAL_UPDATE_DEBOUNCE_MS', '150')),
+                max_views=int(os.getenv('MODAL_UPDATE_MAX_VIEWS', '5000'))
+            )
+            
+            # Load log pipeline configuration; records are written synchronously on Lambda by default
+            logging_config = LoggingConfig(
+                async_enabled=os.getenv('LOG_ASYNC', str(not on_lambda)).lower() == 'true',
+                queue_size=int(os.getenv('LOG_QUEUE_SIZE', '10000')),
+                debug_sample_rates=self._parse_sample_rates(os.getenv('LOG_DEBUG_SAMPLE_RATES', '')),
+                pii_masking=os.getenv('LOG_PII_MASKING', 'true').lower() == 'true'
+            )
+            
+            # Load live quote streaming configuration
+            quote_stream_config = QuoteStreamConfig(
+                enabled=os.getenv('QUOTE_STREAM_ENABLED', 'true').lower() == 'true',
+                source=os.getenv('QUOTE_STREAM_SOURCE', 'poll').lower(),
+                poll_interval_seconds=float(os.getenv('QUOTE_STREAM_POLL_SECONDS', '5')),
+                websocket_url=os.getenv('QUOTE_STREAM_WS_URL', 'wss://ws.finnhub.io'),
+                modal_refresh_seconds=float(os.getenv('QUOTE_STREAM_MODAL_REFRESH_SECONDS', '2')),
+                watch_max_minutes=float(os.getenv('QUOTE_STREAM_WATCH_MAX_MINUTES', '30'))
+            )
+            
+            # Load quote cache prewarming configuration
+            prewarm_symbols = os.getenv('QUOTE_PREWARM_SYMBOLS', 'AAPL,TSLA,MSFT,GOOGL').split(',')
+            quote_prewarm_config = QuotePrewarmConfig(
+                enabled=os.getenv('QUOTE_PREWARM_ENABLED', 'true').lower() == 'true',
+                interval_seconds=float(os.getenv('QUOTE_PREWARM_INTERVAL_SECONDS', '60')),
+                budget_fraction=float(os.getenv('QUOTE_PREWARM_BUDGET_FRACTION', '0.25')),
+                refresh_age_seconds=float(os.getenv('QUOTE_PREWARM_REFRESH_AGE_SECONDS', '240')),
+                max_symbols=int(os.getenv('QUOTE_PREWARM_MAX_SYMBOLS', '50')),
+                quick_symbols=[s.strip().upper() for s in prewarm_symbols if s.strip()],
+                access_half_life_minutes=float(os.getenv('QUOTE_PREWARM_HALF_LIFE_MINUTES', '30')),
+                market_status_ttl_seconds=float(os.getenv('QUOTE_PREWARM_MARKET_STATUS_TTL_SECONDS', '300'))
+            )
+            
+            # Load cross-worker shared cache configuration
+            shared_cache_config = SharedCacheConfig(
+                backend=os.getenv('SHARED_CACHE_BACKEND', 'auto').lower(),
+                redis_enabled=os.getenv('REDIS_ENABLED', 'false').lower() == 'true',
+                redis_url=os.getenv('REDIS_URL', 'redis://localhost:6379/0'),
+                local_path=os.getenv('SHARED_CACHE_PATH', ''),
+                l1_ttl_seconds=float(os.getenv('SHARED_CACHE_L1_TTL_SECONDS', '30')),
+                poll_interval_seconds=float(os.getenv('SHARED_CACHE_POLL_SECONDS', '0.25'))
+            )
+            
             # Create and return main configuration
             return AppConfig(
                 environment=environment,
@@ -396,7 +768,18 @@ class ConfigurationManager:
                 alpaca=alpaca_config,
                 trading=trading_config,
                 security=security_config,
-                debug_mode=debug_mode
+                risk=risk_config,
+                profiling=profiling_config,
+                loop_monitor=loop_monitor_config,
+                assignment_store=assignment_store_config,
+                slack_gateway=slack_gateway_config,
+                modal_updates=modal_update_config,
+                log_pipeline=logging_config,
+                quote_stream=quote_stream_config,
+                quote_prewarm=quote_prewarm_config,
+                shared_cache=shared_cache_config,
+                debug_mode=debug_mode,
+                lazy_startup=lazy_startup
             )
             
         except (ValueError, KeyError) as e:
@@ -404,6 +787,16 @@ class ConfigurationManager:
         except Exception as e:
             raise EnvironmentError(f"Failed to load configuration: {e}")
     
+    @staticmethod
+    def _parse_sample_rates(value: str) -> Dict[str, float]:
+        """Parse ``logger=rate`` pairs, e.g. ``listeners=0.01,services.market_data=0.1``."""
+        rates = {}
+        for pair in value.split(','):
+            if pair.strip():
+                name, _, rate = pair.partition('=')
+                rates[name.strip()] = float(rate)
+        return rates
+    
     def _get_required_env(self, key: str) -> str:
         """
         Get required environment variable with validation.
@@ -0,0 +1,107 @@
+"""
+AWS Lambda entry point for the Slack Trading Bot.
+
+Imports only the Slack Lambda adapter, configuration and the Bolt app factory. The app,
+its listeners and the services they import (aiohttp, Redis, SQLAlchemy, numpy) are loaded
+when the first event arrives, FastAPI, uvicorn and Socket Mode never are, and with
+LAZY_STARTUP (the default under Lambda) services are constructed on first use and schema
+migrations are left to deploy time (scripts/migrate_database.py).
+
+Configured in template.yaml as ``Handler: lambda_entry.lambda_handler``.
+"""
+
+import json
+import logging
+import threading
+import time
+import traceback
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from slack_bolt.adapter.aws_lambda import SlackRequestHandler
+
+from config.settings import get_config, validate_environment
+from bolt_app import app_metrics, build_slack_app
+
+logger = logging.getLogger(__name__)
+
+config = get_config()
+
+
+def _create_handler() -> Optional[SlackRequestHandler]:
+    """Build the Bolt app and Lambda adapter once per execution environment."""
+    try:
+        if not validate_environment():
+            logger.error("Environment validation failed")
+            app_metrics.update_health_check('environment', False, 'Validation failed')
+            return None
+        app_metrics.update_health_check('environment', True, 'Validation passed')
+        return SlackRequestHandler(app=build_slack_app())
+    except Exception as e:
+        logger.critical(f"Failed to create Slack Lambda handler: {e}")
+        logger.error(f"Stack trace: {traceback.format_exc()}")
+        return None
+
+
+# Built on the first event; listener services stay lazy after that
+slack_handler: Optional[SlackRequestHandler] = None
+_handler_lock = threading.Lock()
+_handler_attempted = False
+
+
+def get_slack_handler() -> Optional[SlackRequestHandler]:
+    """Build the handler once per execution environment; None if that failed."""
+    global slack_handler, _handler_attempted
+    if not _handler_attempted:
+        with _handler_lock:
+            if not _handler_attempted:
+                slack_handler = _create_handler()
+                _handler_attempted = True
+    return slack_handler
+
+
+def _error_response(status_code: int, error: str, request_id: str) -> Dict[str, Any]:
+    return {
+        'statusCode': status_code,
+        'headers': {'Content-Type': 'application/json', 'X-Request-ID': request_id},
+        'body': json.dumps({
+            'error': error,
+            'request_id': request_id,
+            'timestamp': datetime.now(timezone.utc).isoformat()
+        })
+    }
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    AWS Lambda handler for Slack events, commands and interactions.
+
+    Args:
+        event: API Gateway / function URL event
+        context: Lambda context object
+
+    Returns:
+        Dict containing HTTP response with status code and body
+    """
+    request_id = context.aws_request_id if context else f"lambda_{int(time.time())}"
+    start_time = time.time()
+    error = None
+
+    try:
+        handler = get_slack_handler()
+        if handler is None:
+            error = 'NotInitialized'
+            return _error_response(503, 'Service temporarily unavailable', request_id)
+
+        response = handler.handle(event, context)
+        response.setdefault('headers', {})['X-Request-ID'] = request_id
+        return response
+
+    except Exception as e:
+        error = type(e).__name__
+        logger.error(f"[{request_id}] Lambda handler error: {e}")
+        logger.error(f"[{request_id}] Stack trace: {traceback.format_exc()}")
+        return _error_response(500, 'Internal server error', request_id)
+
+    finally:
+        app_metrics.record_request('lambda_handler', time.time() - start_time, error)
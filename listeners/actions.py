@@ -34,10 +34,11 @@ from slack_sdk.errors import SlackApiError
 # Import our services and models
 from services.auth import AuthService, AuthenticationError, AuthorizationError, SessionError
 from services.postgresql_service import PostgreSQLService
-from services.market_data import MarketDataService, MarketDataError, MarketQuote
+from services.market_data import MarketDataService, MarketDataError, MarketQuote, QuotePurpose
 from services.risk_analysis import RiskAnalysisService, RiskAnalysisError, RiskAnalysis
 from services.trading_api import TradingAPIService, TradingError, TradeExecution
 from services.service_container import ServiceContainer, get_container
+from services.metrics import MetricsRegistry, OperationMetrics
 from models.trade import Trade, TradeType, TradeStatus, RiskLevel
 from models.user import User, UserRole, Permission
 from ui.trade_widget import TradeWidget, WidgetContext, WidgetState, UITheme
@@ -119,64 +120,48 @@ class ActionContext:
             self.request_id = str(uuid.uuid4())
 
 
-class ActionMetrics:
+class ActionMetrics(OperationMetrics):
     """Action execution metrics tracking."""
     
-    def __init__(self):
-        self.actions_processed = 0
-        self.actions_successful = 0
-        self.actions_failed = 0
-        self.market_data_requests = 0
-        self.risk_analyses = 0
-        self.trades_submitted = 0
-        self.high_risk_confirmations = 0
-        self.response_times = {}
-        self.error_counts = {}
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        super().__init__('action', registry)
         
-    def record_action(self, action_type: ActionType, success: bool, response_time: float,
+    def record_action(self, action_type: Optional[ActionType], success: bool, response_time: float,
                      error_type: Optional[str] = None):
         """Record action execution metrics."""
-        self.actions_processed += 1
-        if success:
-            self.actions_successful += 1
-        else:
-            self.actions_failed += 1
-            if error_type:
-                self.error_counts[error_type] = self.error_counts.get(error_type, 0) + 1
-        
-        # Track response times by action type
-        if action_type.value not in self.response_times:
-            self.response_times[action_type.value] = []
-        self.response_times[action_type.value].append(response_time)
-        
-        # Keep only last 100 response times per action type
-        if len(self.response_times[action_type.value]) > 100:
-            self.response_times[action_type.value] = self.response_times[action_type.value][-100:]
-        
-        # Track specific action types
-        if action_type == ActionType.GET_MARKET_DATA:
-            self.market_data_requests += 1
-        elif action_type == ActionType.ANALYZE_RISK:
-            self.risk_analyses += 1
-        elif action_type == ActionType.SUBMIT_TRADE:
-            self.trades_submitted += 1
-        elif action_type == ActionType.CONFIRM_HIGH_RISK:
-            self.high_risk_confirmations += 1
+        self.record(action_type.value if action_type else 'unknown', success, response_time, error_type)
     
     def get_average_response_time(self, action_type: Optional[ActionType] = None) -> float:
         """Get average response time in milliseconds."""
-        if action_type:
-            times = self.response_times.get(action_type.value, [])
-            return sum(times) / len(times) * 1000 if times else 0.0
-        else:
-            all_times = []
-            for times in self.response_times.values():
-                all_times.extend(times)
-            return sum(all_times) / len(all_times) * 1000 if all_times else 0.0
+        return super().get_average_response_time(action_type.value if action_type else None)
+    
+    @property
+    def actions_processed(self) -> int:
+        return self.processed
+    
+    @property
+    def actions_successful(self) -> int:
+        return self.successful
+    
+    @property
+    def actions_failed(self) -> int:
+        return self.failed
+    
+    @property
+    def market_data_requests(self) -> int:
+        return self.processed_by_type(ActionType.GET_MARKET_DATA.value)
+    
+    @property
+    def risk_analyses(self) -> int:
+        return self.processed_by_type(ActionType.ANALYZE_RISK.value)
+    
+    @property
+    def trades_submitted(self) -> int:
+        return self.processed_by_type(ActionType.SUBMIT_TRADE.value)
     
-    def get_success_rate(self) -> float:
-        """Get action success rate as percentage."""
-        return (self.actions_successful / self.actions_processed * 100) if self.actions_processed > 0 else 0.0
+    @property
+    def high_risk_confirmations(self) -> int:
+        return self.processed_by_type(ActionType.CONFIRM_HIGH_RISK.value)
 
 
 class ActionHandler:
@@ -1015,7 +1000,7 @@ class ActionHandler:
             alpaca_service = get_alpaca_service()
             
             # Get current market data for execution price reference
-            market_quote = await self.market_data_service.get_quote(trade.symbol)
+            market_quote = await self.market_data_service.get_quote(trade.symbol, purpose=QuotePurpose.EXECUTION)
             
             # Try Alpaca execution first if available
             if alpaca_service and alpaca_service.is_available():
@@ -1222,11 +1207,11 @@ def register_action_handlers(app: App, service_container: Optional['ServiceConta
     container = service_container or get_container()
     
     # Get services from container
-    auth_service = container.get(AuthService)
-    database_service = container.get(PostgreSQLService)
-    market_data_service = container.get(MarketDataService)
-    risk_analysis_service = container.get(RiskAnalysisService)
-    trading_api_service = container.get(TradingAPIService)
+    auth_service = container.resolve(AuthService)
+    database_service = container.resolve(PostgreSQLService)
+    market_data_service = container.resolve(MarketDataService)
+    risk_analysis_service = container.resolve(RiskAnalysisService)
+    trading_api_service = container.resolve(TradingAPIService)
     
     # Create action handler
     action_handler = ActionHandler(
@@ -32,6 +32,7 @@ from slack_sdk.errors import SlackApiError
 from services.auth import AuthService, AuthenticationError, AuthorizationError, SessionError, RateLimitError, SecurityViolationError
 from services.postgresql_service import PostgreSQLService
 from services.service_container import ServiceContainer, get_container
+from services.metrics import MetricsRegistry, OperationMetrics
 from models.user import User, UserRole, Permission
 from ui.trade_widget import TradeWidget, WidgetContext, WidgetState, UITheme
 from utils.validators import validate_channel_id, validate_user_id, ValidationError
@@ -103,42 +104,28 @@ class CommandContext:
             self.request_id = str(uuid.uuid4())
 
 
-class CommandMetrics:
+class CommandMetrics(OperationMetrics):
     """Command execution metrics tracking."""
     
-    def __init__(self):
-        self.commands_processed = 0
-        self.commands_successful = 0
-        self.commands_failed = 0
-        self.authentication_failures = 0
-        self.authorization_failures = 0
-        self.validation_failures = 0
-        self.response_times = []
-        self.error_counts = {}
-        
-    def record_command(self, success: bool, response_time: float, error_type: Optional[str] = None):
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        super().__init__('command', registry)
+    
+    def record_command(self, success: bool, response_time: float, error_type: Optional[str] = None,
+                       command_type: Optional['CommandType'] = None):
         """Record command execution metrics."""
-        self.commands_processed += 1
-        if success:
-            self.commands_successful += 1
-        else:
-            self.commands_failed += 1
-            if error_type:
-                self.error_counts[error_type] = self.error_counts.get(error_type, 0) + 1
-        
-        self.response_times.append(response_time)
-        
-        # Keep only last 1000 response times
-        if len(self.response_times) > 1000:
-            self.response_times = self.response_times[-1000:]
+        self.record(command_type.value if command_type else 'unknown', success, response_time, error_type)
+    
+    @property
+    def commands_processed(self) -> int:
+        return self.processed
     
-    def get_average_response_time(self) -> float:
-        """Get average response time in milliseconds."""
-        return sum(self.response_times) / len(self.response_times) * 1000 if self.response_times else 0.0
+    @property
+    def commands_successful(self) -> int:
+        return self.successful
     
-    def get_success_rate(self) -> float:
-        """Get command success rate as percentage."""
-        return (self.commands_successful / self.commands_processed * 100) if self.commands_processed > 0 else 0.0
+    @property
+    def commands_failed(self) -> int:
+        return self.failed
 
 
 class CommandHandler:
@@ -244,7 +231,7 @@ class CommandHandler:
             
         except RateLimitError as e:
             error_type = "RATE_LIMIT"
-            self.metrics.authentication_failures += 1
+            self.metrics.increment('authentication_failures')
             await self._send_error_response(
                 client, command_context, 
                 f"⏱️ Rate limit exceeded. {e.message}",
@@ -258,7 +245,7 @@ class CommandHandler:
             
         except AuthenticationError as e:
             error_type = "AUTHENTICATION"
-            self.metrics.authentication_failures += 1
+            self.metrics.increment('authentication_failures')
             await self._send_error_response(
                 client, command_context,
                 f"🔐 Authentication failed: {e.message}",
@@ -272,7 +259,7 @@ class CommandHandler:
             
         except AuthorizationError as e:
             error_type = "AUTHORIZATION"
-            self.metrics.authorization_failures += 1
+            self.metrics.increment('authorization_failures')
             await self._send_error_response(
                 client, command_context,
                 f"🚫 Access denied: {e.message}",
@@ -286,7 +273,7 @@ class CommandHandler:
             
         except CommandValidationError as e:
             error_type = "VALIDATION"
-            self.metrics.validation_failures += 1
+            self.metrics.increment('validation_failures')
             await self._send_error_response(
                 client, command_context,
                 f"❌ Invalid command: {e.message}",
@@ -343,7 +330,7 @@ class CommandHandler:
         finally:
             # Record metrics
             response_time = time.time() - start_time
-            self.metrics.record_command(success, response_time, error_type)
+            self.metrics.record_command(success, response_time, error_type, command_type)
             
             # Log audit event
             if command_context:
@@ -485,8 +472,8 @@ class CommandHandler:
             parameters = self._parse_trade_parameters(command_context.command_text)
             command_context.parameters = parameters
             
-            print(f"🔍 TRADE PARAMS DEBUG: Command text: '{command_context.command_text}'")
-            print(f"🔍 TRADE PARAMS DEBUG: Parsed parameters: {parameters}")
+            logger.debug("🔍 TRADE PARAMS DEBUG: Command text: '%s'", command_context.command_text)
+            logger.debug("🔍 TRADE PARAMS DEBUG: Parsed parameters: %s", parameters)
             
             # Import interactive components
             from ui.interactive_trade_widget import InteractiveTradeWidget, InteractiveTradeContext
@@ -507,12 +494,12 @@ class CommandHandler:
             # Pre-populate with parsed parameters if available
             if parameters.get('quantity'):
                 interactive_context.shares = parameters['quantity']
-                print(f"🔍 TRADE PARAMS DEBUG: Set shares to {parameters['quantity']}")
+                logger.debug("🔍 TRADE PARAMS DEBUG: Set shares to %s", parameters['quantity'])
             if parameters.get('trade_type'):
                 interactive_context.trade_side = "buy" if parameters['trade_type'].value == "buy" else "sell"
-                print(f"🔍 TRADE PARAMS DEBUG: Set trade_side to {interactive_context.trade_side}")
+                logger.debug("🔍 TRADE PARAMS DEBUG: Set trade_side to %s", interactive_context.trade_side)
             
-            print(f"🔍 TRADE PARAMS DEBUG: Final context - Symbol: {interactive_context.symbol}, Shares: {interactive_context.shares}, Side: {interactive_context.trside}")
+            logger.debug("🔍 TRADE PARAMS DEBUG: Final context - Symbol: %s, Shares: %s, Side: %s", interactive_context.symbol, interactive_context.shares, interactive_context.trside)
             
             # Fetch market data for the symbol
             try:
@@ -571,15 +558,15 @@ class CommandHandler:
                 )
             
             # Debug print statements
-            print(f"🔍 PORTFOLIO DEBUG: Getting positions for user: {command_context.user.user_id}")
+            logger.debug("🔍 PORTFOLIO DEBUG: Getting positions for user: %s", command_context.user.user_id)
             
             # Get user positions from database
             positions = await self.db_service.get_user_positions(command_context.user.user_id)
             
-            print(f"🔍 PORTFOLIO DEBUG: Retrieved {len(positions)} positions")
+            logger.debug("🔍 PORTFOLIO DEBUG: Retrieved %s positions", len(positions))
             for i, pos in enumerate(positions):
-                print(f"🔍 PORTFOLIO DEBUG: Position {i+1}: {pos.symbol} - {pos.quantity} shares @ ${pos.current_price}")
-                print(f"🔍 PORTFOLIO DEBUG: Position {i+1} details: avg_cost=${pos.average_cost}, market_value=${float(pos.quantity) * float(pos.current_price):.2f}")
+                logger.debug("🔍 PORTFOLIO DEBUG: Position %s: %s - %s shares @ $%s", i + 1, pos.symbol, pos.quantity, pos.current_price)
+                logger.debug("🔍 PORTFOLIO DEBUG: Position %s details: avg_cost=$%s, market_value=$%.2f", i + 1, pos.average_cost, float(pos.quantity) * float(pos.current_price))
             
             if positions:
                 # Build portfolio summary
@@ -587,7 +574,7 @@ class CommandHandler:
                 total_value = 0
                 total_cost = 0
                 
-                print(f"🔍 PORTFOLIO DEBUG: Building portfolio text for {len(positions)} positions")
+                logger.debug("🔍 PORTFOLIO DEBUG: Building portfolio text for %s positions", len(positions))
                 
                 for pos in positions:
                     current_value = float(pos.quantity) * float(pos.current_price)
@@ -598,7 +585,7 @@ class CommandHandler:
                     total_value += current_value
                     total_cost += position_cost
                     
-                    print(f"🔍 PORTFOLIO DEBUG: Processing {pos.symbol}: {pos.quantity} shares, current_value=${current_value:.2f}, pnl=${pnl:.2f}")
+                    logger.debug("🔍 PORTFOLIO DEBUG: Processing %s: %s shares, current_value=$%.2f, pnl=$%.2f", pos.symbol, pos.quantity, current_value, pnl)
                     
                     # Format P&L with color indicators
                     pnl_indicator = "🟢" if pnl >= 0 else "🔴"
@@ -627,9 +614,9 @@ class CommandHandler:
                     f"📈 *App Home* tab has detailed charts and trade history."
                 )
                 
-                print(f"🔍 PORTFOLIO DEBUG: Final portfolio text length: {len(portfolio_text)} characters")
-                print(f"🔍 PORTFOLIO DEBUG: Total positions processed: {len(positions)}")
-                print(f"🔍 PORTFOLIO DEBUG: Total value: ${total_value:.2f}")
+                logger.debug("🔍 PORTFOLIO DEBUG: Final portfolio text length: %s characters", len(portfolio_text))
+                logger.debug("🔍 PORTFOLIO DEBUG: Total positions processed: %s", len(positions))
+                logger.debug("🔍 PORTFOLIO DEBUG: Total value: $%.2f", total_value)
             else:
                 portfolio_text = (
                     "*Your Portfolio*\n\n"
@@ -655,7 +642,6 @@ class CommandHandler:
             )
             
         except Exception as e:
-            print(f"🚨 PORTFOLIO COMMAND ERROR: {e}")
             logger.error(f"Error handling portfolio command: {str(e)}")
             raise
     
@@ -929,8 +915,8 @@ def register_command_handlers(app: App, service_container: Optional['ServiceCont
     container = service_container or get_container()
     
     # Get services from container
-    auth_service = container.get(AuthService)
-    database_service = container.get(PostgreSQLService)
+    auth_service = container.resolve(AuthService)
+    database_service = container.resolve(PostgreSQLService)
     
     # Create command handler for non-trade commands
     command_handler = CommandHandler(auth_service, database_service)
@@ -947,23 +933,32 @@ def register_command_handlers(app: App, service_container: Optional['ServiceCont
         
         # Try to get the services from container
         try:
-            multi_alpaca = container.get(MultiAlpacaService)
-            user_manager = container.get(UserAccountManager)
-            logger.info("🔍 DEBUG: Got services from container")
-            
-            # Check if the multi-alpaca service is available
-            is_available = multi_alpaca.is_available()
-            logger.info(f"🔍 DEBUG: multi_alpaca.is_available() = {is_available}")
-            
-            if is_available:
-                multi_account_available = True
-                logger.info("🏦 Multi-account system detected and available")
+            if container.lazy_startup:
+                # Probing is_available() would construct MultiAlpacaService, which calls Alpaca
+                # for every account, during cold start. The commands are registered regardless.
+                multi_account_available = (
+                    container.is_registered(MultiAlpacaService) and
+                    container.is_registered(UserAccountManager)
+                )
+                logger.info(f"🏦 Multi-account services registered: {multi_account_available} (lazy startup)")
             else:
-                logger.info("📊 Multi-account services loaded but no accounts available")
-                # FORCE registration anyway - we want the commands even without accounts
-                multi_account_available = True
-                logger.info("🔍 DEBUG: Forcing multi-account registration anyway")
-                
+                multi_alpaca = container.get(MultiAlpacaService)
+                user_manager = container.get(UserAccountManager)
+                logger.info("🔍 DEBUG: Got services from container")
+
+                # Check if the multi-alpaca service is available
+                is_available = multi_alpaca.is_available()
+                logger.info(f"🔍 DEBUG: multi_alpaca.is_available() = {is_available}")
+
+                if is_available:
+                    multi_account_available = True
+                    logger.info("🏦 Multi-account system detected and available")
+                else:
+                    logger.info("📊 Multi-account services loaded but no accounts available")
+                    # FORCE registration anyway - we want the commands even without accounts
+                    multi_account_available = True
+                    logger.info("🔍 DEBUG: Forcing multi-account registration anyway")
+
         except Exception as service_error:
             logger.info(f"📋 Multi-account services not in container: {service_error}")
             
@@ -1027,11 +1022,10 @@ def register_command_handlers(app: App, service_container: Optional['ServiceCont
     def handle_help_command(ack, body, client, context):
         """Handle the /help slash command."""
         try:
-            print("🔍 HELP COMMAND DEBUG: Starting help command")
             logger.info("🔍 HELP COMMAND DEBUG: Starting help command")
             
             ack()  # Acknowledge immediately
-            print("🔍 HELP COMMAND DEBUG: ACK sent")
+            logger.debug("🔍 HELP COMMAND DEBUG: ACK sent")
             
             # Simple help response
             help_text = (
@@ -1055,10 +1049,9 @@ def register_command_handlers(app: App, service_container: Optional['ServiceCont
                 user=body.get("user_id"),
                 text=help_text
             )
-            print("🔍 HELP COMMAND DEBUG: Command processed successfully")
+            logger.debug("🔍 HELP COMMAND DEBUG: Command processed successfully")
             
         except Exception as e:
-            print(f"❌ HELP COMMAND ERROR: {e}")
             logger.error(f"❌ HELP COMMAND ERROR: {e}")
             logger.error(f"❌ HELP COMMAND TRACEBACK: {traceback.format_exc()}")
             
@@ -1069,17 +1062,16 @@ def register_command_handlers(app: App, service_container: Optional['ServiceCont
                     text=f"Help command failed: {str(e)}\n\nPlease contact support."
                 )
             except Exception as post_error:
-                print(f"❌ Failed to send error message: {post_error}")
+                logger.error("❌ Failed to send error message: %s", post_error)
     
     @app.command("/status")
     def handle_status_command(ack, body, client, context):
         """Handle the /status slash command."""
         try:
-            print("🔍 STATUS COMMAND DEBUG: Starting status command")
             logger.info("🔍 STATUS COMMAND DEBUG: Starting status command")
             
             ack()  # Acknowledge immediately
-            print("🔍 STATUS COMMAND DEBUG: ACK sent")
+            logger.debug("🔍 STATUS COMMAND DEBUG: ACK sent")
             
             # Simple status response
             status_text = (
@@ -1099,10 +1091,9 @@ def register_command_handlers(app: App, service_container: Optional['ServiceCont
                 user=body.get("user_id"),
                 text=status_text
             )
-            print("🔍 STATUS COMMAND DEBUG: Command processed successfully")
+            logger.debug("🔍 STATUS COMMAND DEBUG: Command processed successfully")
             
         except Exception as e:
-            print(f"STATUS COMMAND ERROR: {e}")
             logger.error(f"STATUS COMMAND ERROR: {e}")
             logger.error(f"STATUS COMMAND TRACEBACK: {traceback.format_exc()}")
             
@@ -1113,13 +1104,13 @@ def register_command_handlers(app: App, service_container: Optional['ServiceCont
                     text=f"Status command failed: {str(e)}\n\nPlease contact support."
                 )
             except Exception as post_error:
-                print(f"Failed to send error message: {post_error}")
+                logger.error("Failed to send error message: %s", post_error)
 
     @app.command("/positions")
     def handle_positions_command(ack, body, client, context):
         """Quick positions check command."""
         ack()
-        print("📊 POSITIONS COMMAND CALLED!")
+        logger.info("📊 POSITIONS COMMAND CALLED!")
         
         try:
             # Get user positions using asyncio
@@ -1175,7 +1166,7 @@ def register_command_handlers(app: App, service_container: Optional['ServiceCont
             )
             
         except Exception as e:
-            print(f"Error in positions command: {e}")
+            logger.error("Error in positions command: %s", e)
             client.chat_postEphemeral(
                 channel=body.get('channel_id'),
                 user=body.get('user_id'),
@@ -1188,11 +1179,12 @@ def register_command_handlers(app: App, service_container: Optional['ServiceCont
     def handle_portfolio_command(ack, body, client, context):
         """Handle the /portfolio slash command."""
         ack()
-        print("📊 PORTFOLIO COMMAND CALLED!")
+        logger.info("📊 PORTFOLIO COMMAND CALLED!")
         
         try:
             # Process the command using asyncio in a thread to avoid event loop conflicts
             import asyncio
+            import contextvars
             import threading
             
             def run_portfolio_command():
@@ -1219,8 +1211,8 @@ def register_command_handlers(app: App, service_container: Optional['ServiceCont
                     except Exception:
                         pass
             
-            # Run in background thread
-            thread = threading.Thread(target=run_portfolio_command)
+            # Run in background thread, keeping the request's Slack gateway priority
+            thread = threading.Thread(target=contextvars.copy_context().run, args=(run_portfolio_command,))
             thread.daemon = True
             thread.start()
                 
@@ -1243,7 +1235,7 @@ def register_command_handlers(app: App, service_container: Optional['ServiceCont
                     text=f"Status command failed: {str(e)}\n\nPlease contact support."
                 )
             except Exception as post_error:
-                print(f"Failed to send error message: {post_error}")
+                logger.error("Failed to send error message: %s", post_error)
     
     # Store handler globally for metrics access
     global _command_handler
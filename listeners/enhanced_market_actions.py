@@ -18,6 +18,8 @@ from slack_sdk.errors import SlackApiError
 
 from services.market_data import MarketDataService, MarketDataError
 from services.auth import AuthService
+from services.quote_prewarmer import get_quote_prewarmer
+from services.quote_stream import get_quote_hub
 from services.service_container import get_container
 from listeners.enhanced_trade_command import EnhancedTradeCommand, EnhancedMarketContext, MarketDataView
 from utils.validators import validate_symbol
@@ -39,6 +41,7 @@ class EnhancedMarketActions:
     
     def fetch_any_ticker_data(self, symbol: str, view_id: str, user_id: str, client, company_name: str = None, emoji: str = "📊"):
         """Generic function to fetch market data for any ticker symbol."""
+        import contextvars
         import threading
         import requests
         from config.settings import get_config
@@ -50,7 +53,7 @@ class EnhancedMarketActions:
                 api_key = config.market_data.finnhub_api_key
                 
                 # Make synchronous HTTP request to Finnhub API
-                url = f"https://finnhub.io/api/v1/quote?symbol={symbol}&token={api_key}"
+                url = f"{config.market_data.finnhub_base_url}/quote?symbol={symbol}&token={api_key}"
                 response = requests.get(url, timeout=10)
                 
                 if response.status_code == 200:
@@ -61,14 +64,7 @@ class EnhancedMarketActions:
                     price_change = data.get('d', 0)   # change
                     price_change_percent = data.get('dp', 0)  # change percent
                     
-                    # Print to terminal
-                    print(f"\n🎯 {symbol} MARKET DATA FETCHED SUCCESSFULLY!")
-                    print(f"💰 Current Price: ${current_price}")
-                    print(f"📈 Price Change: ${price_change}")
-                    print(f"📊 Change %: {price_change_percent}%")
-                    print(f"⚡ Data Quality: Real-time")
-                    print(f"🏢 Exchange: Various")
-                    print("-" * 50)
+                    logger.debug("🎯 %s quote: $%s, change $%s (%s%%)", symbol, current_price, price_change, price_change_percent)
                     
                     # Update modal with real data
                     change_emoji = "📈" if price_change >= 0 else "📉"
@@ -111,12 +107,11 @@ class EnhancedMarketActions:
                     logger.info(f"✅ {symbol} real market data displayed for user {user_id}")
                     
                 else:
-                    print(f"❌ {symbol} API request failed with status {response.status_code}")
-                    print(f"Response: {response.text}")
+                    logger.error("❌ %s API request failed with status %s", symbol, response.status_code)
+                    logger.debug("Response: %s", response.text)
                     raise Exception(f"API request failed with status {response.status_code}")
                 
             except Exception as e:
-                print(f"❌ Error fetching {symbol} market data: {e}")
                 logger.error(f"Error fetching {symbol} market data: {e}")
                 
                 # Show error in modal
@@ -146,8 +141,8 @@ class EnhancedMarketActions:
                 except:
                     pass
         
-        # Start the fetch in a separate thread
-        fetch_thread = threading.Thread(target=fetch_market_data)
+        # Start the fetch in a separate thread, keeping the request's Slack gateway priority
+        fetch_thread = threading.Thread(target=contextvars.copy_context().run, args=(fetch_market_data,))
         fetch_thread.daemon = True
         fetch_thread.start()
     
@@ -172,7 +167,8 @@ class EnhancedMarketActions:
             
             if session_key in self.enhanced_command.active_sessions:
                 market_context = self.enhanced_command.active_sessions[session_key]
-                market_context.symbol = symbol
+                with market_context.lock:
+                    market_context.symbol = symbol
                 
                 # Fetch new market data
                 await self.enhanced_command._fetch_market_data(market_context)
@@ -185,6 +181,10 @@ class EnhancedMarketActions:
                     view=updated_modal
                 )
                 
+                # Stream the new symbol's quotes instead of the old one's
+                market_context.view_id = view_id
+                await self.enhanced_command._start_real_time_updates(session_key, client)
+                
                 logger.info(f"Quick symbol selected: {symbol} for user {user_id}")
             
         except Exception as e:
@@ -240,7 +240,8 @@ class EnhancedMarketActions:
                 market_context = self.enhanced_command.active_sessions[session_key]
                 
                 # Toggle auto-refresh
-                market_context.auto_refresh = not market_context.auto_refresh
+                with market_context.lock:
+                    market_context.auto_refresh = not market_context.auto_refresh
                 
                 # Update modal to reflect new state
                 updated_modal = await self.enhanced_command._create_enhanced_market_modal(market_context)
@@ -251,10 +252,11 @@ class EnhancedMarketActions:
                 )
                 
                 # Start or stop real-time updates
+                market_context.view_id = view_id
                 if market_context.auto_refresh and market_context.symbol:
-                    asyncio.create_task(
-                        self.enhanced_command._start_real_time_updates(session_key, client)
-                    )
+                    await self.enhanced_command._start_real_time_updates(session_key, client)
+                else:
+                    get_quote_hub().unwatch_modal(view_id)
                 
                 logger.info(
                     f"Auto-refresh toggled: {market_context.auto_refresh}", 
@@ -281,7 +283,8 @@ class EnhancedMarketActions:
                 market_context = self.enhanced_command.active_sessions[session_key]
                 
                 # Update view type
-                market_context.view_type = MarketDataView(selected_value)
+                with market_context.lock:
+                    market_context.view_type = MarketDataView(selected_value)
                 
                 # Update modal with new view
                 updated_modal = await self.enhanced_command._create_enhanced_market_modal(market_context)
@@ -314,6 +317,7 @@ class EnhancedMarketActions:
                 # Add to watchlist if not already present
                 if symbol not in market_context.watch_list:
                     market_context.watch_list.append(symbol)
+                    get_quote_prewarmer().add_watchlist(symbol)
                     
                     # Send confirmation message
                     await client.chat_postEphemeral(
@@ -382,7 +386,8 @@ class EnhancedMarketActions:
             
             if session_key in self.enhanced_command.active_sessions:
                 market_context = self.enhanced_command.active_sessions[session_key]
-                market_context.symbol = symbol_value
+                with market_context.lock:
+                    market_context.symbol = symbol_value
                 
                 # Fetch market data for new symbol
                 await self.enhanced_command._fetch_market_data(market_context)
@@ -468,6 +473,7 @@ def register_enhanced_market_actions(app: App, enhanced_command: EnhancedTradeCo
             client.views_update(view_id=view_id, view=loading_modal)
             
             # Fetch real market data using synchronous HTTP request
+            import contextvars
             import threading
             import requests
             from config.settings import get_config
@@ -479,7 +485,7 @@ def register_enhanced_market_actions(app: App, enhanced_command: EnhancedTradeCo
                     api_key = config.market_data.finnhub_api_key
                     
                     # Make synchronous HTTP request to Finnhub API
-                    url = f"https://finnhub.io/api/v1/quote?symbol=AAPL&token={api_key}"
+                    url = f"{config.market_data.finnhub_base_url}/quote?symbol=AAPL&token={api_key}"
                     response = requests.get(url, timeout=10)
                     
                     if response.status_code == 200:
@@ -490,14 +496,7 @@ def register_enhanced_market_actions(app: App, enhanced_command: EnhancedTradeCo
                         price_change = data.get('d', 0)   # change
                         price_change_percent = data.get('dp', 0)  # change percent
                         
-                        # Print to terminal
-                        print(f"\n🎯 AAPL MARKET DATA FETCHED SUCCESSFULLY!")
-                        print(f"💰 Current Price: ${current_price}")
-                        print(f"📈 Price Change: ${price_change}")
-                        print(f"📊 Change %: {price_change_percent}%")
-                        print(f"⚡ Data Quality: Real-time")
-                        print(f"🏢 Exchange: NASDAQ")
-                        print("-" * 50)
+                        logger.debug("🎯 AAPL quote: $%s, change $%s (%s%%)", current_price, price_change, price_change_percent)
                         
                         # Update modal with real data
                         change_emoji = "📈" if price_change >= 0 else "📉"
@@ -536,11 +535,10 @@ def register_enhanced_market_actions(app: App, enhanced_command: EnhancedTradeCo
                         logger.info(f"✅ AAPL real market data displayed for user {user_id}")
                         
                     else:
-                        print(f"❌ API request failed with status {response.status_code}")
+                        logger.error("❌ API request failed with status %s", response.status_code)
                         raise Exception(f"API request failed with status {response.status_code}")
                     
                 except Exception as e:
-                    print(f"❌ Error fetching AAPL market data: {e}")
                     logger.error(f"Error fetching AAPL market data: {e}")
                     
                     # Show error in modal
@@ -570,14 +568,13 @@ def register_enhanced_market_actions(app: App, enhanced_command: EnhancedTradeCo
                     except:
                         pass
             
-            # Start the fetch in a separate thread
-            fetch_thread = threading.Thread(target=fetch_market_data)
+            # Start the fetch in a separate thread, keeping the request's Slack gateway priority
+            fetch_thread = threading.Thread(target=contextvars.copy_context().run, args=(fetch_market_data,))
             fetch_thread.daemon = True
             fetch_thread.start()
             
         except Exception as e:
             logger.error(f"Error in AAPL handler: {e}")
-            print(f"❌ Error in AAPL handler: {e}")
     
     def handle_quick_symbol_tsla(ack, body, client, context):
         ack()
@@ -619,6 +616,7 @@ def register_enhanced_market_actions(app: App, enhanced_command: EnhancedTradeCo
             client.views_update(view_id=view_id, view=loading_modal)
             
             # Fetch real market data using synchronous HTTP request
+            import contextvars
             import threading
             import requests
             from config.settings import get_config
@@ -630,7 +628,7 @@ def register_enhanced_market_actions(app: App, enhanced_command: EnhancedTradeCo
                     api_key = config.market_data.finnhub_api_key
                     
                     # Make synchronous HTTP request to Finnhub API
-                    url = f"https://finnhub.io/api/v1/quote?symbol=TSLA&token={api_key}"
+                    url = f"{config.market_data.finnhub_base_url}/quote?symbol=TSLA&token={api_key}"
                     response = requests.get(url, timeout=10)
                     
                     if response.status_code == 200:
@@ -641,14 +639,7 @@ def register_enhanced_market_actions(app: App, enhanced_command: EnhancedTradeCo
                         price_change = data.get('d', 0)   # change
                         price_change_percent = data.get('dp', 0)  # change percent
                         
-                        # Print to terminal
-                        print(f"\n🎯 TSLA MARKET DATA FETCHED SUCCESSFULLY!")
-                        print(f"💰 Current Price: ${current_price}")
-                        print(f"📈 Price Change: ${price_change}")
-                        print(f"📊 Change %: {price_change_percent}%")
-                        print(f"⚡ Data Quality: Real-time")
-                        print(f"🏢 Exchange: NASDAQ")
-                        print("-" * 50)
+                        logger.debug("🎯 TSLA quote: $%s, change $%s (%s%%)", current_price, price_change, price_change_percent)
                         
                         # Update modal with real data
                         change_emoji = "📈" if price_change >= 0 else "📉"
@@ -687,21 +678,19 @@ def register_enhanced_market_actions(app: App, enhanced_command: EnhancedTradeCo
                         logger.info(f"✅ TSLA real market data displayed for user {user_id}")
                         
                     else:
-                        print(f"❌ TSLA API request failed with status {response.status_code}")
+                        logger.error("❌ TSLA API request failed with status %s", response.status_code)
                         raise Exception(f"API request failed with status {response.status_code}")
                     
                 except Exception as e:
-                    print(f"❌ Error fetching TSLA market data: {e}")
                     logger.error(f"Error fetching TSLA market data: {e}")
             
-            # Start the fetch in a separate thread
-            fetch_thread = threading.Thread(target=fetch_market_data)
+            # Start the fetch in a separate thread, keeping the request's Slack gateway priority
+            fetch_thread = threading.Thread(target=contextvars.copy_context().run, args=(fetch_market_data,))
             fetch_thread.daemon = True
             fetch_thread.start()
             
         except Exception as e:
             logger.error(f"Error in TSLA handler: {e}")
-            print(f"❌ Error in TSLA handler: {e}")
     
     def handle_quick_symbol_msft(ack, body, client, context):
         ack()
@@ -743,6 +732,7 @@ def register_enhanced_market_actions(app: App, enhanced_command: EnhancedTradeCo
             client.views_update(view_id=view_id, view=loading_modal)
             
             # Fetch real market data using synchronous HTTP request
+            import contextvars
             import threading
             import requests
             from config.settings import get_config
@@ -754,7 +744,7 @@ def register_enhanced_market_actions(app: App, enhanced_command: EnhancedTradeCo
                     api_key = config.market_data.finnhub_api_key
                     
                     # Make synchronous HTTP request to Finnhub API
-                    url = f"https://finnhub.io/api/v1/quote?symbol=MSFT&token={api_key}"
+                    url = f"{config.market_data.finnhub_base_url}/quote?symbol=MSFT&token={api_key}"
                     response = requests.get(url, timeout=10)
                     
                     if response.status_code == 200:
@@ -765,14 +755,7 @@ def register_enhanced_market_actions(app: App, enhanced_command: EnhancedTradeCo
                         price_change = data.get('d', 0)   # change
                         price_change_percent = data.get('dp', 0)  # change percent
                         
-                        # Print to terminal
-                        print(f"\n🎯 MSFT MARKET DATA FETCHED SUCCESSFULLY!")
-                        print(f"💰 Current Price: ${current_price}")
-                        print(f"📈 Price Change: ${price_change}")
-                        print(f"📊 Change %: {price_change_percent}%")
-                        print(f"⚡ Data Quality: Real-time")
-                        print(f"🏢 Exchange: NASDAQ")
-                        print("-" * 50)
+                        logger.debug("🎯 MSFT quote: $%s, change $%s (%s%%)", current_price, price_change, price_change_percent)
                         
                         # Update modal with real data
                         change_emoji = "📈" if price_change >= 0 else "📉"
@@ -811,21 +794,19 @@ def register_enhanced_market_actions(app: App, enhanced_command: EnhancedTradeCo
                         logger.info(f"✅ MSFT real market data displayed for user {user_id}")
                         
                     else:
-                        print(f"❌ MSFT API request failed with status {response.status_code}")
+                        logger.error("❌ MSFT API request failed with status %s", response.status_code)
                         raise Exception(f"API request failed with status {response.status_code}")
                     
                 except Exception as e:
-                    print(f"❌ Error fetching MSFT market data: {e}")
                     logger.error(f"Error fetching MSFT market data: {e}")
             
-            # Start the fetch in a separate thread
-            fetch_thread = threading.Thread(target=fetch_market_data)
+            # Start the fetch in a separate thread, keeping the request's Slack gateway priority
+            fetch_thread = threading.Thread(target=contextvars.copy_context().run, args=(fetch_market_data,))
             fetch_thread.daemon = True
             fetch_thread.start()
             
         except Exception as e:
             logger.error(f"Error in MSFT handler: {e}")
-            print(f"❌ Error in MSFT handler: {e}")
     
     def handle_quick_symbol_googl(ack, body, client, context):
         ack()
@@ -867,6 +848,7 @@ def register_enhanced_market_actions(app: App, enhanced_command: EnhancedTradeCo
             client.views_update(view_id=view_id, view=loading_modal)
             
             # Fetch real market data using synchronous HTTP request
+            import contextvars
             import threading
             import requests
             from config.settings import get_config
@@ -878,7 +860,7 @@ def register_enhanced_market_actions(app: App, enhanced_command: EnhancedTradeCo
                     api_key = config.market_data.finnhub_api_key
                     
                     # Make synchronous HTTP request to Finnhub API
-                    url = f"https://finnhub.io/api/v1/quote?symbol=GOOGL&token={api_key}"
+                    url = f"{config.market_data.finnhub_base_url}/quote?symbol=GOOGL&token={api_key}"
                     response = requests.get(url, timeout=10)
                     
                     if response.status_code == 200:
@@ -889,14 +871,7 @@ def register_enhanced_market_actions(app: App, enhanced_command: EnhancedTradeCo
                         price_change = data.get('d', 0)   # change
                         price_change_percent = data.get('dp', 0)  # change percent
                         
-                        # Print to terminal
-                        print(f"\n🎯 GOOGL MARKET DATA FETCHED SUCCESSFULLY!")
-                        print(f"💰 Current Price: ${current_price}")
-                        print(f"📈 Price Change: ${price_change}")
-                        print(f"📊 Change %: {price_change_percent}%")
-                        print(f"⚡ Data Quality: Real-time")
-                        print(f"🏢 Exchange: NASDAQ")
-                        print("-" * 50)
+                        logger.debug("🎯 GOOGL quote: $%s, change $%s (%s%%)", current_price, price_change, price_change_percent)
                         
                         # Update modal with real data
                         change_emoji = "📈" if price_change >= 0 else "📉"
@@ -935,21 +910,19 @@ def register_enhanced_market_actions(app: App, enhanced_command: EnhancedTradeCo
                         logger.info(f"✅ GOOGL real market data displayed for user {user_id}")
                         
                     else:
-                        print(f"❌ GOOGL API request failed with status {response.status_code}")
+                        logger.error("❌ GOOGL API request failed with status %s", response.status_code)
                         raise Exception(f"API request failed with status {response.status_code}")
                     
                 except Exception as e:
-                    print(f"❌ Error fetching GOOGL market data: {e}")
                     logger.error(f"Error fetching GOOGL market data: {e}")
             
-            # Start the fetch in a separate thread
-            fetch_thread = threading.Thread(target=fetch_market_data)
+            # Start the fetch in a separate thread, keeping the request's Slack gateway priority
+            fetch_thread = threading.Thread(target=contextvars.copy_context().run, args=(fetch_market_data,))
             fetch_thread.daemon = True
             fetch_thread.start()
             
         except Exception as e:
             logger.error(f"Error in GOOGL handler: {e}")
-            print(f"❌ Error in GOOGL handler: {e}")
     
     # Register the handlers using the decorator pattern
     app.action("quick_symbol_AAPL")(handle_quick_symbol_aapl)
@@ -975,6 +948,7 @@ def register_enhanced_market_actions(app: App, enhanced_command: EnhancedTradeCo
     # Add to watchlist
     def handle_watchlist_add(ack, body, client, context):
         ack()
+        get_quote_prewarmer().add_watchlist(body["actions"][0]["value"])
         logger.info("⭐ Added to watchlist!")
     
     # Modal submission
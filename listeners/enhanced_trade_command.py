@@ -17,11 +17,13 @@ Features:
 """
 
 import asyncio
+import copy
 import logging
+import threading
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Dict, List, Optional, Any, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 import json
 
@@ -32,6 +34,7 @@ from slack_sdk.errors import SlackApiError
 # Import services and models
 from services.market_data import MarketDataService, MarketQuote, MarketStatus, DataQuality, MarketDataError
 from services.auth import AuthService, AuthenticationError, AuthorizationError
+from services.quote_stream import QuoteTick, get_quote_hub
 from services.service_container import get_container
 from models.user import User, UserRole, Permission
 from utils.formatters import format_money, format_percent, format_date
@@ -102,9 +105,13 @@ class EnhancedMarketContext:
     watch_list: List[str] = None
     
     # UI state
+    view_id: Optional[str] = None  # Set once the modal is open; auto-refresh redraws it
     last_updated: Optional[datetime] = None
     error_message: Optional[str] = None
     
+    # Guards the fields above against the quote stream hub thread, which applies live ticks
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    
     def __post_init__(self):
         """Initialize default values."""
         if self.historical_quotes is None:
@@ -152,7 +159,7 @@ class EnhancedTradeCommand:
                 api_key = config.market_data.finnhub_api_key
                 
                 # Make synchronous HTTP request to Finnhub API
-                url = f"https://finnhub.io/api/v1/quote?symbol={symbol}&token={api_key}"
+                url = f"{config.market_data.finnhub_base_url}/quote?symbol={symbol}&token={api_key}"
                 response = requests.get(url, timeout=10)
                 
                 if response.status_code == 200:
@@ -270,7 +277,7 @@ class EnhancedTradeCommand:
             api_key = config.market_data.finnhub_api_key
             
             # Make synchronous HTTP request to Finnhub API
-            url = f"https://finnhub.io/api/v1/quote?symbol={symbol}&token={api_key}"
+            url = f"{config.market_data.finnhub_base_url}/quote?symbol={symbol}&token={api_key}"
             response = requests.get(url, timeout=10)
             
             if response.status_code == 200:
@@ -444,10 +451,11 @@ class EnhancedTradeCommand:
             else:
                 modal = await self._create_enhanced_market_modal(market_context)
             
-            client.views_open(
+            response = client.views_open(
                 trigger_id=market_context.trigger_id,
                 view=modal
             )
+            market_context.view_id = (response.get("view") or {}).get("id")
             
             # Store active session for real-time updates
             session_key = f"{user.user_id}_{market_context.channel_id}"
@@ -557,9 +565,11 @@ class EnhancedTradeCommand:
         
         try:
             # Fetch current quote
-            context.current_quote = await self.market_data_service.get_quote(context.symbol)
-            context.last_updated = datetime.now(timezone.utc)
-            context.error_message = None
+            quote = await self.market_data_service.get_quote(context.symbol)
+            with context.lock:
+                context.current_quote = quote
+                context.last_updated = datetime.now(timezone.utc)
+                context.error_message = None
             
             logger.info(
                 f"Market data fetched successfully for {context.symbol}: "
@@ -992,50 +1002,31 @@ class EnhancedTradeCommand:
             return f"${market_cap:,}"
     
     async def _start_real_time_updates(self, session_key: str, client: WebClient) -> None:
-        """Start real-time market data updates for active session."""
-        logger.info(f"Starting real-time updates for session: {session_key}")
+        """
+        Push live quotes into the session's modal while auto-refresh is on.
         
-        try:
-            # Limit the update loop to prevent infinite running
-            max_updates = 10  # Maximum number of updates
-            update_count = 0
-            
-            while session_key in self.active_sessions and update_count < max_updates:
-                try:
-                    context = self.active_sessions[session_key]
-                    
-                    if not context.auto_refresh or not context.symbol:
-                        await asyncio.sleep(context.refresh_interval)
-                        continue
-                    
-                    # Fetch updated market data
-                    await self._fetch_market_data(context)
-                    
-                    # Update modal with new data
-                    updated_modal = await self._create_enhanced_market_modal(context)
-                    
-                    # Update the view (this would require storing view_id)
-                    # For now, we'll just log the update
-                    logger.info(
-                        f"Market data updated for session {session_key}, "
-                        f"symbol: {context.symbol}, "
-                        f"price: {float(context.current_quote.current_price) if context.current_quote else None}"
-                    )
-                    
-                    update_count += 1
-                    await asyncio.sleep(context.refresh_interval)
-                    
-                except Exception as e:
-                    logger.error(f"Error in real-time updates: {str(e)}")
-                    break
-                    
-        except asyncio.CancelledError:
-            logger.info(f"Real-time updates cancelled for session: {session_key}")
-        finally:
-            # Clean up session
-            if session_key in self.active_sessions:
-                del self.active_sessions[session_key]
-            logger.info(f"Real-time updates ended for session: {session_key}")
+        The modal subscribes to the shared quote stream (services/quote_stream.py)
+        for its symbol; the watch ends when auto-refresh is turned off, the symbol
+        changes, the session is replaced or the modal closes.
+        """
+        context = self.active_sessions.get(session_key)
+        if context is None or not context.auto_refresh or not context.symbol or not isinstance(context.view_id, str):
+            return
+        symbol = context.symbol.upper()
+        
+        async def render(tick: QuoteTick) -> Optional[Dict[str, Any]]:
+            # Runs on the hub thread: update the session under its lock, render from a copy
+            with context.lock:
+                if (self.active_sessions.get(session_key) is not context or not context.auto_refresh
+                        or (context.symbol or '').upper() != symbol):
+                    return None
+                context.current_quote = tick.apply_to(context.current_quote)
+                context.last_updated = datetime.now(timezone.utc)
+                snapshot = copy.copy(context)
+            return await self._create_enhanced_market_modal(snapshot)
+        
+        if get_quote_hub().watch_modal(context.view_id, symbol, render, client):
+            logger.info(f"Live quotes for {symbol} streaming to session {session_key}")
     
     async def _send_error_response(self, client: WebClient, body: Dict[str, Any], error_message: str) -> None:
         """Send error response to user."""
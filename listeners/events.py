@@ -31,8 +31,10 @@ from slack_sdk.errors import SlackApiError
 # Import our services and models
 from services.auth import AuthService, AuthenticationError, AuthorizationError, SessionError
 from services.postgresql_service import PostgreSQLService
-from services.market_data import MarketDataService, MarketDataError
+from services.market_data import MarketDataService, MarketDataError, QuotePurpose
 from services.service_container import ServiceContainer, get_container
+from services.metrics import MetricsRegistry, OperationMetrics
+from services.shared_cache import SharedCache, get_shared_cache_backend
 from models.user import User, UserRole, Permission
 from models.trade import Trade, TradeStatus
 from models.portfolio import Position
@@ -102,58 +104,44 @@ class EventContext:
             self.request_id = str(uuid.uuid4())
 
 
-class EventMetrics:
+class EventMetrics(OperationMetrics):
     """Event processing metrics tracking."""
     
-    def __init__(self):
-        self.events_processed = 0
-        self.events_successful = 0
-        self.events_failed = 0
-        self.app_home_opens = 0
-        self.dashboard_renders = 0
-        self.user_onboardings = 0
-        self.preference_updates = 0
-        self.response_times = {}
-        self.error_counts = {}
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        super().__init__('event', registry)
         
-    def record_event(self, event_type: EventType, success: bool, response_time: float,
+    def record_event(self, event_type: Optional[EventType], success: bool, response_time: float,
                     error_type: Optional[str] = None):
         """Record event processing metrics."""
-        self.events_processed += 1
-        if success:
-            self.events_successful += 1
-        else:
-            self.events_failed += 1
-            if error_type:
-                self.error_counts[error_type] = self.error_counts.get(error_type, 0) + 1
-        
-        # Track response times by event type
-        if event_type.value not in self.response_times:
-            self.response_times[event_type.value] = []
-        self.response_times[event_type.value].append(response_time)
-        
-        # Keep only last 100 response times per event type
-        if len(self.response_times[event_type.value]) > 100:
-            self.response_times[event_type.value] = self.response_times[event_type.value][-100:]
-        
-        # Track specific event types
-        if event_type == EventType.APP_HOME_OPENED:
-            self.app_home_opens += 1
+        self.record(event_type.value if event_type else 'unknown', success, response_time, error_type)
     
     def get_average_response_time(self, event_type: Optional[EventType] = None) -> float:
         """Get average response time in milliseconds."""
-        if event_type:
-            times = self.response_times.get(event_type.value, [])
-            return sum(times) / len(times) * 1000 if times else 0.0
-        else:
-            all_times = []
-            for times in self.response_times.values():
-                all_times.extend(times)
-            return sum(all_times) / len(all_times) * 1000 if all_times else 0.0
+        return super().get_average_response_time(event_type.value if event_type else None)
+    
+    @property
+    def events_processed(self) -> int:
+        return self.processed
+    
+    @property
+    def events_successful(self) -> int:
+        return self.successful
     
-    def get_success_rate(self) -> float:
-        """Get event success rate as percentage."""
-        return (self.events_successful / self.events_processed * 100) if self.events_processed > 0 else 0.0
+    @property
+    def events_failed(self) -> int:
+        return self.failed
+    
+    @property
+    def app_home_opens(self) -> int:
+        return self.processed_by_type(EventType.APP_HOME_OPENED.value)
+    
+    @property
+    def dashboard_renders(self) -> int:
+        return self.count('dashboard_renders')
+    
+    @property
+    def user_onboardings(self) -> int:
+        return self.count('user_onboardings')
 
 
 class EventHandler:
@@ -205,9 +193,11 @@ class EventHandler:
             EventType.REACTION_REMOVED: self._handle_reaction_removed
         }
         
-        # Dashboard cache for performance
-        self._dashboard_cache = {}  # user_id -> (dashboard_data, timestamp)
+        # Dashboard cache for performance, shared by the workers
         self._cache_ttl = 300  # 5 minutes
+        self._dashboard_cache = SharedCache('dashboard', ttl_seconds=self._cache_ttl,
+                                            backend=get_shared_cache_backend(),
+                                            max_entries=100)  # user_id -> (dashboard_data, timestamp)
         
         # User activity tracking
         self._user_activity = {}  # user_id -> last_activity_time
@@ -358,7 +348,7 @@ class EventHandler:
                 return
             
             # Check dashboard cache
-            cached_dashboard = self._get_cached_dashboard(event_context.user.user_id)
+            cached_dashboard = await self._get_cached_dashboard(event_context.user.user_id)
             if cached_dashboard:
                 await self._publish_app_home(client, event_context.user_id, cached_dashboard)
                 return
@@ -370,13 +360,13 @@ class EventHandler:
             dashboard_view = await self.dashboard.create_dashboard_view(dashboard_context)
             
             # Cache dashboard
-            self._cache_dashboard(event_context.user.user_id, dashboard_view)
+            await self._cache_dashboard(event_context.user.user_id, dashboard_view)
             
             # Publish to App Home
             await self._publish_app_home(client, event_context.user_id, dashboard_view)
             
             # Track dashboard render
-            self.metrics.dashboard_renders += 1
+            self.metrics.increment('dashboard_renders')
             
             # Check if this is first time opening (onboarding)
             if await self._is_first_app_home_visit(event_context.user):
@@ -404,7 +394,7 @@ class EventHandler:
                 await self._update_user_profile(event_context.user, slack_user_data)
             
             # Invalidate dashboard cache
-            self._invalidate_dashboard_cache(event_context.user.user_id)
+            await self._invalidate_dashboard_cache(event_context.user.user_id)
             
             logger.info(
                 "User profile updated",
@@ -518,7 +508,7 @@ class EventHandler:
             position_quotes = {}
             for position in positions:
                 try:
-                    quote = await self.market_data_service.get_quote(position.symbol)
+                    quote = await self.market_data_service.get_quote(position.symbol, purpose=QuotePurpose.APP_HOME)
                     position_quotes[position.symbol] = quote
                 except MarketDataError:
                     # Continue without market data for this position
@@ -547,31 +537,25 @@ class EventHandler:
                 theme=DashboardTheme.STANDARD
             )
     
-    def _get_cached_dashboard(self, user_id: str) -> Optional[Dict[str, Any]]:
+    async def _get_cached_dashboard(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get cached dashboard if not expired."""
-        if user_id in self._dashboard_cache:
-            dashboard_data, timestamp = self._dashboard_cache[user_id]
+        entry = await self._dashboard_cache.aget(user_id)
+        if entry is not None:
+            dashboard_data, timestamp = entry
             if time.time() - timestamp < self._cache_ttl:
                 return dashboard_data
             else:
                 # Remove expired cache
-                del self._dashboard_cache[user_id]
+                await self._dashboard_cache.adiscard(user_id)
         return None
     
-    def _cache_dashboard(self, user_id: str, dashboard_data: Dict[str, Any]) -> None:
+    async def _cache_dashboard(self, user_id: str, dashboard_data: Dict[str, Any]) -> None:
         """Cache dashboard data."""
-        self._dashboard_cache[user_id] = (dashboard_data, time.time())
-        
-        # Simple cache cleanup
-        if len(self._dashboard_cache) > 100:
-            oldest_user = min(self._dashboard_cache.keys(), 
-                            key=lambda k: self._dashboard_cache[k][1])
-            del self._dashboard_cache[oldest_user]
+        await self._dashboard_cache.aset(user_id, (dashboard_data, time.time()))
     
-    def _invalidate_dashboard_cache(self, user_id: str) -> None:
-        """Invalidate cached dashboard for user."""
-        if user_id in self._dashboard_cache:
-            del self._dashboard_cache[user_id]
+    async def _invalidate_dashboard_cache(self, user_id: str) -> None:
+        """Invalidate cached dashboard for user, in every worker."""
+        await self._dashboard_cache.adiscard(user_id)
     
     async def _publish_app_home(self, client: WebClient, user_id: str, view: Dict[str, Any]) -> None:
         """Publish view to App Home."""
@@ -662,7 +646,7 @@ class EventHandler:
             )
             
             # Track onboarding
-            self.metrics.user_onboardings += 1
+            self.metrics.increment('user_onboardings')
             
             logger.info(
                 "User onboarding completed",
@@ -841,9 +825,9 @@ def register_event_handlers(app: App, service_container: Optional['ServiceContai
     container = service_container or get_container()
     
     # Get services from container
-    auth_service = container.get(AuthService)
-    database_service = container.get(PostgreSQLService)
-    market_data_service = container.get(MarketDataService)
+    auth_service = container.resolve(AuthService)
+    database_service = container.resolve(PostgreSQLService)
+    market_data_service = container.resolve(MarketDataService)
     
     # Create event handler
     event_handler = EventHandler(auth_service, database_service, market_data_service)
@@ -915,7 +899,7 @@ def register_event_handlers(app: App, service_container: Optional['ServiceContai
         user_id = body['user']['id']
         
         # Invalidate cache and trigger App Home refresh
-        event_handler._invalidate_dashboard_cache(user_id)
+        await event_handler._invalidate_dashboard_cache(user_id)
         
         # Simulate app_home_opened event to refresh
         fake_event = {
@@ -15,13 +15,26 @@ from slack_bolt import App, Ack, BoltContext
 from slack_sdk import WebClient
 
 from ui.interactive_trade_widget import InteractiveTradeWidget, InteractiveTradeContext, OrderType
+from services.modal_updates import get_modal_coalescer
 from services.service_container import get_market_data_service
+from services.symbol_search import get_symbol_search_index
 from models.user import User, UserRole, UserProfile
 from utils.formatters import format_money
 
 logger = logging.getLogger(__name__)
 
 
+def _element_symbol(element: Dict[str, Any]) -> str:
+    """
+    Symbol from a ``symbol_input`` element's state or action payload.
+    
+    The trade modals use a typeahead ``external_select`` (``selected_option``); older
+    modals use a plain text input (``value``).
+    """
+    selected = element.get("selected_option") or {}
+    return (selected.get("value") or element.get("value") or "").strip().upper()
+
+
 class InteractiveActionHandler:
     """
     Handler for interactive trading modal actions.
@@ -49,19 +62,21 @@ class InteractiveActionHandler:
         """
         import asyncio
         
-        # Shares input handler (real-time calculation)
+        # Shares input handler (real-time calculation, coalesced per view)
         @app.action("shares_input")
         def handle_shares_input_wrapper(ack, body, client):
-            asyncio.create_task(self.handle_shares_input(ack, body, client))
+            self.handle_shares_input(ack, body, client)
         
-        # GMV input handler (real-time calculation)
+        # GMV input handler (real-time calculation, coalesced per view)
         @app.action("gmv_input")
         def handle_gmv_input_wrapper(ack, body, client):
-            asyncio.create_task(self.handle_gmv_input(ack, body, client))
+            self.handle_gmv_input(ack, body, client)
         
-        # Symbol input handler (price lookup)
+        # Symbol input handler (price lookup). Registered before the multi-account
+        # listener for the same action, so this is the one that runs for typeahead picks.
         @app.action("symbol_input")
         def handle_symbol_input_wrapper(ack, body, client):
+            self.record_symbol_selection(body)
             asyncio.create_task(self.handle_symbol_input(ack, body, client))
         
         # Trade side selection handler
@@ -108,20 +123,38 @@ class InteractiveActionHandler:
         
         self.logger.info("Interactive action handlers registered")
     
-    async def handle_shares_input(self, ack: Ack, body: Dict[str, Any], client: WebClient) -> None:
+    def record_symbol_selection(self, body: Dict[str, Any]) -> None:
+        """
+        Feed a symbol pick into the typeahead index's popularity and the user's recent list.
+        
+        Args:
+            body: symbol_input action body
+        """
+        try:
+            symbol = _element_symbol(body.get("actions", [{}])[0])
+            if symbol:
+                get_symbol_search_index().record_selection(body.get("user", {}).get("id"), symbol)
+        except Exception as e:
+            self.logger.warning(f"Failed to record symbol selection: {e}")
+    
+    def handle_shares_input(self, ack: Ack, body: Dict[str, Any], client: WebClient) -> None:
         """
         Handle shares input changes with real-time GMV calculation.
         
+        Keystrokes arrive faster than views.update can keep up, so the redraw goes
+        through the modal coalescer: only the newest calculation per view is built
+        and sent.
+        
         Args:
             ack: Slack acknowledgment function
             body: Request body
             client: Slack web client
         """
-        await ack()
+        ack()
         
         try:
-            # Extract context and new shares value
-            context = self._extract_context_from_body(body)
+            # Context comes from the payload's view state; no views.info round trip
+            context = self._extract_context_from_submission(body)
             if not context:
                 return
             
@@ -132,18 +165,14 @@ class InteractiveActionHandler:
                 try:
                     shares = int(float(shares_value))
                     if shares > 0:
-                        # Update modal with new calculation
-                        updated_modal = self.widget.update_modal_with_calculation(
-                            context, "shares", shares
-                        )
-                        
-                        # Update the modal view
-                        await client.views_update(
-                            view_id=body["view"]["id"],
-                            view=updated_modal
+                        # Built only if still the newest update when the debounce expires
+                        get_modal_coalescer().update(
+                            client,
+                            body["view"]["id"],
+                            lambda: self.widget.update_modal_with_calculation(context, "shares", shares)
                         )
                         
-                        self.logger.info(f"Shares updated: {shares} -> GMV: ${context.gmv}")
+                        self.logger.debug(f"Shares update queued: {shares}")
                     
                 except (ValueError, InvalidOperation) as e:
                     self.logger.warning(f"Invalid shares input: {shares_value} - {e}")
@@ -151,20 +180,22 @@ class InteractiveActionHandler:
         except Exception as e:
             self.logger.error(f"Shares input handler error: {e}")
     
-    async def handle_gmv_input(self, ack: Ack, body: Dict[str, Any], client: WebClient) -> None:
+    def handle_gmv_input(self, ack: Ack, body: Dict[str, Any], client: WebClient) -> None:
         """
         Handle GMV input changes with real-time shares calculation.
         
+        Coalesced per view like handle_shares_input.
+        
         Args:
             ack: Slack acknowledgment function
             body: Request body
             client: Slack web client
         """
-        await ack()
+        ack()
         
         try:
-            # Extract context and new GMV value
-            context = self._extract_context_from_body(body)
+            # Context comes from the payload's view state; no views.info round trip
+            context = self._extract_context_from_submission(body)
             if not context:
                 return
             
@@ -175,18 +206,14 @@ class InteractiveActionHandler:
                 try:
                     gmv = Decimal(str(gmv_value))
                     if gmv > 0:
-                        # Update modal with new calculation
-                        updated_modal = self.widget.update_modal_with_calculation(
-                            context, "gmv", gmv
-                        )
-                        
-                        # Update the modal view
-                        await client.views_update(
-                            view_id=body["view"]["id"],
-                            view=updated_modal
+                        # Built only if still the newest update when the debounce expires
+                        get_modal_coalescer().update(
+                            client,
+                            body["view"]["id"],
+                            lambda: self.widget.update_modal_with_calculation(context, "gmv", gmv)
                         )
                         
-                        self.logger.info(f"GMV updated: ${gmv} -> Shares: {context.shares}")
+                        self.logger.debug(f"GMV update queued: ${gmv}")
                     
                 except (ValueError, InvalidOperation) as e:
                     self.logger.warning(f"Invalid GMV input: {gmv_value} - {e}")
@@ -218,7 +245,7 @@ class InteractiveActionHandler:
             print(f"✅ SYMBOL INPUT: Context extracted successfully")
             
             # Get new symbol value
-            symbol_value = body.get("actions", [{}])[0].get("value", "").upper().strip()
+            symbol_value = _element_symbol(body.get("actions", [{}])[0])
             print(f"🔍 SYMBOL INPUT: Symbol value: '{symbol_value}'")
             
             if symbol_value and len(symbol_value) >= 1:
@@ -731,8 +758,9 @@ class InteractiveActionHandler:
         try:
             # Get current market data for execution price reference
             from services.service_container import get_market_data_service
+            from services.market_data import QuotePurpose
             market_data_service = get_market_data_service()
-            market_quote = await market_data_service.get_quote(trade.symbol)
+            market_quote = await market_data_service.get_quote(trade.symbol, purpose=QuotePurpose.EXECUTION)
             
             # Try Alpaca execution first if available
             if alpaca_service and alpaca_service.is_available():
@@ -1048,7 +1076,7 @@ class InteractiveActionHandler:
                     print(f"🔍 CONTEXT EXTRACTION: Action {action_id}: {action_data}")
                     
                     if "symbol" in action_id.lower():
-                        symbol = action_data.get("value", symbol)
+                        symbol = _element_symbol(action_data) or symbol
                         print(f"🔍 CONTEXT EXTRACTION: Found symbol: {symbol}")
                     elif "shares" in action_id.lower() or "quantity" in action_id.lower():
                         try:
@@ -1163,7 +1191,7 @@ class InteractiveActionHandler:
             private_metadata = json.loads(view.get("private_metadata", "{}"))
             
             # Extract form values
-            symbol = values.get("trade_symbol_block", {}).get("symbol_input", {}).get("value", "AAPL").upper()
+            symbol = _element_symbol(values.get("trade_symbol_block", {}).get("symbol_input", {})) or "AAPL"
             trade_side = values.get("trade_side_block", {}).get("trade_side_radio", {}).get("selected_option", {}).get("value", "buy")
             
             # Extract shares
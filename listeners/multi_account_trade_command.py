@@ -9,6 +9,7 @@ with automatic user assignment and account selection capabilities.
 from dotenv import load_dotenv
 load_dotenv()
 
+import asyncio
 import logging
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone
@@ -25,6 +26,11 @@ from slack_sdk.errors import SlackApiError
 from listeners.enhanced_trade_command import EnhancedTradeCommand, EnhancedMarketContext
 from services.service_container import get_multi_alpaca_service, get_user_account_manager
 from services.auth import AuthService
+from services.market_data import MarketDataService
+from services.modal_updates import get_modal_coalescer
+from ui.trade_modal_templates import (
+    PRICE_LOADING_TEXT, render_instant_trade_modal, render_multi_account_trade_modal
+)
 
 logger = logging.getLogger(__name__)
 
@@ -46,9 +52,9 @@ class MultiAccountTradeCommand(EnhancedTradeCommand):
     """
     
     def __init__(self, auth_service: AuthService):
-        # Get market data service for parent class
-        from services.service_container import get_market_data_service
-        market_data_service = get_market_data_service()
+        # Get market data service for parent class (a lazy proxy during lazy startup)
+        from services.service_container import get_container
+        market_data_service = get_container().resolve(MarketDataService)
         
         super().__init__(market_data_service, auth_service)
         self.multi_alpaca = None
@@ -321,186 +327,19 @@ class MultiAccountTradeCommand(EnhancedTradeCommand):
         Returns:
             Dict[str, Any]: Slack modal view
         """
-        # Create the enhanced modal with live market data
-        modal = {
-            "type": "modal",
-            "callback_id": "trade_form_submission",
-            "title": {
-                "type": "plain_text",
-                "text": f"Trade - {context.account_info.get('account_name', 'Account') if context.account_info else 'Account'}"
-            },
-            "submit": {
-                "type": "plain_text",
-                "text": "Execute Trade"
-            },
-            "close": {
-                "type": "plain_text",
-                "text": "Cancel"
-            },
-            "blocks": []
-        }
-        
-        # Add account information section
+        account_blocks = []
         if context.account_info:
-            account_section = self._create_account_info_section(context)
-            modal["blocks"].append(account_section)
-            modal["blocks"].append({"type": "divider"})
-        
-        # Add trading form with pre-filled values
-        symbol_input = {
-            "type": "input",
-            "block_id": "symbol_input",
-            "element": {
-                "type": "plain_text_input",
-                "action_id": "symbol",
-                "placeholder": {
-                    "type": "plain_text",
-                    "text": "e.g., AAPL, TSLA, MSFT"
-                }
-            },
-            "label": {
-                "type": "plain_text",
-                "text": "Stock Symbol"
-            }
-        }
-        
-        # Pre-fill symbol if provided
-        if context.symbol:
-            symbol_input["element"]["initial_value"] = context.symbol
-        
-        quantity_input = {
-            "type": "input",
-            "block_id": "quantity_input",
-            "element": {
-                "type": "plain_text_input",
-                "action_id": "quantity",
-                "placeholder": {
-                    "type": "plain_text",
-                    "text": "e.g., 100"
-                }
-            },
-            "label": {
-                "type": "plain_text",
-                "text": "Quantity (shares)"
-            }
-        }
-        
-        # Pre-fill quantity if provided
-        if hasattr(context, 'quantity') and context.quantity:
-            quantity_input["element"]["initial_value"] = str(context.quantity)
-        
-        # Add GMV field
-        gmv_input = {
-            "type": "input",
-            "block_id": "gmv_input",
-            "element": {
-                "type": "plain_text_input",
-                "action_id": "gmv",
-                "placeholder": {
-                    "type": "plain_text",
-                    "text": "e.g., 17500.00"
-                }
-            },
-            "label": {
-                "type": "plain_text",
-                "text": "GMV (Gross Monetary Value)"
-            }
-        }
-        
-        # Pre-fill GMV if calculated
-        if hasattr(context, 'gmv') and context.gmv:
-            gmv_input["element"]["initial_value"] = f"{context.gmv:.2f}"
-        
-        action_select = {
-            "type": "input",
-            "block_id": "action_select",
-            "element": {
-                "type": "static_select",
-                "action_id": "action",
-                "placeholder": {
-                    "type": "plain_text",
-                    "text": "Select trade action"
-                },
-                "options": [
-                    {
-                        "text": {
-                            "type": "plain_text",
-                            "text": "Buy"
-                        },
-                        "value": "buy"
-                    },
-                    {
-                        "text": {
-                            "type": "plain_text",
-                            "text": "Sell"
-                        },
-                        "value": "sell"
-                    }
-                ]
-            },
-            "label": {
-                "type": "plain_text",
-                "text": "Action"
-            }
-        }
-        
-        # Pre-fill action if provided
-        if hasattr(context, 'action') and context.action:
-            action_select["element"]["initial_option"] = {
-                "text": {
-                    "type": "plain_text",
-                    "text": "Buy" if context.action == "buy" else "Sell"
-                },
-                "value": context.action
-            }
-        
-        modal["blocks"].extend([
-            symbol_input,
-            quantity_input,
-            gmv_input,
-            action_select,
-            {
-                "type": "input",
-                "block_id": "order_type_select",
-                "element": {
-                    "type": "static_select",
-                    "action_id": "order_type",
-                    "placeholder": {
-                        "type": "plain_text",
-                        "text": "Select order type"
-                    },
-                    "initial_option": {
-                        "text": {
-                            "type": "plain_text",
-                            "text": "Market Order"
-                        },
-                        "value": "market"
-                    },
-                    "options": [
-                        {
-                            "text": {
-                                "type": "plain_text",
-                                "text": "Market Order"
-                            },
-                            "value": "market"
-                        },
-                        {
-                            "text": {
-                                "type": "plain_text",
-                                "text": "Limit Order"
-                            },
-                            "value": "limit"
-                        }
-                    ]
-                },
-                "label": {
-                    "type": "plain_text",
-                    "text": "Order Type"
-                }
-            }
-        ])
-        
-        return modal
+            account_blocks = [self._create_account_info_section(context), {"type": "divider"}]
+        
+        # Only the account and pre-filled values vary; the layout is precompiled
+        return render_multi_account_trade_modal(
+            account_name=context.account_info.get('account_name', 'Account') if context.account_info else 'Account',
+            account_blocks=account_blocks,
+            symbol=context.symbol,
+            quantity=getattr(context, 'quantity', None),
+            gmv=getattr(context, 'gmv', None),
+            action=getattr(context, 'action', None)
+        )
     
     async def _create_multi_account_modal_with_live_data(self, symbol: str, 
                                                        context: EnhancedMarketContext) -> Dict[str, Any]:
@@ -832,104 +671,60 @@ class MultiAccountTradeCommand(EnhancedTradeCommand):
             order_type = self._get_form_value(values, "order_type_block", "order_type_select", "market")
             limit_price = self._get_form_value(values, "limit_price_block", "limit_price_input")
             
-            # STEP 2: Validate inputs using ValidationService
+            # STEP 2: Run pre-trade checks (asset, account and positions fetched once, concurrently)
             from services.validation_service import ValidationService
-            validation_service = ValidationService(
-                alpaca_service=self.multi_alpaca.get_account_client(user_account) if hasattr(self.multi_alpaca, 'get_account_client') else None
+            from services.pre_trade_checks import (
+                PreTradeContext, DATA_ACCOUNT, DATA_ASSET, DATA_POSITIONS, DATA_QUOTE,
+                create_pre_trade_pipeline
             )
+            account_client = self.multi_alpaca.get_account_client(user_account) if hasattr(self.multi_alpaca, 'get_account_client') else None
+            validation_service = ValidationService(alpaca_service=account_client)
             
-            # Get account info for buying power check
-            account_info = self.multi_alpaca.get_account_info(user_account)
+            fetchers = {
+                DATA_ACCOUNT: lambda ctx: self.multi_alpaca.get_account_info(user_account),
+                DATA_POSITIONS: lambda ctx: self.multi_alpaca.get_positions(user_account)
+            }
+            if (action or '').lower() == 'buy':
+                # Only buying power needs the price; a sell would pay a quote round trip before ack()
+                fetchers[DATA_QUOTE] = self._fetch_quote_price
+            if validation_service.can_lookup_assets():
+                fetchers[DATA_ASSET] = lambda ctx: validation_service.lookup_asset(ctx.values['symbol'])
+            
+            pre_trade_context = PreTradeContext(
+                symbol=symbol,
+                quantity=quantity_str,
+                side=action,
+                price=float(limit_price) if limit_price and order_type in ['limit', 'stop_limit'] else None,
+                account_id=user_account,
+                fetchers=fetchers
+            )
+            # The confirmation needs the account even when no check does (sells), so fetch it alongside them
+            pre_trade_context.prefetch(DATA_ACCOUNT)
+            pipeline = create_pre_trade_pipeline(validation_service, max_quantity=10000)
+            pre_trade = await pipeline.run(pre_trade_context)
+            
+            try:
+                account_info = await pre_trade_context.get(DATA_ACCOUNT)
+            except Exception as e:
+                logger.error(f"Error retrieving account info for {user_account}: {e}")
+                account_info = None
             if not account_info:
                 ack(response_action="errors", errors={
                     "trade_symbol_block": "Unable to retrieve account information. Please try again."
                 })
                 return
             
-            # Get current price for validation (only for BUY orders)
-            current_price = None
-            if action and action.upper() == 'BUY':
-                try:
-                    # Try to get current price from market data
-                    from services.service_container import ServiceContainer
-                    container = ServiceContainer.get_instance()
-                    market_service = container.get('MarketDataService')
-                    if market_service:
-                        quote = market_service.get_quote(symbol)
-                        if quote and 'price' in quote:
-                            current_price = float(quote['price'])
-                            logger.info(f"Current price for {symbol}: ${current_price}")
-                except Exception as e:
-                    logger.warning(f"Could not fetch current price for {symbol}: {e}")
-            
-            # STEP 2.1: For SELL orders, validate position ownership
-            if action and action.upper() == 'SELL':
-                try:
-                    # Get user's current positions
-                    user_positions = self.multi_alpaca.get_positions(user_account)
-                    logger.info(f"Retrieved {len(user_positions) if user_positions else 0} positions for user {user_id}")
-                    
-                    # First validate basic inputs (symbol & quantity format)
-                    basic_validation = validation_service.validate_trade_inputs(
-                        symbol=symbol,
-                        quantity=quantity_str,
-                        account_cash=None,  # Not needed for sell
-                        current_price=None,  # Not needed for sell
-                        max_quantity=10000
-                    )
-                    
-                    if not basic_validation["valid"]:
-                        logger.warning(f"Basic validation failed for SELL: {basic_validation['errors']}")
-                        ack(response_action="errors", errors=basic_validation["errors"])
-                        return
-                    
-                    # Extract validated symbol and quantity
-                    validated_symbol = basic_validation["data"]["symbol"]
-                    validated_quantity = basic_validation["data"]["quantity"]
-                    
-                    # Validate sell order (position check)
-                    sell_validation = validation_service.validate_sell_order(
-                        symbol=validated_symbol,
-                        quantity=validated_quantity,
-                        user_positions=user_positions
-                    )
-                    
-                    if not sell_validation["valid"]:
-                        logger.warning(f"Sell validation failed: {sell_validation['error']}")
-                        ack(response_action="errors", errors={
-                            "qty_shares_block": sell_validation["error"]
-                        })
-                        return
-                    
-                    # Use validated data
-                    symbol = validated_symbol
-                    quantity = validated_quantity
-                    
-                except Exception as e:
-                    logger.error(f"Error validating sell order: {e}")
-                    ack(response_action="errors", errors={
-                        "trade_symbol_block": "Unable to validate your positions. Please try again."
-                    })
-                    return
-            else:
-                # For BUY orders, use existing validation
-                validation_result = validation_service.validate_trade_inputs(
-                    symbol=symbol,
-                    quantity=quantity_str,
-                    account_cash=float(account_info.get('cash', 0)) if action and action.upper() == 'BUY' else None,
-                    current_price=current_price,
-                    max_quantity=10000
-                )
-                
-                # If validation fails, return errors to modal
-                if not validation_result["valid"]:
-                    logger.warning(f"Trade validation failed: {validation_result['errors']}")
-                    ack(response_action="errors", errors=validation_result["errors"])
-                    return
-                
-                # Extract validated data
-                symbol = validation_result["data"]["symbol"]
-                quantity = validation_result["data"]["quantity"]
+            # If validation fails, return errors to modal
+            if not pre_trade.passed:
+                logger.warning(f"Trade validation failed: {pre_trade.to_dict()}")
+                ack(response_action="errors", errors=pre_trade.errors)
+                return
+            
+            logger.info(f"Pre-trade checks for user {user_id}: {pre_trade.to_dict()}")
+            
+            # Extract validated data
+            symbol = pre_trade.data["symbol"]
+            quantity = pre_trade.data["quantity"]
             
             # Acknowledge with clear to close modal (validation passed)
             ack(response_action="clear")
@@ -961,6 +756,21 @@ class MultiAccountTradeCommand(EnhancedTradeCommand):
             logger.error(f"Error handling trade submission: {e}")
             await self._send_error_message(client, body, f"Error processing trade: {str(e)}")
     
+    async def _fetch_quote_price(self, ctx) -> Optional[float]:
+        """
+        Fetch the current price for a pre-trade context's validated symbol.
+        
+        Args:
+            ctx: PreTradeContext being checked
+            
+        Returns:
+            Optional[float]: Current price if available
+        """
+        from services.market_data import QuotePurpose, get_market_data_service
+        market_service = await get_market_data_service()
+        quote = await market_service.get_quote(ctx.values['symbol'], purpose=QuotePurpose.EXECUTION)
+        return float(quote.current_price) if quote and quote.current_price is not None else None
+    
     def _get_form_value(self, values: Dict[str, Any], block_id: str, 
                        action_id: str, default: Any = None) -> Any:
         """
@@ -1377,145 +1187,127 @@ async def _get_company_description_standalone(symbol: str) -> str:
         return symbol.upper()
         
     except Exception as e:
-        print(f"Could not fetch company description for {symbol}: {e}")
+        logger.info("Could not fetch company description for %s: %s", symbol, e)
         return symbol.upper()
 
 
+def _modal_quantity(view_id: str) -> str:
+    """
+    Current quantity in an open trade modal.
+    
+    Read from the modal coalescer's copy of the view state, which interaction
+    payloads keep current, instead of a views.info round trip.
+    """
+    values = get_modal_coalescer().get_values(view_id) or {}
+    # Check both 'value' (user typed) and 'initial_value' (pre-filled)
+    shares_input = values.get("qty_shares_block", {}).get("shares_input", {})
+    current_quantity = shares_input.get("value") or shares_input.get("initial_value", "1")
+    if not current_quantity or str(current_quantity).strip() == "":
+        current_quantity = "1"
+    return current_quantity
+
+
 async def _fetch_and_update_price(symbol: str, view_id: str, client: WebClient) -> None:
     """Fetch price and update buy modal in background."""
     try:
-        print(f"🔄 BUY PRICE FETCH: Starting for {symbol}")
-        
-        # Get the current view to extract quantity
-        try:
-            view_info = client.views_info(view=view_id)
-            current_view = view_info.get("view", {})
-            values = current_view.get("state", {}).get("values", {})
-            
-            # Extract current quantity from modal state
-            # Check both 'value' (user typed) and 'initial_value' (pre-filled)
-            qty_block = values.get("qty_shares_block", {})
-            shares_input = qty_block.get("shares_input", {})
-            current_quantity = shares_input.get("value") or shares_input.get("initial_value", "1")
-            if not current_quantity or str(current_quantity).strip() == "":
-                current_quantity = "1"
-            print(f"✅ BUY PRICE FETCH: Current quantity in modal: {current_quantity}")
-        except Exception as e:
-            print(f"⚠️ BUY PRICE FETCH: Could not extract quantity, using default: {e}")
-            current_quantity = "1"
+        logger.debug("🔄 BUY PRICE FETCH: Starting for %s", symbol)
         
         # Import here to avoid circular imports
         from services.service_container import get_market_data_service
         
         market_service = get_market_data_service()
-        print(f"✅ BUY PRICE FETCH: Market service obtained")
+        logger.debug("✅ BUY PRICE FETCH: Market service obtained")
         
         # Get current price
         quote = await market_service.get_quote(symbol)
         current_price = float(quote.current_price)
-        print(f"✅ BUY PRICE FETCH: Got price ${current_price:.2f} for {symbol}")
-        
-        # Update the modal with the new price using actual quantity
-        updated_modal = _create_instant_buy_modal_with_price(symbol, current_quantity, current_price)
-        
-        response = client.views_update(
-            view_id=view_id,
-            view=updated_modal
+        logger.debug("✅ BUY PRICE FETCH: Got price $%.2f for %s", current_price, symbol)
+        
+        # Update the modal with the new price; the quantity is read when the coalesced
+        # update is sent, so anything typed during the fetch is kept
+        update = get_modal_coalescer().update(
+            client,
+            view_id,
+            lambda: _create_instant_buy_modal_with_price(symbol, _modal_quantity(view_id), current_price)
         )
+        response = await asyncio.wrap_future(update)
         
-        if response.get("ok"):
-            print(f"✅ BUY PRICE FETCH: Modal updated with ${current_price:.2f} (qty: {current_quantity})")
+        if response is None:
+            logger.debug("⏭️ BUY PRICE FETCH: Update superseded or modal changed, skipped")
+        elif response.get("ok"):
+            logger.debug("✅ BUY PRICE FETCH: Modal updated with $%.2f", current_price)
         else:
-            print(f"❌ BUY PRICE FETCH: Modal update failed: {response}")
+            logger.error("❌ BUY PRICE FETCH: Modal update failed: %s", response)
             
     except Exception as e:
-        print(f"❌ BUY PRICE FETCH: Error: {e}")
-        import traceback
-        print(f"🚨 BUY PRICE FETCH: Traceback: {traceback.format_exc()}")
+        logger.error("❌ BUY PRICE FETCH: Error: %s", e, exc_info=True)
 
 
 async def _fetch_and_update_sell_price(symbol: str, view_id: str, client: WebClient) -> None:
     """Fetch price and update sell modal in background."""
     try:
-        print(f"🔄 SELL PRICE FETCH: Starting for {symbol}")
-        
-        # Get the current view to extract quantity
-        try:
-            view_info = client.views_info(view=view_id)
-            current_view = view_info.get("view", {})
-            values = current_view.get("state", {}).get("values", {})
-            
-            # Extract current quantity from modal state
-            # Check both 'value' (user typed) and 'initial_value' (pre-filled)
-            qty_block = values.get("qty_shares_block", {})
-            shares_input = qty_block.get("shares_input", {})
-            current_quantity = shares_input.get("value") or shares_input.get("initial_value", "1")
-            if not current_quantity or str(current_quantity).strip() == "":
-                current_quantity = "1"
-            print(f"✅ SELL PRICE FETCH: Current quantity in modal: {current_quantity}")
-        except Exception as e:
-            print(f"⚠️ SELL PRICE FETCH: Could not extract quantity, using default: {e}")
-            current_quantity = "1"
+        logger.debug("🔄 SELL PRICE FETCH: Starting for %s", symbol)
         
         # Import here to avoid circular imports
         from services.service_container import get_market_data_service
         
         market_service = get_market_data_service()
-        print(f"✅ SELL PRICE FETCH: Market service obtained")
+        logger.debug("✅ SELL PRICE FETCH: Market service obtained")
         
         # Get current price
         quote = await market_service.get_quote(symbol)
         current_price = float(quote.current_price)
-        print(f"✅ SELL PRICE FETCH: Got price ${current_price:.2f} for {symbol}")
-        
-        # Update the modal with the new price (sell modal) using actual quantity
-        updated_modal = _create_instant_sell_modal_with_price(symbol, current_quantity, current_price)
-        
-        response = client.views_update(
-            view_id=view_id,
-            view=updated_modal
+        logger.debug("✅ SELL PRICE FETCH: Got price $%.2f for %s", current_price, symbol)
+        
+        # Update the modal with the new price; the quantity is read when the coalesced
+        # update is sent, so anything typed during the fetch is kept
+        update = get_modal_coalescer().update(
+            client,
+            view_id,
+            lambda: _create_instant_sell_modal_with_price(symbol, _modal_quantity(view_id), current_price)
         )
+        response = await asyncio.wrap_future(update)
         
-        if response.get("ok"):
-            print(f"✅ SELL PRICE FETCH: Modal updated with ${current_price:.2f} (qty: {current_quantity})")
+        if response is None:
+            logger.debug("⏭️ SELL PRICE FETCH: Update superseded or modal changed, skipped")
+        elif response.get("ok"):
+            logger.debug("✅ SELL PRICE FETCH: Modal updated with $%.2f", current_price)
         else:
-            print(f"❌ SELL PRICE FETCH: Modal update failed: {response}")
+            logger.error("❌ SELL PRICE FETCH: Modal update failed: %s", response)
             
     except Exception as e:
-        print(f"❌ SELL PRICE FETCH: Error: {e}")
-        import traceback
-        print(f"🚨 SELL PRICE FETCH: Traceback: {traceback.format_exc()}")
+        logger.error("❌ SELL PRICE FETCH: Error: %s", e, exc_info=True)
 
 
 async def _fetch_and_update_buy_price(symbol: str, view_id: str, client: WebClient, quantity: str = "1") -> None:
     """Fetch price and update buy modal in background."""
     try:
-        print(f"🔄 BUY PRICE FETCH: Starting for {symbol} (qty: {quantity})")
+        logger.debug("🔄 BUY PRICE FETCH: Starting for %s (qty: %s)", symbol, quantity)
         
         # Use the passed quantity parameter
         current_quantity = quantity
-        print(f"✅ BUY PRICE FETCH: Using quantity: {current_quantity}")
+        logger.debug("✅ BUY PRICE FETCH: Using quantity: %s", current_quantity)
         
         # Import here to avoid circular imports
         from services.service_container import get_market_data_service
         
         market_service = get_market_data_service()
-        print(f"✅ BUY PRICE FETCH: Market service obtained")
+        logger.debug("✅ BUY PRICE FETCH: Market service obtained")
         
         # Validate symbol and get current price
         try:
             quote = await market_service.get_quote(symbol)
             current_price = float(quote.current_price)
-            print(f"✅ BUY PRICE FETCH: Got price ${current_price:.2f} for {symbol}")
+            logger.debug("✅ BUY PRICE FETCH: Got price $%.2f for %s", current_price, symbol)
             
             # Calculate GMV with the actual quantity
             try:
                 qty_num = int(current_quantity)
                 calculated_gmv = qty_num * current_price
-                print(f"✅ BUY PRICE FETCH: Calculated GMV: {qty_num} × ${current_price:.2f} = ${calculated_gmv:.2f}")
+                logger.debug("✅ BUY PRICE FETCH: Calculated GMV: %s × $%.2f = $%.2f", qty_num, current_price, calculated_gmv)
             except:
                 calculated_gmv = current_price
-                print(f"⚠️ BUY PRICE FETCH: Invalid quantity '{current_quantity}', using 1 share")
+                logger.warning("⚠️ BUY PRICE FETCH: Invalid quantity '%s', using 1 share", current_quantity)
             
             # Update the modal with the new price and calculated GMV
             updated_modal = _create_instant_buy_modal_with_price_and_gmv(symbol, current_quantity, current_price, calculated_gmv)
@@ -1526,14 +1318,14 @@ async def _fetch_and_update_buy_price(symbol: str, view_id: str, client: WebClie
             )
             
             if response.get("ok"):
-                print(f"✅ BUY PRICE FETCH: Modal updated with ${current_price:.2f} (qty: {current_quantity}, GMV: ${calculated_gmv:.2f})")
+                logger.debug("✅ BUY PRICE FETCH: Modal updated with $%.2f (qty: %s, GMV: $%.2f)", current_price, current_quantity, calculated_gmv)
             else:
-                print(f"❌ BUY PRICE FETCH: Modal update failed (Slack API error): {response}")
+                logger.error("❌ BUY PRICE FETCH: Modal update failed (Slack API error): %s", response)
                 # This is a modal format error, not an invalid symbol error
                 
         except Exception as price_error:
             # This is actually an invalid symbol error (market data API failed)
-            print(f"❌ BUY PRICE FETCH: Invalid symbol '{symbol}': {price_error}")
+            logger.error("❌ BUY PRICE FETCH: Invalid symbol '%s': %s", symbol, price_error)
             
             # Create error modal for invalid symbol
             error_modal = _create_error_modal(symbol, f"Invalid ticker symbol '{symbol}'. Please try a valid stock symbol like AAPL, TSLA, MSFT.")
@@ -1545,162 +1337,61 @@ async def _fetch_and_update_buy_price(symbol: str, view_id: str, client: WebClie
                 )
                 
                 if response.get("ok"):
-                    print(f"✅ BUY PRICE FETCH: Error modal displayed for invalid symbol '{symbol}'")
+                    logger.debug("✅ BUY PRICE FETCH: Error modal displayed for invalid symbol '%s'", symbol)
                 else:
-                    print(f"❌ BUY PRICE FETCH: Error modal update failed: {response}")
+                    logger.error("❌ BUY PRICE FETCH: Error modal update failed: %s", response)
             except Exception as modal_error:
-                print(f"❌ BUY PRICE FETCH: Failed to show error modal: {modal_error}")
+                logger.error("❌ BUY PRICE FETCH: Failed to show error modal: %s", modal_error)
             
     except Exception as e:
-        print(f"❌ BUY PRICE FETCH: Error: {e}")
-        import traceback
-        print(f"🚨 BUY PRICE FETCH: Traceback: {traceback.format_exc()}")
+        logger.error("❌ BUY PRICE FETCH: Error: %s", e, exc_info=True)
 
 
-def _create_instant_buy_modal(symbol: str = "", quantity: str = "1") -> Dict[str, Any]:
-    """Create a minimal instant modal for buy command that opens immediately."""
-    return {
-        "type": "modal",
-        "callback_id": "stock_trade_modal_interactive",
-        "title": {"type": "plain_text", "text": "KEMBot"},
-        "submit": {"type": "plain_text", "text": "Execute Trade"},
-        "close": {"type": "plain_text", "text": "Cancel"},
-        "blocks": [
-            {
-                "type": "input",
-                "block_id": "trade_symbol_block",
-                "label": {"type": "plain_text", "text": "Stock Symbol (e.g., AAPL)"},
-                "element": {
-                    "type": "plain_text_input",
-                    "action_id": "symbol_input",
-                    "placeholder": {"type": "plain_text", "text": "Enter stock ticker (e.g., AAPL, TSLA)"},
-                    "initial_value": symbol if symbol else "",
-                    "dispatch_action_config": {
-                        "trigger_actions_on": ["on_enter_pressed", "on_character_entered"]
-                    }
-                }
-            },
-            {
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": "*Current Stock Price:* *Loading...*"},
-                "block_id": "current_price_display"
-            },
-            {"type": "divider"},
-            {
-                "type": "input",
-                "block_id": "trade_side_block",
-                "label": {"type": "plain_text", "text": "Trade Action (Buy/Sell)"},
-                "element": {
-                    "type": "radio_buttons",
-                    "action_id": "trade_side_radio",
-                    "options": [
-                        {"value": "buy", "text": {"type": "plain_text", "text": "Buy"}},
-                        {"value": "sell", "text": {"type": "plain_text", "text": "Sell"}}
-                    ],
-                    "initial_option": {"value": "buy", "text": {"type": "plain_text", "text": "Buy"}}
-                }
-            },
-            {
-                "type": "input",
-                "block_id": "qty_shares_block",
-                "label": {"type": "plain_text", "text": "Quantity (shares)"},
-                "element": {
-                    "type": "number_input",
-                    "action_id": "shares_input",
-                    "placeholder": {"type": "plain_text", "text": "Enter shares, and GMV will update"},
-                    "is_decimal_allowed": False,
-                    "initial_value": quantity,
-                    "dispatch_action_config": {
-                        "trigger_actions_on": ["on_enter_pressed", "on_character_entered"]
-                    }
-                },
-                "hint": {"type": "plain_text", "text": "Changes here trigger an automatic GMV calculation."}
-            },
-            {
-                "type": "input",
-                "block_id": "gmv_block",
-                "label": {"type": "plain_text", "text": "Gross Market Value (GMV)"},
-                "element": {
-                    "type": "number_input",
-                    "action_id": "gmv_input",
-                    "placeholder": {"type": "plain_text", "text": "Enter dollar amount, and shares will update"},
-                    "is_decimal_allowed": True,
-                    "dispatch_action_config": {
-                        "trigger_actions_on": ["on_enter_pressed", "on_character_entered"]
-                    }
-                },
-                "hint": {"type": "plain_text", "text": "Changes here trigger an automatic Shares calculation."}
-            },
-            {"type": "divider"},
-            {
-                "type": "input",
-                "block_id": "order_type_block",
-                "label": {"type": "plain_text", "text": "Order Type"},
-                "element": {
-                    "type": "static_select",
-                    "action_id": "order_type_select",
-                    "initial_option": {"text": {"type": "plain_text", "text": "Market"}, "value": "market"},
-                    "options": [
-                        {"text": {"type": "plain_text", "text": "Market"}, "value": "market"},
-                        {"text": {"type": "plain_text", "text": "Limit"}, "value": "limit"},
-                        {"text": {"type": "plain_text", "text": "Stop"}, "value": "stop"},
-                        {"text": {"type": "plain_text", "text": "Stop Limit"}, "value": "stop_limit"}
-                    ]
-                }
-            }
-        ]
+def _build_symbol_select_element(symbol: str = "") -> Dict[str, Any]:
+    """Typeahead symbol picker served by the ``symbol_input`` options handler."""
+    element = {
+        "type": "external_select",
+        "action_id": "symbol_input",
+        "placeholder": {"type": "plain_text", "text": "Search ticker or company (e.g., AAPL, Apple)"},
+        "min_query_length": 1
     }
+    if symbol:
+        element["initial_option"] = {
+            "text": {"type": "plain_text", "text": symbol.upper()},
+            "value": symbol.upper()
+        }
+    return element
+
+
+def _get_symbol_value(values: Dict[str, Any]) -> str:
+    """Read the symbol from the trade modal (typeahead select or plain text input)."""
+    action = values.get("trade_symbol_block", {}).get("symbol_input", {})
+    selected = action.get("selected_option") or {}
+    return (selected.get("value") or action.get("value") or "").strip().upper()
+
+
+def _create_instant_buy_modal(symbol: str = "", quantity: str = "1",
+                              private_metadata: Optional[str] = None) -> Dict[str, Any]:
+    """Create a minimal instant modal for buy command that opens immediately."""
+    return render_instant_trade_modal("buy", symbol, quantity, private_metadata=private_metadata)
 
 
 def _create_instant_buy_modal_with_price(symbol: str = "", quantity: str = "1", price: float = None) -> Dict[str, Any]:
     """Create an instant modal with actual price data."""
-    modal = _create_instant_buy_modal(symbol, quantity)
-    
-    # Update the price display block
-    if price is not None:
-        for block in modal["blocks"]:
-            if block.get("block_id") == "current_price_display":
-                change_emoji = ""  # Default to positive
-                block["text"]["text"] = f"*Current Stock Price:* ${price:.2f}"
-                break
-        
-        # Calculate and populate initial GMV
-        if quantity and quantity.isdigit():
-            try:
-                qty_int = int(quantity)
-                calculated_gmv = qty_int * price
-                
-                # Find and update the GMV block
-                for block in modal["blocks"]:
-                    if block.get("block_id") == "gmv_block":
-                        block["element"]["initial_value"] = str(calculated_gmv)
-                        break
-            except:
-                pass
-    
-    return modal
+    return _render_instant_modal_with_price("buy", symbol, quantity, price)
 
 
 def _create_instant_buy_modal_with_price_and_gmv(symbol: str = "", quantity: str = "1", price: float = None, gmv: float = None) -> Dict[str, Any]:
     """Create an instant buy modal with price and GMV pre-calculated."""
-    modal = _create_instant_buy_modal(symbol, quantity)
-    
-    # Update the price display block
+    price_text = PRICE_LOADING_TEXT
     if price is not None:
-        for block in modal["blocks"]:
-            if block.get("block_id") == "current_price_display":
-                change_emoji = "📈"  # Default to positive for buy
-                block["text"]["text"] = f"*Current Stock Price:* *${price:.2f}* {change_emoji}"
-                break
+        change_emoji = "📈"  # Default to positive for buy
+        price_text = f"*Current Stock Price:* *${price:.2f}* {change_emoji}"
     
-    # Update the GMV field with calculated value
-    if gmv is not None:
-        for block in modal["blocks"]:
-            if block.get("block_id") == "gmv_block":
-                block["element"]["initial_value"] = str(round(gmv, 2))
-                break
-    
-    return modal
+    return render_instant_trade_modal(
+        "buy", symbol, quantity, price_text,
+        gmv=str(round(gmv, 2)) if gmv is not None else None
+    )
 
 
 def _create_error_modal(symbol: str, error_message: str) -> Dict[str, Any]:
@@ -1737,128 +1428,28 @@ def _create_error_modal(symbol: str, error_message: str) -> Dict[str, Any]:
     }
 
 
-def _create_instant_sell_modal(symbol: str = "", quantity: str = "1") -> Dict[str, Any]:
+def _create_instant_sell_modal(symbol: str = "", quantity: str = "1",
+                               private_metadata: Optional[str] = None) -> Dict[str, Any]:
     """Create a minimal instant modal for sell command that opens immediately."""
-    return {
-        "type": "modal",
-        "callback_id": "stock_trade_modal_interactive",
-        "title": {"type": "plain_text", "text": "KEMBot"},
-        "submit": {"type": "plain_text", "text": "Execute Trade"},
-        "close": {"type": "plain_text", "text": "Cancel"},
-        "blocks": [
-            {
-                "type": "input",
-                "block_id": "trade_symbol_block",
-                "label": {"type": "plain_text", "text": "Stock Symbol (e.g., AAPL)"},
-                "element": {
-                    "type": "plain_text_input",
-                    "action_id": "symbol_input",
-                    "placeholder": {"type": "plain_text", "text": "Enter stock ticker (e.g., AAPL, TSLA)"},
-                    "initial_value": symbol if symbol else "",
-                    "dispatch_action_config": {
-                        "trigger_actions_on": ["on_enter_pressed", "on_character_entered"]
-                    }
-                }
-            },
-            {
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": "*Current Stock Price:* *Loading...*"},
-                "block_id": "current_price_display"
-            },
-            {"type": "divider"},
-            {
-                "type": "input",
-                "block_id": "trade_side_block",
-                "label": {"type": "plain_text", "text": "Trade Action (Buy/Sell)"},
-                "element": {
-                    "type": "radio_buttons",
-                    "action_id": "trade_side_radio",
-                    "options": [
-                        {"value": "buy", "text": {"type": "plain_text", "text": "Buy"}},
-                        {"value": "sell", "text": {"type": "plain_text", "text": "Sell"}}
-                    ],
-                    "initial_option": {"value": "sell", "text": {"type": "plain_text", "text": "Sell"}}
-                }
-            },
-            {
-                "type": "input",
-                "block_id": "qty_shares_block",
-                "label": {"type": "plain_text", "text": "Quantity (shares)"},
-                "element": {
-                    "type": "number_input",
-                    "action_id": "shares_input",
-                    "placeholder": {"type": "plain_text", "text": "Enter shares, and GMV will update"},
-                    "is_decimal_allowed": False,
-                    "initial_value": quantity,
-                    "dispatch_action_config": {
-                        "trigger_actions_on": ["on_enter_pressed", "on_character_entered"]
-                    }
-                },
-                "hint": {"type": "plain_text", "text": "Changes here trigger an automatic GMV calculation."}
-            },
-            {
-                "type": "input",
-                "block_id": "gmv_block",
-                "label": {"type": "plain_text", "text": "Gross Market Value (GMV)"},
-                "element": {
-                    "type": "number_input",
-                    "action_id": "gmv_input",
-                    "placeholder": {"type": "plain_text", "text": "Enter dollar amount, and shares will update"},
-                    "is_decimal_allowed": True,
-                    "dispatch_action_config": {
-                        "trigger_actions_on": ["on_enter_pressed", "on_character_entered"]
-                    }
-                },
-                "hint": {"type": "plain_text", "text": "Changes here trigger an automatic Shares calculation."}
-            },
-            {"type": "divider"},
-            {
-                "type": "input",
-                "block_id": "order_type_block",
-                "label": {"type": "plain_text", "text": "Order Type"},
-                "element": {
-                    "type": "static_select",
-                    "action_id": "order_type_select",
-                    "initial_option": {"text": {"type": "plain_text", "text": "Market"}, "value": "market"},
-                    "options": [
-                        {"text": {"type": "plain_text", "text": "Market"}, "value": "market"},
-                        {"text": {"type": "plain_text", "text": "Limit"}, "value": "limit"},
-                        {"text": {"type": "plain_text", "text": "Stop"}, "value": "stop"},
-                        {"text": {"type": "plain_text", "text": "Stop Limit"}, "value": "stop_limit"}
-                    ]
-                }
-            }
-        ]
-    }
+    return render_instant_trade_modal("sell", symbol, quantity, private_metadata=private_metadata)
 
 
 def _create_instant_sell_modal_with_price(symbol: str = "", quantity: str = "1", price: float = None) -> Dict[str, Any]:
     """Create an instant sell modal with actual price data."""
-    modal = _create_instant_sell_modal(symbol, quantity)
+    return _render_instant_modal_with_price("sell", symbol, quantity, price)
+
+
+def _render_instant_modal_with_price(side: str, symbol: str, quantity: str, price: Optional[float]) -> Dict[str, Any]:
+    """Instant modal showing the price, with GMV pre-filled from the quantity."""
+    if price is None:
+        return render_instant_trade_modal(side, symbol, quantity)
     
-    # Update the price display block
-    if price is not None:
-        for block in modal["blocks"]:
-            if block.get("block_id") == "current_price_display":
-                change_emoji = ""  # Default to negative for sell
-                block["text"]["text"] = f"*Current Stock Price:* ${price:.2f}"
-                break
-        
-        # Calculate and populate initial GMV
-        if quantity and quantity.isdigit():
-            try:
-                qty_int = int(quantity)
-                calculated_gmv = qty_int * price
-                
-                # Find and update the GMV block
-                for block in modal["blocks"]:
-                    if block.get("block_id") == "gmv_block":
-                        block["element"]["initial_value"] = str(calculated_gmv)
-                        break
-            except:
-                pass
+    # Calculate initial GMV
+    gmv = None
+    if quantity and quantity.isdigit():
+        gmv = str(int(quantity) * price)
     
-    return modal
+    return render_instant_trade_modal(side, symbol, quantity, f"*Current Stock Price:* ${price:.2f}", gmv=gmv)
 
 
 async def handle_modal_interactions(ack, body, client, logger):
@@ -1871,8 +1462,7 @@ async def handle_modal_interactions(ack, body, client, logger):
         values = view.get("state", {}).get("values", {})
         
         # Extract current values
-        symbol_block = values.get("trade_symbol_block", {})
-        symbol = symbol_block.get("symbol_input", {}).get("value", "").upper()
+        symbol = _get_symbol_value(values)
         
         qty_block = values.get("qty_shares_block", {})
         quantity_str = qty_block.get("shares_input", {}).get("value", "1")
@@ -1904,16 +1494,8 @@ async def handle_modal_interactions(ack, body, client, logger):
         updated_blocks.append({
             "type": "input",
             "block_id": "trade_symbol_block",
-            "label": {"type": "plain_text", "text": "Stock Symbol (e.g., AAPL)"},
-            "element": {
-                "type": "plain_text_input",
-                "action_id": "symbol_input",
-                "placeholder": {"type": "plain_text", "text": "Enter the stock ticker"},
-                "initial_value": symbol,
-                "dispatch_action_config": {
-                    "trigger_actions_on": ["on_enter_pressed", "on_character_entered"]
-                }
-            }
+            "label": {"type": "plain_text", "text": "Stock Symbol"},
+            "element": _build_symbol_select_element(symbol)
         })
         
         # Price display block
@@ -2075,15 +1657,13 @@ def register_multi_account_trade_command(app: App, auth_service: AuthService) ->
         start_time = time.time()
         
         try:
-            print("BUY COMMAND DEBUG: Starting buy command")
             logger.info("BUY COMMAND DEBUG: Starting buy command")
             
             # Immediate acknowledgment and terminal feedback
             ack()
             ack_time = time.time()
-            print("BUY COMMAND DEBUG: ACK sent successfully")
+            logger.debug("BUY COMMAND DEBUG: ACK sent successfully")
         except Exception as e:
-            print(f"BUY COMMAND ACK ERROR: {e}")
             logger.error(f"BUY COMMAND ACK ERROR: {e}")
             return
         
@@ -2153,14 +1733,13 @@ def register_multi_account_trade_command(app: App, auth_service: AuthService) ->
             
             # Create modal
             modal_start = time.time()
-            modal_view = _create_instant_buy_modal(symbol, quantity)
+            # channel_id goes in private_metadata
+            modal_view = _create_instant_buy_modal(
+                symbol, quantity, private_metadata=body.get("channel_id", "C09H1R7KKP1")
+            )
             modal_create_time = time.time()
             logger.info(f"⚡ Modal creation took: {(modal_create_time - modal_start)*1000:.2f}ms")
             
-            # Add channel_id to private_metadata
-            if 'private_metadata' not in modal_view:
-                modal_view['private_metadata'] = body.get("channel_id", "C09H1R7KKP1")
-            
             # Try to open modal (this might fail due to timing, but we already gave feedback)
             api_start = time.time()
             try:
@@ -2230,15 +1809,13 @@ def register_multi_account_trade_command(app: App, auth_service: AuthService) ->
         start_time = time.time()
         
         try:
-            print("SELL COMMAND DEBUG: Starting sell command")
             logger.info("SELL COMMAND DEBUG: Starting sell command")
             
             # Immediate acknowledgment and terminal feedback
             ack()
             ack_time = time.time()
-            print("SELL COMMAND DEBUG: ACK sent successfully")
+            logger.debug("SELL COMMAND DEBUG: ACK sent successfully")
         except Exception as e:
-            print(f"SELL COMMAND ACK ERROR: {e}")
             logger.error(f"SELL COMMAND ACK ERROR: {e}")
             return
         
@@ -2308,14 +1885,13 @@ def register_multi_account_trade_command(app: App, auth_service: AuthService) ->
             
             # Create modal
             modal_start = time.time()
-            modal_view = _create_instant_sell_modal(symbol, quantity)
+            # channel_id goes in private_metadata
+            modal_view = _create_instant_sell_modal(
+                symbol, quantity, private_metadata=body.get("channel_id", "C09H1R7KKP1")
+            )
             modal_create_time = time.time()
             logger.info(f"⚡ Modal creation took: {(modal_create_time - modal_start)*1000:.2f}ms")
             
-            # Add channel_id to private_metadata
-            if 'private_metadata' not in modal_view:
-                modal_view['private_metadata'] = body.get("channel_id", "C09H1R7KKP1")
-            
             # Try to open modal (this might fail due to timing, but we already gave feedback)
             api_start = time.time()
             try:
@@ -2393,6 +1969,20 @@ def register_multi_account_trade_command(app: App, auth_service: AuthService) ->
     interactive_handler = InteractiveActionHandler()
     interactive_handler.register_handlers(app)
     
+    # Typeahead options for the symbol picker (answered from the in-memory index)
+    @app.options("symbol_input")
+    def handle_symbol_options(ack, body, logger):
+        from services.symbol_search import get_symbol_search_index
+        try:
+            options = get_symbol_search_index().slack_options(
+                body.get("value", ""),
+                user_id=body.get("user", {}).get("id")
+            )
+        except Exception as e:
+            logger.error(f"Symbol search failed: {e}")
+            options = []
+        ack(options=options)
+    
     # Register modal interaction handlers for GMV/Quantity calculations
     @app.action("symbol_input")
     async def handle_symbol_change(ack, body, client, logger):
@@ -2448,8 +2038,7 @@ def register_multi_account_trade_command(app: App, auth_service: AuthService) ->
             # Extract values from modal
             values = body["view"]["state"]["values"]
             
-            symbol_block = values.get("trade_symbol_block", {})
-            symbol = symbol_block.get("symbol_input", {}).get("value", "").upper()
+            symbol = _get_symbol_value(values)
             
             qty_block = values.get("qty_shares_block", {})
             quantity = qty_block.get("shares_input", {}).get("value", "1")
@@ -2472,6 +2061,7 @@ def register_multi_account_trade_command(app: App, auth_service: AuthService) ->
                         limit_price = float(limit_price_block["limit_price_input"]["value"])
                     except:
                         pass
+            limit_line = f"\n• Limit Price: ${limit_price:.2f}" if limit_price else ""
             
             user_id = body["user"]["id"]
             
@@ -2550,7 +2140,7 @@ def register_multi_account_trade_command(app: App, auth_service: AuthService) ->
                                     "type": "section",
                                     "text": {
                                         "type": "mrkdwn",
-                                        "text": f"*Order Details:*\n• Symbol: {symbol}\n• Action: {trade_side.upper()}\n• Quantity: {qty_int:,} shares\n• Order Type: {order_type.title()}{f'\n• Limit Price: ${limit_price:.2f}' if limit_price else ''}\n• Order ID: {order_id}\n• Status: {status}"
+                                        "text": f"*Order Details:*\n• Symbol: {symbol}\n• Action: {trade_side.upper()}\n• Quantity: {qty_int:,} shares\n• Order Type: {order_type.title()}{limit_line}\n• Order ID: {order_id}\n• Status: {status}"
                                     }
                                 }
                             ]
@@ -2596,7 +2186,7 @@ def register_multi_account_trade_command(app: App, auth_service: AuthService) ->
                                 "type": "section",
                                 "text": {
                                     "type": "mrkdwn",
-                                    "text": f"Error: {str(trade_error)}\n\n*Attempted Trade:*\n• Symbol: {symbol}\n• Action: {trade_side.upper()}\n• Quantity: {quantity} shares\n• Order Type: {order_type}{f'\n• Limit Price: ${limit_price:.2f}' if limit_price else ''}\n\nPlease check your inputs and try again."
+                                    "text": f"Error: {str(trade_error)}\n\n*Attempted Trade:*\n• Symbol: {symbol}\n• Action: {trade_side.upper()}\n• Quantity: {quantity} shares\n• Order Type: {order_type}{limit_line}\n\nPlease check your inputs and try again."
                                 }
                             }
                         ]
@@ -2634,7 +2224,7 @@ def register_multi_account_trade_command(app: App, auth_service: AuthService) ->
                         "type": "section",
                         "text": {
                             "type": "mrkdwn",
-                            "text": f"*Order Details:*\n• Symbol: {symbol}\n• Action: {trade_side.upper()}\n• Quantity: {quantity} shares\n• Order Type: {order_type.title()}{f'\n• Limit Price: ${limit_price:.2f}' if limit_price else ''}\n\nSubmitting to Alpaca Paper Trading..."
+                            "text": f"*Order Details:*\n• Symbol: {symbol}\n• Action: {trade_side.upper()}\n• Quantity: {quantity} shares\n• Order Type: {order_type.title()}{limit_line}\n\nSubmitting to Alpaca Paper Trading..."
                         }
                     }
                 ]
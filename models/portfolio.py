@@ -8,13 +8,15 @@ P&L calculations, risk metrics, and advanced portfolio analytics for the Slack T
 import logging
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal, ROUND_HALF_UP
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Callable, Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 import json
 import statistics
 from collections import defaultdict
 
+from utils.codec import Field, RecordCodec
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -399,6 +401,16 @@ class Position:
             raise PortfolioValidationError(f"Failed to create Position from dict: {str(e)}")
 
 
+# Binary form of cached positions; append new fields at the end (see utils.codec)
+POSITION_CODEC = RecordCodec(Position, 3, [
+    Field('user_id'), Field('symbol'), Field('quantity'), Field('average_cost'), Field('current_price'),
+    Field('position_type', PositionType), Field('opened_date'), Field('last_updated'),
+    Field('realized_pnl'), Field('unrealized_pnl'), Field('total_cost'), Field('current_value'),
+    Field('day_change'), Field('day_change_percent'), Field('trade_history'),
+    Field('dividends_received'), Field('commission_paid'), Field('risk_metrics'), Field('notes')
+])
+
+
 @dataclass
 class Portfolio:
     """
@@ -468,6 +480,9 @@ class Portfolio:
     
     def __post_init__(self):
         """Post-initialization validation and calculations."""
+        # Called with (portfolio, symbol, last_updated before the change) after a position is
+        # added, filled or repriced, e.g. by the sector exposure tracker; not a dataclass field
+        self.on_position_change: Optional[Callable[['Portfolio', str, datetime], None]] = None
         try:
             self.validate()
             self.calculate_portfolio_values()
@@ -523,8 +538,10 @@ class Portfolio:
         if position.user_id != self.user_id:
             raise PortfolioValidationError("Position user_id must match portfolio user_id")
         
+        previous_update = self.last_updated
         self.positions[position.symbol] = position
         self.calculate_portfolio_values()
+        self._position_changed(position.symbol, previous_update)
         logger.info(f"Position {position.symbol} added to portfolio {self.portfolio_id}")
     
     def get_position(self, symbol: str) -> Optional[Position]:
@@ -555,8 +572,10 @@ class Portfolio:
         """
         position = self.get_position(symbol)
         if position:
+            previous_update = self.last_updated
             position.update_price(new_price, previous_price)
             self.calculate_portfolio_values()
+            self._position_changed(position.symbol, previous_update)
     
     def update_all_prices(self, price_data: Dict[str, Decimal], previous_prices: Optional[Dict[str, Decimal]] = None) -> None:
         """
@@ -615,9 +634,15 @@ class Portfolio:
         if position.is_closed():
             del self.positions[symbol]
         
+        previous_update = self.last_updated
         self.calculate_portfolio_values()
+        self._position_changed(symbol, previous_update)
         logger.info(f"Trade executed: {quantity} shares of {symbol} at ${price}")
     
+    def _position_changed(self, symbol: str, previous_update: datetime) -> None:
+        if self.on_position_change is not None:
+            self.on_position_change(self, symbol, previous_update)
+    
     def get_active_positions(self) -> List[Position]:
         """Get list of active (non-zero) positions."""
         return [pos for pos in self.positions.values() if not pos.is_closed()]
@@ -14,6 +14,8 @@ from dataclasses import dataclass, field, asdict
 from enum import Enum
 import json
 
+from utils.codec import Field, RecordCodec
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -446,4 +448,14 @@ class Trade:
         return (f"Trade(trade_id='{self.trade_id}', user_id='{self.user_id}', "
                 f"symbol='{self.symbol}', quantity={self.quantity}, "
                 f"trade_type={self.trade_type}, price={self.price}, "
-                f"status={self.status}, risk_level={self.risk_level})")
\ No newline at end of file
+                f"status={self.status}, risk_level={self.risk_level})")
+
+
+# Binary form of cached trades; append new fields at the end (see utils.codec)
+TRADE_CODEC = RecordCodec(Trade, 2, [
+    Field('user_id'), Field('symbol'), Field('quantity'), Field('trade_type', TradeType), Field('price'),
+    Field('trade_id'), Field('timestamp'), Field('status', TradeStatus), Field('risk_level', RiskLevel),
+    Field('execution_id'), Field('channel_id'), Field('portfolio_manager_id'), Field('market_data'),
+    Field('risk_analysis'), Field('execution_timestamp'), Field('execution_price'), Field('commission'),
+    Field('notes')
+])
@@ -95,7 +95,7 @@ deploy_to_lambda() {
             --function-name "$LAMBDA_FUNCTION_NAME" \
             --runtime python3.12 \
             --role "$role_arn" \
-            --handler app.lambda_handler \
+            --handler lambda_entry.lambda_handler \
             --zip-file "fileb://$DEPLOYMENT_PACKAGE" \
             --timeout 30 \
             --memory-size 512 \
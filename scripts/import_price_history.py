@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Import daily closes into the local price history store used by the risk engine.
+
+CSV files may be long (date,symbol,close) or wide (date,AAPL,MSFT,...); Parquet files
+must be long and need pyarrow. Each import replaces the whole dataset, and running
+workers pick it up on their next restart:
+
+    PRICE_HISTORY_DIR=data/price_history python scripts/import_price_history.py closes.csv
+"""
+
+import argparse
+import os
+import sys
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.price_history import PriceHistoryError, PriceHistoryStore
+
+load_dotenv()
+
+
+def main() -> int:
+    """Import a CSV or Parquet file into PRICE_HISTORY_DIR."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('path', help='CSV or Parquet file of daily closes')
+    parser.add_argument('--dir', default=os.getenv('PRICE_HISTORY_DIR', 'data/price_history'),
+                        help='Store directory (default: PRICE_HISTORY_DIR or data/price_history)')
+    args = parser.parse_args()
+
+    store = PriceHistoryStore(args.dir)
+    try:
+        if args.path.lower().endswith(('.parquet', '.pq')):
+            store.import_parquet(args.path)
+        else:
+            store.import_csv(args.path)
+    except (OSError, ValueError, PriceHistoryError) as e:
+        print(f"❌ Import failed: {e}")
+        return 1
+
+    print(f"✅ Imported {len(store.symbols)} symbols through {store.last_date} into {args.dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
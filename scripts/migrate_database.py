@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Create tables and apply schema migrations for the trading bot database.
+
+Lazy (Lambda) startup constructs PostgreSQLService with auto_migrate=False so that
+no request pays for DDL. Run this once per deploy instead:
+
+    DATABASE_URL=postgresql://... python scripts/migrate_database.py
+"""
+
+import os
+import sys
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.postgresql_service import PostgreSQLService
+
+load_dotenv()
+
+
+def main() -> int:
+    """Run migrations against DATABASE_URL."""
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        print("❌ ERROR: DATABASE_URL environment variable not set")
+        return 1
+
+    # Handle Render's postgres:// vs postgresql:// URL format
+    if database_url.startswith('postgres://'):
+        database_url = database_url.replace('postgres://', 'postgresql://', 1)
+
+    try:
+        service = PostgreSQLService(database_url, auto_migrate=False)
+        service.create_tables()
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        return 1
+
+    print("✅ Database tables and migrations are up to date")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
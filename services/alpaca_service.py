@@ -307,6 +307,18 @@ class AlpacaService:
             logger.warning(f"Error getting asset {symbol}: {e}")
             return None
     
+    def list_assets(self) -> List[Dict[str, Any]]:
+        """
+        List all active US equity assets in one request.
+        
+        Returns:
+            List of raw asset records (empty if unavailable)
+        """
+        if not self.is_available():
+            return []
+        
+        return self.alpaca.list_assets() or []
+    
     async def submit_order(
         self,
         symbol: str,
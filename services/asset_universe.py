@@ -0,0 +1,398 @@
+"""
+Local tradable-asset universe for network-free symbol validation.
+
+The full list of active US equities is loaded in bulk (once a day from the Alpaca
+assets endpoint, or at cold start from an on-disk snapshot) into a sorted symbol
+array with parallel name, exchange-code and flag arrays. Tradability, exchange and
+name lookups and symbol prefix search are binary searches over that array, so
+they answer in microseconds without touching the network.
+
+Snapshot format (JSON)::
+
+    {"version": 1, "loaded_at": "...", "exchanges": ["NASDAQ", ...],
+     "symbols": [...], "names": [...], "exchange_codes": [...], "flags": [...]}
+"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+# Flag bits
+FLAG_TRADABLE = 1
+FLAG_SHORTABLE = 2
+FLAG_FRACTIONABLE = 4
+FLAG_EASY_TO_BORROW = 8
+
+AssetLoader = Callable[[], Iterable[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class AssetRecord:
+    """A single asset in the universe."""
+    symbol: str
+    name: str
+    exchange: str
+    tradable: bool
+    shortable: bool = False
+    fractionable: bool = False
+    easy_to_borrow: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert record to the dictionary shape returned by ``AlpacaService.get_asset``."""
+        return {
+            'symbol': self.symbol,
+            'name': self.name,
+            'tradable': self.tradable,
+            'status': 'active',
+            'exchange': self.exchange,
+            'shortable': self.shortable,
+            'fractionable': self.fractionable,
+            'easy_to_borrow': self.easy_to_borrow
+        }
+
+
+class _UniverseData:
+    """Immutable arrays backing one loaded universe (swapped atomically on refresh)."""
+
+    __slots__ = ('symbols', 'names', 'exchange_codes', 'flags', 'exchanges', 'loaded_at')
+
+    def __init__(
+        self,
+        symbols: List[str],
+        names: List[str],
+        exchange_codes: array,
+        flags: array,
+        exchanges: List[str],
+        loaded_at: Optional[datetime]
+    ):
+        self.symbols = symbols
+        self.names = names
+        self.exchange_codes = exchange_codes
+        self.flags = flags
+        self.exchanges = exchanges
+        self.loaded_at = loaded_at
+
+
+_EMPTY = _UniverseData([], [], array('B'), array('B'), [], None)
+
+
+def _flags_for(asset: Dict[str, Any]) -> int:
+    flags = 0
+    if asset.get('tradable'):
+        flags |= FLAG_TRADABLE
+    if asset.get('shortable'):
+        flags |= FLAG_SHORTABLE
+    if asset.get('fractionable'):
+        flags |= FLAG_FRACTIONABLE
+    if asset.get('easy_to_borrow'):
+        flags |= FLAG_EASY_TO_BORROW
+    return flags
+
+
+class AssetUniverse:
+    """
+    Sorted in-memory index of the tradable-asset universe.
+
+    Readers never lock: a refresh builds new arrays and swaps a single reference.
+    """
+
+    def __init__(self, snapshot_path: Optional[str] = None):
+        """
+        Initialize an empty universe.
+
+        Args:
+            snapshot_path: Snapshot file used by ``load_snapshot`` / ``save_snapshot``
+        """
+        self.snapshot_path = snapshot_path
+        self._data = _EMPTY
+        self._refresh_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return self._index(self._data, symbol.upper()) is not None
+
+    @property
+    def is_loaded(self) -> bool:
+        """Check whether any assets are loaded."""
+        return bool(self._data.symbols)
+
+    @property
+    def loaded_at(self) -> Optional[datetime]:
+        """When the universe was last loaded from the source."""
+        return self._data.loaded_at
+
+    def is_stale(self, max_age: timedelta) -> bool:
+        """Check whether the universe is missing or older than ``max_age``."""
+        loaded_at = self._data.loaded_at
+        return loaded_at is None or datetime.utcnow() - loaded_at > max_age
+
+    @staticmethod
+    def _index(data: _UniverseData, symbol: str) -> Optional[int]:
+        i = bisect.bisect_left(data.symbols, symbol)
+        if i < len(data.symbols) and data.symbols[i] == symbol:
+            return i
+        return None
+
+    def _record(self, data: _UniverseData, i: int) -> AssetRecord:
+        flags = data.flags[i]
+        return AssetRecord(
+            symbol=data.symbols[i],
+            name=data.names[i],
+            exchange=data.exchanges[data.exchange_codes[i]],
+            tradable=bool(flags & FLAG_TRADABLE),
+            shortable=bool(flags & FLAG_SHORTABLE),
+            fractionable=bool(flags & FLAG_FRACTIONABLE),
+            easy_to_borrow=bool(flags & FLAG_EASY_TO_BORROW)
+        )
+
+    def get(self, symbol: str) -> Optional[AssetRecord]:
+        """
+        Look up an asset.
+
+        Args:
+            symbol: Ticker symbol (case-insensitive)
+
+        Returns:
+            AssetRecord or None if the symbol is not in the universe
+        """
+        data = self._data
+        i = self._index(data, symbol.strip().upper())
+        return self._record(data, i) if i is not None else None
+
+    def is_tradable(self, symbol: str) -> bool:
+        """Check whether a symbol is in the universe and tradable."""
+        data = self._data
+        i = self._index(data, symbol.strip().upper())
+        return i is not None and bool(data.flags[i] & FLAG_TRADABLE)
+
+    def get_exchange(self, symbol: str) -> Optional[str]:
+        """Get the listing exchange for a symbol."""
+        data = self._data
+        i = self._index(data, symbol.strip().upper())
+        return data.exchanges[data.exchange_codes[i]] if i is not None else None
+
+    def get_name(self, symbol: str) -> Optional[str]:
+        """Get the company name for a symbol."""
+        data = self._data
+        i = self._index(data, symbol.strip().upper())
+        return data.names[i] if i is not None else None
+
+    def records(self, tradable_only: bool = True) -> Iterator[AssetRecord]:
+        """Iterate over all assets in symbol order."""
+        data = self._data
+        for i in range(len(data.symbols)):
+            if not tradable_only or data.flags[i] & FLAG_TRADABLE:
+                yield self._record(data, i)
+
+    def search_prefix(self, prefix: str, limit: int = 10, tradable_only: bool = True) -> List[AssetRecord]:
+        """
+        Find assets whose symbol starts with a prefix, in symbol order.
+
+        Args:
+            prefix: Symbol prefix (case-insensitive)
+            limit: Maximum number of results
+            tradable_only: Skip non-tradable assets
+
+        Returns:
+            List of matching AssetRecords
+        """
+        prefix = prefix.strip().upper()
+        if not prefix:
+            return []
+
+        data = self._data
+        results: List[AssetRecord] = []
+        i = bisect.bisect_left(data.symbols, prefix)
+        while i < len(data.symbols) and len(results) < limit and data.symbols[i].startswith(prefix):
+            if not tradable_only or data.flags[i] & FLAG_TRADABLE:
+                results.append(self._record(data, i))
+            i += 1
+        return results
+
+    def load_assets(self, assets: Iterable[Dict[str, Any]], loaded_at: Optional[datetime] = None) -> int:
+        """
+        Replace the universe with raw asset records.
+
+        Args:
+            assets: Alpaca-style asset dicts (symbol, name, exchange, tradable, ...)
+            loaded_at: Source timestamp (defaults to now)
+
+        Returns:
+            int: Number of assets loaded
+        """
+        rows: Dict[str, Tuple[str, str, int]] = {}
+        for asset in assets:
+            symbol = (asset.get('symbol') or '').strip().upper()
+            if not symbol:
+                continue
+            rows[symbol] = ((asset.get('name') or '').strip(), (asset.get('exchange') or '').strip(), _flags_for(asset))
+
+        exchanges: List[str] = []
+        exchange_lookup: Dict[str, int] = {}
+        symbols = sorted(rows)
+        names: List[str] = []
+        exchange_codes = array('B')
+        flags = array('B')
+
+        for symbol in symbols:
+            name, exchange, flag = rows[symbol]
+            code = exchange_lookup.get(exchange)
+            if code is None:
+                code = len(exchanges)
+                exchanges.append(exchange)
+                exchange_lookup[exchange] = code
+            names.append(name)
+            exchange_codes.append(code)
+            flags.append(flag)
+
+        self._data = _UniverseData(symbols, names, exchange_codes, flags, exchanges,
+                                   loaded_at or datetime.utcnow())
+        logger.info(f"Asset universe loaded: {len(symbols)} assets on {len(exchanges)} exchanges")
+        return len(symbols)
+
+    def refresh(self, loader: AssetLoader, save: bool = True) -> bool:
+        """
+        Reload the universe from a bulk source and optionally persist a snapshot.
+
+        Args:
+            loader: Callable returning raw asset dicts
+            save: Write a snapshot after a successful load
+
+        Returns:
+            bool: True if the universe was refreshed
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            return False  # Another refresh is already running
+        try:
+            assets = list(loader() or [])
+            if not assets:
+                logger.warning("Asset universe refresh returned no assets; keeping current universe")
+                return False
+            self.load_assets(assets)
+            if save and self.snapshot_path:
+                self.save_snapshot()
+            return True
+        finally:
+            self._refresh_lock.release()
+
+    def refresh_if_stale(self, loader: AssetLoader, max_age: timedelta) -> bool:
+        """Refresh only when the universe is older than ``max_age``."""
+        if not self.is_stale(max_age):
+            return False
+        return self.refresh(loader)
+
+    def save_snapshot(self, path: Optional[str] = None) -> None:
+        """
+        Write the universe to a snapshot file (atomic replace).
+
+        Args:
+            path: Snapshot path (defaults to ``snapshot_path``)
+        """
+        path = path or self.snapshot_path
+        data = self._data
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'loaded_at': data.loaded_at.isoformat() if data.loaded_at else None,
+            'exchanges': data.exchanges,
+            'symbols': data.symbols,
+            'names': data.names,
+            'exchange_codes': data.exchange_codes.tolist(),
+            'flags': data.flags.tolist()
+        }
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        logger.info(f"Asset universe snapshot written: {len(data.symbols)} assets to {path}")
+
+    def load_snapshot(self, path: Optional[str] = None) -> bool:
+        """
+        Load the universe from a snapshot file.
+
+        Args:
+            path: Snapshot path (defaults to ``snapshot_path``)
+
+        Returns:
+            bool: True if a snapshot was loaded
+        """
+        path = path or self.snapshot_path
+        if not path or not os.path.exists(path):
+            return False
+
+        with open(path, 'r') as f:
+            snapshot = json.load(f)
+
+        if snapshot.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported asset universe snapshot version: {snapshot.get('version')}")
+
+        symbols = snapshot['symbols']
+        if not (len(symbols) == len(snapshot['names']) == len(snapshot['exchange_codes']) == len(snapshot['flags'])):
+            raise ValueError(f"Asset universe snapshot arrays have mismatched lengths: {path}")
+
+        loaded_at = snapshot.get('loaded_at')
+        self._data = _UniverseData(
+            symbols=symbols,
+            names=snapshot['names'],
+            exchange_codes=array('B', snapshot['exchange_codes']),
+            flags=array('B', snapshot['flags']),
+            exchanges=snapshot['exchanges'],
+            loaded_at=datetime.fromisoformat(loaded_at) if loaded_at else None
+        )
+        logger.info(f"Asset universe snapshot loaded: {len(symbols)} assets from {path}")
+        return True
+
+
+def _load_from_alpaca() -> List[Dict[str, Any]]:
+    """Bulk-load active US equities from Alpaca."""
+    from services.alpaca_service import AlpacaService
+    alpaca = AlpacaService()
+    alpaca.initialize()
+    return alpaca.list_assets()
+
+
+# Global universe instance
+_asset_universe: Optional[AssetUniverse] = None
+
+
+def get_asset_universe() -> AssetUniverse:
+    """
+    Get or create the global AssetUniverse, loading the on-disk snapshot if present.
+
+    Returns:
+        AssetUniverse: Shared universe (empty until a snapshot or refresh is loaded)
+    """
+    global _asset_universe
+
+    if _asset_universe is None:
+        from config.settings import get_config
+        universe = AssetUniverse(get_config().market_data.asset_universe_path)
+        try:
+            universe.load_snapshot()
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Asset universe snapshot unavailable: {e}")
+        _asset_universe = universe
+
+    return _asset_universe
+
+
+def refresh_asset_universe_task() -> None:
+    """Background task: refresh the asset universe from Alpaca once it is a day old."""
+    from config.settings import get_config
+    max_age = timedelta(hours=get_config().market_data.asset_universe_refresh_hours)
+    get_asset_universe().refresh_if_stale(_load_from_alpaca, max_age)
@@ -0,0 +1,172 @@
+"""
+Persistence backends for user-to-account assignments.
+
+UserAccountManager keeps every assignment in memory and hands changed records
+to one of these stores in batches:
+
+- DatabaseAssignmentStore: the ``user_account_assignments`` table behind
+  PostgreSQLService (PostgreSQL in production, SQLite locally)
+- LogAssignmentStore: an append-only JSON-lines file for runs without a database
+- MemoryAssignmentStore: no persistence (tests, scripts)
+
+Records are plain dictionaries with the AccountAssignment columns; ``assigned_at``
+is a timezone-aware datetime.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List
+
+from config.settings import AssignmentStoreConfig
+
+logger = logging.getLogger(__name__)
+
+LEGACY_ASSIGNMENTS_FILE = "user_assignments.json"
+
+
+class AssignmentStore:
+    """Base class for assignment persistence."""
+
+    name = "memory"
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Return every stored assignment, one record per user."""
+        return []
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """Persist a batch of new or changed assignments."""
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+
+
+class MemoryAssignmentStore(AssignmentStore):
+    """Keeps nothing; assignments live only as long as the process."""
+
+
+class DatabaseAssignmentStore(AssignmentStore):
+    """Assignments in the PostgreSQL/SQLite database, written with one upsert per batch."""
+
+    name = "database"
+
+    def __init__(self, database_service):
+        self.database_service = database_service
+
+    def load(self) -> List[Dict[str, Any]]:
+        return self.database_service.get_account_assignments()
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        self.database_service.upsert_account_assignments(records)
+
+
+class LogAssignmentStore(AssignmentStore):
+    """
+    Append-only JSON-lines log.
+
+    Each batch is appended and fsynced once. Loading replays the log with the last
+    record per user winning, and rewrites it when superseded lines outnumber live ones.
+    """
+
+    name = "log"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def load(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return []
+
+        latest: Dict[str, Dict[str, Any]] = {}
+        lines = 0
+        with open(self.path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-append; everything before it is intact
+                    logger.warning(f"Skipping unreadable line {lines + 1} in {self.path}")
+                    continue
+                lines += 1
+                record['assigned_at'] = datetime.fromisoformat(record['assigned_at'])
+                latest[record['user_id']] = record
+
+        records = list(latest.values())
+        if lines > 2 * len(records):
+            self._compact(records)
+        return records
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        if not records:
+            return
+        payload = ''.join(json.dumps(self._serialize(record)) + '\n' for record in records)
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._file = open(self.path, 'a')
+            self._file.write(payload)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _compact(self, records: List[Dict[str, Any]]) -> None:
+        """Rewrite the log with one line per user."""
+        temp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(temp_path, 'w') as f:
+                for record in records:
+                    f.write(json.dumps(self._serialize(record)) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        logger.info(f"Compacted assignment log {self.path} to {len(records)} records")
+
+    @staticmethod
+    def _serialize(record: Dict[str, Any]) -> Dict[str, Any]:
+        return dict(record, assigned_at=record['assigned_at'].isoformat())
+
+
+def read_legacy_assignments(path: str = LEGACY_ASSIGNMENTS_FILE) -> List[Dict[str, Any]]:
+    """Read assignments from the old whole-file JSON format, if present."""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return [
+        dict(record, assigned_at=datetime.fromisoformat(record['assigned_at']))
+        for record in data.values()
+    ]
+
+
+def create_assignment_store(config: AssignmentStoreConfig, database_service=None) -> AssignmentStore:
+    """
+    Build the store selected by configuration.
+
+    ``auto`` uses the database when a database service is available and keeps
+    assignments in memory otherwise.
+    """
+    backend = config.backend
+    if backend == 'auto':
+        backend = 'database' if database_service is not None else 'memory'
+
+    if backend == 'database':
+        if database_service is None:
+            raise ValueError("Assignment store backend 'database' requires a database service")
+        return DatabaseAssignmentStore(database_service)
+    if backend == 'log':
+        return LogAssignmentStore(config.log_path)
+    return MemoryAssignmentStore()
@@ -31,6 +31,10 @@ from slack_sdk.errors import SlackApiError
 from models.user import User, UserRole, UserStatus, Permission, UserProfile, UserValidationError
 from services.database import DatabaseService, DatabaseError, NotFoundError, ConflictError
 from config.settings import get_config
+from services.profiling import profiled
+from services.shared_cache import SharedCache, SharedSetIndex, get_shared_cache_backend
+from services.slack_gateway import GatewayWebClient
+from utils import codec
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -199,6 +203,15 @@ class UserSession:
         )
 
 
+def _encode_session(session: UserSession) -> bytes:
+    """Shared cache form of a session."""
+    return codec.dumps(session.to_dict())
+
+
+def _decode_session(data: bytes) -> UserSession:
+    return UserSession.from_dict(codec.loads(data))
+
+
 class AuthService:
     """
     Comprehensive authentication and authorization service.
@@ -233,11 +246,16 @@ class AuthService:
         if slack_client:
             self.slack_client = slack_client
         else:
-            self.slack_client = WebClient(token=self.config.slack.bot_token)
+            self.slack_client = GatewayWebClient(token=self.config.slack.bot_token, base_url=self.config.slack.api_url)
         
-        # Session management
-        self._active_sessions: Dict[str, UserSession] = {}
-        self._user_sessions: Dict[str, List[str]] = {}  # user_id -> [session_ids]
+        # Session management, shared by the workers so any of them can validate a session
+        session_ttl = self.config.security.session_timeout_minutes * 60
+        shared_backend = get_shared_cache_backend()
+        self._active_sessions = SharedCache('session', ttl_seconds=session_ttl, backend=shared_backend,
+                                            encode=_encode_session, decode=_decode_session)
+        self._user_sessions = SharedSetIndex('user_sessions', ttl_seconds=session_ttl,
+                                             backend=shared_backend)  # user_id -> {session_ids}
+        self._saved_activity: Dict[str, datetime] = {}  # session_id -> last_activity this worker stored
         
         # Rate limiting
         self._rate_limits: Dict[str, List[float]] = {}  # user_id -> [timestamps]
@@ -267,6 +285,7 @@ class AuthService:
         base_key = self.config.slack.signing_secret.encode('utf-8')
         return hashlib.sha256(base_key + b'jwt_secret').hexdigest()
     
+    @profiled('auth.authenticate_slack_user')
     async def authenticate_slack_user(self, slack_user_id: str, team_id: str, 
                                     channel_id: Optional[str] = None,
                                     ip_address: Optional[str] = None,
@@ -653,22 +672,24 @@ class AuthService:
             UserSession object
         """
         # Check for existing active session
-        existing_sessions = self._user_sessions.get(user.user_id, [])
-        for session_id in existing_sessions[:]:  # Copy list to avoid modification during iteration
-            if session_id in self._active_sessions:
-                session = self._active_sessions[session_id]
-                if session.is_active():
-                    # Update existing session
-                    session.update_activity('authentication', {
-                        'channel_id': channel_id,
-                        'ip_address': ip_address
-                    })
-                    if channel_id:
-                        session.channel_id = channel_id
-                    return session
-                else:
-                    # Remove expired session
-                    await self._cleanup_session(session_id)
+        for session_id in await self._user_sessions.members(user.user_id):
+            session = await self._active_sessions.aget(session_id)
+            if session is None:
+                # Expired from the shared tier
+                await self._user_sessions.remove(user.user_id, session_id)
+            elif session.is_active():
+                # Update existing session
+                session.update_activity('authentication', {
+                    'channel_id': channel_id,
+                    'ip_address': ip_address
+                })
+                if channel_id:
+                    session.channel_id = channel_id
+                await self._save_session(session)
+                return session
+            else:
+                # Remove expired session
+                await self._cleanup_session(session_id)
         
         # Create new session
         session_id = str(uuid.uuid4())
@@ -687,18 +708,16 @@ class AuthService:
             permissions=user.permissions.copy()
         )
         
-        # Store session
-        self._active_sessions[session_id] = session
-        if user.user_id not in self._user_sessions:
-            self._user_sessions[user.user_id] = []
-        self._user_sessions[user.user_id].append(session_id)
-        
         # Log session creation
         session.update_activity('session_created', {
             'ip_address': ip_address,
             'user_agent': user_agent
         })
         
+        # Store session
+        await self._save_session(session)
+        await self._user_sessions.add(user.user_id, session_id)
+        
         logger.info(f"Created new session {session_id} for user {user.user_id}")
         return session
     
@@ -712,11 +731,10 @@ class AuthService:
         Returns:
             UserSession object or None if not found/expired
         """
-        if session_id not in self._active_sessions:
+        session = await self._active_sessions.aget(session_id)
+        if session is None:
             return None
         
-        session = self._active_sessions[session_id]
-        
         # Check if session is expired
         if session.is_expired():
             await self._cleanup_session(session_id)
@@ -724,6 +742,7 @@ class AuthService:
         
         return session
     
+    @profiled('auth.validate_session')
     async def validate_session(self, session_id: str, required_permissions: Optional[List[Permission]] = None) -> Tuple[User, UserSession]:
         """
         Validate session and optionally check permissions.
@@ -781,9 +800,15 @@ class AuthService:
         session.update_activity('session_validated', {
             'required_permissions': [p.value for p in required_permissions] if required_permissions else None
         })
+        # Other workers get the new activity time once it has moved on enough; this worker's copy has it now
+        saved = self._saved_activity.get(session_id)
+        write_after = timedelta(seconds=self.config.security.session_activity_write_seconds)
+        if saved is None or session.last_activity - saved >= write_after:
+            await self._save_session(session)
         
         return user, session
     
+    @profiled('auth.authorize_channel_access')
     async def authorize_channel_access(self, user: User, channel_id: str) -> bool:
         """
         Check if user can access a specific channel.
@@ -889,6 +914,7 @@ class AuthService:
             logger.error(f"Slack API error getting channel info: {e}")
             return {}
     
+    @profiled('auth.check_permission')
     async def check_permission(self, user: User, permission: Permission, 
                              context: Optional[Dict[str, Any]] = None) -> bool:
         """
@@ -1035,22 +1061,21 @@ class AuthService:
             logger.error(f"Error during logout: {e}")
             return False
     
+    async def _save_session(self, session: UserSession) -> None:
+        """Store the session for every worker, noting the activity time stored."""
+        await self._active_sessions.aset(session.session_id, session)
+        self._saved_activity[session.session_id] = session.last_activity
+    
     async def _cleanup_session(self, session_id: str) -> None:
         """Clean up expired or invalid session."""
-        if session_id in self._active_sessions:
-            session = self._active_sessions[session_id]
-            
-            # Remove from user sessions list
-            if session.user_id in self._user_sessions:
-                if session_id in self._user_sessions[session.user_id]:
-                    self._user_sessions[session.user_id].remove(session_id)
-                
-                # Clean up empty user session list
-                if not self._user_sessions[session.user_id]:
-                    del self._user_sessions[session.user_id]
+        session = await self._active_sessions.aget(session_id)
+        if session is not None:
+            # Remove from user sessions
+            await self._user_sessions.remove(session.user_id, session_id)
             
             # Remove from active sessions
-            del self._active_sessions[session_id]
+            await self._active_sessions.adiscard(session_id)
+            self._saved_activity.pop(session_id, None)
             
             logger.debug(f"Cleaned up session {session_id}")
     
@@ -1070,6 +1095,11 @@ class AuthService:
         for session_id in expired_sessions:
             await self._cleanup_session(session_id)
         
+        # Forget activity times of sessions other workers have removed
+        local_sessions = set(self._active_sessions)
+        for session_id in [s for s in self._saved_activity if s not in local_sessions]:
+            del self._saved_activity[session_id]
+        
         if expired_sessions:
             logger.info(f"Cleaned up {len(expired_sessions)} expired sessions")
         
@@ -1251,8 +1281,8 @@ class AuthService:
                 self._blocked_users[user_id] = datetime.now(timezone.utc) + block_duration
                 
                 # Invalidate all user sessions
-                user_sessions = self._user_sessions.get(user_id, [])
-                for session_id in user_sessions[:]:
+                user_sessions = await self._user_sessions.members(user_id)
+                for session_id in user_sessions:
                     await self._cleanup_session(session_id)
                 
                 logger.warning(f"User {user_id} temporarily blocked due to suspicious activity: {pattern_type}")
@@ -1299,7 +1329,7 @@ class AuthService:
         status = {
             'user_id': user_id,
             'is_blocked': user_id in self._blocked_users,
-            'active_sessions': len(self._user_sessions.get(user_id, [])),
+            'active_sessions': len(await self._user_sessions.members(user_id)),
             'recent_activity_count': len(self._suspicious_activity.get(user_id, [])),
             'rate_limit_status': 'normal'
         }
@@ -0,0 +1,297 @@
+"""
+Circuit breaker for calls to external services (Slack, Alpaca, Finnhub).
+
+One implementation for sync and async code. The protected call itself always runs
+without holding the breaker's lock, so concurrent calls through a closed breaker run
+in parallel; the lock only guards the outcome window and state transitions.
+
+- CLOSED: calls pass through. Outcomes are counted in a rolling window of one-second
+  buckets; the breaker opens once the window holds at least ``failure_threshold``
+  failures and its error rate reaches ``error_rate_threshold``.
+- OPEN: calls fail fast with CircuitBreakerOpenError until ``recovery_timeout`` passes.
+- HALF_OPEN: up to ``half_open_max_calls`` trial calls run at once (others are
+  rejected); that many successes close the breaker, any failure re-opens it.
+
+State, error rate and rejections are exported to the metrics registry.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from enum import Enum
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple, Type, Union
+
+from services.metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(Enum):
+    """Circuit breaker states."""
+    CLOSED = "CLOSED"
+    HALF_OPEN = "HALF_OPEN"
+    OPEN = "OPEN"
+
+
+# circuit_breaker_state gauge values
+STATE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+class CircuitBreakerOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+    def __init__(self, name: str, retry_after: float = 0.0):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"Circuit breaker is OPEN for {name}")
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker usable as a decorator (sync or async functions) or via call().
+
+    Example:
+        @CircuitBreaker(failure_threshold=3, recovery_timeout=30)
+        def create_client(): ...
+
+        breaker = CircuitBreaker('finnhub')
+        quote = await breaker.call(fetch_quote, 'AAPL')
+    """
+
+    def __init__(self, name: Optional[str] = None, failure_threshold: int = 5,
+                 recovery_timeout: float = 60, expected_exception: Union[Type[BaseException], Tuple] = Exception,
+                 window_seconds: int = 60, error_rate_threshold: float = 0.5,
+                 half_open_max_calls: int = 1):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            name: Name used in logs and metrics (defaults to the decorated function's name)
+            failure_threshold: Failures within the window needed to open the circuit
+            recovery_timeout: Seconds to stay open before allowing trial calls
+            expected_exception: Exception type(s) counted as failures
+            window_seconds: Length of the rolling outcome window
+            error_rate_threshold: Minimum window error rate (0-1) needed to open the circuit
+            half_open_max_calls: Concurrent trial calls allowed (and successes needed) in HALF_OPEN
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.expected_exception = expected_exception
+        self.window_seconds = window_seconds
+        self.error_rate_threshold = error_rate_threshold
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = CircuitState.CLOSED
+        self._window: deque = deque()  # [second, successes, failures]
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._half_open_successes = 0
+        self._lock = threading.Lock()
+
+        registry = get_metrics_registry()
+        self._state_gauge = registry.gauge(
+            'circuit_breaker_state', 'Circuit breaker state (0 closed, 1 half-open, 2 open)', ('service',))
+        self._error_rate_gauge = registry.gauge(
+            'circuit_breaker_error_rate', 'Circuit breaker rolling-window error rate', ('service',))
+        self._rejections = registry.counter(
+            'circuit_breaker_rejections', 'Calls rejected by an open circuit breaker', ('service',))
+        if name:
+            self._register()
+
+    def _register(self) -> None:
+        self._state_gauge.set(STATE_VALUES[self._state], self.name)
+        self._error_rate_gauge.set_function(lambda: self.error_rate, self.name)
+        _breakers[self.name] = self
+
+    # Public state
+
+    @property
+    def state(self) -> str:
+        """Current state name (CLOSED, OPEN or HALF_OPEN)."""
+        return self._state.value
+
+    @property
+    def error_rate(self) -> float:
+        """Error rate over the rolling window."""
+        with self._lock:
+            successes, failures = self._window_counts(time.monotonic())
+        total = successes + failures
+        return failures / total if total else 0.0
+
+    def get_status(self) -> Dict[str, Any]:
+        """State and window statistics for health and metrics endpoints."""
+        with self._lock:
+            now = time.monotonic()
+            successes, failures = self._window_counts(now)
+            state = self._state
+            retry_after = max(0.0, self._opened_at + self.recovery_timeout - now) if state is CircuitState.OPEN else 0.0
+        total = successes + failures
+        return {
+            'state': state.value,
+            'error_rate': failures / total if total else 0.0,
+            'window_requests': total,
+            'window_failures': failures,
+            'retry_after_seconds': round(retry_after, 1)
+        }
+
+    def reset(self) -> None:
+        """Force the breaker closed and clear its window."""
+        with self._lock:
+            self._window.clear()
+            self._transition(CircuitState.CLOSED)
+
+    # Wrapping
+
+    def __call__(self, func: Callable) -> Callable:
+        """Decorator to wrap sync or async functions with circuit breaker logic."""
+        if self.name is None:
+            self.name = func.__name__
+            self._register()
+
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await self._call_async(func, *args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return self._call_sync(func, *args, **kwargs)
+        return wrapper
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Execute function with circuit breaker protection.
+
+        For coroutine functions this returns an awaitable, so both
+        ``breaker.call(fn)`` and ``await breaker.call(async_fn)`` work.
+
+        Raises:
+            CircuitBreakerOpenError: If the circuit is open
+        """
+        if asyncio.iscoroutinefunction(func):
+            return self._call_async(func, *args, **kwargs)
+        return self._call_sync(func, *args, **kwargs)
+
+    def _call_sync(self, func: Callable, *args, **kwargs) -> Any:
+        trial = self._before_call()
+        try:
+            result = func(*args, **kwargs)
+        except self.expected_exception:
+            self._after_call(trial, False)
+            raise
+        except BaseException:
+            self._after_call(trial, None)
+            raise
+        self._after_call(trial, True)
+        return result
+
+    async def _call_async(self, func: Callable, *args, **kwargs) -> Any:
+        trial = self._before_call()
+        try:
+            result = await func(*args, **kwargs)
+        except self.expected_exception:
+            self._after_call(trial, False)
+            raise
+        except BaseException:
+            self._after_call(trial, None)
+            raise
+        self._after_call(trial, True)
+        return result
+
+    # State machine
+
+    def _before_call(self) -> bool:
+        """Admit or reject a call; returns True if it is a half-open trial."""
+        if self._state is CircuitState.CLOSED:
+            return False
+
+        with self._lock:
+            if self._state is CircuitState.OPEN:
+                remaining = self._opened_at + self.recovery_timeout - time.monotonic()
+                if remaining > 0:
+                    self._rejections.inc(self.name)
+                    raise CircuitBreakerOpenError(self.name, remaining)
+                self._transition(CircuitState.HALF_OPEN)
+
+            if self._state is CircuitState.HALF_OPEN:
+                if self._half_open_in_flight >= self.half_open_max_calls:
+                    self._rejections.inc(self.name)
+                    raise CircuitBreakerOpenError(self.name)
+                self._half_open_in_flight += 1
+                return True
+            return False
+
+    def _after_call(self, trial: bool, success: Optional[bool]) -> None:
+        """Record a call outcome (None: neither success nor failure, e.g. cancelled)."""
+        with self._lock:
+            if trial:
+                self._half_open_in_flight -= 1
+                if self._state is not CircuitState.HALF_OPEN or success is None:
+                    return
+                if not success:
+                    self._transition(CircuitState.OPEN)
+                    return
+                self._half_open_successes += 1
+                if self._half_open_successes >= self.half_open_max_calls:
+                    self._window.clear()
+                    self._transition(CircuitState.CLOSED)
+                return
+
+            if success is None:
+                return
+            now = time.monotonic()
+            self._record(now, success)
+            if not success and self._state is CircuitState.CLOSED:
+                successes, failures = self._window_counts(now)
+                if (failures >= self.failure_threshold and
+                        failures / (successes + failures) >= self.error_rate_threshold):
+                    self._transition(CircuitState.OPEN)
+
+    def _record(self, now: float, success: bool) -> None:
+        """Count an outcome in the current one-second bucket; caller holds the lock."""
+        second = int(now)
+        window = self._window
+        if not window or window[-1][0] != second:
+            window.append([second, 0, 0])
+        window[-1][1 if success else 2] += 1
+
+    def _window_counts(self, now: float) -> Tuple[int, int]:
+        """Drop expired buckets and sum the rest; caller holds the lock."""
+        cutoff = int(now) - self.window_seconds
+        window = self._window
+        while window and window[0][0] <= cutoff:
+            window.popleft()
+        successes = failures = 0
+        for _, bucket_successes, bucket_failures in window:
+            successes += bucket_successes
+            failures += bucket_failures
+        return successes, failures
+
+    def _transition(self, state: CircuitState) -> None:
+        """Change state; caller holds the lock."""
+        if state is self._state:
+            return
+        previous, self._state = self._state, state
+        if state is CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+            logger.error(f"Circuit breaker for {self.name} opened (was {previous.value})")
+        elif state is CircuitState.HALF_OPEN:
+            self._half_open_successes = 0
+            logger.info(f"Circuit breaker for {self.name} moved to HALF_OPEN")
+        else:
+            logger.info(f"Circuit breaker for {self.name} reset to CLOSED")
+        self._state_gauge.set(STATE_VALUES[state], self.name)
+
+
+# Named breakers, for health and metrics reporting
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker_states() -> Dict[str, Dict[str, Any]]:
+    """Status of every named circuit breaker."""
+    return {name: breaker.get_status() for name, breaker in list(_breakers.items())}
@@ -23,12 +23,14 @@ from botocore.config import Config
 import backoff
 
 # Import our models
-from models.trade import Trade, TradeStatus, TradeType, RiskLevel, TradeValidationError
+from models.trade import TRADE_CODEC, Trade, TradeStatus, TradeType, RiskLevel, TradeValidationError
 from models.user import User, UserRole, UserStatus, Permission, UserProfile, UserValidationError
 from models.portfolio import Portfolio, Position, PortfolioStatus, PositionType, PortfolioValidationError
 
 # Import serialization utilities
 from utils.serializers import serialize_for_dynamodb, deserialize_from_dynamodb
+from utils import codec
+from services.shared_cache import SharedCache, get_shared_cache_backend
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -123,8 +125,10 @@ class DatabaseService:
         self._connection_pool = {}
         
         # Performance and monitoring
-        self._query_cache = {}
         self._cache_ttl = 300  # 5 minutes
+        # cache key -> (result, stored at); shared by the workers, bounded to 1000 entries per worker
+        self._query_cache = SharedCache(f'query:{table_prefix}', ttl_seconds=self._cache_ttl,
+                                        backend=get_shared_cache_backend(), max_entries=1000)
         self._metrics = {
             'queries_executed': 0,
             'cache_hits': 0,
@@ -417,30 +421,24 @@ class DatabaseService:
             key_parts.append(f"{k}:{v}")
         return ":".join(key_parts)
     
-    def _get_from_cache(self, cache_key: str) -> Optional[Any]:
+    async def _get_from_cache(self, cache_key: str) -> Optional[Any]:
         """Get result from cache if not expired."""
-        if cache_key in self._query_cache:
-            cached_data, timestamp = self._query_cache[cache_key]
+        entry = await self._query_cache.aget(cache_key)
+        if entry is not None:
+            cached_data, timestamp = entry
             if time.time() - timestamp < self._cache_ttl:
                 self._metrics['cache_hits'] += 1
                 return cached_data
             else:
                 # Remove expired entry
-                del self._query_cache[cache_key]
+                await self._query_cache.adiscard(cache_key)
         
         self._metrics['cache_misses'] += 1
         return None
     
-    def _set_cache(self, cache_key: str, data: Any) -> None:
+    async def _set_cache(self, cache_key: str, data: Any) -> None:
         """Store result in cache with timestamp."""
-        self._query_cache[cache_key] = (data, time.time())
-        
-        # Simple cache cleanup - remove oldest entries if cache gets too large
-        if len(self._query_cache) > 1000:
-            oldest_keys = sorted(self._query_cache.keys(), 
-                               key=lambda k: self._query_cache[k][1])[:100]
-            for key in oldest_keys:
-                del self._query_cache[key]
+        await self._query_cache.aset(cache_key, (data, time.time()))
     
     def _log_audit_event(self, event_type: str, user_id: str, details: Dict[str, Any]) -> None:
         """
@@ -563,9 +561,9 @@ class DatabaseService:
         try:
             # Check cache first
             cache_key = self._generate_cache_key('get_trade', user_id=user_id, trade_id=trade_id)
-            cached_result = self._get_from_cache(cache_key)
+            cached_result = await self._get_from_cache(cache_key)
             if cached_result is not None:
-                return Trade.from_dict(cached_result) if cached_result else None
+                return TRADE_CODEC.decode(cached_result)
             
             table = self._get_table(self.trades_table_name)
             response = await self._execute_with_retry(
@@ -595,12 +593,12 @@ class DatabaseService:
                 trade = Trade.from_dict(filtered_data)
                 
                 # Cache the result
-                self._set_cache(cache_key, trade_data)
+                await self._set_cache(cache_key, TRADE_CODEC.encode(trade))
                 
                 return trade
             
             # Cache negative result
-            self._set_cache(cache_key, None)
+            await self._set_cache(cache_key, None)
             return None
             
         except Exception as e:
@@ -636,9 +634,9 @@ class DatabaseService:
             cache_key = self._generate_cache_key('get_user_trades', **cache_params)
             
             # Check cache
-            cached_result = self._get_from_cache(cache_key)
+            cached_result = await self._get_from_cache(cache_key)
             if cached_result is not None:
-                return [Trade.from_dict(trade_data) for trade_data in cached_result]
+                return codec.loads(cached_result)
             
             table = self._get_table(self.trades_table_name)
             
@@ -702,8 +700,7 @@ class DatabaseService:
                     continue
             
             # Cache the results
-            trade_data_list = [trade.to_dict() for trade in trades]
-            self._set_cache(cache_key, trade_data_list)
+            await self._set_cache(cache_key, codec.dumps(trades))
             
             logger.info(f"Retrieved {len(trades)} trades for user {user_id}")
             return trades
@@ -762,9 +759,7 @@ class DatabaseService:
                 f"get_user_trades:user_id:{user_id}"
             ]
             for pattern in cache_patterns:
-                keys_to_remove = [k for k in self._query_cache.keys() if pattern in k]
-                for key in keys_to_remove:
-                    del self._query_cache[key]
+                await self._query_cache.adiscard_matching(pattern)
             
             # Log audit event
             self._log_audit_event('trade_updated', user_id, {
@@ -800,9 +795,9 @@ class DatabaseService:
         try:
             # Check cache
             cache_key = self._generate_cache_key('get_user_positions', user_id=user_id, active_only=active_only)
-            cached_result = self._get_from_cache(cache_key)
+            cached_result = await self._get_from_cache(cache_key)
             if cached_result is not None:
-                return [Position.from_dict(pos_data) for pos_data in cached_result]
+                return codec.loads(cached_result)
             
             table = self._get_table(self.positions_table_name)
             response = await self._execute_with_retry(
@@ -839,8 +834,7 @@ class DatabaseService:
                     continue
             
             # Cache the results
-            position_data_list = [pos.to_dict() for pos in positions]
-            self._set_cache(cache_key, position_data_list)
+            await self._set_cache(cache_key, codec.dumps(positions))
             
             print(f"🔍 DB DEBUG: Final result - returning {len(positions)} positions for user {user_id}")
             for pos in positions:
@@ -974,9 +968,7 @@ class DatabaseService:
             # Clear position cache
             cache_patterns = [f"get_user_positions:user_id:{user_id}"]
             for pattern in cache_patterns:
-                keys_to_remove = [k for k in self._query_cache.keys() if pattern in k]
-                for key in keys_to_remove:
-                    del self._query_cache[key]
+                await self._query_cache.adiscard_matching(pattern)
             
             # Log audit event
             self._log_audit_event('position_updated', user_id, {
@@ -1052,7 +1044,7 @@ class DatabaseService:
         try:
             # Check cache
             cache_key = self._generate_cache_key('get_user', user_id=user_id)
-            cached_result = self._get_from_cache(cache_key)
+            cached_result = await self._get_from_cache(cache_key)
             if cached_result is not None:
                 return User.from_dict(cached_result) if cached_result else None
             
@@ -1075,12 +1067,12 @@ class DatabaseService:
                 user = User.from_dict(deserialized_data)
                 
                 # Cache the result
-                self._set_cache(cache_key, user_data)
+                await self._set_cache(cache_key, user_data)
                 
                 return user
             
             # Cache negative result
-            self._set_cache(cache_key, None)
+            await self._set_cache(cache_key, None)
             return None
             
         except Exception as e:
@@ -1100,7 +1092,7 @@ class DatabaseService:
         try:
             # Check cache
             cache_key = self._generate_cache_key('get_user_by_slack_id', slack_user_id=slack_user_id)
-            cached_result = self._get_from_cache(cache_key)
+            cached_result = await self._get_from_cache(cache_key)
             if cached_result is not None:
                 if cached_result == False:  # Cached negative result
                     return None
@@ -1111,10 +1103,10 @@ class DatabaseService:
                     except Exception as e:
                         logger.warning(f"Invalid cached data for user {slack_user_id}, clearing cache: {e}")
                         # Clear invalid cache entry
-                        self._query_cache.pop(cache_key, None)
+                        await self._query_cache.adiscard(cache_key)
                 else:
                     # Clear invalid cache entry if it's not a dict
-                    self._query_cache.pop(cache_key, None)
+                    await self._query_cache.adiscard(cache_key)
             
             table = self._get_table(self.users_table_name)
             response = await self._execute_with_retry(
@@ -1146,12 +1138,12 @@ class DatabaseService:
                 user = User.from_dict(filtered_data)
                 
                 # Cache the filtered data (not the raw user_data)
-                self._set_cache(cache_key, filtered_data)
+                await self._set_cache(cache_key, filtered_data)
                 
                 return user
             
             # Cache negative result
-            self._set_cache(cache_key, False)
+            await self._set_cache(cache_key, False)
             return None
             
         except Exception as e:
@@ -1187,11 +1179,11 @@ class DatabaseService:
             
             # Update cache
             cache_key = self._generate_cache_key('get_user', user_id=user.user_id)
-            self._set_cache(cache_key, user)
+            await self._set_cache(cache_key, user)
             
             # Update Slack ID cache
             slack_cache_key = self._generate_cache_key('get_user_by_slack_id', slack_user_id=user.slack_user_id)
-            self._set_cache(slack_cache_key, user)
+            await self._set_cache(slack_cache_key, user)
             
             logger.info(f"User {user.user_id} updated successfully")
             return True
@@ -1224,7 +1216,7 @@ class DatabaseService:
             
             # Check cache first
             cache_key = self._generate_cache_key('get_users_by_role', role=role_str)
-            cached_result = self._get_from_cache(cache_key)
+            cached_result = await self._get_from_cache(cache_key)
             if cached_result is not None:
                 return cached_result
             
@@ -1248,7 +1240,7 @@ class DatabaseService:
                 users.append(user)
             
             # Cache the result
-            self._set_cache(cache_key, users)
+            await self._set_cache(cache_key, users)
             
             logger.debug(f"Found {len(users)} users with role {role_str}")
             return users
@@ -1272,7 +1264,7 @@ class DatabaseService:
         try:
             # Check cache first
             cache_key = self._generate_cache_key('is_channel_approved', channel_id=channel_id)
-            cached_result = self._get_from_cache(cache_key)
+            cached_result = await self._get_from_cache(cache_key)
             if cached_result is not None:
                 return cached_result
             
@@ -1288,7 +1280,7 @@ class DatabaseService:
                 is_approved = item.get('is_approved', False)
             
             # Cache the result
-            self._set_cache(cache_key, is_approved)
+            await self._set_cache(cache_key, is_approved)
             
             return is_approved
             
@@ -1325,8 +1317,7 @@ class DatabaseService:
             
             # Clear cache
             cache_key = self._generate_cache_key('is_channel_approved', channel_id=channel_id)
-            if cache_key in self._query_cache:
-                del self._query_cache[cache_key]
+            await self._query_cache.adiscard(cache_key)
             
             # Log audit event
             self._log_audit_event('channel_approved', created_by, {
@@ -1438,7 +1429,7 @@ class DatabaseService:
         return self._metrics.copy()
     
     def clear_cache(self) -> None:
-        """Clear query cache."""
+        """Clear this worker's copy of the query cache."""
         self._query_cache.clear()
         logger.info("Query cache cleared")
     
@@ -0,0 +1,255 @@
+"""
+Asynchronous, sampled log record pipeline.
+
+Request handlers log with lazy ``logger.debug("... %s", value)`` calls. Once
+installed, the root logger's handlers (console and log file) move behind a
+bounded queue: the calling thread only samples the record and enqueues it,
+and a QueueListener thread masks PII, formats and writes it. When the queue is
+full the record is dropped and counted rather than blocking the request.
+
+DEBUG records can be sampled per logger: with ``LOG_DEBUG_SAMPLE_RATES=
+"listeners=0.01"`` one in a hundred DEBUG records from ``listeners.*`` is
+kept, deterministically. INFO and above are never sampled.
+"""
+
+import atexit
+import copy
+import itertools
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from config.settings import LoggingConfig, get_config
+from services.metrics import MetricsRegistry, get_metrics_registry
+from utils.formatters import sanitize_log_data
+
+logger = logging.getLogger(__name__)
+
+# Argument types that cannot change between enqueueing a record and formatting it
+_IMMUTABLE_ARG_TYPES = frozenset({str, int, float, bool, type(None), Decimal, bytes})
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+
+class SamplingFilter(logging.Filter):
+    """Keep one in N DEBUG records per logger, N taken from the longest matching name prefix."""
+
+    def __init__(self, rates: Dict[str, float], on_discard=None):
+        super().__init__()
+        self.rates = dict(rates)
+        self._on_discard = on_discard
+        self._intervals: Dict[str, int] = {}
+        self._counters: Dict[str, Any] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or not self.rates:
+            return True
+        # Without the queue this filter sits on every root handler; decide once per record
+        keep = getattr(record, '_sampled_keep', None)
+        if keep is None:
+            keep = record._sampled_keep = self._keep(record.name)
+            if not keep and self._on_discard is not None:
+                self._on_discard('sampled')
+        return keep
+
+    def _keep(self, name: str) -> bool:
+        interval = self._intervals.get(name)
+        if interval is None:
+            self._counters.setdefault(name, itertools.count())
+            interval = self._intervals[name] = self._interval_for(name)
+        if interval == 1:
+            return True
+        # next() on itertools.count is atomic, so concurrent threads never share a slot
+        return bool(interval) and next(self._counters[name]) % interval == 0
+
+    def _interval_for(self, name: str) -> int:
+        """1 keeps every record, 0 keeps none."""
+        best = None
+        for prefix in self.rates:
+            if name == prefix or name.startswith(prefix + '.'):
+                if best is None or len(prefix) > len(best):
+                    best = prefix
+        if best is None:
+            return 1
+        rate = self.rates[best]
+        return round(1 / rate) if rate > 0 else 0
+
+
+class PIIMaskingFilter(logging.Filter):
+    """Mask PII in the formatted message (utils.formatters.sanitize_log_data)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        message = record.getMessage()
+        masked = sanitize_log_data(message)
+        if masked != message:
+            record.msg, record.args = masked, None
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks the caller and leaves formatting to the listener.
+
+    Messages whose arguments are immutable are enqueued unformatted; anything else
+    (and exception tracebacks) is rendered now, while it still shows the state at
+    the time of the call.
+    """
+
+    def __init__(self, log_queue: queue.Queue, on_discard=None):
+        super().__init__(log_queue)
+        self._on_discard = on_discard
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if self._on_discard is not None:
+                self._on_discard('queue_full')
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        render_message = args and not (
+            isinstance(args, tuple) and all(type(arg) in _IMMUTABLE_ARG_TYPES for arg in args))
+        if not render_message and not record.exc_info:
+            return record
+        # Other handlers may still see this record, so change a copy
+        record = copy.copy(record)
+        if render_message:
+            record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _TRACEBACK_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class LoggingPipeline:
+    """Installs sampling, PII masking and the queued writer on the root logger."""
+
+    def __init__(self, config: Optional[LoggingConfig] = None, registry: Optional[MetricsRegistry] = None):
+        self.config = config or get_config().log_pipeline
+        registry = registry or get_metrics_registry()
+        self.discarded = registry.counter(
+            'log_records_discarded', 'Log records not written, by reason (sampled, queue_full)', ('reason',))
+        self.queue: Optional[queue.Queue] = None
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._queue_handler: Optional[NonBlockingQueueHandler] = None
+        self._handlers: List[logging.Handler] = []
+        self._filters: List[tuple] = []
+        self._root: Optional[logging.Logger] = None
+        self._lock = threading.Lock()
+
+    @property
+    def installed(self) -> bool:
+        return self._root is not None
+
+    def install(self, root: Optional[logging.Logger] = None) -> None:
+        """Wrap ``root``'s current handlers (the root logger by default)."""
+        with self._lock:
+            if self._root is not None:
+                return
+            root = root or logging.getLogger()
+            self._root = root
+            self._handlers = list(root.handlers)
+            sampling = SamplingFilter(self.config.debug_sample_rates, on_discard=self._discard)
+            masking = PIIMaskingFilter() if self.config.pii_masking else None
+
+            if not self.config.async_enabled:
+                # Same filters, written on the calling thread
+                for handler in self._handlers:
+                    self._add_filter(handler, sampling)
+                    if masking is not None:
+                        self._add_filter(handler, masking)
+                return
+
+            if masking is not None:
+                for handler in self._handlers:
+                    self._add_filter(handler, masking)
+            self.queue = queue.Queue(self.config.queue_size)
+            self._queue_handler = NonBlockingQueueHandler(self.queue, on_discard=self._discard)
+            self._queue_handler.addFilter(sampling)
+            self._listener = logging.handlers.QueueListener(
+                self.queue, *self._handlers, respect_handler_level=True)
+            self._listener.start()
+            for handler in self._handlers:
+                root.removeHandler(handler)
+            root.addHandler(self._queue_handler)
+        atexit.register(self.uninstall)
+
+    def uninstall(self) -> None:
+        """Write out queued records and put the original handlers back."""
+        with self._lock:
+            root, self._root = self._root, None
+            if root is None:
+                return
+            if self._queue_handler is not None:
+                root.removeHandler(self._queue_handler)
+                for handler in self._handlers:
+                    root.addHandler(handler)
+                self._stop_listener()
+            for handler, log_filter in self._filters:
+                handler.removeFilter(log_filter)
+            self._filters, self._handlers = [], []
+            self._queue_handler = self._listener = self.queue = None
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued record has been written; False on timeout."""
+        log_queue = self.queue
+        if log_queue is None:
+            return True
+        deadline = time.monotonic() + timeout
+        while log_queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.001)
+        for handler in self._handlers:
+            handler.flush()
+        return True
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            'installed': self.installed,
+            'async': self._queue_handler is not None,
+            'queued_records': self.queue.qsize() if self.queue is not None else 0,
+            'discarded_queue_full': self.discarded.value('queue_full'),
+            'discarded_sampled': self.discarded.value('sampled')
+        }
+
+    def _discard(self, reason: str) -> None:
+        self.discarded.inc(reason)
+
+    def _add_filter(self, handler: logging.Handler, log_filter: logging.Filter) -> None:
+        handler.addFilter(log_filter)
+        self._filters.append((handler, log_filter))
+
+    def _stop_listener(self) -> None:
+        """Stop the listener thread; the sentinel is queued even if the queue is full."""
+        listener = self._listener
+        if listener is None or listener._thread is None:
+            return
+        while True:
+            try:
+                listener.enqueue_sentinel()
+                break
+            except queue.Full:
+                time.sleep(0.001)
+        listener._thread.join()
+        listener._thread = None
+
+
+# Global pipeline instance
+_logging_pipeline: Optional[LoggingPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def get_logging_pipeline() -> LoggingPipeline:
+    """Get the global log record pipeline."""
+    global _logging_pipeline
+    if _logging_pipeline is None:
+        with _pipeline_lock:
+            if _logging_pipeline is None:
+                _logging_pipeline = LoggingPipeline()
+    return _logging_pipeline
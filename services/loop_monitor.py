@@ -0,0 +1,275 @@
+"""
+Event-loop lag monitoring and blocking-call detection.
+
+A probe task sleeps for a fixed interval on the application's event loop and records
+how late each wake-up fires. That overshoot is the loop lag, exported as the
+``slackoms_event_loop_lag_seconds`` histogram. Lag builds up whenever something runs
+on the loop without yielding, typically a sync boto3, ``requests`` or SQLAlchemy
+call inside an ``async def``.
+
+A stall longer than LOOP_SLOW_CALLBACK_MS is recorded as a blocking incident. With
+stack capture on (the default in debug mode), a watchdog thread notices the probe
+has stopped waking up and snapshots the loop thread's stack while it is still
+blocked. The incident then names the blocking call itself, not whatever callback
+happens to run next.
+
+Test mode: assert_within_budget() raises EventLoopBlockedError if any stall went past
+LOOP_BLOCK_BUDGET_MS. ``loop_block_budget()`` does the same check around a block of
+async code. CI benchmarks and async tests use them to fail when a request path
+blocks the loop.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from config.settings import LoopMonitorConfig, get_config
+from services.metrics import MetricsRegistry, get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# Incidents kept for the status report and the test-mode assertion
+MAX_INCIDENTS = 100
+
+# Lag samples kept for take_window(); about 100s at the default 50ms interval
+WINDOW_SAMPLES = 2048
+
+# Innermost frames kept in a stack snapshot
+MAX_STACK_FRAMES = 30
+
+
+class EventLoopBlockedError(AssertionError):
+    """Raised in test mode when the event loop stalled for longer than the budget."""
+
+    def __init__(self, budget_ms: float, incidents: List[Dict[str, Any]]):
+        self.budget_ms = budget_ms
+        self.incidents = incidents
+        worst = max(incidents, key=lambda incident: incident['duration_ms'])
+        message = (f"Event loop blocked for {worst['duration_ms']:.1f}ms (budget {budget_ms:.1f}ms); "
+                   f"{len(incidents)} stall(s) over budget")
+        if worst.get('stack'):
+            message += "\nLoop thread stack during the worst stall:\n" + ''.join(worst['stack'])
+        super().__init__(message)
+
+
+class LoopMonitor:
+    """Measures event-loop lag and records stalls longer than the slow-callback threshold."""
+
+    def __init__(self, config: Optional[LoopMonitorConfig] = None, registry: Optional[MetricsRegistry] = None):
+        config = config or get_config().loop_monitor
+        registry = registry or get_metrics_registry()
+        self.enabled = config.enabled
+        self.interval = config.interval_ms / 1000
+        self.slow_callback = config.slow_callback_ms / 1000
+        self.capture_stacks = config.capture_stacks
+        self.block_budget_ms = config.block_budget_ms
+
+        self.lag = registry.histogram('event_loop_lag_seconds', 'How late the event-loop probe woke up')
+        self.blocked = registry.counter('event_loop_blocked', 'Event-loop stalls longer than the slow-callback threshold')
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._cycle = 0  # probe wake-ups so far; a snapshot belongs to the cycle it was taken in
+        self._cycle_started = 0.0  # time.monotonic() when the current probe sleep began
+        self._snapshot: Optional[Dict[str, Any]] = None  # stack taken by the watchdog during a stall
+        self._incidents: deque = deque(maxlen=MAX_INCIDENTS)
+        self._window_lag: deque = deque(maxlen=WINDOW_SAMPLES)
+        self._window_incidents: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._watchdog: Optional[threading.Thread] = None
+        self._watchdog_stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start probing the running event loop (and the watchdog, when capturing stacks)."""
+        if not self.enabled or self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._cycle_started = time.monotonic()
+        self._task = self._loop.create_task(self._probe())
+
+        if self.capture_stacks:
+            self._watchdog_stop.clear()
+            self._watchdog = threading.Thread(target=self._watch, name='loop-watchdog', daemon=True)
+            self._watchdog.start()
+        logger.info(f"Event-loop monitor started | Interval: {self.interval * 1000:.0f}ms | "
+                    f"Slow callback: {self.slow_callback * 1000:.0f}ms | Stacks: {self.capture_stacks}")
+
+    def stop(self) -> None:
+        """Stop the probe task and the watchdog thread."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._watchdog_stop.set()
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    async def _probe(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self._record(max(0.0, time.monotonic() - self._cycle_started - self.interval))
+
+    def _end_cycle(self) -> Optional[List[str]]:
+        """Start the next probe cycle; returns the stack the watchdog took during this one."""
+        with self._lock:
+            snapshot, self._snapshot = self._snapshot, None
+            cycle = self._cycle
+            self._cycle += 1
+            self._cycle_started = time.monotonic()
+        return snapshot['stack'] if snapshot and snapshot['cycle'] == cycle else None
+
+    def _record(self, lag: float) -> None:
+        self.lag.observe(lag)
+        stack = self._end_cycle()
+        with self._lock:
+            self._window_lag.append(lag)
+        if lag >= self.slow_callback:
+            self._add_incident(lag, stack)
+
+    def record_stall_in_progress(self) -> None:
+        """Record the current stall now instead of when the probe next wakes (used at scope exit)."""
+        if not self.running:
+            return
+        lag = time.monotonic() - self._cycle_started - self.interval
+        if lag >= self.slow_callback:
+            self._add_incident(lag, self._end_cycle())
+
+    def _add_incident(self, lag: float, stack: Optional[List[str]]) -> None:
+        incident = {
+            'detected_at': datetime.now(timezone.utc).isoformat(),
+            'duration_ms': round(lag * 1000, 3),
+            'stack': stack
+        }
+        self.blocked.inc()
+        with self._lock:
+            self._incidents.append(incident)
+            self._window_incidents.append(incident)
+
+        if stack:
+            logger.warning(f"Event loop blocked for {lag * 1000:.0f}ms; loop thread was in:\n{''.join(stack)}")
+        else:
+            logger.warning(f"Event loop blocked for {lag * 1000:.0f}ms")
+
+    def _watch(self) -> None:
+        """Watchdog thread: snapshot the loop thread's stack once a stall passes the threshold."""
+        period = min(max(self.slow_callback / 4, 0.005), 0.25)
+        while not self._watchdog_stop.wait(period):
+            with self._lock:
+                cycle, started = self._cycle, self._cycle_started
+                already_taken = self._snapshot is not None and self._snapshot['cycle'] == cycle
+            if already_taken or time.monotonic() - started - self.interval < self.slow_callback:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.format_list(traceback.extract_stack(frame)[-MAX_STACK_FRAMES:])
+            with self._lock:
+                if self._cycle == cycle:
+                    self._snapshot = {'cycle': cycle, 'stack': stack}
+
+    # Reporting
+
+    def take_window(self) -> Dict[str, Any]:
+        """Lag samples and incidents since the previous call (for benchmark scenarios)."""
+        with self._lock:
+            lag, self._window_lag = list(self._window_lag), deque(maxlen=WINDOW_SAMPLES)
+            incidents, self._window_incidents = self._window_incidents, []
+        return {
+            'interval_ms': self.interval * 1000,
+            'lag_ms': [round(sample * 1000, 3) for sample in lag],
+            'incidents': incidents
+        }
+
+    def get_status(self, include_stacks: bool = False) -> Dict[str, Any]:
+        """Lag percentiles since startup and the most recent blocking incidents."""
+        snapshot = self.lag.snapshot()
+        with self._lock:
+            incidents = list(self._incidents)[-5:]
+        if not include_stacks:
+            incidents = [{k: v for k, v in incident.items() if k != 'stack'} for incident in incidents]
+        return {
+            'enabled': self.enabled,
+            'running': self.running,
+            'interval_ms': self.interval * 1000,
+            'slow_callback_ms': self.slow_callback * 1000,
+            'lag_p50_ms': round(snapshot.percentile(50) * 1000, 3),
+            'lag_p99_ms': round(snapshot.percentile(99) * 1000, 3),
+            'blocked_count': int(self.blocked.total()),
+            'recent_incidents': incidents
+        }
+
+    def assert_within_budget(self, budget_ms: Optional[float] = None) -> None:
+        """
+        Test mode: fail if any recorded stall exceeded the budget.
+
+        Args:
+            budget_ms: Longest allowed stall; defaults to LOOP_BLOCK_BUDGET_MS
+
+        Raises:
+            EventLoopBlockedError: If a stall exceeded the budget
+        """
+        budget_ms = budget_ms if budget_ms is not None else self.block_budget_ms
+        if budget_ms is None:
+            raise ValueError("No loop block budget configured (set LOOP_BLOCK_BUDGET_MS)")
+        with self._lock:
+            over_budget = [incident for incident in self._incidents if incident['duration_ms'] > budget_ms]
+        if over_budget:
+            raise EventLoopBlockedError(budget_ms, over_budget)
+
+    def reset(self) -> None:
+        """Forget recorded incidents and window samples."""
+        with self._lock:
+            self._incidents.clear()
+            self._window_lag.clear()
+            self._window_incidents = []
+
+
+@asynccontextmanager
+async def loop_block_budget(budget_ms: float, interval_ms: float = 5.0) -> AsyncIterator[LoopMonitor]:
+    """
+    Fail if the running event loop stalls for longer than budget_ms inside the block.
+
+    Usage in an async test or benchmark:
+        async with loop_block_budget(50):
+            await handler.process_event(...)
+
+    Raises:
+        EventLoopBlockedError: On exit, if a stall exceeded the budget
+    """
+    monitor = LoopMonitor(LoopMonitorConfig(interval_ms=interval_ms, slow_callback_ms=budget_ms,
+                                            capture_stacks=True, block_budget_ms=budget_ms),
+                          registry=MetricsRegistry(namespace='loop_budget'))
+    monitor.start()
+    await asyncio.sleep(0)  # let the probe start its first cycle
+    try:
+        yield monitor
+    finally:
+        monitor.record_stall_in_progress()
+        monitor.stop()
+    monitor.assert_within_budget()
+
+
+# Global loop monitor instance
+_loop_monitor: Optional[LoopMonitor] = None
+
+
+def get_loop_monitor() -> LoopMonitor:
+    """Get the global event-loop monitor."""
+    global _loop_monitor
+    if _loop_monitor is None:
+        _loop_monitor = LoopMonitor()
+    return _loop_monitor
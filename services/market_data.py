@@ -10,15 +10,19 @@ mechanisms to ensure reliable operation even when external APIs are experiencing
 """
 
 import asyncio
+import concurrent.futures
 import logging
 import time
-from datetime import datetime, timedelta
+import threading
+from datetime import date, datetime, time as dt_time, timedelta, timezone
 from decimal import Decimal
-from typing import Dict, List, Optional, Any, Tuple, Union
-from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Any, Union
+from dataclasses import dataclass, field, replace
 from enum import Enum
 import json
 import hashlib
+import math
+from zoneinfo import ZoneInfo
 
 import aiohttp
 import redis
@@ -33,6 +37,12 @@ from prometheus_client import Counter, Histogram, Gauge
 import structlog
 
 from config.settings import get_config
+from services.asset_universe import AssetRecord, get_asset_universe
+from services.circuit_breaker import CircuitBreaker
+from services.profiling import profiled
+from services.shared_cache import SharedCache, get_shared_cache_backend
+from services.symbol_search import get_symbol_search_index
+from utils.codec import Field, RecordCodec, is_encoded
 
 
 class MarketDataError(Exception):
@@ -64,6 +74,13 @@ class DataQuality(Enum):
     FALLBACK = "fallback"
 
 
+class QuotePurpose(Enum):
+    """What a quote is for; decides how stale a cached quote the caller accepts."""
+    EXECUTION = "execution"  # Orders and pre-trade checks
+    DISPLAY = "display"  # Trade modals and commands
+    APP_HOME = "app_home"  # App Home portfolio
+
+
 @dataclass
 class MarketQuote:
     """
@@ -96,6 +113,7 @@ class MarketQuote:
     source: str = "finnhub"
     cache_hit: bool = False
     api_latency_ms: Optional[float] = None
+    cache_age_seconds: Optional[float] = None  # Set when an expired cached quote is served
     
     def __post_init__(self):
         """Validate quote data after initialization."""
@@ -145,12 +163,23 @@ class MarketQuote:
             'source': self.source,
             'cache_hit': self.cache_hit,
             'api_latency_ms': self.api_latency_ms,
+            'cache_age_seconds': self.cache_age_seconds,
             'price_change': float(self.price_change) if self.price_change else None,
             'price_change_percent': float(self.price_change_percent) if self.price_change_percent else None,
             'is_stale': self.is_stale
         }
 
 
+# Binary form of cached quotes; append new fields at the end (see utils.codec)
+QUOTE_CODEC = RecordCodec(MarketQuote, 1, [
+    Field('symbol'), Field('current_price'), Field('open_price'), Field('high_price'),
+    Field('low_price'), Field('previous_close'), Field('volume'), Field('market_cap'),
+    Field('pe_ratio'), Field('timestamp'), Field('market_status', MarketStatus),
+    Field('data_quality', DataQuality), Field('exchange'), Field('currency'), Field('timezone'),
+    Field('source'), Field('cache_hit'), Field('api_latency_ms'), Field('cache_age_seconds')
+])
+
+
 @dataclass
 class SymbolInfo:
     """Symbol information and validation data."""
@@ -181,6 +210,121 @@ class SymbolInfo:
         }
 
 
+# US equities sessions, exchange local time
+EXCHANGE_TIMEZONE = ZoneInfo('America/New_York')
+PRE_MARKET_OPEN = dt_time(4, 0)
+REGULAR_OPEN = dt_time(9, 30)
+REGULAR_CLOSE = dt_time(16, 0)
+AFTER_HOURS_CLOSE = dt_time(20, 0)
+
+
+@dataclass(frozen=True)
+class CacheTTL:
+    """How long a cached quote may be served to one kind of caller."""
+    fresh_seconds: float  # Served as is
+    stale_seconds: float = 0.0  # Then still served, flagged STALE, while a background refresh runs
+    
+    @property
+    def max_age_seconds(self) -> float:
+        """Age after which the quote is not served from cache at all."""
+        return self.fresh_seconds + self.stale_seconds
+
+
+def calendar_market_status(now: datetime) -> MarketStatus:
+    """
+    US equities session at an aware ``now`` from the weekly calendar (holidays not known).
+    
+    Args:
+        now: Timezone-aware current time
+        
+    Returns:
+        MarketStatus: OPEN, PRE_MARKET, AFTER_HOURS or CLOSED
+    """
+    local = now.astimezone(EXCHANGE_TIMEZONE)
+    if local.weekday() >= 5:
+        return MarketStatus.CLOSED
+    
+    clock = local.time()
+    if REGULAR_OPEN <= clock < REGULAR_CLOSE:
+        return MarketStatus.OPEN
+    if PRE_MARKET_OPEN <= clock < REGULAR_OPEN:
+        return MarketStatus.PRE_MARKET
+    if REGULAR_CLOSE <= clock < AFTER_HOURS_CLOSE:
+        return MarketStatus.AFTER_HOURS
+    return MarketStatus.CLOSED
+
+
+class QuoteTTLPolicy:
+    """
+    Market-hours-aware TTLs for cached quotes.
+    
+    Prices only move while the market trades: regular hours get a short TTL,
+    pre-market and after hours a medium TTL, and a closed market a day-long one.
+    After the TTL each QuotePurpose may still be served the quote for its own
+    stale window while it is refreshed in the background. The session comes from
+    the clock, so picking a TTL never calls the API; holidays are learned from
+    get_market_status() answers.
+    """
+    
+    def __init__(self, config=None, clock: Optional[Callable[[], datetime]] = None):
+        """
+        Initialize TTL policy.
+        
+        Args:
+            config: MarketDataConfig with the TTL settings (app configuration by default)
+            clock: Returns the current aware datetime (UTC wall clock by default)
+        """
+        self.config = config or get_config().market_data
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+        self._closed_day: Optional[date] = None
+    
+    def market_status(self, now: Optional[datetime] = None) -> MarketStatus:
+        """Current session by the calendar, or HOLIDAY on a day the exchange reported closed."""
+        now = now or self._clock()
+        status = calendar_market_status(now)
+        if status != MarketStatus.CLOSED and self._closed_day == now.astimezone(EXCHANGE_TIMEZONE).date():
+            return MarketStatus.HOLIDAY
+        return status
+    
+    def ttl(self, now: Optional[datetime] = None, purpose: QuotePurpose = QuotePurpose.DISPLAY) -> CacheTTL:
+        """TTLs for a quote read or written now on behalf of ``purpose``."""
+        status = self.market_status(now)
+        if status == MarketStatus.OPEN:
+            fresh = self.config.cache_ttl_seconds
+        elif status in (MarketStatus.PRE_MARKET, MarketStatus.AFTER_HOURS):
+            fresh = self.config.cache_ttl_extended_hours_seconds
+        else:
+            fresh = self.config.cache_ttl_closed_seconds
+        return CacheTTL(fresh, self.max_staleness(purpose))
+    
+    def max_staleness(self, purpose: QuotePurpose) -> float:
+        """Seconds past the TTL a cached quote may still be served for ``purpose``."""
+        if purpose == QuotePurpose.EXECUTION:
+            return self.config.cache_stale_execution_seconds
+        if purpose == QuotePurpose.APP_HOME:
+            return self.config.cache_stale_app_home_seconds
+        return self.config.cache_stale_seconds
+    
+    def retention_seconds(self, now: Optional[datetime] = None) -> float:
+        """How long a quote cached now is kept: until no purpose would be served it."""
+        return max(self.ttl(now, purpose).max_age_seconds for purpose in QuotePurpose)
+    
+    def observe(self, status: MarketStatus, now: Optional[datetime] = None) -> None:
+        """
+        Learn from a get_market_status() answer.
+        
+        A closed or holiday answer while the calendar expects trading marks the rest
+        of the day closed; a trading answer on such a day clears it.
+        """
+        now = now or self._clock()
+        today = now.astimezone(EXCHANGE_TIMEZONE).date()
+        if status in (MarketStatus.CLOSED, MarketStatus.HOLIDAY):
+            if calendar_market_status(now) != MarketStatus.CLOSED:
+                self._closed_day = today
+        elif status != MarketStatus.UNKNOWN and self._closed_day == today:
+            self._closed_day = None
+
+
 class RateLimiter:
     """
     Token bucket rate limiter for API requests.
@@ -201,7 +345,8 @@ class RateLimiter:
         self.time_window = time_window
         self.tokens = max_requests
         self.last_refill = time.time()
-        self._lock = asyncio.Lock()
+        # Not an asyncio.Lock: services on other event loops share one limiter (no awaits inside)
+        self._lock = threading.Lock()
     
     async def acquire(self) -> bool:
         """
@@ -210,7 +355,7 @@ class RateLimiter:
         Returns:
             bool: True if token acquired, False if rate limited
         """
-        async with self._lock:
+        with self._lock:
             now = time.time()
             
             # Refill tokens based on elapsed time
@@ -234,77 +379,27 @@ class RateLimiter:
             await asyncio.sleep(0.1)
 
 
-class CircuitBreaker:
-    """
-    Circuit breaker pattern implementation for API resilience.
-    
-    Prevents cascading failures by temporarily stopping requests to a failing service
-    and allowing it time to recover.
-    """
-    
-    def __init__(self, failure_threshold: int = 5, recovery_timeout: int = 60):
-        """
-        Initialize circuit breaker.
-        
-        Args:
-            failure_threshold: Number of failures before opening circuit
-            recovery_timeout: Seconds to wait before attempting recovery
-        """
-        self.failure_threshold = failure_threshold
-        self.recovery_timeout = recovery_timeout
-        self.failure_count = 0
-        self.last_failure_time = None
-        self.state = "closed"  # closed, open, half_open
-        self._lock = asyncio.Lock()
-    
-    async def call(self, func, *args, **kwargs):
-        """
-        Execute function with circuit breaker protection.
-        
-        Args:
-            func: Function to execute
-            *args: Function arguments
-            **kwargs: Function keyword arguments
-            
-        Returns:
-            Function result
-            
-        Raises:
-            Exception: If circuit is open or function fails
-        """
-        async with self._lock:
-            if self.state == "open":
-                if self._should_attempt_reset():
-                    self.state = "half_open"
-                else:
-                    raise Exception("Circuit breaker is open")
-            
-            try:
-                result = await func(*args, **kwargs)
-                await self._on_success()
-                return result
-            except Exception as e:
-                await self._on_failure()
-                raise e
-    
-    def _should_attempt_reset(self) -> bool:
-        """Check if enough time has passed to attempt reset."""
-        if self.last_failure_time is None:
-            return True
-        return time.time() - self.last_failure_time >= self.recovery_timeout
-    
-    async def _on_success(self):
-        """Handle successful request."""
-        self.failure_count = 0
-        self.state = "closed"
-    
-    async def _on_failure(self):
-        """Handle failed request."""
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-        
-        if self.failure_count >= self.failure_threshold:
-            self.state = "open"
+# Prometheus collectors are process-wide, so every service instance shares them
+_REQUEST_COUNTER = Counter(
+    'market_data_requests_total',
+    'Total market data requests',
+    ['endpoint', 'status']
+)
+_REQUEST_DURATION = Histogram(
+    'market_data_request_duration_seconds',
+    'Market data request duration',
+    ['endpoint']
+)
+_CACHE_HIT_COUNTER = Counter(
+    'market_data_cache_hits_total',
+    'Cache hits for market data',
+    ['cache_type']
+)
+_API_ERROR_COUNTER = Counter(
+    'market_data_api_errors_total',
+    'API errors by type',
+    ['error_type']
+)
 
 
 class MarketDataService:
@@ -316,8 +411,16 @@ class MarketDataService:
     sophisticated retry logic and fallback mechanisms for high availability.
     """
     
-    def __init__(self):
-        """Initialize market data service with configuration and dependencies."""
+    def __init__(self, rate_limiter: Optional[RateLimiter] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None):
+        """
+        Initialize market data service with configuration and dependencies.
+        
+        Args:
+            rate_limiter: Finnhub rate limiter to share (a service on another event loop
+                passes the app service's so both stay within one budget)
+            circuit_breaker: Finnhub circuit breaker to share, likewise
+        """
         self.config = get_config()
         self.logger = structlog.get_logger(__name__)
         
@@ -326,41 +429,42 @@ class MarketDataService:
         
         # Initialize caching
         self.redis_client: Optional[redis.Redis] = None
-        self.memory_cache: Dict[str, Tuple[MarketQuote, datetime]] = {}
+        # symbol -> (MarketQuote, cached at); shared with other workers when Redis above is unavailable
+        self.memory_cache = SharedCache('quote', ttl_seconds=self.config.market_data.cache_ttl_closed_seconds,
+                                        max_entries=1000)
         
         # Initialize rate limiting and circuit breaker
-        self.rate_limiter = RateLimiter(
+        self.rate_limiter = rate_limiter or RateLimiter(
             max_requests=self.config.market_data.rate_limit_per_minute,
             time_window=60
         )
-        self.circuit_breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=60)
+        self.circuit_breaker = circuit_breaker or CircuitBreaker('finnhub', failure_threshold=5, recovery_timeout=60)
+        
+        # Quote cache TTLs follow the market session; stale quotes are refreshed in the background
+        self.ttl_policy = QuoteTTLPolicy(self.config.market_data)
+        # Refreshes run on a loop of their own; callers' loops may be thrown away right after get_quote
+        self._revalidations: Dict[str, concurrent.futures.Future] = {}
+        self._revalidation_lock = threading.Lock()
+        self._revalidation_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._revalidation_thread: Optional[threading.Thread] = None
+        self._revalidation_service: Optional['MarketDataService'] = None
         
         # Metrics
-        self.request_counter = Counter(
-            'market_data_requests_total',
-            'Total market data requests',
-            ['endpoint', 'status']
-        )
-        self.request_duration = Histogram(
-            'market_data_request_duration_seconds',
-            'Market data request duration',
-            ['endpoint']
-        )
-        self.cache_hit_counter = Counter(
-            'market_data_cache_hits_total',
-            'Cache hits for market data',
-            ['cache_type']
-        )
-        self.api_error_counter = Counter(
-            'market_data_api_errors_total',
-            'API errors by type',
-            ['error_type']
-        )
+        self.request_counter = _REQUEST_COUNTER
+        self.request_duration = _REQUEST_DURATION
+        self.cache_hit_counter = _CACHE_HIT_COUNTER
+        self.api_error_counter = _API_ERROR_COUNTER
         
         # Symbol cache for validation
         self.symbol_cache: Dict[str, SymbolInfo] = {}
         self.symbol_cache_expiry = datetime.utcnow()
         
+        # Local tradable-asset universe (answers validation and prefix search offline)
+        self.asset_universe = get_asset_universe()
+        
+        # Called with (symbol, cached quote or None) on each cached quote lookup; the prewarmer listens
+        self.on_quote_access: Optional[Callable[[str, Optional['MarketQuote']], None]] = None
+        
         self.logger.info("MarketDataService initialized", 
                         api_key_configured=bool(self.config.market_data.finnhub_api_key),
                         rate_limit=self.config.market_data.rate_limit_per_minute)
@@ -395,7 +499,7 @@ class MarketDataService:
                 host='localhost',
                 port=6379,
                 db=0,
-                decode_responses=True,
+                decode_responses=False,  # Quotes are stored as QUOTE_CODEC bytes
                 socket_timeout=5
             )
             # Test connection
@@ -407,10 +511,18 @@ class MarketDataService:
             self.logger.warning("Redis cache not available, using memory cache only", error=str(e))
             self.redis_client = None
         
+        # Without the quote Redis, share cached quotes with the other workers through the shared cache tier
+        if self.redis_client is None and self.memory_cache.backend is None:
+            backend = await asyncio.get_event_loop().run_in_executor(None, get_shared_cache_backend)
+            if backend is not None:
+                self.memory_cache.attach(backend)
+        
         self.logger.info("MarketDataService initialization complete")
     
     async def cleanup(self) -> None:
         """Clean up resources."""
+        await self._stop_revalidation_loop()
+        
         if self.session:
             await self.session.close()
         
@@ -465,13 +577,20 @@ class MarketDataService:
                     self.logger.error(f"Even fallback session creation failed: {fallback_error}")
                     raise
     
-    async def get_quote(self, symbol: str, use_cache: bool = True) -> MarketQuote:
+    @profiled('market_data.get_quote')
+    async def get_quote(self, symbol: str, use_cache: bool = True,
+                        purpose: QuotePurpose = QuotePurpose.DISPLAY) -> MarketQuote:
         """
         Get real-time quote for a symbol.
         
+        An expired cached quote within the purpose's stale window is returned at once,
+        flagged STALE with its age, while one background fetch refreshes it. The same
+        window bounds the cached quote returned when Finnhub fails or the circuit is open.
+        
         Args:
             symbol: Stock symbol (e.g., 'AAPL', 'MSFT')
             use_cache: Whether to use cached data if available
+            purpose: What the quote is for; EXECUTION never gets a quote past its TTL by default
             
         Returns:
             MarketQuote: Comprehensive quote data
@@ -491,10 +610,25 @@ class MarketDataService:
         # Check cache first if enabled
         if use_cache:
             cached_quote = await self._get_cached_quote(symbol)
-            if cached_quote and not cached_quote.is_stale:
-                self.cache_hit_counter.labels(cache_type='hit').inc()
-                self.logger.debug("Cache hit for symbol", symbol=symbol)
-                return cached_quote
+            if cached_quote:
+                ttl = self.ttl_policy.ttl(purpose=purpose)
+                age = (datetime.utcnow() - cached_quote.timestamp).total_seconds()
+                if age < ttl.max_age_seconds:
+                    if age < ttl.fresh_seconds:
+                        self.cache_hit_counter.labels(cache_type='hit').inc()
+                    else:
+                        # Stale-while-revalidate: answer now, refresh for the next caller
+                        self.cache_hit_counter.labels(cache_type='stale').inc()
+                        self._revalidate(symbol)
+                    self.logger.debug("Cache hit for symbol", symbol=symbol, age_seconds=round(age, 1),
+                                      purpose=purpose.value)
+                    if self.on_quote_access is not None:
+                        self.on_quote_access(symbol, cached_quote)
+                    if age >= ttl.fresh_seconds:
+                        return self._stale_copy(cached_quote, age)
+                    return cached_quote
+            if self.on_quote_access is not None:
+                self.on_quote_access(symbol, None)
         
         # Fetch from API with circuit breaker protection
         try:
@@ -514,12 +648,13 @@ class MarketDataService:
             self.api_error_counter.labels(error_type=type(e).__name__).inc()
             self.logger.error("Failed to fetch quote", symbol=symbol, error=str(e))
             
-            # Try to return stale cached data as fallback
+            # Fall back to cached data the caller still accepts
             cached_quote = await self._get_cached_quote(symbol)
             if cached_quote:
-                cached_quote.data_quality = DataQuality.STALE
-                self.logger.warning("Returning stale cached data", symbol=symbol)
-                return cached_quote
+                age = (datetime.utcnow() - cached_quote.timestamp).total_seconds()
+                if age < self.ttl_policy.ttl(purpose=purpose).max_age_seconds:
+                    self.logger.warning("Returning stale cached data", symbol=symbol, age_seconds=round(age, 1))
+                    return self._stale_copy(cached_quote, age)
             
             raise e
     
@@ -581,6 +716,12 @@ class MarketDataService:
         if symbol in self.symbol_cache and datetime.utcnow() < self.symbol_cache_expiry:
             return self.symbol_cache[symbol]
         
+        # Answer from the local asset universe without a network call
+        record = self.asset_universe.get(symbol)
+        if record is not None:
+            self.cache_hit_counter.labels(cache_type='asset_universe').inc()
+            return self._symbol_info_from_asset(record)
+        
         # Fetch symbol information from API
         try:
             symbol_info = await self.circuit_breaker.call(self._fetch_symbol_info, symbol)
@@ -610,6 +751,8 @@ class MarketDataService:
         """
         try:
             status = await self.circuit_breaker.call(self._fetch_market_status, exchange)
+            if exchange == "US":
+                self.ttl_policy.observe(status)
             
             self.logger.debug("Market status fetched", exchange=exchange, status=status.value)
             return status
@@ -632,6 +775,21 @@ class MarketDataService:
         if not query or len(query.strip()) < 2:
             return []
         
+        # Ticker, company-name and typo-tolerant matches from the in-memory index
+        local_matches = get_symbol_search_index().search(query, limit=limit)
+        if local_matches:
+            self.cache_hit_counter.labels(cache_type='symbol_search').inc()
+            return [
+                SymbolInfo(
+                    symbol=match.symbol,
+                    display_symbol=match.symbol,
+                    description=match.name,
+                    type='Common Stock',
+                    exchange=match.exchange
+                )
+                for match in local_matches
+            ]
+        
         try:
             results = await self.circuit_breaker.call(self._search_symbols_api, query, limit)
             
@@ -645,6 +803,18 @@ class MarketDataService:
             self.logger.error("Symbol search failed", query=query, error=str(e))
             return []
     
+    @staticmethod
+    def _symbol_info_from_asset(record: AssetRecord) -> SymbolInfo:
+        """Build SymbolInfo from a local asset universe record."""
+        return SymbolInfo(
+            symbol=record.symbol,
+            display_symbol=record.symbol,
+            description=record.name,
+            type='Common Stock',
+            exchange=record.exchange,
+            is_tradable=record.tradable
+        )
+    
     async def _safe_get_quote(self, symbol: str, use_cache: bool = True) -> MarketQuote:
         """Safely get quote with error handling for batch operations."""
         try:
@@ -687,7 +857,7 @@ class MarketDataService:
         
         try:
             # Fetch real-time quote with asyncio timeout
-            quote_url = f"https://finnhub.io/api/v1/quote"
+            quote_url = f"{self.config.market_data.finnhub_base_url}/quote"
             quote_params = {
                 'symbol': symbol,
                 'token': self.config.market_data.finnhub_api_key
@@ -741,7 +911,7 @@ class MarketDataService:
                     raise request_error
             
             # Fetch company profile for additional data
-            profile_url = f"https://finnhub.io/api/v1/stock/profile2"
+            profile_url = f"{self.config.market_data.finnhub_base_url}/stock/profile2"
             profile_params = {
                 'symbol': symbol,
                 'token': self.config.market_data.finnhub_api_key
@@ -783,7 +953,7 @@ class MarketDataService:
         
         try:
             # Fetch company profile
-            url = f"https://finnhub.io/api/v1/stock/profile2"
+            url = f"{self.config.market_data.finnhub_base_url}/stock/profile2"
             params = {
                 'symbol': symbol,
                 'token': self.config.market_data.finnhub_api_key
@@ -831,7 +1001,7 @@ class MarketDataService:
         await self.rate_limiter.wait_for_token()
         
         try:
-            url = f"https://finnhub.io/api/v1/stock/market-status"
+            url = f"{self.config.market_data.finnhub_base_url}/stock/market-status"
             params = {
                 'exchange': exchange,
                 'token': self.config.market_data.finnhub_api_key
@@ -843,10 +1013,16 @@ class MarketDataService:
                 
                 data = await response.json()
                 
+                session = data.get('session')
+                if session == 'pre-market':
+                    return MarketStatus.PRE_MARKET
+                if session == 'post-market':
+                    return MarketStatus.AFTER_HOURS
                 if data.get('isOpen'):
                     return MarketStatus.OPEN
-                else:
-                    return MarketStatus.CLOSED
+                if data.get('holiday'):
+                    return MarketStatus.HOLIDAY
+                return MarketStatus.CLOSED
                     
         except Exception as e:
             self.logger.error("Failed to fetch market status", exchange=exchange, error=str(e))
@@ -869,7 +1045,7 @@ class MarketDataService:
         await self.rate_limiter.wait_for_token()
         
         try:
-            url = f"https://finnhub.io/api/v1/search"
+            url = f"{self.config.market_data.finnhub_base_url}/search"
             params = {
                 'q': query,
                 'token': self.config.market_data.finnhub_api_key
@@ -950,7 +1126,21 @@ class MarketDataService:
         Returns:
             Cached MarketQuote or None if not found
         """
-        # Try Redis cache first
+        # Try memory cache first (this worker's copy, then the shared tier)
+        entry = await self.memory_cache.aget(symbol)
+        if entry is not None:
+            quote, cached_time = entry
+            
+            # Keep entries as long as the current market session lets any caller be served them
+            max_age = timedelta(seconds=self.ttl_policy.retention_seconds())
+            if datetime.utcnow() - cached_time < max_age:
+                quote.cache_hit = True
+                return quote
+            else:
+                # Remove expired entry
+                await self.memory_cache.adiscard(symbol)
+        
+        # Then the quote Redis
         if self.redis_client:
             try:
                 cached_data = await asyncio.get_event_loop().run_in_executor(
@@ -958,26 +1148,17 @@ class MarketDataService:
                 )
                 
                 if cached_data:
-                    quote_dict = json.loads(cached_data)
-                    quote = self._dict_to_market_quote(quote_dict)
+                    if is_encoded(cached_data):
+                        quote = QUOTE_CODEC.decode(cached_data)
+                    else:
+                        # Entry written as JSON before the binary codec
+                        quote = self._dict_to_market_quote(json.loads(cached_data))
                     quote.cache_hit = True
                     return quote
                     
             except Exception as e:
                 self.logger.warning("Redis cache read failed", symbol=symbol, error=str(e))
         
-        # Try memory cache
-        if symbol in self.memory_cache:
-            quote, cached_time = self.memory_cache[symbol]
-            
-            # Check if cache entry is still valid (5 minutes)
-            if datetime.utcnow() - cached_time < timedelta(minutes=5):
-                quote.cache_hit = True
-                return quote
-            else:
-                # Remove stale entry
-                del self.memory_cache[symbol]
-        
         return None
     
     async def _cache_quote(self, symbol: str, quote: MarketQuote) -> None:
@@ -988,33 +1169,101 @@ class MarketDataService:
             symbol: Stock symbol
             quote: MarketQuote to cache
         """
-        # Cache in Redis with 5-minute expiration
+        # Cache in Redis, expiring when the current market session stops serving it
         if self.redis_client:
             try:
-                quote_dict = quote.to_dict()
                 await asyncio.get_event_loop().run_in_executor(
                     None, 
                     self.redis_client.setex,
                     f"quote:{symbol}",
-                    300,  # 5 minutes
-                    json.dumps(quote_dict)
+                    math.ceil(self.ttl_policy.retention_seconds()),
+                    QUOTE_CODEC.encode(quote)
                 )
             except Exception as e:
                 self.logger.warning("Redis cache write failed", symbol=symbol, error=str(e))
         
-        # Cache in memory as backup
-        self.memory_cache[symbol] = (quote, datetime.utcnow())
+        # Cache in memory (bounded to the 1000 newest symbols per worker)
+        await self.memory_cache.aset(symbol, (quote, datetime.utcnow()),
+                                     ttl_seconds=math.ceil(self.ttl_policy.retention_seconds()))
+    
+    @staticmethod
+    def _stale_copy(quote: MarketQuote, age: float) -> MarketQuote:
+        """Copy of a cached quote flagged as served past its TTL; the cached object stays untouched."""
+        return replace(quote, data_quality=DataQuality.STALE, cache_age_seconds=round(age, 1))
+    
+    def _revalidate(self, symbol: str) -> None:
+        """
+        Refresh a stale cached quote in the background, at most once per symbol at a time.
+        
+        Listeners call get_quote from loops they close straight afterwards (asyncio.run, or
+        new_event_loop() then close()), which would cancel a refresh task left on them. The
+        refresh runs on this service's long-lived revalidation thread instead.
+        """
+        with self._revalidation_lock:
+            future = self._revalidations.get(symbol)
+            if future is not None and not future.done():
+                return
+            loop = self._revalidation_loop
+            if loop is None or loop.is_closed() or not self._revalidation_thread.is_alive():
+                # Futures left from a loop that is gone would never finish
+                self._revalidations.clear()
+                self._revalidation_service = None
+                loop = self._revalidation_loop = asyncio.new_event_loop()
+                self._revalidation_thread = threading.Thread(target=loop.run_forever,
+                                                             name='quote-revalidate', daemon=True)
+                self._revalidation_thread.start()
+            self._revalidations[symbol] = asyncio.run_coroutine_threadsafe(
+                self._refresh_cached_quote(symbol), loop)
+    
+    async def _refresh_cached_quote(self, symbol: str) -> None:
+        try:
+            service = await self._get_revalidation_service()
+            quote = await self.circuit_breaker.call(service._fetch_quote_from_api, symbol)
+            await self._cache_quote(symbol, quote)
+        except Exception as e:
+            self.logger.warning("Background quote refresh failed", symbol=symbol, error=str(e))
+        finally:
+            with self._revalidation_lock:
+                self._revalidations.pop(symbol, None)
+    
+    async def _get_revalidation_service(self) -> 'MarketDataService':
+        if self._revalidation_service is None:
+            # Its HTTP session belongs to the revalidation loop; the Finnhub budget and breaker are ours
+            service = MarketDataService(rate_limiter=self.rate_limiter, circuit_breaker=self.circuit_breaker)
+            await service.initialize()
+            self._revalidation_service = service
+        return self._revalidation_service
+    
+    async def _stop_revalidation_loop(self) -> None:
+        with self._revalidation_lock:
+            loop, thread, service = (self._revalidation_loop, self._revalidation_thread,
+                                     self._revalidation_service)
+            self._revalidation_loop = self._revalidation_thread = self._revalidation_service = None
+            self._revalidations.clear()
+        if loop is None or loop.is_closed():
+            return
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._close_revalidation_loop(service), loop))
+        loop.call_soon_threadsafe(loop.stop)
+        await asyncio.to_thread(thread.join, 5)
+        loop.close()
+    
+    @staticmethod
+    async def _close_revalidation_loop(service: Optional['MarketDataService']) -> None:
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        if service is not None:
+            await service.cleanup()
+    
+    async def warm_cache(self, quote: MarketQuote) -> None:
+        """
+        Cache a quote fetched elsewhere, e.g. by the quote prewarmer.
         
-        # Limit memory cache size
-        if len(self.memory_cache) > 1000:
-            # Remove oldest entries
-            oldest_symbols = sorted(
-                self.memory_cache.keys(),
-                key=lambda s: self.memory_cache[s][1]
-            )[:100]
-            
-            for old_symbol in oldest_symbols:
-                del self.memory_cache[old_symbol]
+        Args:
+            quote: MarketQuote to cache under its symbol
+        """
+        await self._cache_quote(quote.symbol, quote)
     
     def _dict_to_market_quote(self, data: Dict) -> MarketQuote:
         """
@@ -1044,7 +1293,8 @@ class MarketDataService:
             timezone=data.get('timezone', 'America/New_York'),
             source=data.get('source', 'finnhub'),
             cache_hit=data.get('cache_hit', False),
-            api_latency_ms=data.get('api_latency_ms')
+            api_latency_ms=data.get('api_latency_ms'),
+            cache_age_seconds=data.get('cache_age_seconds')
         )
     
     def _is_valid_symbol_format(self, symbol: str) -> bool:
@@ -1078,7 +1328,10 @@ class MarketDataService:
             'circuit_breaker_state': self.circuit_breaker.state,
             'cache_status': {
                 'redis_available': self.redis_client is not None,
-                'memory_cache_size': len(self.memory_cache)
+                'memory_cache_size': len(self.memory_cache),
+                'shared_cache': self.memory_cache.stats(),
+                'market_session': self.ttl_policy.market_status().value,
+                'quote_ttl_seconds': self.ttl_policy.ttl().fresh_seconds
             },
             'rate_limiter': {
                 'tokens_available': self.rate_limiter.tokens,
@@ -1089,7 +1342,7 @@ class MarketDataService:
         # Test API connectivity
         try:
             if self.session:
-                test_url = "https://finnhub.io/api/v1/quote"
+                test_url = f"{self.config.market_data.finnhub_base_url}/quote"
                 test_params = {
                     'symbol': 'AAPL',
                     'token': self.config.market_data.finnhub_api_key
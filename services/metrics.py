@@ -0,0 +1,466 @@
+"""
+Low-overhead metrics registry with Prometheus text exposition.
+
+Counters and histograms are sharded per thread: each thread records into its own
+dict without taking a lock, and readers merge the shards. Histogram observations are
+buffered per thread and bucketed in batches, off the request path. Latency histograms use
+HDR-style log-linear buckets (32 sub-buckets per power of two, so any recorded
+value is reported within ~3%) over 1µs..~19h, which gives real percentiles
+instead of averages over a sample window.
+
+Usage:
+    requests = get_metrics_registry().histogram(
+        'slack_request_duration_seconds', 'Slack request latency', ('endpoint',))
+    requests.observe(0.012, 'slack_command')
+"""
+
+import logging
+import math
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# HDR bucket layout: values below SUB_BUCKETS microseconds are exact, above that each
+# power of two is split into SUB_BUCKETS linear buckets.
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+MAX_EXPONENT = 31  # 2**36 µs (~19 hours) and above land in the last bucket
+BUCKET_COUNT = SUB_BUCKETS * (MAX_EXPONENT + 1)
+
+# `le` boundaries (seconds) used for the Prometheus exposition of histograms
+EXPOSITION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def bucket_index(microseconds: int) -> int:
+    """Map a latency in whole microseconds to its HDR bucket."""
+    if microseconds < SUB_BUCKETS:
+        return microseconds if microseconds > 0 else 0
+    shift = microseconds.bit_length() - SUB_BUCKET_BITS - 1
+    index = ((shift + 1) << SUB_BUCKET_BITS) + (microseconds >> shift) - SUB_BUCKETS
+    return index if index < BUCKET_COUNT else BUCKET_COUNT - 1
+
+
+def bucket_upper_bound(index: int) -> int:
+    """Highest microsecond value that maps to a bucket."""
+    if index < SUB_BUCKETS:
+        return index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    mantissa = (index & (SUB_BUCKETS - 1)) + SUB_BUCKETS
+    return ((mantissa + 1) << shift) - 1
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+class _Family(ABC):
+    """A named metric with label names and per-thread shards of label values -> data."""
+
+    metric_type = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Dict[LabelValues, object]] = []
+        self._lock = threading.Lock()
+
+    def _new_shard(self) -> Dict[LabelValues, object]:
+        """Create the calling thread's shard (once per thread)."""
+        shard: Dict[LabelValues, object] = {}
+        with self._lock:
+            self._shards.append(shard)
+        self._local.shard = shard
+        return shard
+
+    def _shard_copies(self) -> List[Dict[LabelValues, object]]:
+        """Copy every shard; dict.copy() is atomic under the GIL."""
+        with self._lock:
+            shards = list(self._shards)
+        return [shard.copy() for shard in shards]
+
+    def _label_text(self, labelvalues: LabelValues, extra: str = '') -> str:
+        pairs = [f'{name}="{_escape_label(str(value))}"' for name, value in zip(self.labelnames, labelvalues)]
+        if extra:
+            pairs.append(extra)
+        return '{' + ','.join(pairs) + '}' if pairs else ''
+
+    def reset(self) -> None:
+        """Drop all recorded values (tests and manual resets)."""
+        with self._lock:
+            for shard in self._shards:
+                shard.clear()
+
+    @abstractmethod
+    def expose(self) -> List[str]:
+        """Prometheus text exposition lines for this metric."""
+
+
+class Counter(_Family):
+    """Monotonic counter."""
+
+    metric_type = 'counter'
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        """Increment the counter for the given label values."""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard[labelvalues] = shard.get(labelvalues, 0) + amount
+
+    def collect(self) -> Dict[LabelValues, float]:
+        """Totals per label values across all shards."""
+        totals: Dict[LabelValues, float] = {}
+        for shard in self._shard_copies():
+            for labelvalues, value in shard.items():
+                totals[labelvalues] = totals.get(labelvalues, 0) + value
+        return totals
+
+    def value(self, *labelvalues: str) -> float:
+        """Total for one set of label values."""
+        return self.collect().get(labelvalues, 0)
+
+    def total(self) -> float:
+        """Total across all label values."""
+        return sum(self.collect().values())
+
+    def expose(self) -> List[str]:
+        return [f'{self.name}_total{self._label_text(labels)} {_format_value(value)}'
+                for labels, value in sorted(self.collect().items())]
+
+
+class HistogramSnapshot:
+    """Merged histogram data with percentile queries."""
+
+    __slots__ = ('count', 'sum', 'buckets')
+
+    def __init__(self, count: int = 0, total: float = 0.0, buckets: Optional[List[int]] = None):
+        self.count = count
+        self.sum = total
+        self.buckets = buckets if buckets is not None else [0] * BUCKET_COUNT
+
+    def merge(self, other: 'HistogramSnapshot') -> None:
+        self.count += other.count
+        self.sum += other.sum
+        buckets = self.buckets
+        for index, bucket_count in enumerate(other.buckets):
+            if bucket_count:
+                buckets[index] += bucket_count
+
+    @property
+    def mean(self) -> float:
+        """Mean value in seconds."""
+        return self.sum / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        """
+        Value at a percentile (0-100) in seconds.
+
+        Like HDR histograms, reports the highest value equivalent to the bucket
+        holding the requested rank, so results are never under-reported.
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percentile / 100))
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank:
+                return bucket_upper_bound(index) / 1_000_000
+        return bucket_upper_bound(BUCKET_COUNT - 1) / 1_000_000
+
+    def cumulative(self, boundaries: Iterable[float]) -> List[Tuple[float, int]]:
+        """Cumulative counts at each `le` boundary (seconds), ending with +Inf."""
+        results = []
+        index, seen = 0, 0
+        for boundary in boundaries:
+            limit = boundary * 1_000_000
+            while index < BUCKET_COUNT and bucket_upper_bound(index) <= limit:
+                seen += self.buckets[index]
+                index += 1
+            results.append((boundary, seen))
+        results.append((math.inf, self.count))
+        return results
+
+
+class Histogram(_Family):
+    """
+    Latency histogram in seconds with HDR-style buckets.
+
+    observe() only appends to the calling thread's buffer for its label values;
+    buffers are bucketed into the shared aggregate when they fill up or when the
+    histogram is read. Only the owning thread appends and drains remove exactly
+    the items they copied, so no samples are lost without a lock on the hot path.
+    """
+
+    metric_type = 'histogram'
+    FLUSH_THRESHOLD = 4096
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._aggregate: Dict[LabelValues, HistogramSnapshot] = {}
+
+    def observe(self, seconds: float, *labelvalues: str) -> None:
+        """Record one observation in seconds."""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        buffer = shard.get(labelvalues)
+        if buffer is None:
+            buffer = shard[labelvalues] = []
+        buffer.append(seconds)
+        if len(buffer) >= self.FLUSH_THRESHOLD:
+            with self._lock:
+                self._drain(labelvalues, buffer)
+
+    def _drain(self, labelvalues: LabelValues, buffer: List[float]) -> None:
+        """Bucket buffered samples into the aggregate; caller holds self._lock."""
+        samples = buffer[:]
+        del buffer[:len(samples)]
+        if not samples:
+            return
+        snapshot = self._aggregate.get(labelvalues)
+        if snapshot is None:
+            snapshot = self._aggregate[labelvalues] = HistogramSnapshot()
+        buckets = snapshot.buckets
+        for seconds in samples:
+            buckets[bucket_index(int(seconds * 1_000_000))] += 1
+        snapshot.count += len(samples)
+        snapshot.sum += sum(samples)
+
+    def collect(self) -> Dict[LabelValues, HistogramSnapshot]:
+        """Merged snapshot per label values."""
+        with self._lock:
+            for shard in self._shards:
+                for labelvalues, buffer in shard.copy().items():
+                    self._drain(labelvalues, buffer)
+            return {labels: HistogramSnapshot(snapshot.count, snapshot.sum, list(snapshot.buckets))
+                    for labels, snapshot in self._aggregate.items()}
+
+    def snapshot(self, *labelvalues: str) -> HistogramSnapshot:
+        """
+        Merged snapshot for one set of label values, or across all of them when
+        called without label values on a labelled histogram.
+        """
+        collected = self.collect()
+        if labelvalues or not self.labelnames:
+            return collected.get(labelvalues, HistogramSnapshot())
+        combined = HistogramSnapshot()
+        for snapshot in collected.values():
+            combined.merge(snapshot)
+        return combined
+
+    def reset(self) -> None:
+        with self._lock:
+            for shard in self._shards:
+                for buffer in shard.copy().values():
+                    del buffer[:]
+            self._aggregate.clear()
+
+    def expose(self) -> List[str]:
+        lines = []
+        for labels, snapshot in sorted(self.collect().items()):
+            for boundary, count in snapshot.cumulative(EXPOSITION_BUCKETS):
+                le = f'le="{_format_value(boundary)}"'
+                lines.append(f'{self.name}_bucket{self._label_text(labels, le)} {count}')
+            lines.append(f'{self.name}_sum{self._label_text(labels)} {_format_value(snapshot.sum)}')
+            lines.append(f'{self.name}_count{self._label_text(labels)} {snapshot.count}')
+        return lines
+
+
+class Gauge(_Family):
+    """
+    Point-in-time value. Gauges are set rarely (health, breaker state), so they use
+    a single dict instead of shards; set_function() computes the value at scrape time.
+    """
+
+    metric_type = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._functions: Dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        self._values[labelvalues] = value
+
+    def set_function(self, function: Callable[[], float], *labelvalues: str) -> None:
+        """Compute the value for these label values when collected."""
+        self._functions[labelvalues] = function
+
+    def collect(self) -> Dict[LabelValues, float]:
+        values = dict(self._values)
+        for labelvalues, function in list(self._functions.items()):
+            values[labelvalues] = function()
+        return values
+
+    def reset(self) -> None:
+        self._values.clear()
+
+    def expose(self) -> List[str]:
+        return [f'{self.name}{self._label_text(labels)} {_format_value(value)}'
+                for labels, value in sorted(self.collect().items())]
+
+
+class MetricsRegistry:
+    """Registry of metric families with a single Prometheus text exposition."""
+
+    def __init__(self, namespace: str = 'slackoms'):
+        self.namespace = namespace
+        self._families: Dict[str, _Family] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, family_class, name: str, documentation: str, labelnames: Iterable[str]):
+        full_name = f"{self.namespace}_{name}" if self.namespace else name
+        with self._lock:
+            family = self._families.get(full_name)
+            if family is None:
+                family = self._families[full_name] = family_class(full_name, documentation, labelnames)
+            elif not isinstance(family, family_class) or family.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {full_name} already registered with a different type or labels")
+            return family
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Histogram:
+        """Get or create a latency histogram."""
+        return self._register(Histogram, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def reset(self) -> None:
+        """Drop all recorded values, keeping registrations."""
+        with self._lock:
+            families = list(self._families.values())
+        for family in families:
+            family.reset()
+
+    def exposition(self) -> str:
+        """Render all metrics in the Prometheus text format (version 0.0.4)."""
+        with self._lock:
+            families = sorted(self._families.values(), key=lambda family: family.name)
+
+        lines = []
+        for family in families:
+            try:
+                samples = family.expose()
+            except Exception as e:
+                logger.error(f"Failed to collect metric {family.name}: {e}")
+                continue
+            lines.append(f'# HELP {family.name} {family.documentation}')
+            lines.append(f'# TYPE {family.name} {family.metric_type}')
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+
+class OperationMetrics:
+    """
+    Outcome, latency and error metrics for one kind of Slack operation (commands,
+    actions, events), labelled by operation type. Named occurrences such as
+    authentication failures or dashboard renders are kept in a single counter.
+    """
+
+    def __init__(self, kind: str, registry: Optional[MetricsRegistry] = None):
+        registry = registry or get_metrics_registry()
+        self.latency = registry.histogram(
+            f'{kind}_duration_seconds', f'Slack {kind} handling latency', ('type', 'outcome'))
+        self.errors = registry.counter(
+            f'{kind}_errors', f'Failed Slack {kind}s by error type', ('type', 'error'))
+        self.occurrences = registry.counter(
+            f'{kind}_occurrences', f'Notable Slack {kind} occurrences', ('name',))
+
+    def record(self, operation_type: str, success: bool, response_time: float,
+               error_type: Optional[str] = None) -> None:
+        """Record one handled operation."""
+        self.latency.observe(response_time, operation_type, 'success' if success else 'failure')
+        if not success and error_type:
+            self.errors.inc(operation_type, error_type)
+
+    def increment(self, name: str) -> None:
+        """Count a named occurrence."""
+        self.occurrences.inc(name)
+
+    def count(self, name: str) -> int:
+        return int(self.occurrences.value(name))
+
+    def _outcome_counts(self) -> Dict[str, int]:
+        counts = {'success': 0, 'failure': 0}
+        for (_, outcome), snapshot in self.latency.collect().items():
+            counts[outcome] += snapshot.count
+        return counts
+
+    @property
+    def processed(self) -> int:
+        return sum(self._outcome_counts().values())
+
+    def processed_by_type(self, operation_type: str) -> int:
+        return sum(snapshot.count for (kind, _), snapshot in self.latency.collect().items()
+                   if kind == operation_type)
+
+    @property
+    def successful(self) -> int:
+        return self._outcome_counts()['success']
+
+    @property
+    def failed(self) -> int:
+        return self._outcome_counts()['failure']
+
+    @property
+    def error_counts(self) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for (_, error), count in self.errors.collect().items():
+            totals[error] = totals.get(error, 0) + int(count)
+        return totals
+
+    def get_average_response_time(self, operation_type: Optional[str] = None) -> float:
+        """Get average response time in milliseconds."""
+        snapshots = [snapshot for (kind, _), snapshot in self.latency.collect().items()
+                     if operation_type is None or kind == operation_type]
+        count = sum(snapshot.count for snapshot in snapshots)
+        return sum(snapshot.sum for snapshot in snapshots) / count * 1000 if count else 0.0
+
+    def get_percentile_response_time(self, percentile: float) -> float:
+        """Get a response time percentile in milliseconds."""
+        return self.latency.snapshot().percentile(percentile) * 1000
+
+    def get_success_rate(self) -> float:
+        """Get success rate as percentage."""
+        counts = self._outcome_counts()
+        processed = counts['success'] + counts['failure']
+        return counts['success'] / processed * 100 if processed else 0.0
+
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Global registry instance
+_metrics_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the global metrics registry."""
+    global _metrics_registry
+    if _metrics_registry is None:
+        with _registry_lock:
+            if _metrics_registry is None:
+                _metrics_registry = MetricsRegistry()
+    return _metrics_registry
@@ -0,0 +1,262 @@
+"""
+Coalesced modal updates keyed by view_id.
+
+Typing in a trade modal's quantity field, or a price fetch landing, each wants to
+redraw the modal. ModalUpdateCoalescer keeps the latest known state and hash of
+every open view, taken from the interaction payloads Bolt dispatches and from
+views.* responses, so handlers never call views.info to read it back.
+
+Updates for one view are debounced: a newer update replaces any pending one,
+only the newest is sent, and at most one views.update per view is in flight.
+Each send carries the view's current ``hash``; if Slack answers
+``hash_conflict`` the modal changed underneath us and the update is dropped
+rather than overwriting the newer view.
+"""
+
+import concurrent.futures
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Optional, Union
+
+from slack_sdk.errors import SlackApiError
+
+from config.settings import ModalUpdateConfig, get_config
+from services.metrics import MetricsRegistry, get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+ViewSource = Union[Dict[str, Any], Callable[[], Optional[Dict[str, Any]]]]
+
+# Hashes a view carried before our own updates replaced them; payloads still
+# carrying one of these were generated before the update landed
+_STALE_HASHES_KEPT = 16
+
+
+class _ViewEntry:
+    """Known state of one open view plus its pending and in-flight update."""
+
+    __slots__ = ('hash', 'values', 'stale_hashes', 'pending', 'pending_client',
+                 'pending_futures', 'timer', 'in_flight')
+
+    def __init__(self):
+        self.hash: Optional[str] = None
+        self.values: Optional[Dict[str, Any]] = None
+        self.stale_hashes: Deque[str] = deque(maxlen=_STALE_HASHES_KEPT)
+        self.pending: Optional[ViewSource] = None
+        self.pending_client = None
+        self.pending_futures: list = []
+        self.timer: Optional[threading.Timer] = None
+        self.in_flight = False
+
+    def set_hash(self, view_hash: Optional[str]) -> None:
+        if view_hash and view_hash != self.hash:
+            if self.hash:
+                self.stale_hashes.append(self.hash)
+            self.hash = view_hash
+
+    @property
+    def busy(self) -> bool:
+        return self.pending is not None or self.in_flight
+
+
+class ModalUpdateCoalescer:
+    """Per-view debounced views.update with hash-based optimistic concurrency."""
+
+    def __init__(self, config: Optional[ModalUpdateConfig] = None, registry: Optional[MetricsRegistry] = None):
+        self.config = config or get_config().modal_updates
+        self.enabled = self.config.enabled
+        self.debounce_seconds = self.config.debounce_ms / 1000
+        self._views: 'OrderedDict[str, _ViewEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        registry = registry or get_metrics_registry()
+        self.outcomes = registry.counter(
+            'modal_updates', 'Modal updates by outcome (sent, superseded, conflict, failed)', ('outcome',))
+
+    def observe(self, view: Optional[Dict[str, Any]]) -> None:
+        """Record the hash and input state of a view from a payload or views.* response."""
+        if not isinstance(view, dict) or not view.get('id'):
+            return
+        values = (view.get('state') or {}).get('values')
+        with self._lock:
+            entry = self._entry(view['id'])
+            view_hash = view.get('hash')
+            if view_hash not in entry.stale_hashes:
+                entry.set_hash(view_hash)
+            if values is not None:
+                entry.values = values
+
+    def forget(self, view_id: str) -> None:
+        """Drop a closed or submitted view, cancelling any pending update."""
+        with self._lock:
+            entry = self._views.pop(view_id, None)
+        if entry is not None:
+            self._cancel_pending(entry)
+
+    def get_values(self, view_id: str) -> Optional[Dict[str, Any]]:
+        """Latest known ``state.values`` of a view, or None if it has not been seen."""
+        with self._lock:
+            entry = self._views.get(view_id)
+            return entry.values if entry else None
+
+    def get_hash(self, view_id: str) -> Optional[str]:
+        with self._lock:
+            entry = self._views.get(view_id)
+            return entry.hash if entry else None
+
+    def update(self, client, view_id: str, view: ViewSource) -> concurrent.futures.Future:
+        """
+        Schedule a views.update for ``view_id``.
+
+        ``view`` is the view payload, or a callable building it that is only invoked
+        if this update is still the newest when it is sent. The returned future
+        resolves to the Slack response, or to None if the update was superseded or
+        dropped on a hash conflict.
+        """
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        if not self.enabled:
+            try:
+                future.set_result(self._send_now(client, view_id, view, None))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        with self._lock:
+            entry = self._entry(view_id)
+            if entry.pending is not None:
+                self.outcomes.inc('superseded', amount=len(entry.pending_futures))
+                for superseded in entry.pending_futures:
+                    superseded.set_result(None)
+            entry.pending = view
+            entry.pending_client = client
+            entry.pending_futures = [future]
+            if not entry.in_flight:
+                self._schedule(view_id, entry)
+        return future
+
+    def flush(self, view_id: Optional[str] = None) -> None:
+        """Send pending updates now instead of waiting out the debounce."""
+        with self._lock:
+            view_ids = [view_id] if view_id is not None else list(self._views)
+            ready = []
+            for vid in view_ids:
+                entry = self._views.get(vid)
+                if entry is not None and entry.timer is not None:
+                    entry.timer.cancel()
+                    entry.timer = None
+                    ready.append(vid)
+        for vid in ready:
+            self._send(vid)
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'tracked_views': len(self._views),
+                'pending_updates': sum(1 for entry in self._views.values() if entry.pending is not None)
+            }
+
+    def _entry(self, view_id: str) -> _ViewEntry:
+        """Get or create the entry for a view; caller holds the lock."""
+        entry = self._views.get(view_id)
+        if entry is None:
+            entry = self._views[view_id] = _ViewEntry()
+            self._evict()
+        else:
+            self._views.move_to_end(view_id)
+        return entry
+
+    def _evict(self) -> None:
+        """Drop the least recently used idle views beyond max_views; caller holds the lock."""
+        excess = len(self._views) - self.config.max_views
+        if excess <= 0:
+            return
+        for view_id in [vid for vid, entry in self._views.items() if not entry.busy][:excess]:
+            del self._views[view_id]
+
+    def _schedule(self, view_id: str, entry: _ViewEntry) -> None:
+        """Start the debounce timer for a view's pending update; caller holds the lock."""
+        if entry.timer is not None:
+            return
+        entry.timer = threading.Timer(self.debounce_seconds, self._send, args=(view_id,))
+        entry.timer.daemon = True
+        entry.timer.start()
+
+    def _send(self, view_id: str) -> None:
+        with self._lock:
+            entry = self._views.get(view_id)
+            if entry is None or entry.pending is None or entry.in_flight:
+                return
+            source, client, futures = entry.pending, entry.pending_client, entry.pending_futures
+            entry.pending, entry.pending_client, entry.pending_futures = None, None, []
+            entry.timer = None
+            entry.in_flight = True
+            view_hash = entry.hash
+
+        try:
+            response = self._send_now(client, view_id, source, view_hash)
+            outcome = 'sent' if response is not None else 'superseded'
+        except SlackApiError as e:
+            response = None
+            if e.response.get('error') == 'hash_conflict':
+                # Someone else redrew the view; our update was built from older state
+                outcome = 'conflict'
+                logger.debug(f"Dropped update for view {view_id}: hash conflict")
+            else:
+                outcome = 'failed'
+                logger.warning(f"Modal update for view {view_id} failed: {e.response.get('error')}")
+        except Exception as e:
+            response = None
+            outcome = 'failed'
+            logger.warning(f"Modal update for view {view_id} failed: {e}")
+
+        self.outcomes.inc(outcome)
+        with self._lock:
+            entry = self._views.get(view_id)
+            if entry is not None:
+                entry.in_flight = False
+                if response is not None:
+                    entry.set_hash((response.get('view') or {}).get('hash'))
+                elif outcome == 'conflict':
+                    # The new hash arrives with the next interaction payload
+                    entry.hash = None
+                if entry.pending is not None:
+                    self._schedule(view_id, entry)
+        for future in futures:
+            future.set_result(response)
+
+    @staticmethod
+    def _send_now(client, view_id: str, source: ViewSource, view_hash: Optional[str]):
+        view = source() if callable(source) else source
+        if view is None:
+            return None
+        return client.views_update(view_id=view_id, view=view, hash=view_hash)
+
+    def _cancel_pending(self, entry: _ViewEntry) -> None:
+        with self._lock:
+            if entry.timer is not None:
+                entry.timer.cancel()
+                entry.timer = None
+            futures = entry.pending_futures
+            had_pending = entry.pending is not None
+            entry.pending, entry.pending_client, entry.pending_futures = None, None, []
+        if had_pending:
+            self.outcomes.inc('superseded', amount=len(futures))
+        for future in futures:
+            future.set_result(None)
+
+
+# Global coalescer instance
+_modal_coalescer: Optional[ModalUpdateCoalescer] = None
+_coalescer_lock = threading.Lock()
+
+
+def get_modal_coalescer() -> ModalUpdateCoalescer:
+    """Get the global modal update coalescer."""
+    global _modal_coalescer
+    if _modal_coalescer is None:
+        with _coalescer_lock:
+            if _modal_coalescer is None:
+                _modal_coalescer = ModalUpdateCoalescer()
+    return _modal_coalescer
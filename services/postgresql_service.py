@@ -20,6 +20,8 @@ from sqlalchemy import JSON
 from sqlalchemy.sql import func
 import uuid
 
+from services.profiling import instrument_engine
+
 logger = logging.getLogger(__name__)
 
 Base = declarative_base()
@@ -101,11 +103,33 @@ class Channel(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+class AccountAssignment(Base):
+    """User-to-Alpaca-account assignment model for PostgreSQL."""
+    __tablename__ = 'user_account_assignments'
+    
+    user_id = Column(String, primary_key=True)
+    account_id = Column(String, nullable=False)
+    assigned_at = Column(DateTime(timezone=True), nullable=False)
+    assigned_by = Column(String, nullable=False, default='system')
+    assignment_reason = Column(String, nullable=False, default='')
+    is_active = Column(Boolean, nullable=False, default=True)
+    
+    __table_args__ = (
+        Index('idx_assignments_account_id', 'account_id'),
+    )
+
 class PostgreSQLService:
     """PostgreSQL database service replacing DynamoDB functionality."""
     
-    def __init__(self, database_url: str):
-        """Initialize PostgreSQL connection."""
+    def __init__(self, database_url: str, auto_migrate: bool = True):
+        """
+        Initialize PostgreSQL connection.
+        
+        Args:
+            database_url: SQLAlchemy database URL
+            auto_migrate: Create tables and run migrations now. Lazy (Lambda) startup passes
+                False and runs migrations at deploy time via scripts/migrate_database.py.
+        """
         self.database_url = database_url
         self.engine = create_engine(
             database_url,
@@ -114,12 +138,14 @@ class PostgreSQLService:
             max_overflow=10,
             echo=False  # Set to True for SQL debugging
         )
+        instrument_engine(self.engine)
         
         # Create session factory
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
         
         # Create tables
-        self.create_tables()
+        if auto_migrate:
+            self.create_tables()
         
         logger.info("PostgreSQL service initialized successfully")
     
@@ -364,6 +390,16 @@ class PostgreSQLService:
             
             return [self._position_to_dict(position) for position in positions]
     
+    def get_held_symbols(self) -> List[str]:
+        """Get the distinct symbols with an open position for any user."""
+        with self.get_session() as session:
+            rows = session.query(Position.symbol)\
+                .filter(Position.quantity != 0)\
+                .distinct()\
+                .all()
+            
+            return sorted(row.symbol for row in rows)
+    
     def update_position(self, user_id: str, symbol: str, quantity_change: int, 
                        price: float, trade_type: str) -> Dict[str, Any]:
         """Update or create position."""
@@ -453,6 +489,55 @@ class PostgreSQLService:
                 logger.error(f"Error creating/updating channel: {e}")
                 raise
     
+    # Account assignment operations
+    def get_account_assignments(self) -> List[Dict[str, Any]]:
+        """Get every user-to-account assignment."""
+        with self.get_session() as session:
+            return [self._assignment_to_dict(row) for row in session.query(AccountAssignment).all()]
+    
+    def upsert_account_assignments(self, records: List[Dict[str, Any]]) -> int:
+        """
+        Insert or update a batch of assignments in one statement.
+        
+        Args:
+            records: Assignment dictionaries keyed like the AccountAssignment columns
+            
+        Returns:
+            int: Number of records written
+        """
+        if not records:
+            return 0
+        
+        dialect = self.engine.dialect.name
+        with self.get_session() as session:
+            try:
+                if dialect in ('postgresql', 'sqlite'):
+                    if dialect == 'postgresql':
+                        from sqlalchemy.dialects.postgresql import insert
+                    else:
+                        from sqlalchemy.dialects.sqlite import insert
+                    # Table-level insert: one executemany, without ORM per-row bookkeeping
+                    statement = insert(AccountAssignment.__table__)
+                    statement = statement.on_conflict_do_update(
+                        index_elements=['user_id'],
+                        set_={
+                            column: statement.excluded[column]
+                            for column in ('account_id', 'assigned_at', 'assigned_by',
+                                           'assignment_reason', 'is_active')
+                        }
+                    )
+                    session.execute(statement, records)
+                else:
+                    for record in records:
+                        session.merge(AccountAssignment(**record))
+                
+                session.commit()
+                return len(records)
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Error writing account assignments: {e}")
+                raise
+    
     # Helper methods
     def _user_to_dict(self, user: User) -> Dict[str, Any]:
         """Convert User model to dictionary."""
@@ -514,6 +599,21 @@ class PostgreSQLService:
             'updated_at': channel.updated_at.isoformat() if channel.updated_at else None
         }
     
+    def _assignment_to_dict(self, assignment: AccountAssignment) -> Dict[str, Any]:
+        """Convert AccountAssignment model to dictionary."""
+        assigned_at = assignment.assigned_at
+        if assigned_at is not None and assigned_at.tzinfo is None:
+            # SQLite drops the timezone; assignments are always written in UTC
+            assigned_at = assigned_at.replace(tzinfo=timezone.utc)
+        return {
+            'user_id': assignment.user_id,
+            'account_id': assignment.account_id,
+            'assigned_at': assigned_at,
+            'assigned_by': assignment.assigned_by,
+            'assignment_reason': assignment.assignment_reason,
+            'is_active': assignment.is_active
+        }
+    
     def health_check(self) -> bool:
         """Check database connectivity."""
         try:
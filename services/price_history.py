@@ -0,0 +1,343 @@
+"""
+Local daily-close time-series store for quantitative risk calculations.
+
+This module keeps a columnar, memory-mapped matrix of daily closing prices on disk so
+the risk engine can read years of history for the whole book without touching the
+network. Data is imported from CSV (long or wide layout) or Parquet and persisted as
+NumPy ``.npy`` files that are mapped read-only on load.
+
+On-disk layout (inside ``price_history_dir``)::
+
+    manifest.json   {"version": 1, "symbols": [...], "rows": N, "last_date": "YYYY-MM-DD"}
+    dates.npy       int64 vector of days since the Unix epoch, ascending
+    closes.npy      float64 matrix (rows x symbols) in Fortran order, NaN where missing
+
+Fortran order keeps each symbol's series contiguous, so slicing a handful of columns
+out of a wide universe only pages in the columns that are actually used.
+
+Import a dataset with ``python scripts/import_price_history.py closes.csv``.
+"""
+
+import csv
+import json
+import logging
+import os
+import threading
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet import is optional
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+_EPOCH = date(1970, 1, 1)
+
+
+class PriceHistoryError(Exception):
+    """Custom exception for price history store errors."""
+
+    def __init__(self, message: str, path: str = None):
+        self.message = message
+        self.path = path
+        super().__init__(self.message)
+
+
+def _to_epoch_day(value) -> int:
+    """Convert a date, datetime or ISO string to days since the Unix epoch."""
+    if isinstance(value, datetime):
+        value = value.date()
+    elif isinstance(value, str):
+        value = date.fromisoformat(value.strip()[:10])
+    return (value - _EPOCH).days
+
+
+def _from_epoch_day(day: int) -> date:
+    """Convert days since the Unix epoch back to a date."""
+    return date.fromordinal(_EPOCH.toordinal() + int(day))
+
+
+def _save_atomic(path: str, array: np.ndarray) -> None:
+    """
+    Write an ``.npy`` file next to its destination and rename it into place.
+
+    Stores that already mapped the old file keep reading it; saving in place would
+    truncate the pages under their memory maps.
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+class PriceHistoryStore:
+    """
+    Memory-mapped store of daily closes keyed by symbol.
+
+    The store is written once per import and read many times. Reads never copy the
+    full matrix; ``get_closes`` returns a dense array containing only the requested
+    columns and the trailing lookback window.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Directory holding the manifest and ``.npy`` files
+        """
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._dates: Optional[np.ndarray] = None
+        self._closes: Optional[np.ndarray] = None
+        self._symbols: List[str] = []
+        self._symbol_index: Dict[str, int] = {}
+        self._version = 0
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, 'manifest.json')
+
+    @property
+    def is_loaded(self) -> bool:
+        """Check whether a dataset is currently mapped."""
+        return self._closes is not None
+
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols available in the store."""
+        return list(self._symbols)
+
+    @property
+    def version(self) -> int:
+        """Counter bumped each time a dataset is mapped (every write, import and load)."""
+        return self._version
+
+    @property
+    def last_date(self) -> Optional[date]:
+        """Most recent date in the store (the current trading day for caching)."""
+        if self._dates is None or len(self._dates) == 0:
+            return None
+        return _from_epoch_day(self._dates[-1])
+
+    def has_symbol(self, symbol: str) -> bool:
+        """Check if the store has history for a symbol."""
+        return symbol.upper() in self._symbol_index
+
+    def load(self) -> bool:
+        """
+        Memory-map the persisted dataset if one exists.
+
+        Returns:
+            bool: True if a dataset was mapped
+        """
+        if not os.path.exists(self.manifest_path):
+            logger.info(f"No price history found at {self.directory}")
+            return False
+
+        with open(self.manifest_path, 'r') as f:
+            manifest = json.load(f)
+
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise PriceHistoryError(
+                f"Unsupported price history version: {manifest.get('version')}",
+                self.manifest_path
+            )
+
+        dates = np.load(os.path.join(self.directory, 'dates.npy'), mmap_mode='r')
+        closes = np.load(os.path.join(self.directory, 'closes.npy'), mmap_mode='r')
+        symbols = list(manifest['symbols'])
+
+        if closes.shape != (len(dates), len(symbols)):
+            raise PriceHistoryError(
+                f"Price matrix shape {closes.shape} does not match manifest "
+                f"({len(dates)} rows, {len(symbols)} symbols)",
+                self.directory
+            )
+
+        with self._lock:
+            self._dates = dates
+            self._closes = closes
+            self._symbols = symbols
+            self._symbol_index = {s: i for i, s in enumerate(symbols)}
+            self._version += 1
+
+        logger.info(f"Price history loaded: {len(symbols)} symbols, {len(dates)} days, "
+                    f"last date {self.last_date}")
+        return True
+
+    def write(self, dates: Sequence, symbols: Sequence[str], closes: np.ndarray) -> None:
+        """
+        Persist a dataset and map it.
+
+        Args:
+            dates: Trading dates (date, datetime, ISO string or epoch day ints), one per row
+            symbols: Column symbols
+            closes: Matrix of closes shaped (len(dates), len(symbols)); NaN where missing
+        """
+        day_array = np.asarray(
+            [d if isinstance(d, (int, np.integer)) else _to_epoch_day(d) for d in dates],
+            dtype=np.int64
+        )
+        closes = np.asarray(closes, dtype=np.float64)
+        symbols = [s.strip().upper() for s in symbols]
+
+        if closes.shape != (len(day_array), len(symbols)):
+            raise PriceHistoryError(
+                f"Close matrix shape {closes.shape} does not match "
+                f"{len(day_array)} dates x {len(symbols)} symbols"
+            )
+
+        order = np.argsort(day_array, kind='stable')
+        day_array = day_array[order]
+        closes = np.asfortranarray(closes[order])
+
+        os.makedirs(self.directory, exist_ok=True)
+        _save_atomic(os.path.join(self.directory, 'dates.npy'), day_array)
+        _save_atomic(os.path.join(self.directory, 'closes.npy'), closes)
+
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'symbols': symbols,
+            'rows': int(len(day_array)),
+            'last_date': _from_epoch_day(day_array[-1]).isoformat() if len(day_array) else None
+        }
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+        self.load()
+
+    def import_csv(self, path: str) -> None:
+        """
+        Import daily closes from a CSV file.
+
+        Two layouts are accepted:
+        - long: ``date,symbol,close`` (one row per symbol per day)
+        - wide: ``date,AAPL,MSFT,...`` (one row per day, one column per symbol)
+
+        Args:
+            path: CSV file path
+        """
+        with open(path, 'r', newline='') as f:
+            reader = csv.reader(f)
+            header = [h.strip() for h in next(reader)]
+            rows = list(reader)
+
+        lowered = [h.lower() for h in header]
+        if lowered[:1] != ['date']:
+            raise PriceHistoryError("CSV must start with a 'date' column", path)
+
+        if set(lowered) >= {'date', 'symbol', 'close'} and len(lowered) <= 4:
+            date_col, symbol_col, close_col = (lowered.index(c) for c in ('date', 'symbol', 'close'))
+            self._write_long(
+                [r[date_col] for r in rows],
+                [r[symbol_col] for r in rows],
+                [r[close_col] for r in rows]
+            )
+        else:
+            closes = np.array(
+                [[float(v) if v.strip() else np.nan for v in r[1:]] for r in rows],
+                dtype=np.float64
+            ).reshape(len(rows), len(header) - 1)
+            self.write([r[0] for r in rows], header[1:], closes)
+
+        logger.info(f"Imported price history from CSV: {path}")
+
+    def import_parquet(self, path: str) -> None:
+        """
+        Import daily closes from a Parquet file in long layout (date, symbol, close).
+
+        Args:
+            path: Parquet file path
+
+        Raises:
+            PriceHistoryError: If pyarrow is not installed
+        """
+        if pq is None:
+            raise PriceHistoryError("Parquet import requires pyarrow to be installed", path)
+
+        table = pq.read_table(path, columns=['date', 'symbol', 'close']).to_pydict()
+        self._write_long(table['date'], table['symbol'], table['close'])
+        logger.info(f"Imported price history from Parquet: {path}")
+
+    def _write_long(self, dates: Sequence, symbols: Sequence[str], closes: Sequence) -> None:
+        """Pivot long-format records into the dense matrix and persist it."""
+        day_values = np.asarray([_to_epoch_day(d) for d in dates], dtype=np.int64)
+        symbol_values = [s.strip().upper() for s in symbols]
+        unique_days = np.unique(day_values)
+        unique_symbols = sorted(set(symbol_values))
+
+        column = {s: i for i, s in enumerate(unique_symbols)}
+        rows = np.searchsorted(unique_days, day_values)
+        cols = np.fromiter((column[s] for s in symbol_values), dtype=np.int64, count=len(symbol_values))
+
+        matrix = np.full((len(unique_days), len(unique_symbols)), np.nan, dtype=np.float64)
+        matrix[rows, cols] = np.asarray(closes, dtype=np.float64)
+        self.write(unique_days, unique_symbols, matrix)
+
+    def get_closes(
+        self,
+        symbols: Sequence[str],
+        lookback: int,
+        as_of: Optional[date] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get aligned closes for several symbols.
+
+        Args:
+            symbols: Symbols to return, in column order
+            lookback: Maximum number of trailing rows
+            as_of: Last date to include (defaults to the latest date in the store)
+
+        Returns:
+            Tuple of (epoch-day vector, closes matrix). Columns for unknown symbols are NaN.
+        """
+        if not self.is_loaded:
+            return np.empty(0, dtype=np.int64), np.empty((0, len(symbols)), dtype=np.float64)
+
+        end = len(self._dates)
+        if as_of is not None:
+            end = int(np.searchsorted(self._dates, _to_epoch_day(as_of), side='right'))
+        start = max(0, end - lookback)
+
+        known = [(i, self._symbol_index[s.upper()]) for i, s in enumerate(symbols)
+                 if s.upper() in self._symbol_index]
+
+        result = np.full((end - start, len(symbols)), np.nan, dtype=np.float64)
+        if known:
+            out_cols, src_cols = zip(*known)
+            result[:, list(out_cols)] = self._closes[start:end, list(src_cols)]
+
+        return np.array(self._dates[start:end]), result
+
+
+# Global store instance
+_price_history_store: Optional[PriceHistoryStore] = None
+
+
+def get_price_history_store() -> PriceHistoryStore:
+    """
+    Get or create the global PriceHistoryStore, loading any persisted dataset.
+
+    Returns:
+        PriceHistoryStore: Shared store instance
+    """
+    global _price_history_store
+
+    if _price_history_store is None:
+        from config.settings import get_config
+        store = PriceHistoryStore(get_config().risk.price_history_dir)
+        try:
+            store.load()
+        except (OSError, ValueError, PriceHistoryError) as e:
+            logger.warning(f"Price history unavailable: {e}")
+        _price_history_store = store
+
+    return _price_history_store
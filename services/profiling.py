@@ -0,0 +1,388 @@
+"""
+Request profiling: span timing, slow-request breakdowns and sampled stack capture.
+
+A sampled fraction of Slack requests is traced (PROFILING_SAMPLE_RATE). While a
+request is traced, ``span()`` / ``@profiled`` blocks around service calls (auth,
+database queries, market data, Alpaca, Slack API calls, Block Kit building) record
+their timings into it. Traced requests are kept as breakdowns: the most recent ones
+and the slowest N, served by the /admin/profiling endpoint.
+
+With stack sampling on, a background thread samples the Python stack of every
+thread that is handling a traced request; the slowest N requests have their samples
+written as collapsed-stack files (flamegraph.pl / speedscope input) to
+PROFILING_DUMP_DIR.
+
+When profiling is disabled or a request is not sampled, ``span()`` costs one
+ContextVar lookup and returns a shared no-op context manager.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar, Token
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from config.settings import ProfilingConfig, get_config
+
+logger = logging.getLogger(__name__)
+
+# Spans recorded per trace beyond this are counted in totals but not listed
+MAX_LISTED_SPANS = 200
+
+_current_trace: ContextVar[Optional['RequestTrace']] = ContextVar('profiling_trace', default=None)
+_span_depth: ContextVar[int] = ContextVar('profiling_span_depth', default=0)
+_NULL_SPAN = nullcontext()
+
+
+class RequestTrace:
+    """Spans (and optional stack samples) recorded for one traced request."""
+
+    __slots__ = ('name', 'request_id', 'started_at', 'start', 'duration', 'error',
+                 'spans', 'totals', 'stacks', 'thread_id')
+
+    def __init__(self, name: str, request_id: Optional[str] = None):
+        self.name = name
+        self.request_id = request_id
+        self.started_at = datetime.now(timezone.utc)
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+        self.spans: List[Tuple[str, float, float, int, Optional[str]]] = []
+        self.totals: Dict[str, List] = {}  # name -> [count, seconds, top-level seconds, errors]
+        self.stacks: Counter = Counter()
+        self.thread_id: Optional[int] = None
+
+    def add_span(self, name: str, start: float, duration: float, depth: int, error: Optional[str] = None) -> None:
+        """Record a finished span (start is a perf_counter value)."""
+        if len(self.spans) < MAX_LISTED_SPANS:
+            self.spans.append((name, start - self.start, duration, depth, error))
+        totals = self.totals.get(name)
+        if totals is None:
+            totals = self.totals[name] = [0, 0.0, 0.0, 0]
+        totals[0] += 1
+        totals[1] += duration
+        if depth == 0:
+            totals[2] += duration
+        if error:
+            totals[3] += 1
+
+    def breakdown(self) -> Dict[str, Any]:
+        """Summary of where the request spent its time."""
+        duration = self.duration if self.duration is not None else time.perf_counter() - self.start
+        top_level = sum(totals[2] for totals in self.totals.values())
+        return {
+            'name': self.name,
+            'request_id': self.request_id,
+            'started_at': self.started_at.isoformat(),
+            'duration_ms': round(duration * 1000, 2),
+            'error': self.error,
+            # Time not covered by any top-level span (framework, middleware, own code)
+            'unaccounted_ms': round(max(0.0, duration - top_level) * 1000, 2),
+            'span_totals': [
+                {'name': name, 'count': count, 'total_ms': round(seconds * 1000, 2), 'errors': errors}
+                for name, (count, seconds, _, errors) in sorted(
+                    self.totals.items(), key=lambda item: item[1][1], reverse=True)
+            ],
+            'spans': [
+                {'name': name, 'start_ms': round(offset * 1000, 2), 'duration_ms': round(span_duration * 1000, 2),
+                 'depth': depth, 'error': error}
+                for name, offset, span_duration, depth, error in self.spans
+            ],
+            'stack_samples': sum(self.stacks.values())
+        }
+
+
+class _Span:
+    """Context manager timing one span of a traced request."""
+
+    __slots__ = ('trace', 'name', 'start', 'token')
+
+    def __init__(self, trace: RequestTrace, name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self) -> '_Span':
+        self.token = _span_depth.set(_span_depth.get() + 1)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration = time.perf_counter() - self.start
+        _span_depth.reset(self.token)
+        self.trace.add_span(self.name, self.start, duration, _span_depth.get(),
+                            exc_type.__name__ if exc_type else None)
+        return False
+
+
+def span(name: str):
+    """
+    Time a block as a span of the current traced request.
+
+    Example:
+        with span('slack.views_open'):
+            client.views_open(...)
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return _NULL_SPAN
+    return _Span(trace, name)
+
+
+def profiled(name: str) -> Callable:
+    """Decorator recording each call of a sync or async function as a span."""
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                trace = _current_trace.get()
+                if trace is None:
+                    return await func(*args, **kwargs)
+                with _Span(trace, name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _current_trace.get()
+            if trace is None:
+                return func(*args, **kwargs)
+            with _Span(trace, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def instrument_engine(engine) -> None:
+    """Record every SQL statement executed on a SQLAlchemy engine as a ``db.<VERB>`` span."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and _current_trace.get() is not None:
+            context._profiling_start = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        trace = _current_trace.get()
+        start = getattr(context, '_profiling_start', None)
+        if trace is None or start is None:
+            return
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement and statement.strip() else 'QUERY'
+        trace.add_span(f"db.{verb}", start, time.perf_counter() - start, _span_depth.get())
+
+
+def _collapse_stack(frame) -> str:
+    """Root-first ``;``-joined frame names, as in collapsed-stack (folded) files."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class Profiler:
+    """Samples requests for tracing and keeps their breakdowns."""
+
+    def __init__(self, config: Optional[ProfilingConfig] = None):
+        config = config or get_config().profiling
+        self.enabled = config.enabled
+        self.sample_rate = config.sample_rate
+        self.slow_request_count = config.slow_request_count
+        self.stack_sampling = config.stack_sampling
+        self.stack_interval = config.stack_interval_ms / 1000
+        self.dump_dir = config.dump_dir
+
+        self.traced_requests = 0
+        self._slowest: List[Tuple[float, int, Dict[str, Any]]] = []  # min-heap on duration
+        self._recent: deque = deque(maxlen=config.slow_request_count)
+        self._sequence = itertools.count()
+        self._active: Dict[int, RequestTrace] = {}  # thread id -> trace, for the stack sampler
+        self._lock = threading.Lock()
+        self._sampler: Optional[threading.Thread] = None
+        self._sampler_stop = threading.Event()
+
+    def configure(self, enabled: Optional[bool] = None, sample_rate: Optional[float] = None,
+                  stack_sampling: Optional[bool] = None) -> None:
+        """Change profiling settings at runtime."""
+        if sample_rate is not None:
+            if not (0.0 <= sample_rate <= 1.0):
+                raise ValueError("Profiling sample rate must be between 0 and 1")
+            self.sample_rate = sample_rate
+        if stack_sampling is not None:
+            self.stack_sampling = stack_sampling
+        if enabled is not None:
+            self.enabled = enabled
+        logger.info(f"Profiling configured | Enabled: {self.enabled} | Sample rate: {self.sample_rate} | "
+                    f"Stack sampling: {self.stack_sampling}")
+
+    # Request lifecycle
+
+    def start_request(self, name: str, request_id: Optional[str] = None) -> Optional[Tuple[RequestTrace, Token]]:
+        """
+        Start tracing the current request if it is sampled.
+
+        Returns:
+            Handle to pass to finish_request, or None if the request is not traced
+        """
+        if not self.enabled or random.random() >= self.sample_rate:
+            return None
+        trace = RequestTrace(name, request_id)
+        token = _current_trace.set(trace)
+        if self.stack_sampling:
+            trace.thread_id = threading.get_ident()
+            self._active[trace.thread_id] = trace
+            self._ensure_sampler()
+        return trace, token
+
+    def finish_request(self, handle: Optional[Tuple[RequestTrace, Token]], error: Optional[str] = None) -> None:
+        """Finish a traced request started by start_request (no-op for None)."""
+        if handle is None:
+            return
+        trace, token = handle
+        trace.duration = time.perf_counter() - trace.start
+        trace.error = error
+        _current_trace.reset(token)
+        if trace.thread_id is not None:
+            self._active.pop(trace.thread_id, None)
+        try:
+            self._store(trace)
+        except Exception as e:
+            logger.error(f"Failed to store profile for {trace.name}: {e}")
+
+    @contextmanager
+    def request(self, name: str, request_id: Optional[str] = None) -> Iterator[Optional[RequestTrace]]:
+        """Trace a block as one request (if sampled)."""
+        handle = self.start_request(name, request_id)
+        error = None
+        try:
+            yield handle[0] if handle else None
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self.finish_request(handle, error)
+
+    def _store(self, trace: RequestTrace) -> None:
+        breakdown = trace.breakdown()
+        with self._lock:
+            self.traced_requests += 1
+            self._recent.append(breakdown)
+            qualifies = (len(self._slowest) < self.slow_request_count or
+                         trace.duration > self._slowest[0][0])
+        if not qualifies:
+            return
+
+        if trace.stacks:
+            breakdown['profile_path'] = self._dump_stacks(trace)
+
+        evicted = None
+        with self._lock:
+            entry = (trace.duration, next(self._sequence), breakdown)
+            if len(self._slowest) < self.slow_request_count:
+                heapq.heappush(self._slowest, entry)
+            else:
+                evicted = heapq.heappushpop(self._slowest, entry)
+        if evicted is not None and evicted[2].get('profile_path'):
+            try:
+                os.remove(evicted[2]['profile_path'])
+            except OSError:
+                pass
+
+    # Stack sampling
+
+    def _ensure_sampler(self) -> None:
+        if self._sampler is not None and self._sampler.is_alive():
+            return
+        with self._lock:
+            if self._sampler is None or not self._sampler.is_alive():
+                self._sampler_stop.clear()
+                self._sampler = threading.Thread(target=self._sample_loop, name='profiling-sampler', daemon=True)
+                self._sampler.start()
+
+    def _sample_loop(self) -> None:
+        while not self._sampler_stop.wait(self.stack_interval):
+            if not self._active:
+                continue
+            frames = sys._current_frames()
+            for thread_id, trace in list(self._active.items()):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    trace.stacks[_collapse_stack(frame)] += 1
+
+    def _dump_stacks(self, trace: RequestTrace) -> Optional[str]:
+        """Write a trace's stack samples as a collapsed-stack file."""
+        try:
+            os.makedirs(self.dump_dir, exist_ok=True)
+            label = re.sub(r'[^A-Za-z0-9_.-]+', '_', f"{trace.name}_{trace.request_id or 'request'}").strip('_')
+            path = os.path.join(self.dump_dir, f"{trace.started_at.strftime('%Y%m%dT%H%M%S')}_{label}.folded")
+            with open(path, 'w') as handle:
+                for stack, count in trace.stacks.most_common():
+                    handle.write(f"{stack} {count}\n")
+            return path
+        except OSError as e:
+            logger.warning(f"Failed to write profile for {trace.name}: {e}")
+            return None
+
+    # Reporting
+
+    def get_slow_requests(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Breakdowns of the slowest traced requests, slowest first."""
+        with self._lock:
+            entries = sorted(self._slowest, reverse=True)
+        return [breakdown for _, _, breakdown in entries[:limit]]
+
+    def get_recent_requests(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Breakdowns of the most recently traced requests, newest first."""
+        with self._lock:
+            recent = list(self._recent)
+        recent.reverse()
+        return recent[:limit]
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            'enabled': self.enabled,
+            'sample_rate': self.sample_rate,
+            'stack_sampling': self.stack_sampling,
+            'stack_interval_ms': self.stack_interval * 1000,
+            'slow_request_count': self.slow_request_count,
+            'traced_requests': self.traced_requests,
+            'dump_dir': self.dump_dir
+        }
+
+    def reset(self) -> None:
+        """Drop stored breakdowns."""
+        with self._lock:
+            self._slowest.clear()
+            self._recent.clear()
+            self.traced_requests = 0
+
+    def shutdown(self) -> None:
+        """Stop the stack sampler thread."""
+        self._sampler_stop.set()
+        if self._sampler is not None:
+            self._sampler.join(timeout=1)
+            self._sampler = None
+
+
+# Global profiler instance
+_profiler: Optional[Profiler] = None
+
+
+def get_profiler() -> Profiler:
+    """Get the global profiler."""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
@@ -0,0 +1,326 @@
+"""
+Background quote cache prewarming.
+
+The first ``/buy`` for a symbol used to pay a cold Finnhub fetch while the
+modal waited. QuotePrewarmer keeps the shared MarketDataService quote cache
+warm for the symbols likely to be asked for next, the hot symbol set:
+
+- the trade modal's quick-pick symbols (QUOTE_PREWARM_SYMBOLS),
+- every symbol with an open position in the database,
+- symbols added to a watchlist,
+- symbols users looked up recently, scored by access frequency with an
+  exponential decay (QUOTE_PREWARM_HALF_LIFE_MINUTES).
+
+Every QUOTE_PREWARM_INTERVAL_SECONDS it re-fetches the cached quotes that are
+missing or older than QUOTE_PREWARM_REFRESH_AGE_SECONDS (or the market session's
+quote TTL, if shorter), most-accessed first, spending at most
+QUOTE_PREWARM_BUDGET_FRACTION of the Finnhub rate limit. While
+get_market_status() reports the market closed it fetches nothing.
+
+Cache lookups are counted so /health shows the quote cache hit rate and how
+much of it came from prewarmed entries.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from config.settings import QuotePrewarmConfig, get_config
+from services.market_data import MarketQuote, MarketStatus
+from services.metrics import MetricsRegistry, get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+FetchQuotes = Callable[[List[str]], Awaitable[Dict[str, MarketQuote]]]
+
+# Statuses during which quotes do not move, so prewarming would only spend rate limit
+_PAUSED_STATUSES = frozenset({MarketStatus.CLOSED, MarketStatus.HOLIDAY})
+# Accessed symbols whose decayed score falls below this leave the hot set
+_MIN_ACCESS_SCORE = 0.05
+
+
+class QuotePrewarmer:
+    """Keeps the shared quote cache warm for hot symbols within a rate-limit budget."""
+
+    def __init__(self, config: Optional[QuotePrewarmConfig] = None, service=None,
+                 fetch: Optional[FetchQuotes] = None,
+                 market_status: Optional[Callable[[], Awaitable[MarketStatus]]] = None,
+                 held_symbols: Optional[Callable[[], List[str]]] = None,
+                 registry: Optional[MetricsRegistry] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            config: Prewarm settings (the app configuration by default)
+            service: MarketDataService whose cache is warmed (the container's by default)
+            fetch: Fetches quotes for symbols (by default a MarketDataService on the prewarm thread
+                sharing the service's rate limit and circuit breaker)
+            market_status: Returns the current market status (the fetching service's by default)
+            held_symbols: Returns symbols with open positions (from the database by default)
+            clock: Monotonic time source for access scores and the market status cache
+        """
+        self.config = config or get_config().quote_prewarm
+        self.enabled = self.config.enabled
+        self.service = service
+        self._fetch = fetch
+        self._market_status = market_status
+        self._held_symbols = held_symbols
+        self._clock = clock
+        self._fetch_service = None
+
+        self._lock = threading.Lock()
+        self._scores: Dict[str, tuple] = {}  # symbol -> (score, clock time of last access)
+        self._watchlist: Set[str] = set()
+        self._positions: Set[str] = set()
+        self._warmed: Dict[str, datetime] = {}  # symbol -> timestamp of a cached quote not yet looked up
+        self._status: Optional[MarketStatus] = None
+        self._status_checked = 0.0
+        self.paused = False
+        self.last_cycle: Optional[datetime] = None
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._task = None
+
+        registry = registry or get_metrics_registry()
+        self.lookups = registry.counter(
+            'quote_cache_lookups',
+            'Cached quote lookups by result (hit, miss, prewarmed_hit: would have missed without prewarming)',
+            ('result',))
+        self.fetches = registry.counter(
+            'quote_prewarm_fetches', 'Quotes fetched by the prewarmer, by outcome', ('outcome',))
+        registry.gauge('quote_cache_hit_ratio', 'Share of cached quote lookups served from cache').set_function(
+            lambda: self.hit_rate()[0])
+        registry.gauge('quote_prewarm_hot_symbols', 'Symbols in the prewarm hot set').set_function(
+            lambda: len(self.hot_symbols()))
+
+    @property
+    def budget_per_cycle(self) -> int:
+        """Quotes one cycle may fetch: the configured share of the Finnhub rate limit."""
+        per_minute = get_config().market_data.rate_limit_per_minute * self.config.budget_fraction
+        return max(1, int(per_minute * self.config.interval_seconds / 60))
+
+    # Hot symbol set
+
+    def record_access(self, symbol: str, cached: Optional[MarketQuote]) -> None:
+        """MarketDataService.on_quote_access hook: count the lookup and raise the symbol's score."""
+        symbol = symbol.upper()
+        now = self._clock()
+        with self._lock:
+            score, last = self._scores.get(symbol, (0.0, now))
+            self._scores[symbol] = (self._decay(score, now - last) + 1.0, now)
+            # Only the first lookup of a prewarmed quote would have missed without it
+            prewarmed = cached is not None and self._warmed.get(symbol) == cached.timestamp
+            if prewarmed:
+                del self._warmed[symbol]
+        if cached is None:
+            self.lookups.inc('miss')
+        else:
+            self.lookups.inc('prewarmed_hit' if prewarmed else 'hit')
+
+    def add_watchlist(self, symbol: str) -> None:
+        with self._lock:
+            self._watchlist.add(symbol.upper())
+
+    def set_held_symbols(self, symbols: Iterable[str]) -> None:
+        with self._lock:
+            self._positions = {symbol.upper() for symbol in symbols}
+
+    def hot_symbols(self) -> List[str]:
+        """The hot symbol set, most recently and frequently accessed first."""
+        now = self._clock()
+        with self._lock:
+            scores = {}
+            for symbol, (score, last) in list(self._scores.items()):
+                score = self._decay(score, now - last)
+                if score < _MIN_ACCESS_SCORE:
+                    del self._scores[symbol]
+                else:
+                    scores[symbol] = score
+            pinned = set(self.config.quick_symbols) | self._watchlist | self._positions
+        ranked = sorted(pinned | set(scores), key=lambda symbol: (-scores.get(symbol, 0.0), symbol))
+        return ranked[:self.config.max_symbols]
+
+    def plan_refresh(self) -> List[str]:
+        """Hot symbols whose cached quote is missing or old, within the cycle budget."""
+        cache = self.service.memory_cache if self.service is not None else {}
+        refresh_age = self.config.refresh_age_seconds
+        if self.service is not None:
+            # Refresh before the current market session's quote TTL runs out
+            refresh_age = min(refresh_age, self.service.ttl_policy.ttl().fresh_seconds)
+        cutoff = datetime.utcnow() - timedelta(seconds=refresh_age)
+        due = []
+        for symbol in self.hot_symbols():
+            entry = cache.get(symbol)
+            if entry is None or entry[1] <= cutoff:
+                due.append(symbol)
+                if len(due) == self.budget_per_cycle:
+                    break
+        return due
+
+    def hit_rate(self) -> tuple:
+        """(hit rate, hit rate the same lookups would have had without prewarming) so far."""
+        hits, prewarmed, misses = (self.lookups.value(result) for result in ('hit', 'prewarmed_hit', 'miss'))
+        total = hits + prewarmed + misses
+        if not total:
+            return 0.0, 0.0
+        return (hits + prewarmed) / total, hits / total
+
+    # Refresh cycle
+
+    async def run_cycle(self) -> int:
+        """Refresh the due hot symbols once; returns the number of quotes cached."""
+        if await self._market_closed():
+            self.paused = True
+            return 0
+        self.paused = False
+        await self._refresh_held_symbols()
+
+        symbols = self.plan_refresh()
+        self.last_cycle = datetime.utcnow()
+        if not symbols:
+            return 0
+        try:
+            quotes = await self._fetch_quotes(symbols)
+        except Exception as e:
+            logger.warning("Quote prewarm of %s symbols failed: %s", len(symbols), e)
+            quotes = {}
+
+        for symbol in symbols:
+            quote = quotes.get(symbol)
+            if quote is None:
+                self.fetches.inc('error')
+                continue
+            await self.service.warm_cache(quote)
+            with self._lock:
+                self._warmed[symbol] = quote.timestamp
+            self.fetches.inc('ok')
+        logger.debug("Prewarmed %s of %s due quotes", len(quotes), len(symbols))
+        return len(quotes)
+
+    async def _market_closed(self) -> bool:
+        now = self._clock()
+        if self._status is None or now - self._status_checked >= self.config.market_status_ttl_seconds:
+            self._status_checked = now
+            try:
+                if self._market_status is not None:
+                    self._status = await self._market_status()
+                else:
+                    self._status = await (await self._get_fetch_service()).get_market_status()
+            except Exception as e:
+                logger.warning("Market status check failed: %s", e)
+                self._status = MarketStatus.UNKNOWN
+        # An unknown status does not pause prewarming
+        return self._status in _PAUSED_STATUSES
+
+    async def _refresh_held_symbols(self) -> None:
+        held_symbols = self._held_symbols or self._database_held_symbols
+        try:
+            # A sync database query: keep it off the loop
+            self.set_held_symbols(await asyncio.to_thread(held_symbols))
+        except Exception as e:
+            logger.warning("Could not load held position symbols: %s", e)
+
+    @staticmethod
+    def _database_held_symbols() -> List[str]:
+        from services.service_container import get_database_service
+        return get_database_service().get_held_symbols()
+
+    async def _fetch_quotes(self, symbols: List[str]) -> Dict[str, MarketQuote]:
+        if self._fetch is not None:
+            return await self._fetch(symbols)
+        service = await self._get_fetch_service()
+        return await service.get_multiple_quotes(symbols, use_cache=False)
+
+    async def _get_fetch_service(self):
+        if self._fetch_service is None:
+            # Its HTTP session belongs to the prewarm loop; the Finnhub budget and breaker are the app's
+            from services.market_data import MarketDataService
+            service = MarketDataService(rate_limiter=self.service.rate_limiter,
+                                        circuit_breaker=self.service.circuit_breaker)
+            await service.initialize()
+            self._fetch_service = service
+        return self._fetch_service
+
+    def _decay(self, score: float, elapsed: float) -> float:
+        return score * 0.5 ** (elapsed / (self.config.access_half_life_minutes * 60))
+
+    # Lifecycle
+
+    def start(self) -> None:
+        """Hook into the shared service's cache lookups and start refreshing on a thread."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if self.service is None:
+                from services.service_container import get_market_data_service
+                self.service = get_market_data_service()
+            self.service.on_quote_access = self.record_access
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, name='quote-prewarm', daemon=True)
+            self._thread.start()
+        self._task = asyncio.run_coroutine_threadsafe(self._run(), self._loop)
+        logger.info("Quote prewarmer started (budget %s quotes every %ss)",
+                    self.budget_per_cycle, self.config.interval_seconds)
+
+    def stop(self) -> None:
+        with self._lock:
+            loop, thread, task = self._loop, self._thread, self._task
+            self._loop = self._thread = self._task = None
+        if loop is None:
+            return
+        if self.service is not None and self.service.on_quote_access == self.record_access:
+            self.service.on_quote_access = None
+        task.cancel()
+        asyncio.run_coroutine_threadsafe(self._close_fetch_service(), loop).result(timeout=10)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+        logger.info("Quote prewarmer stopped")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_cycle()
+            except Exception as e:
+                logger.warning("Quote prewarm cycle failed: %s", e)
+            await asyncio.sleep(self.config.interval_seconds)
+
+    async def _close_fetch_service(self) -> None:
+        service, self._fetch_service = self._fetch_service, None
+        if service is not None:
+            await service.cleanup()
+
+    def get_status(self) -> Dict[str, Any]:
+        hit_rate, without_prewarm = self.hit_rate()
+        hot = self.hot_symbols()
+        return {
+            'enabled': self.enabled,
+            'running': self._thread is not None and self._thread.is_alive(),
+            'paused_market_closed': self.paused,
+            'hot_symbols': len(hot),
+            'top_symbols': hot[:10],
+            'budget_per_cycle': self.budget_per_cycle,
+            'last_cycle': self.last_cycle.isoformat() if self.last_cycle else None,
+            'cache_hit_rate': round(hit_rate, 4),
+            'cache_hit_rate_without_prewarm': round(without_prewarm, 4)
+        }
+
+
+# Global prewarmer instance
+_quote_prewarmer: Optional[QuotePrewarmer] = None
+_prewarmer_lock = threading.Lock()
+
+
+def get_quote_prewarmer() -> QuotePrewarmer:
+    """Get the global quote prewarmer."""
+    global _quote_prewarmer
+    if _quote_prewarmer is None:
+        with _prewarmer_lock:
+            if _quote_prewarmer is None:
+                _quote_prewarmer = QuotePrewarmer()
+    return _quote_prewarmer
@@ -0,0 +1,517 @@
+"""
+Live quote streaming hub.
+
+Open market-data modals with auto-refresh on used to poll for their own symbol.
+QuoteStreamHub keeps one upstream subscription per distinct symbol instead and
+fans each tick out in process:
+
+- QuoteSource: the upstream feed. PollingQuoteSource fetches every subscribed
+  symbol once per interval through a MarketDataService on the hub loop that
+  shares the app service's Finnhub rate limit and circuit breaker;
+  FinnhubWebSocketSource subscribes to Finnhub's trade stream once per symbol.
+  Upstream cost follows the number of distinct symbols, not of viewers.
+- Subscription: reference-counted per symbol. The first subscriber starts the
+  upstream subscription and the last one to close ends it. Each subscriber holds
+  only the latest tick; ticks it has not taken yet are overwritten (conflated).
+- watch_modal(): a subscriber that redraws one modal, at most once per
+  QUOTE_STREAM_MODAL_REFRESH_SECONDS, through the modal update coalescer.
+
+The hub runs sources and modal watches on its own event-loop thread, started
+on first subscription; Subscription.get() serves threads that want to block.
+"""
+
+import asyncio
+import concurrent.futures
+import dataclasses
+import inspect
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Union
+
+import aiohttp
+
+from config.settings import QuoteStreamConfig, get_config
+from services.market_data import DataQuality, MarketQuote
+from services.metrics import MetricsRegistry, get_metrics_registry
+from services.modal_updates import get_modal_coalescer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class QuoteTick:
+    """A price update for one symbol."""
+    symbol: str
+    price: Decimal
+    timestamp: datetime
+    volume: Optional[int] = None
+    quote: Optional[MarketQuote] = None  # The full quote, when the source fetched one
+
+    @classmethod
+    def from_quote(cls, quote: MarketQuote) -> 'QuoteTick':
+        return cls(quote.symbol, quote.current_price, quote.timestamp, quote.volume, quote)
+
+    def apply_to(self, quote: Optional[MarketQuote]) -> Optional[MarketQuote]:
+        """The quote to display after this tick, given the one displayed before it."""
+        if self.quote is not None:
+            return self.quote
+        if quote is None:
+            return None
+        return dataclasses.replace(quote, current_price=self.price, timestamp=self.timestamp,
+                                   data_quality=DataQuality.REAL_TIME, cache_hit=False)
+
+
+Publish = Callable[[QuoteTick], None]
+ModalRenderer = Callable[[QuoteTick], Union[Optional[Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]]
+
+
+class QuoteSource(ABC):
+    """
+    Upstream quote feed driven by the hub.
+
+    All methods are called on the hub's event loop. add() and remove() are called
+    once per distinct symbol, in order, and must not block; sources do their I/O
+    in tasks of their own.
+    """
+
+    @abstractmethod
+    def start(self, publish: Publish) -> None:
+        """Begin feeding ticks to ``publish``."""
+
+    @abstractmethod
+    def add(self, symbol: str) -> None:
+        """Start the upstream subscription for ``symbol``."""
+
+    @abstractmethod
+    def remove(self, symbol: str) -> None:
+        """End the upstream subscription for ``symbol``."""
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """Stop feeding ticks and release connections."""
+
+
+class PollingQuoteSource(QuoteSource):
+    """One shared poll: every subscribed symbol is fetched once per interval."""
+
+    def __init__(self, interval_seconds: float,
+                 fetch: Optional[Callable[[List[str]], Awaitable[Dict[str, MarketQuote]]]] = None,
+                 app_service=None):
+        self.interval = interval_seconds
+        self._fetch = fetch
+        self._app_service = app_service  # Whose rate limit and breaker the poll shares (the container's by default)
+        self._service = None
+        self._symbols: Set[str] = set()
+        self._last_prices: Dict[str, Decimal] = {}
+        self._publish: Optional[Publish] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, publish: Publish) -> None:
+        self._publish = publish
+        self._wake = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def add(self, symbol: str) -> None:
+        self._symbols.add(symbol)
+        self._wake.set()  # Fetch the new symbol now rather than at the next interval
+
+    def remove(self, symbol: str) -> None:
+        self._symbols.discard(symbol)
+        self._last_prices.pop(symbol, None)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        if self._service is not None:
+            await self._service.cleanup()
+
+    async def _run(self) -> None:
+        while True:
+            symbols = sorted(self._symbols)
+            if symbols:
+                try:
+                    quotes = await self._fetch_quotes(symbols)
+                except Exception as e:
+                    logger.warning("Quote poll for %s symbols failed: %s", len(symbols), e)
+                    quotes = {}
+                for symbol, quote in quotes.items():
+                    # Unchanged prices are not ticks; removed symbols may still be in the batch
+                    if symbol in self._symbols and self._last_prices.get(symbol) != quote.current_price:
+                        self._last_prices[symbol] = quote.current_price
+                        self._publish(QuoteTick.from_quote(quote))
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fetch_quotes(self, symbols: List[str]) -> Dict[str, MarketQuote]:
+        if self._fetch is not None:
+            return await self._fetch(symbols)
+        if self._service is None:
+            # Its HTTP session belongs to this loop; the Finnhub budget and breaker are the app's
+            from services.market_data import MarketDataService
+            if self._app_service is None:
+                from services.service_container import get_market_data_service
+                self._app_service = get_market_data_service()
+            service = MarketDataService(rate_limiter=self._app_service.rate_limiter,
+                                        circuit_breaker=self._app_service.circuit_breaker)
+            await service.initialize()
+            self._service = service
+        return await self._service.get_multiple_quotes(symbols, use_cache=False)
+
+
+class FinnhubWebSocketSource(QuoteSource):
+    """Finnhub trade stream: one subscribe message per symbol, resubscribed on reconnect."""
+
+    RECONNECT_MAX_SECONDS = 30.0
+
+    def __init__(self, url: str, token: str):
+        self.url = url
+        self.token = token
+        self._symbols: Set[str] = set()
+        self._outbox: Optional[asyncio.Queue] = None
+        self._publish: Optional[Publish] = None
+        self._task: Optional[asyncio.Task] = None
+        self.connected = False
+
+    def start(self, publish: Publish) -> None:
+        self._publish = publish
+        self._outbox = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def add(self, symbol: str) -> None:
+        self._symbols.add(symbol)
+        self._outbox.put_nowait({'type': 'subscribe', 'symbol': symbol})
+
+    def remove(self, symbol: str) -> None:
+        self._symbols.discard(symbol)
+        self._outbox.put_nowait({'type': 'unsubscribe', 'symbol': symbol})
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        delay = 1.0
+        async with aiohttp.ClientSession() as session:
+            while True:
+                try:
+                    async with session.ws_connect(self.url, params={'token': self.token}, heartbeat=30) as ws:
+                        self.connected = True
+                        delay = 1.0
+                        await self._stream(ws)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning("Finnhub quote stream disconnected: %s", e)
+                finally:
+                    self.connected = False
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.RECONNECT_MAX_SECONDS)
+
+    async def _stream(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        # Messages queued while disconnected are superseded by a full resubscribe
+        while not self._outbox.empty():
+            self._outbox.get_nowait()
+        for symbol in sorted(self._symbols):
+            await ws.send_str(json.dumps({'type': 'subscribe', 'symbol': symbol}))
+
+        sender = asyncio.create_task(self._send_outbox(ws))
+        try:
+            async for message in ws:
+                if message.type == aiohttp.WSMsgType.TEXT:
+                    self._on_message(json.loads(message.data))
+                elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    break
+        finally:
+            sender.cancel()
+
+    async def _send_outbox(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        while True:
+            await ws.send_str(json.dumps(await self._outbox.get()))
+
+    def _on_message(self, message: Dict[str, Any]) -> None:
+        if message.get('type') != 'trade':
+            return
+        # A message can carry many trades per symbol; only the last one matters
+        latest: Dict[str, Dict[str, Any]] = {}
+        for trade in message.get('data') or ():
+            latest[trade['s']] = trade
+        for symbol, trade in latest.items():
+            if symbol in self._symbols:
+                self._publish(QuoteTick(symbol, Decimal(str(trade['p'])),
+                                        datetime.utcfromtimestamp(trade['t'] / 1000), trade.get('v')))
+
+
+class Subscription:
+    """A subscriber's view of one symbol: the latest tick not yet taken."""
+
+    def __init__(self, hub: 'QuoteStreamHub', symbol: str):
+        self.hub = hub
+        self.symbol = symbol
+        self.closed = False
+        self._latest: Optional[QuoteTick] = None
+        self._condition = threading.Condition()
+        self._event: Optional[asyncio.Event] = None  # For waiters on the hub loop
+
+    def offer(self, tick: QuoteTick) -> bool:
+        """Hold ``tick`` for the subscriber; True if it replaced one never taken."""
+        with self._condition:
+            conflated = self._latest is not None
+            self._latest = tick
+            self._condition.notify_all()
+        if self._event is not None:
+            self._event.set()
+        return conflated
+
+    def get(self, timeout: Optional[float] = None) -> Optional[QuoteTick]:
+        """Take the latest tick, waiting up to ``timeout`` for one; None on timeout or close."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._latest is not None or self.closed, timeout)
+            tick, self._latest = self._latest, None
+            return tick
+
+    async def next(self) -> Optional[QuoteTick]:
+        """Take the latest tick on the hub loop, waiting for one; None once closed."""
+        if self._event is None:
+            self._event = asyncio.Event()
+        while True:
+            with self._condition:
+                if self._latest is not None or self.closed:
+                    tick, self._latest = self._latest, None
+                    return tick
+                self._event.clear()
+            await self._event.wait()
+
+    def close(self) -> None:
+        self.hub._unsubscribe(self)
+
+
+class _ModalWatch:
+    __slots__ = ('subscription', 'task')
+
+    def __init__(self, subscription: Subscription):
+        self.subscription = subscription
+        self.task: Optional[concurrent.futures.Future] = None
+
+
+class QuoteStreamHub:
+    """In-process pub/sub for live quotes with one upstream subscription per symbol."""
+
+    def __init__(self, config: Optional[QuoteStreamConfig] = None, source: Optional[QuoteSource] = None,
+                 registry: Optional[MetricsRegistry] = None):
+        self.config = config or get_config().quote_stream
+        self.enabled = self.config.enabled
+        self.modal_refresh_seconds = self.config.modal_refresh_seconds
+        self._source = source
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._last_ticks: Dict[str, QuoteTick] = {}
+        self._watches: Dict[str, _ModalWatch] = {}
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+        registry = registry or get_metrics_registry()
+        self.ticks = registry.counter('quote_stream_ticks', 'Upstream quote ticks received')
+        self.conflated = registry.counter(
+            'quote_stream_conflated_ticks', 'Ticks overwritten before a subscriber took them')
+        self.modal_refreshes = registry.counter(
+            'quote_stream_modal_refreshes', 'Modal redraws queued by auto-refresh watches')
+        registry.gauge('quote_stream_symbols', 'Symbols with an upstream subscription').set_function(
+            lambda: len(self._subscribers))
+        registry.gauge('quote_stream_subscribers', 'Open quote subscriptions across all symbols').set_function(
+            lambda: sum(len(subs) for subs in list(self._subscribers.values())))
+
+    def start(self) -> None:
+        """Start the hub loop thread and the upstream source if they are not running."""
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if self._source is None:
+                self._source = self._default_source()
+            started = threading.Event()
+            self._loop = asyncio.new_event_loop()
+
+            def run() -> None:
+                asyncio.set_event_loop(self._loop)
+                self._loop.call_soon(self._source.start, self._publish)
+                self._loop.call_soon(started.set)
+                self._loop.run_forever()
+
+            self._thread = threading.Thread(target=run, name='quote-stream', daemon=True)
+            self._thread.start()
+            started.wait()
+            logger.info("Quote stream hub started (%s)", type(self._source).__name__)
+
+    def stop(self) -> None:
+        """End all watches and subscriptions and stop the source and loop thread."""
+        with self._start_lock:
+            if self._loop is None:
+                return
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        with self._lock:
+            subscriptions = [sub for subs in self._subscribers.values() for sub in subs]
+            self._subscribers.clear()
+            self._last_ticks.clear()
+            self._watches.clear()
+        for subscription in subscriptions:
+            self._close(subscription)
+        asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout=10)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+        logger.info("Quote stream hub stopped")
+
+    def subscribe(self, symbol: str) -> Subscription:
+        """Subscribe to ``symbol``; the latest known tick, if any, is available at once."""
+        self.start()
+        symbol = symbol.upper()
+        subscription = Subscription(self, symbol)
+        with self._lock:
+            subscribers = self._subscribers.setdefault(symbol, set())
+            first = not subscribers
+            subscribers.add(subscription)
+            last_tick = self._last_ticks.get(symbol)
+            if first:
+                self._loop.call_soon_threadsafe(self._source.add, symbol)
+        if last_tick is not None:
+            subscription.offer(last_tick)
+        return subscription
+
+    def watch_modal(self, view_id: str, symbol: str, render: ModalRenderer, client) -> bool:
+        """
+        Redraw a modal with each new tick for ``symbol``, throttled to one redraw per
+        modal_refresh_seconds. ``render(tick)`` returns the view (or an awaitable of
+        it); returning None ends the watch. Replaces any earlier watch of the view.
+        """
+        if not self.enabled:
+            return False
+        self.unwatch_modal(view_id)
+        watch = _ModalWatch(self.subscribe(symbol))
+        with self._lock:
+            self._watches[view_id] = watch
+        watch.task = asyncio.run_coroutine_threadsafe(self._run_watch(view_id, watch, render, client), self._loop)
+        return True
+
+    def unwatch_modal(self, view_id: str) -> None:
+        """Stop refreshing a modal, e.g. because it was closed."""
+        with self._lock:
+            watch = self._watches.pop(view_id, None)
+        if watch is not None:
+            watch.subscription.close()
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            symbols = {symbol: len(subs) for symbol, subs in self._subscribers.items()}
+            watches = len(self._watches)
+        return {
+            'enabled': self.enabled,
+            'running': self._thread is not None and self._thread.is_alive(),
+            'source': type(self._source).__name__ if self._source is not None else None,
+            'symbols': symbols,
+            'modal_watches': watches
+        }
+
+    def _default_source(self) -> QuoteSource:
+        if self.config.source == 'websocket':
+            return FinnhubWebSocketSource(self.config.websocket_url, get_config().market_data.finnhub_api_key)
+        return PollingQuoteSource(self.config.poll_interval_seconds)
+
+    def _publish(self, tick: QuoteTick) -> None:
+        """Fan a tick out to the symbol's subscribers; runs on the hub loop."""
+        self.ticks.inc()
+        with self._lock:
+            if tick.symbol not in self._subscribers:
+                return
+            self._last_ticks[tick.symbol] = tick
+            subscribers = list(self._subscribers[tick.symbol])
+        conflated = sum(subscription.offer(tick) for subscription in subscribers)
+        if conflated:
+            self.conflated.inc(amount=conflated)
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.symbol)
+            if subscribers is None or subscription not in subscribers:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.symbol]
+                self._last_ticks.pop(subscription.symbol, None)
+                if self._loop is not None:
+                    self._loop.call_soon_threadsafe(self._source.remove, subscription.symbol)
+        self._close(subscription)
+
+    def _close(self, subscription: Subscription) -> None:
+        """Mark closed and wake anything waiting on it, in threads or on the hub loop."""
+        with subscription._condition:
+            subscription.closed = True
+            subscription._condition.notify_all()
+        loop, event = self._loop, subscription._event
+        if loop is not None and event is not None:
+            loop.call_soon_threadsafe(event.set)
+
+    async def _run_watch(self, view_id: str, watch: _ModalWatch, render: ModalRenderer, client) -> None:
+        deadline = time.monotonic() + self.config.watch_max_minutes * 60
+        subscription = watch.subscription
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    tick = await asyncio.wait_for(subscription.next(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if tick is None:
+                    break
+                view = render(tick)
+                if inspect.isawaitable(view):
+                    view = await view
+                if view is None:
+                    break
+                get_modal_coalescer().update(client, view_id, view)
+                self.modal_refreshes.inc()
+                # Ticks arriving meanwhile conflate; the next pass takes only the newest
+                await asyncio.sleep(self.modal_refresh_seconds)
+        except Exception as e:
+            logger.warning("Auto-refresh of view %s stopped: %s", view_id, e)
+        finally:
+            with self._lock:
+                if self._watches.get(view_id) is watch:
+                    del self._watches[view_id]
+            subscription.close()
+
+    async def _shutdown(self) -> None:
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        await self._source.stop()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Global hub instance
+_quote_hub: Optional[QuoteStreamHub] = None
+_hub_lock = threading.Lock()
+
+
+def get_quote_hub() -> QuoteStreamHub:
+    """Get the global quote stream hub."""
+    global _quote_hub
+    if _quote_hub is None:
+        with _hub_lock:
+            if _quote_hub is None:
+                _quote_hub = QuoteStreamHub()
+    return _quote_hub
@@ -17,7 +17,7 @@ import os
 import time
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional, Any, Tuple, Union
+from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass, field
 from enum import Enum
 import hashlib
@@ -37,7 +37,20 @@ import structlog
 from config.settings import get_config
 from models.trade import Trade
 from models.portfolio import Portfolio, Position
-from services.market_data import MarketQuote, get_market_data_service
+from services.market_data import MarketQuote, QuotePurpose, get_market_data_service
+from services.risk_engine import RiskEngine, get_risk_engine
+from services.sector_index import SectorIndex, get_sector_index
+from services.shared_cache import SharedCache, get_shared_cache_backend
+from utils.codec import Field, RecordCodec
+
+# Default risk thresholds; the dashboard flags sectors against the same limits
+RISK_THRESHOLDS: Dict[str, float] = {
+    'concentration_limit': 0.10,  # 10% max single position
+    'sector_limit': 0.25,  # 25% max sector exposure (fraction of portfolio value)
+    'volatility_threshold': 0.30,  # 30% annualized volatility
+    'liquidity_threshold': 1000000,  # $1M daily volume minimum
+    'position_size_limit': 0.05  # 5% max single trade of portfolio
+}
 
 
 class RiskAnalysisError(Exception):
@@ -180,6 +193,21 @@ class RiskAnalysis:
         }
 
 
+# Binary form of risk analyses; append new fields at the end (see utils.codec)
+RISK_FACTOR_CODEC = RecordCodec(RiskFactor, 5, [
+    Field('category', RiskCategory), Field('level', RiskLevel), Field('score'), Field('description'),
+    Field('impact'), Field('recommendation'), Field('confidence')
+])
+RISK_ANALYSIS_CODEC = RecordCodec(RiskAnalysis, 4, [
+    Field('trade_id'), Field('symbol'), Field('trade_type'), Field('quantity'), Field('price'),
+    Field('overall_risk_level', RiskLevel), Field('overall_risk_score'), Field('risk_factors'),
+    Field('analysis_summary'), Field('portfolio_impact'), Field('market_context'),
+    Field('recommendations'), Field('generated_at'), Field('analysis_duration_ms'), Field('model_used'),
+    Field('confidence_score'), Field('regulatory_flags'), Field('requires_approval'),
+    Field('approval_reason')
+])
+
+
 class PromptTemplate:
     """Risk analysis prompt templates for different scenarios."""
     
@@ -304,7 +332,15 @@ class RiskAnalysisService:
         self.is_mock_mode = False
         
         # Initialize caching
-        self.analysis_cache: Dict[str, Tuple[RiskAnalysis, datetime]] = {}
+        # cache key -> (RiskAnalysis, cached at); shared by the workers, 100 newest kept per worker
+        self.analysis_cache = SharedCache('risk_analysis', ttl_seconds=300, backend=get_shared_cache_backend(),
+                                          max_entries=100)
+        
+        # Quantitative risk engine backed by local price history
+        self.risk_engine: RiskEngine = get_risk_engine()
+        
+        # Symbol classification index for sector concentration
+        self.sector_index: SectorIndex = get_sector_index()
         
         # Metrics
         self.analysis_counter = Counter(
@@ -328,13 +364,7 @@ class RiskAnalysisService:
         )
         
         # Risk thresholds and configuration
-        self.risk_thresholds = {
-            'concentration_limit': 0.10,  # 10% max single position
-            'sector_limit': 0.25,  # 25% max sector exposure
-            'volatility_threshold': 0.30,  # 30% annualized volatility
-            'liquidity_threshold': 1000000,  # $1M daily volume minimum
-            'position_size_limit': 0.05  # 5% max single trade of portfolio
-        }
+        self.risk_thresholds = dict(RISK_THRESHOLDS)
         
         # Use mock mode for local development (no AWS)
         self.is_mock_mode = True
@@ -405,7 +435,7 @@ class RiskAnalysisService:
         
         # Check cache first if enabled
         if use_cache:
-            cached_analysis = self._get_cached_analysis(cache_key)
+            cached_analysis = await self._get_cached_analysis(cache_key)
             if cached_analysis:
                 self.cache_hit_counter.inc()
                 self.logger.debug("Cache hit for risk analysis", trade_id=trade.trade_id)
@@ -415,7 +445,7 @@ class RiskAnalysisService:
             # Fetch market data if not provided
             if market_quote is None:
                 market_data_service = await get_market_data_service()
-                market_quote = await market_data_service.get_quote(trade.symbol)
+                market_quote = await market_data_service.get_quote(trade.symbol, purpose=QuotePurpose.EXECUTION)
             
             # Perform comprehensive analysis
             analysis = await self._perform_comprehensive_analysis(trade, portfolio, market_quote)
@@ -424,7 +454,7 @@ class RiskAnalysisService:
             analysis.analysis_duration_ms = (time.time() - start_time) * 1000
             
             # Cache the result
-            self._cache_analysis(cache_key, analysis)
+            await self._cache_analysis(cache_key, analysis)
             
             # Update metrics
             self.analysis_counter.labels(
@@ -941,12 +971,32 @@ Data Quality: {context['market']['data_quality']}
     
     async def _analyze_sector_impact(self, trade: Trade, portfolio: Portfolio) -> Dict[str, Any]:
         """Analyze sector concentration impact of the trade."""
-        # This would typically integrate with a sector classification service
-        # For now, return basic analysis
+        tracker = self.sector_index.get_tracker(portfolio)
+        check = tracker.check_trade(
+            trade.symbol,
+            self._get_signed_trade_value(trade),
+            self.risk_thresholds['sector_limit'],
+            capital=float(portfolio.total_value)
+        )
+        
+        # Adding to a sector the book already holds raises correlation with existing positions
+        if check.exceeds_limit:
+            correlation_risk = 'high'
+        elif check.current_weight > 0 and check.weight_change > 0:
+            correlation_risk = 'medium'
+        else:
+            correlation_risk = 'low'
+        
         return {
-            'sector_exposure_change': 0.0,
-            'sector_concentration_risk': 'low',
-            'sector_correlation_risk': 'medium'
+            'sector': check.sector,
+            'industry': check.industry,
+            'current_sector_weight': check.current_weight,
+            'new_sector_weight': check.new_weight,
+            'sector_exposure_change': check.weight_change,
+            'sector_limit': check.limit,
+            'exceeds_sector_limit': check.exceeds_limit,
+            'sector_concentration_risk': check.risk_level,
+            'sector_correlation_risk': correlation_risk
         }
     
     async def _calculate_portfolio_risk_metrics(
@@ -954,18 +1004,69 @@ Data Quality: {context['market']['data_quality']}
         trade: Trade, 
         portfolio: Portfolio
     ) -> Dict[str, Any]:
-        """Calculate portfolio-level risk metrics."""
-        # Basic risk metrics calculation
-        trade_value = abs(trade.quantity * trade.price)
-        portfolio_value = portfolio.total_value
+        """
+        Calculate portfolio-level risk metrics before and after the trade.
+        
+        Uses the vectorized risk engine over local price history. When no history is
+        available for the book, falls back to conservative estimates flagged as such.
+        """
+        trade_value = float(abs(trade.quantity * trade.price))
+        portfolio_value = float(portfolio.total_value)
+        concentration_ratio = trade_value / portfolio_value if portfolio_value else 0.0
+        
+        current_exposures = self._get_position_exposures(portfolio)
+        proposed_exposures = dict(current_exposures)
+        proposed_exposures[trade.symbol] = (
+            proposed_exposures.get(trade.symbol, 0.0) + self._get_signed_trade_value(trade)
+        )
+        
+        benchmark = portfolio.benchmark_symbol
+        after = self.risk_engine.compute(proposed_exposures, benchmark)
+        
+        if after is None:
+            return {
+                'portfolio_beta': 1.0,
+                'portfolio_volatility': 0.15,
+                'var_impact': trade_value * 0.02,
+                'concentration_ratio': concentration_ratio,
+                'data_source': 'estimate'
+            }
+        
+        before = self.risk_engine.compute(current_exposures, benchmark) if current_exposures else None
+        before_var = before.historical_var if before else 0.0
         
         return {
-            'portfolio_beta': 1.0,  # Would calculate from historical data
-            'portfolio_volatility': 0.15,  # Would calculate from positions
-            'var_impact': trade_value * 0.02,  # Simplified VaR calculation
-            'concentration_ratio': trade_value / portfolio_value
+            'portfolio_beta': after.beta,
+            'portfolio_volatility': after.volatility,
+            'var_impact': after.historical_var - before_var,
+            'historical_var': after.historical_var,
+            'parametric_var': after.parametric_var,
+            'var_confidence': after.confidence,
+            'var_horizon_days': after.horizon_days,
+            'concentration_ratio': concentration_ratio,
+            'correlation_matrix': {
+                'symbols': after.symbols,
+                'matrix': after.correlation_matrix
+            },
+            'missing_history': after.missing_symbols,
+            'observations': after.observations,
+            'as_of': after.as_of.isoformat() if after.as_of else None,
+            'data_source': 'price_history'
         }
     
+    def _get_position_exposures(self, portfolio: Portfolio) -> Dict[str, float]:
+        """Get signed dollar exposure per symbol for active positions."""
+        return {
+            position.symbol: float(position.quantity * position.current_price)
+            for position in portfolio.get_active_positions()
+        }
+    
+    def _get_signed_trade_value(self, trade: Trade) -> float:
+        """Get dollar value of a trade, negative for sells."""
+        trade_type = getattr(trade.trade_type, 'value', trade.trade_type)
+        value = float(trade.quantity * trade.price)
+        return -value if str(trade_type).lower() == 'sell' else value
+    
     def _check_concentration_limits(self, position_concentration: float) -> List[str]:
         """Check position concentration against limits."""
         flags = []
@@ -1030,34 +1131,24 @@ Data Quality: {context['market']['data_quality']}
         key_data = f"{trade.symbol}:{trade.trade_type}:{trade.quantity}:{trade.price}:{portfolio.total_value}:{len(portfolio.positions)}"
         return hashlib.md5(key_data.encode()).hexdigest()
     
-    def _get_cached_analysis(self, cache_key: str) -> Optional[RiskAnalysis]:
+    async def _get_cached_analysis(self, cache_key: str) -> Optional[RiskAnalysis]:
         """Get cached analysis if available and not stale."""
-        if cache_key in self.analysis_cache:
-            analysis, cached_time = self.analysis_cache[cache_key]
+        entry = await self.analysis_cache.aget(cache_key)
+        if entry is not None:
+            analysis, cached_time = entry
             
             # Check if cache is still valid (5 minutes)
             if datetime.utcnow() - cached_time < timedelta(minutes=5):
                 return analysis
             else:
                 # Remove stale entry
-                del self.analysis_cache[cache_key]
+                await self.analysis_cache.adiscard(cache_key)
         
         return None
     
-    def _cache_analysis(self, cache_key: str, analysis: RiskAnalysis) -> None:
+    async def _cache_analysis(self, cache_key: str, analysis: RiskAnalysis) -> None:
         """Cache analysis result."""
-        self.analysis_cache[cache_key] = (analysis, datetime.utcnow())
-        
-        # Limit cache size
-        if len(self.analysis_cache) > 100:
-            # Remove oldest entries
-            oldest_keys = sorted(
-                self.analysis_cache.keys(),
-                key=lambda k: self.analysis_cache[k][1]
-            )[:20]
-            
-            for old_key in oldest_keys:
-                del self.analysis_cache[old_key]
+        await self.analysis_cache.aset(cache_key, (analysis, datetime.utcnow()))
     
     async def _test_bedrock_connectivity(self) -> None:
         """Test Bedrock service connectivity."""
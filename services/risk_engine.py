@@ -0,0 +1,287 @@
+"""
+Vectorized portfolio risk engine built on the local price history store.
+
+Computes historical and parametric Value-at-Risk, beta to the portfolio benchmark,
+volatility and the correlation matrix for a whole book in a single NumPy pass.
+Return statistics depend only on the symbol universe and the history, so they are
+cached per version of the price history store and re-used for every proposed trade;
+applying a new set of exposures to cached statistics is a couple of matrix-vector products.
+"""
+
+import logging
+import math
+import threading
+from dataclasses import dataclass, field
+from datetime import date
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.price_history import PriceHistoryStore, get_price_history_store
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+@dataclass
+class ReturnStatistics:
+    """Daily return statistics for a symbol universe on one trading day."""
+    symbols: Tuple[str, ...]
+    benchmark_symbol: str
+    returns: np.ndarray            # (observations x symbols) simple daily returns
+    benchmark_returns: np.ndarray  # (observations,)
+    covariance: np.ndarray         # (symbols x symbols)
+    correlation: np.ndarray        # (symbols x symbols)
+    benchmark_covariance: np.ndarray  # (symbols,) covariance of each symbol with benchmark
+    benchmark_variance: float
+
+    @property
+    def observations(self) -> int:
+        return int(self.returns.shape[0])
+
+
+@dataclass
+class PortfolioRiskMetrics:
+    """Risk metrics for a set of dollar exposures."""
+    as_of: Optional[date]
+    symbols: List[str]
+    gross_exposure: float
+    net_exposure: float
+    historical_var: float
+    parametric_var: float
+    volatility: float  # Annualized volatility of portfolio returns
+    beta: float
+    confidence: float
+    horizon_days: int
+    observations: int
+    position_betas: Dict[str, float] = field(default_factory=dict)
+    position_volatilities: Dict[str, float] = field(default_factory=dict)
+    correlation_matrix: List[List[float]] = field(default_factory=list)
+    missing_symbols: List[str] = field(default_factory=list)
+
+    def to_dict(self):
+        """Convert metrics to dictionary for serialization."""
+        return {
+            'as_of': self.as_of.isoformat() if self.as_of else None,
+            'symbols': self.symbols,
+            'gross_exposure': self.gross_exposure,
+            'net_exposure': self.net_exposure,
+            'historical_var': self.historical_var,
+            'parametric_var': self.parametric_var,
+            'volatility': self.volatility,
+            'beta': self.beta,
+            'confidence': self.confidence,
+            'horizon_days': self.horizon_days,
+            'observations': self.observations,
+            'position_betas': self.position_betas,
+            'position_volatilities': self.position_volatilities,
+            'correlation_matrix': self.correlation_matrix,
+            'missing_symbols': self.missing_symbols
+        }
+
+
+class RiskEngine:
+    """
+    NumPy risk engine for portfolio-level VaR, beta, volatility and correlation.
+
+    Usage:
+        engine = RiskEngine(store)
+        metrics = engine.compute({'AAPL': 15000.0, 'MSFT': -4000.0}, benchmark_symbol='SPY')
+    """
+
+    def __init__(
+        self,
+        store: PriceHistoryStore,
+        confidence: float = 0.95,
+        horizon_days: int = 1,
+        lookback_days: int = 252
+    ):
+        """
+        Initialize risk engine.
+
+        Args:
+            store: Price history store supplying daily closes
+            confidence: VaR confidence level (e.g. 0.95)
+            horizon_days: VaR horizon in trading days (square-root-of-time scaling)
+            lookback_days: Number of trailing daily returns used
+        """
+        self.store = store
+        self.confidence = confidence
+        self.horizon_days = horizon_days
+        self.lookback_days = lookback_days
+        self._z_score = NormalDist().inv_cdf(confidence)
+        self._cache: Dict[Tuple[Tuple[str, ...], str], ReturnStatistics] = {}
+        self._cache_version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_available(self) -> bool:
+        """Check whether the engine has history to work with."""
+        return self.store.is_loaded
+
+    def get_statistics(self, symbols: Tuple[str, ...], benchmark_symbol: str) -> Optional[ReturnStatistics]:
+        """
+        Get cached return statistics for a symbol universe, computing them once per store version.
+
+        Any write or import bumps the store version, so corrected history for a day
+        already cached is picked up too, not only a new trading day.
+
+        Args:
+            symbols: Sorted tuple of symbols
+            benchmark_symbol: Benchmark symbol for beta
+
+        Returns:
+            ReturnStatistics or None if there is not enough aligned history
+        """
+        version = self.store.version
+        key = (symbols, benchmark_symbol)
+
+        with self._lock:
+            if self._cache_version != version:
+                self._cache.clear()
+                self._cache_version = version
+            cached = self._cache.get(key)
+
+        if cached is not None:
+            return cached
+
+        stats = self._compute_statistics(symbols, benchmark_symbol)
+        if stats is not None:
+            with self._lock:
+                if self._cache_version == version:
+                    self._cache[key] = stats
+        return stats
+
+    def _compute_statistics(self, symbols: Tuple[str, ...], benchmark_symbol: str) -> Optional[ReturnStatistics]:
+        """Build returns, covariance and correlation for the universe in one pass."""
+        columns = list(symbols) + [benchmark_symbol]
+        _, closes = self.store.get_closes(columns, self.lookback_days + 1)
+
+        if closes.shape[0] < 3:
+            return None
+
+        returns = closes[1:] / closes[:-1] - 1.0
+        complete_rows = ~np.isnan(returns).any(axis=1)
+        returns = returns[complete_rows]
+
+        if returns.shape[0] < 2:
+            return None
+
+        covariance = np.cov(returns, rowvar=False)
+        std = np.sqrt(np.diag(covariance))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            correlation = covariance / np.outer(std, std)
+        correlation = np.nan_to_num(correlation)
+
+        n = len(symbols)
+        return ReturnStatistics(
+            symbols=symbols,
+            benchmark_symbol=benchmark_symbol,
+            returns=returns[:, :n],
+            benchmark_returns=returns[:, n],
+            covariance=covariance[:n, :n],
+            correlation=correlation[:n, :n],
+            benchmark_covariance=covariance[:n, n],
+            benchmark_variance=float(covariance[n, n])
+        )
+
+    def compute(self, exposures: Dict[str, float], benchmark_symbol: str = "SPY") -> Optional[PortfolioRiskMetrics]:
+        """
+        Compute portfolio risk metrics for dollar exposures.
+
+        Args:
+            exposures: Mapping of symbol to signed dollar exposure (negative for short)
+            benchmark_symbol: Benchmark for beta
+
+        Returns:
+            PortfolioRiskMetrics or None if no symbol has usable history
+        """
+        benchmark_symbol = benchmark_symbol.upper()
+        exposures = {s.upper(): float(v) for s, v in exposures.items() if v}
+        if not exposures or not self.store.has_symbol(benchmark_symbol):
+            return None
+
+        missing = sorted(s for s in exposures if not self.store.has_symbol(s))
+        symbols = tuple(sorted(s for s in exposures if self.store.has_symbol(s)))
+        if not symbols:
+            return None
+
+        stats = self.get_statistics(symbols, benchmark_symbol)
+        if stats is None:
+            return None
+
+        weights = np.fromiter((exposures[s] for s in symbols), dtype=np.float64, count=len(symbols))
+        gross = float(np.abs(weights).sum())
+        horizon_scale = math.sqrt(self.horizon_days)
+
+        # Dollar P&L series and variance for the book
+        pnl = stats.returns @ weights
+        pnl_variance = float(weights @ stats.covariance @ weights)
+        historical_var = max(0.0, -float(np.quantile(pnl, 1.0 - self.confidence))) * horizon_scale
+        parametric_var = self._z_score * math.sqrt(max(pnl_variance, 0.0)) * horizon_scale
+
+        # Return-space metrics are normalized by gross exposure
+        if gross > 0 and stats.benchmark_variance > 0:
+            beta = float(weights @ stats.benchmark_covariance) / gross / stats.benchmark_variance
+        else:
+            beta = 0.0
+        volatility = math.sqrt(max(pnl_variance, 0.0)) / gross * math.sqrt(TRADING_DAYS_PER_YEAR) if gross else 0.0
+
+        variances = np.diag(stats.covariance)
+        if stats.benchmark_variance > 0:
+            betas = stats.benchmark_covariance / stats.benchmark_variance
+        else:
+            betas = np.zeros(len(symbols))
+        annual_vols = np.sqrt(variances * TRADING_DAYS_PER_YEAR)
+
+        return PortfolioRiskMetrics(
+            as_of=self.store.last_date,
+            symbols=list(symbols),
+            gross_exposure=gross,
+            net_exposure=float(weights.sum()),
+            historical_var=historical_var,
+            parametric_var=parametric_var,
+            volatility=volatility,
+            beta=beta,
+            confidence=self.confidence,
+            horizon_days=self.horizon_days,
+            observations=stats.observations,
+            position_betas=dict(zip(symbols, betas.tolist())),
+            position_volatilities=dict(zip(symbols, annual_vols.tolist())),
+            correlation_matrix=stats.correlation.tolist(),
+            missing_symbols=missing
+        )
+
+    def clear_cache(self) -> None:
+        """Drop cached statistics (e.g. after a history import)."""
+        with self._lock:
+            self._cache.clear()
+            self._cache_version = None
+
+
+# Global engine instance
+_risk_engine: Optional[RiskEngine] = None
+
+
+def get_risk_engine() -> RiskEngine:
+    """
+    Get or create the global RiskEngine.
+
+    Returns:
+        RiskEngine: Shared engine bound to the global price history store
+    """
+    global _risk_engine
+
+    if _risk_engine is None:
+        from config.settings import get_config
+        risk_config = get_config().risk
+        _risk_engine = RiskEngine(
+            get_price_history_store(),
+            confidence=risk_config.var_confidence,
+            horizon_days=risk_config.var_horizon_days,
+            lookback_days=risk_config.lookback_days
+        )
+
+    return _risk_engine
@@ -0,0 +1,437 @@
+"""
+Sector and industry classification index for concentration checks.
+
+Loads a symbol -> sector / industry / market-cap reference file once into compact
+parallel arrays (interned sector and industry codes, a float array of market caps)
+and maintains incremental per-portfolio sector exposure so that a concentration
+check for a proposed trade is O(1) rather than a scan over positions.
+
+Reference file format (CSV with header)::
+
+    symbol,sector,industry,market_cap
+    AAPL,Technology,Consumer Electronics,3400000000000
+"""
+
+import csv
+import logging
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from models.portfolio import Portfolio
+
+logger = logging.getLogger(__name__)
+
+UNCLASSIFIED = "Unclassified"
+
+# Market-cap buckets (lower bound in USD, label), checked in order
+MARKET_CAP_BUCKETS: Tuple[Tuple[float, str], ...] = (
+    (200e9, "mega"),
+    (10e9, "large"),
+    (2e9, "mid"),
+    (300e6, "small"),
+    (0.0, "micro"),
+)
+
+
+@dataclass(frozen=True)
+class SecurityClassification:
+    """Classification data for a single symbol."""
+    symbol: str
+    sector: str
+    industry: str
+    market_cap: Optional[float] = None
+
+    @property
+    def market_cap_bucket(self) -> Optional[str]:
+        """Market-cap size bucket (mega, large, mid, small, micro)."""
+        if self.market_cap is None:
+            return None
+        for lower_bound, label in MARKET_CAP_BUCKETS:
+            if self.market_cap >= lower_bound:
+                return label
+        return None
+
+    def to_dict(self) -> Dict[str, any]:
+        """Convert classification to dictionary."""
+        return {
+            'symbol': self.symbol,
+            'sector': self.sector,
+            'industry': self.industry,
+            'market_cap': self.market_cap,
+            'market_cap_bucket': self.market_cap_bucket
+        }
+
+
+@dataclass
+class SectorConcentrationCheck:
+    """Result of a sector concentration check for a proposed trade."""
+    symbol: str
+    sector: str
+    industry: str
+    current_weight: float
+    new_weight: float
+    limit: float
+
+    @property
+    def weight_change(self) -> float:
+        return self.new_weight - self.current_weight
+
+    @property
+    def exceeds_limit(self) -> bool:
+        return self.new_weight > self.limit
+
+    @property
+    def risk_level(self) -> str:
+        """Concentration risk classification (low, medium, high)."""
+        if self.exceeds_limit:
+            return 'high'
+        if self.new_weight > self.limit * 0.75:
+            return 'medium'
+        return 'low'
+
+    def to_dict(self) -> Dict[str, any]:
+        """Convert check result to dictionary."""
+        return {
+            'symbol': self.symbol,
+            'sector': self.sector,
+            'industry': self.industry,
+            'current_weight': self.current_weight,
+            'new_weight': self.new_weight,
+            'weight_change': self.weight_change,
+            'limit': self.limit,
+            'exceeds_limit': self.exceeds_limit,
+            'risk_level': self.risk_level
+        }
+
+
+class SectorIndex:
+    """
+    Compact in-memory symbol classification index.
+
+    Symbols map to a row; each row stores a sector code, an industry code and a
+    market cap in typed arrays. Sector and industry names are interned once.
+    """
+
+    def __init__(self, max_trackers: int = 1000):
+        """
+        Initialize an empty index.
+
+        Args:
+            max_trackers: Portfolios whose exposure trackers are kept (least recently used dropped)
+        """
+        self.max_trackers = max_trackers
+        self._rows: Dict[str, int] = {}
+        self._sector_codes = array('H')
+        self._industry_codes = array('H')
+        self._market_caps = array('d')
+        self._sector_names: List[str] = []
+        self._industry_names: List[str] = []
+        self._sector_lookup: Dict[str, int] = {}
+        self._industry_lookup: Dict[str, int] = {}
+        self._trackers: 'OrderedDict[str, SectorExposureTracker]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._rows
+
+    @property
+    def sectors(self) -> List[str]:
+        """All known sector names."""
+        return list(self._sector_names)
+
+    def _intern(self, value: str, names: List[str], lookup: Dict[str, int]) -> int:
+        code = lookup.get(value)
+        if code is None:
+            code = len(names)
+            names.append(value)
+            lookup[value] = code
+        return code
+
+    def add(self, symbol: str, sector: str, industry: str, market_cap: Optional[float] = None) -> None:
+        """
+        Add or replace a classification.
+
+        Args:
+            symbol: Ticker symbol
+            sector: Sector name
+            industry: Industry name
+            market_cap: Market capitalization in USD (optional)
+        """
+        symbol = symbol.strip().upper()
+        sector_code = self._intern(sector.strip() or UNCLASSIFIED, self._sector_names, self._sector_lookup)
+        industry_code = self._intern(industry.strip() or UNCLASSIFIED, self._industry_names, self._industry_lookup)
+        cap = float(market_cap) if market_cap not in (None, '') else float('nan')
+
+        row = self._rows.get(symbol)
+        if row is None:
+            self._rows[symbol] = len(self._sector_codes)
+            self._sector_codes.append(sector_code)
+            self._industry_codes.append(industry_code)
+            self._market_caps.append(cap)
+        else:
+            self._sector_codes[row] = sector_code
+            self._industry_codes[row] = industry_code
+            self._market_caps[row] = cap
+
+    def load_csv(self, path: str) -> int:
+        """
+        Load classifications from a reference CSV file.
+
+        Args:
+            path: CSV path with symbol, sector, industry, market_cap columns
+
+        Returns:
+            int: Number of symbols loaded
+        """
+        count = 0
+        with open(path, 'r', newline='') as f:
+            for record in csv.DictReader(f):
+                symbol = (record.get('symbol') or '').strip()
+                if not symbol:
+                    continue
+                self.add(
+                    symbol,
+                    record.get('sector') or '',
+                    record.get('industry') or '',
+                    record.get('market_cap') or None
+                )
+                count += 1
+
+        with self._lock:
+            self._trackers.clear()
+
+        logger.info(f"Sector index loaded {count} symbols from {path}")
+        return count
+
+    def get_sector(self, symbol: str) -> str:
+        """Get sector name for a symbol (``Unclassified`` if unknown)."""
+        row = self._rows.get(symbol.upper())
+        return self._sector_names[self._sector_codes[row]] if row is not None else UNCLASSIFIED
+
+    def classify(self, symbol: str) -> SecurityClassification:
+        """
+        Get full classification for a symbol.
+
+        Args:
+            symbol: Ticker symbol
+
+        Returns:
+            SecurityClassification (sector/industry ``Unclassified`` if unknown)
+        """
+        symbol = symbol.upper()
+        row = self._rows.get(symbol)
+        if row is None:
+            return SecurityClassification(symbol, UNCLASSIFIED, UNCLASSIFIED)
+
+        cap = self._market_caps[row]
+        return SecurityClassification(
+            symbol=symbol,
+            sector=self._sector_names[self._sector_codes[row]],
+            industry=self._industry_names[self._industry_codes[row]],
+            market_cap=None if cap != cap else cap  # NaN check
+        )
+
+    def get_tracker(self, portfolio: Portfolio) -> 'SectorExposureTracker':
+        """
+        Get the incremental sector exposure tracker for a portfolio.
+
+        The tracker follows fills and reprices made through the portfolio afterwards
+        (Portfolio.on_position_change) and is rebuilt only when the portfolio has changed
+        some other way since it was last synchronized.
+
+        Args:
+            portfolio: Portfolio to track
+
+        Returns:
+            SectorExposureTracker bound to the portfolio's current state
+        """
+        with self._lock:
+            tracker = self._trackers.get(portfolio.portfolio_id)
+            if tracker is None:
+                tracker = SectorExposureTracker(self)
+                self._trackers[portfolio.portfolio_id] = tracker
+                while len(self._trackers) > self.max_trackers:
+                    self._trackers.popitem(last=False)
+            else:
+                self._trackers.move_to_end(portfolio.portfolio_id)
+
+        if tracker.synced_at != portfolio.last_updated:
+            tracker.rebuild(portfolio)
+        portfolio.on_position_change = tracker.follow
+        return tracker
+
+    def drop_tracker(self, portfolio_id: str) -> None:
+        """Forget the tracker for a portfolio."""
+        with self._lock:
+            self._trackers.pop(portfolio_id, None)
+
+
+class SectorExposureTracker:
+    """
+    Running per-sector dollar exposure for a single portfolio.
+
+    Keeps per-symbol and per-sector absolute exposure plus the gross total, so
+    position updates and proposed-trade checks touch a constant number of entries.
+    """
+
+    def __init__(self, index: SectorIndex):
+        """
+        Initialize tracker.
+
+        Args:
+            index: Classification index used to map symbols to sectors
+        """
+        self.index = index
+        self.symbol_values: Dict[str, float] = {}
+        self.sector_values: Dict[str, float] = {}
+        self.gross_exposure = 0.0
+        self.synced_at = None
+        self._lock = threading.Lock()
+
+    def rebuild(self, portfolio: Portfolio) -> None:
+        """Rebuild totals from a portfolio's active positions."""
+        with self._lock:
+            self.symbol_values.clear()
+            self.sector_values.clear()
+            self.gross_exposure = 0.0
+            for position in portfolio.get_active_positions():
+                self._set_locked(position.symbol, float(position.quantity * position.current_price))
+            self.synced_at = portfolio.last_updated
+
+    def update_position(self, symbol: str, value: float, synced_at: Optional[datetime] = None) -> None:
+        """
+        Set the signed dollar exposure of one position.
+
+        Args:
+            symbol: Ticker symbol
+            value: New signed dollar value (0 removes the position)
+            synced_at: Portfolio last_updated the totals now match, if known
+        """
+        with self._lock:
+            self._set_locked(symbol.upper(), float(value))
+            if synced_at is not None:
+                self.synced_at = synced_at
+
+    def follow(self, portfolio: Portfolio, symbol: str, previous_update: datetime) -> None:
+        """
+        Apply a fill or reprice of one position (Portfolio.on_position_change).
+
+        Ignored when the tracker was already out of date before the change; the next
+        get_tracker call rebuilds it instead.
+        """
+        if self.synced_at != previous_update:
+            return
+        position = portfolio.positions.get(symbol)
+        value = 0.0
+        if position is not None and not position.is_closed():
+            value = float(position.quantity * position.current_price)
+        self.update_position(symbol, value, synced_at=portfolio.last_updated)
+
+    def _set_locked(self, symbol: str, value: float) -> None:
+        sector = self.index.get_sector(symbol)
+        old_abs = abs(self.symbol_values.get(symbol, 0.0))
+        new_abs = abs(value)
+
+        if value:
+            self.symbol_values[symbol] = value
+        else:
+            self.symbol_values.pop(symbol, None)
+
+        sector_total = self.sector_values.get(sector, 0.0) + new_abs - old_abs
+        if sector_total > 1e-9:
+            self.sector_values[sector] = sector_total
+        else:
+            self.sector_values.pop(sector, None)
+
+        self.gross_exposure = max(0.0, self.gross_exposure + new_abs - old_abs)
+
+    def get_sector_weights(self, capital: Optional[float] = None) -> Dict[str, float]:
+        """
+        Get sector weights, largest first.
+
+        Args:
+            capital: Portfolio value to weigh sectors against (gross exposure when not positive)
+        """
+        base = capital if capital is not None and capital > 0 else self.gross_exposure
+        if base <= 0:
+            return {}
+        return dict(sorted(
+            ((sector, value / base) for sector, value in self.sector_values.items()),
+            key=lambda item: item[1],
+            reverse=True
+        ))
+
+    def check_trade(self, symbol: str, signed_value: float, limit: float,
+                    capital: Optional[float] = None) -> SectorConcentrationCheck:
+        """
+        Check sector concentration after a proposed trade in O(1).
+
+        Weights are fractions of ``capital``. Against gross exposure alone the first
+        position in a book would always weigh 100% of it and breach any limit.
+
+        Args:
+            symbol: Ticker symbol being traded
+            signed_value: Dollar value of the trade (negative for sells)
+            limit: Maximum allowed sector weight (fraction of capital)
+            capital: Portfolio value (positions plus cash); gross exposure when not positive
+
+        Returns:
+            SectorConcentrationCheck with current and post-trade sector weights
+        """
+        symbol = symbol.upper()
+        classification = self.index.classify(symbol)
+
+        with self._lock:
+            old_position = self.symbol_values.get(symbol, 0.0)
+            sector_value = self.sector_values.get(classification.sector, 0.0)
+            gross = self.gross_exposure
+
+        new_position = old_position + float(signed_value)
+        delta = abs(new_position) - abs(old_position)
+        new_sector_value = sector_value + delta
+        if capital is not None and capital > 0:
+            base, new_base = capital, capital
+        else:
+            base, new_base = gross, gross + delta
+
+        return SectorConcentrationCheck(
+            symbol=symbol,
+            sector=classification.sector,
+            industry=classification.industry,
+            current_weight=sector_value / base if base > 0 else 0.0,
+            new_weight=new_sector_value / new_base if new_base > 0 else 0.0,
+            limit=limit
+        )
+
+
+# Global index instance
+_sector_index: Optional[SectorIndex] = None
+
+
+def get_sector_index() -> SectorIndex:
+    """
+    Get or create the global SectorIndex, loading the configured reference file.
+
+    Returns:
+        SectorIndex: Shared classification index
+    """
+    global _sector_index
+
+    if _sector_index is None:
+        from config.settings import get_config
+        index = SectorIndex()
+        path = get_config().risk.sector_reference_path
+        try:
+            index.load_csv(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Sector reference data unavailable ({path}): {e}")
+        _sector_index = index
+
+    return _sector_index
@@ -11,6 +11,7 @@ import asyncio
 import logging
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, Type, TypeVar, Callable, List
 from dataclasses import dataclass, field
 from enum import Enum
@@ -66,6 +67,8 @@ class ServiceDefinition:
     startup_priority: int = 100
     shutdown_priority: int = 100
     auto_start: bool = True
+    startup_timeout: Optional[float] = None  # Seconds; None uses the container default
+    health_check_timeout: Optional[float] = None  # Seconds; None uses the container default
     
     def __post_init__(self):
         """Initialize derived values."""
@@ -85,6 +88,9 @@ class ServiceInstance:
     health_status: bool = True
     error_count: int = 0
     last_error: Optional[str] = None
+    init_duration: Optional[float] = None  # Seconds spent constructing, initializing and starting
+    health_latency: Optional[float] = None  # Seconds taken by the last health check
+    health_error: Optional[str] = None  # Why the last health check failed (None when healthy)
     
     @property
     def uptime(self) -> float:
@@ -114,6 +120,36 @@ class CircularDependencyError(ServiceContainerError):
     pass
 
 
+class LazyService:
+    """
+    Placeholder handed to listeners in lazy startup mode.
+    
+    The real service is resolved from the container on first attribute access,
+    so registering Slack handlers does not construct (or connect) anything.
+    """
+    
+    __slots__ = ('_container', '_service_type')
+    
+    def __init__(self, container: 'ServiceContainer', service_type: Type):
+        object.__setattr__(self, '_container', container)
+        object.__setattr__(self, '_service_type', service_type)
+    
+    def _resolve(self) -> Any:
+        return self._container.get(self._service_type)
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._resolve(), name, value)
+    
+    def __bool__(self) -> bool:
+        return True
+    
+    def __repr__(self) -> str:
+        return f"<LazyService {self._service_type.__name__}>"
+
+
 class ServiceContainer:
     """
     Comprehensive service container with dependency injection and lifecycle management.
@@ -121,6 +157,7 @@ class ServiceContainer:
     This container provides:
     - Service registration and discovery
     - Dependency injection with circular dependency detection
+    - Concurrent, dependency-ordered startup with per-service timeouts
     - Service lifecycle management (initialization, startup, shutdown)
     - Health monitoring and circuit breaker integration
     - Configuration management and validation
@@ -128,21 +165,34 @@ class ServiceContainer:
     - Thread-safe operations
     """
     
-    def __init__(self, config: Optional[AppConfig] = None):
+    def __init__(self, config: Optional[AppConfig] = None, startup_timeout: float = 30.0,
+                 health_check_timeout: float = 5.0):
         """
         Initialize service container.
         
         Args:
             config: Application configuration (defaults to global config)
+            startup_timeout: Default per-service startup timeout in seconds
+            health_check_timeout: Default per-service health check deadline in seconds
         """
         self.config = config or get_config()
+        self.lazy_startup = self.config.lazy_startup
         self._services: Dict[Type, ServiceDefinition] = {}
         self._instances: Dict[Type, ServiceInstance] = {}
         self._lock = threading.RLock()
+        self._creation_locks: Dict[Type, threading.Lock] = {}
+        self.startup_timeout = startup_timeout
+        self._startup_timeline: List[Dict[str, Any]] = []
+        self._startup_duration: Optional[float] = None
+        self._startup_loop: Optional[asyncio.AbstractEventLoop] = None
         self._initialization_order: List[Type] = []
         self._shutdown_handlers: List[Callable] = []
         self._health_check_interval = 30  # seconds
         self._health_check_task: Optional[asyncio.Task] = None
+        self.health_check_timeout = health_check_timeout
+        self._health_executor: Optional[ThreadPoolExecutor] = None
+        self._health_in_flight: Dict[Type, asyncio.Future] = {}
+        self._last_health_run: Optional[float] = None
         self._metrics = {
             'services_registered': 0,
             'services_initialized': 0,
@@ -164,7 +214,9 @@ class ServiceContainer:
                 health_check: Optional[Callable[[T], bool]] = None,
                 startup_priority: int = 100,
                 shutdown_priority: int = 100,
-                auto_start: bool = True) -> 'ServiceContainer':
+                auto_start: bool = True,
+                startup_timeout: Optional[float] = None,
+                health_check_timeout: Optional[float] = None) -> 'ServiceContainer':
         """
         Register a service with the container.
         
@@ -179,6 +231,8 @@ class ServiceContainer:
             startup_priority: Startup priority (lower = earlier)
             shutdown_priority: Shutdown priority (lower = earlier)
             auto_start: Whether to auto-start the service
+            startup_timeout: Startup timeout in seconds (defaults to the container's)
+            health_check_timeout: Health check deadline in seconds (defaults to the container's)
             
         Returns:
             Self for method chaining
@@ -194,7 +248,9 @@ class ServiceContainer:
                 health_check=health_check,
                 startup_priority=startup_priority,
                 shutdown_priority=shutdown_priority,
-                auto_start=auto_start
+                auto_start=auto_start,
+                startup_timeout=startup_timeout,
+                health_check_timeout=health_check_timeout
             )
             
             self._services[service_type] = definition
@@ -223,6 +279,10 @@ class ServiceContainer:
             ServiceNotFoundError: If service is not registered
             ServiceInitializationError: If service initialization fails
         """
+        return self._get_or_create(service_type, [])
+    
+    def _get_existing(self, service_type: Type[T]) -> Optional[T]:
+        """Return the ready instance of a service, or None if it must be created."""
         with self._lock:
             if service_type not in self._services:
                 raise ServiceNotFoundError(f"Service {service_type.__name__} is not registered")
@@ -237,9 +297,63 @@ class ServiceContainer:
                     raise ServiceInitializationError(
                         f"Service {service_type.__name__} is in failed state: {instance_info.last_error}"
                     )
+            return None
+    
+    def _get_or_create(self, service_type: Type[T], dependency_chain: List[Type]) -> T:
+        """
+        Get a service, creating it (and its dependencies) if needed.
+        
+        Creation is serialized per service type rather than container-wide, so
+        independent services can be constructed concurrently from different threads.
+        """
+        # Check for circular dependencies before waiting on any creation lock
+        if service_type in dependency_chain:
+            chain_str = " -> ".join([t.__name__ for t in dependency_chain + [service_type]])
+            raise CircularDependencyError(f"Circular dependency detected: {chain_str}")
+        
+        instance = self._get_existing(service_type)
+        if instance is not None:
+            return instance
+        
+        with self._lock:
+            creation_lock = self._creation_locks.setdefault(service_type, threading.Lock())
+        
+        with creation_lock:
+            # Another thread may have finished creating it while we waited
+            instance = self._get_existing(service_type)
+            if instance is not None:
+                return instance
+            return self._create_instance(service_type, dependency_chain)
+    
+    def get_lazy(self, service_type: Type[T]) -> T:
+        """
+        Get a proxy that constructs the service on first use.
+        
+        Args:
+            service_type: Service type to retrieve
+            
+        Returns:
+            LazyService proxy (typed as the service for callers)
             
-            # Create new instance
-            return self._create_instance(service_type)
+        Raises:
+            ServiceNotFoundError: If service is not registered
+        """
+        if not self.is_registered(service_type):
+            raise ServiceNotFoundError(f"Service {service_type.__name__} is not registered")
+        return LazyService(self, service_type)
+    
+    def resolve(self, service_type: Type[T]) -> T:
+        """
+        Get a service for handler wiring: a lazy proxy in lazy startup mode,
+        otherwise the constructed instance.
+        """
+        if self.lazy_startup:
+            return self.get_lazy(service_type)
+        return self.get(service_type)
+    
+    def is_registered(self, service_type: Type) -> bool:
+        """Check whether a service type is registered."""
+        return service_type in self._services
     
     def _create_instance(self, service_type: Type[T], 
                         dependency_chain: Optional[List[Type]] = None) -> T:
@@ -267,22 +381,22 @@ class ServiceContainer:
         
         definition = self._services[service_type]
         
+        # Resolve dependencies (reusing instances that already exist)
+        new_chain = dependency_chain + [service_type]
+        dependency_instances = [
+            self._get_or_create(dep_type, new_chain) for dep_type in definition.dependencies
+        ]
+        
         # Create service instance record
         instance_info = ServiceInstance(definition=definition)
-        self._instances[service_type] = instance_info
+        with self._lock:
+            self._instances[service_type] = instance_info
+        init_started = time.perf_counter()
         
         try:
             instance_info.state = ServiceState.INITIALIZING
             instance_info.created_at = time.time()
             
-            # Resolve dependencies
-            dependency_instances = []
-            new_chain = dependency_chain + [service_type]
-            
-            for dep_type in definition.dependencies:
-                dep_instance = self._create_instance(dep_type, new_chain)
-                dependency_instances.append(dep_instance)
-            
             # Create instance
             if definition.factory:
                 # Use factory function
@@ -296,9 +410,17 @@ class ServiceContainer:
             
             # Initialize instance if it has an initialize method
             if hasattr(instance, 'initialize') and callable(getattr(instance, 'initialize')):
-                if asyncio.iscoroutinefunction(instance.initialize):
+                if asyncio.iscoroutinefunction(instance.initialize) and self._on_startup_worker():
+                    # Concurrent startup: initialize on the application loop, wait from this worker
+                    asyncio.run_coroutine_threadsafe(instance.initialize(), self._startup_loop).result()
+                elif asyncio.iscoroutinefunction(instance.initialize):
                     # Handle async initialization
-                    loop = asyncio.get_event_loop()
+                    try:
+                        loop = asyncio.get_event_loop()
+                    except RuntimeError:
+                        # Worker thread without an event loop
+                        loop = asyncio.new_event_loop()
+                        asyncio.set_event_loop(loop)
                     if loop.is_running():
                         # Create a task for async initialization
                         task = loop.create_task(instance.initialize())
@@ -312,8 +434,9 @@ class ServiceContainer:
             
             instance_info.instance = instance
             instance_info.state = ServiceState.INITIALIZED
-            self._metrics['services_initialized'] += 1
-            self._metrics['total_initializations'] += 1
+            with self._lock:
+                self._metrics['services_initialized'] += 1
+                self._metrics['total_initializations'] += 1
             
             logger.info(f"Service initialized: {service_type.__name__}")
             
@@ -321,13 +444,16 @@ class ServiceContainer:
             if definition.auto_start:
                 self._start_service(instance_info)
             
+            instance_info.init_duration = time.perf_counter() - init_started
             return instance
             
         except Exception as e:
+            instance_info.init_duration = time.perf_counter() - init_started
             instance_info.state = ServiceState.FAILED
             instance_info.last_error = str(e)
             instance_info.error_count += 1
-            self._metrics['services_failed'] += 1
+            with self._lock:
+                self._metrics['services_failed'] += 1
             
             logger.error(
                 f"Failed to initialize service {service_type.__name__}: {e}",
@@ -338,6 +464,17 @@ class ServiceContainer:
                 f"Failed to initialize service {service_type.__name__}: {e}"
             ) from e
     
+    def _on_startup_worker(self) -> bool:
+        """True when called from a start_all_services worker thread (not the loop itself)."""
+        startup_loop = self._startup_loop
+        if startup_loop is None or not startup_loop.is_running():
+            return False
+        try:
+            asyncio.get_running_loop()
+            return False
+        except RuntimeError:
+            return True
+    
     def _start_service(self, instance_info: ServiceInstance) -> None:
         """Start a service instance."""
         try:
@@ -349,7 +486,8 @@ class ServiceContainer:
             
             instance_info.state = ServiceState.RUNNING
             instance_info.started_at = time.time()
-            self._metrics['services_started'] += 1
+            with self._lock:
+                self._metrics['services_started'] += 1
             
             logger.info(f"Service started: {instance_info.definition.service_type.__name__}")
             
@@ -363,27 +501,126 @@ class ServiceContainer:
                 exc_info=True
             )
     
-    async def start_all_services(self) -> None:
-        """Start all registered services in priority order."""
+    def _startup_graph(self) -> Dict[Type, List[Type]]:
+        """
+        Build the startup DAG: every auto-start service plus the services it depends on.
+        
+        Returns:
+            Mapping of service type to its dependency types, in startup priority order
+            
+        Raises:
+            ServiceNotFoundError: If a dependency is not registered
+            CircularDependencyError: If the dependencies contain a cycle
+        """
         with self._lock:
-            # Sort services by startup priority
-            services_by_priority = sorted(
-                self._services.items(),
-                key=lambda x: x[1].startup_priority
+            pending = sorted(
+                (t for t, d in self._services.items() if d.auto_start),
+                key=lambda t: self._services[t].startup_priority
             )
+            graph: Dict[Type, List[Type]] = {}
+            while pending:
+                service_type = pending.pop(0)
+                if service_type in graph:
+                    continue
+                if service_type not in self._services:
+                    raise ServiceNotFoundError(f"Service {service_type.__name__} is not registered")
+                graph[service_type] = list(self._services[service_type].dependencies)
+                pending.extend(graph[service_type])
+        
+        # Reject cycles up front (depth-first search with an explicit path)
+        visited = set()
+        
+        def visit(node: Type, path: List[Type]) -> None:
+            if node in path:
+                chain_str = " -> ".join(t.__name__ for t in path[path.index(node):] + [node])
+                raise CircularDependencyError(f"Circular dependency detected: {chain_str}")
+            if node in visited:
+                return
+            for dep in graph[node]:
+                visit(dep, path + [node])
+            visited.add(node)
+        
+        for node in graph:
+            visit(node, [])
+        
+        return graph
+    
+    async def start_all_services(self) -> None:
+        """
+        Start all auto-start services, concurrently where the dependency graph allows.
+        
+        Each service is constructed in a worker thread as soon as all of its
+        dependencies are running, bounded by its startup timeout. A service whose
+        dependency failed or timed out is skipped. Per-service timings are exposed
+        as ``startup_timeline`` in get_service_status().
+        """
+        graph = self._startup_graph()
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=max(len(graph), 1), thread_name_prefix='service-startup')
+        startup_began = time.perf_counter()
+        timeline: List[Dict[str, Any]] = []
+        tasks: Dict[Type, asyncio.Task] = {}
+        
+        async def start(service_type: Type) -> bool:
+            dependencies = graph[service_type]
+            dependency_results = await asyncio.gather(*(tasks[dep] for dep in dependencies))
+            entry = {
+                'service': service_type.__name__,
+                'dependencies': [dep.__name__ for dep in dependencies],
+                'start_offset_ms': round((time.perf_counter() - startup_began) * 1000, 1),
+                'duration_ms': 0.0,
+                'status': 'running',
+                'error': None
+            }
+            timeline.append(entry)
             
-            for service_type, definition in services_by_priority:
-                if definition.auto_start:
-                    try:
-                        # Get or create instance (this will auto-start it)
-                        self.get(service_type)
-                    except Exception as e:
-                        logger.error(f"Failed to start service {service_type.__name__}: {e}")
-            
-            # Start health monitoring
-            await self._start_health_monitoring()
+            if not all(dependency_results):
+                failed = [dep.__name__ for dep, ok in zip(dependencies, dependency_results) if not ok]
+                entry.update(status='skipped', error=f"Dependencies not started: {', '.join(failed)}")
+                logger.error(f"Skipping service {service_type.__name__}: {entry['error']}")
+                return False
             
-            logger.info("All services started")
+            definition = self._services[service_type]
+            timeout = definition.startup_timeout if definition.startup_timeout is not None else self.startup_timeout
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(loop.run_in_executor(executor, self.get, service_type), timeout)
+                return True
+            except asyncio.TimeoutError:
+                entry.update(status='timeout', error=f"Startup exceeded {timeout:.1f}s")
+                logger.error(f"Service {service_type.__name__} startup timed out after {timeout:.1f}s")
+                return False
+            except Exception as e:
+                entry.update(status='failed', error=str(e))
+                logger.error(f"Failed to start service {service_type.__name__}: {e}")
+                return False
+            finally:
+                entry['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        
+        self._startup_loop = loop
+        try:
+            # Graph order already follows startup priority, so ties start in priority order
+            for service_type in graph:
+                tasks[service_type] = asyncio.ensure_future(start(service_type))
+            results = await asyncio.gather(*tasks.values())
+        finally:
+            self._startup_loop = None
+            # Timed-out initializers keep running in their threads; don't wait for them
+            executor.shutdown(wait=False)
+        
+        self._startup_duration = time.perf_counter() - startup_began
+        with self._lock:
+            self._startup_timeline = sorted(timeline, key=lambda e: e['start_offset_ms'])
+        
+        # Start health monitoring
+        await self._start_health_monitoring()
+        
+        slowest = max(timeline, key=lambda e: e['duration_ms'], default=None)
+        logger.info(
+            f"All services started: {sum(results)}/{len(results)} running in "
+            f"{self._startup_duration * 1000:.0f}ms"
+            + (f" (slowest: {slowest['service']} {slowest['duration_ms']:.0f}ms)" if slowest else "")
+        )
     
     async def stop_all_services(self) -> None:
         """Stop all services in reverse priority order."""
@@ -442,7 +679,7 @@ class ServiceContainer:
             )
     
     async def _start_health_monitoring(self) -> None:
-        """Start health monitoring task."""
+        """Start health monitoring task (the first check runs immediately)."""
         if self._health_check_task is None or self._health_check_task.done():
             self._health_check_task = asyncio.create_task(self._health_check_loop())
             logger.info("Health monitoring started")
@@ -456,48 +693,142 @@ class ServiceContainer:
             except asyncio.CancelledError:
                 pass
             logger.info("Health monitoring stopped")
+        
+        if self._health_executor is not None:
+            self._health_executor.shutdown(wait=False)
+            self._health_executor = None
+            self._health_in_flight.clear()
     
     async def _health_check_loop(self) -> None:
         """Health check monitoring loop."""
         while True:
             try:
-                await asyncio.sleep(self._health_check_interval)
                 await self._perform_health_checks()
+                await asyncio.sleep(self._health_check_interval)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Health check loop error: {e}")
+                await asyncio.sleep(self._health_check_interval)
     
     async def _perform_health_checks(self) -> None:
-        """Perform health checks on all services."""
+        """
+        Run every running service's health check concurrently and cache the results.
+        
+        Sync checks (e.g. Postgres ``SELECT 1``, Alpaca availability) run in a small
+        thread pool so they never block the event loop. Each check is bounded by its
+        deadline; a check still running from a previous round is not started again.
+        Probe endpoints read the cached results via get_health_snapshot().
+        """
+        with self._lock:
+            targets = [
+                (service_type, instance_info)
+                for service_type, instance_info in self._instances.items()
+                if instance_info.instance and
+                instance_info.state == ServiceState.RUNNING and
+                instance_info.definition.health_check
+            ]
+        
+        if targets:
+            await asyncio.gather(*(self._run_health_check(t, info) for t, info in targets))
+        self._last_health_run = time.time()
+    
+    async def _run_health_check(self, service_type: Type, instance_info: ServiceInstance) -> None:
+        """Run one health check with its deadline and record the outcome."""
+        definition = instance_info.definition
+        timeout = (definition.health_check_timeout if definition.health_check_timeout is not None
+                   else self.health_check_timeout)
+        
+        in_flight = self._health_in_flight.get(service_type)
+        if in_flight is not None and not in_flight.done():
+            self._record_health(service_type, instance_info, False, None,
+                                f"Previous health check still running (over {timeout:.1f}s)")
+            return
+        
+        started = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(definition.health_check):
+                check = asyncio.ensure_future(definition.health_check(instance_info.instance))
+            else:
+                if self._health_executor is None:
+                    self._health_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='health-check')
+                check = asyncio.get_running_loop().run_in_executor(
+                    self._health_executor, definition.health_check, instance_info.instance
+                )
+            self._health_in_flight[service_type] = check
+            
+            # shield() so a missed deadline leaves the check running (and in flight) rather
+            # than cancelling it; the next round reports it instead of stacking another one
+            healthy = bool(await asyncio.wait_for(asyncio.shield(check), timeout))
+            error = None if healthy else "Health check returned unhealthy"
+        except asyncio.TimeoutError:
+            healthy, error = False, f"Health check exceeded {timeout:.1f}s deadline"
+        except Exception as e:
+            healthy, error = False, str(e)
+        
+        self._record_health(service_type, instance_info, healthy, time.perf_counter() - started, error)
+    
+    def _record_health(self, service_type: Type, instance_info: ServiceInstance,
+                       healthy: bool, latency: Optional[float], error: Optional[str]) -> None:
+        """Store a health check outcome on the service instance."""
         with self._lock:
+            self._metrics['total_health_checks'] += 1
+            instance_info.health_status = healthy
+            instance_info.health_latency = latency
+            instance_info.health_error = error
+            instance_info.last_health_check = time.time()
+            
+            if not healthy:
+                self._metrics['failed_health_checks'] += 1
+                instance_info.last_error = error
+                instance_info.error_count += 1
+        
+        if not healthy:
+            logger.warning(f"Health check failed for {service_type.__name__}: {error}")
+    
+    async def refresh_health(self) -> Dict[str, Any]:
+        """Run a health check round now and return the refreshed snapshot."""
+        await self._perform_health_checks()
+        return self.get_health_snapshot()
+    
+    def get_health_snapshot(self) -> Dict[str, Any]:
+        """
+        Get cached health check results without running any checks.
+        
+        A result is ``stale`` when it is older than two check intervals, i.e. the
+        monitoring loop has stopped or fallen behind.
+        
+        Returns:
+            Dict with overall ``healthy`` flag and per-service status, age and latency
+        """
+        now = time.time()
+        stale_after = self._health_check_interval * 2
+        
+        with self._lock:
+            services = {}
             for service_type, instance_info in self._instances.items():
-                if (instance_info.instance and 
-                    instance_info.state == ServiceState.RUNNING and
-                    instance_info.definition.health_check):
-                    
-                    try:
-                        self._metrics['total_health_checks'] += 1
-                        
-                        if asyncio.iscoroutinefunction(instance_info.definition.health_check):
-                            healthy = await instance_info.definition.health_check(instance_info.instance)
-                        else:
-                            healthy = instance_info.definition.health_check(instance_info.instance)
-                        
-                        instance_info.health_status = healthy
-                        instance_info.last_health_check = time.time()
-                        
-                        if not healthy:
-                            self._metrics['failed_health_checks'] += 1
-                            logger.warning(f"Health check failed for {service_type.__name__}")
-                        
-                    except Exception as e:
-                        instance_info.health_status = False
-                        instance_info.last_error = str(e)
-                        instance_info.error_count += 1
-                        self._metrics['failed_health_checks'] += 1
-                        
-                        logger.error(f"Health check error for {service_type.__name__}: {e}")
+                if not instance_info.definition.health_check:
+                    continue
+                checked_at = instance_info.last_health_check
+                age = now - checked_at if checked_at is not None else None
+                services[service_type.__name__] = {
+                    'healthy': instance_info.health_status and instance_info.state == ServiceState.RUNNING,
+                    'state': instance_info.state.value,
+                    'checked_at': checked_at,
+                    'age_seconds': round(age, 1) if age is not None else None,
+                    'stale': age is None or age > stale_after,
+                    'latency_ms': round(instance_info.health_latency * 1000, 1)
+                    if instance_info.health_latency is not None else None,
+                    'error': instance_info.health_error
+                }
+            last_run = self._last_health_run
+        
+        return {
+            'healthy': all(service['healthy'] for service in services.values()),
+            'last_run_at': last_run,
+            'stale': last_run is None or now - last_run > stale_after,
+            'services': services
+        }
     
     def get_service_status(self) -> Dict[str, Any]:
         """Get comprehensive service status information."""
@@ -507,6 +838,8 @@ class ServiceContainer:
             for service_type, instance_info in self._instances.items():
                 services_status[service_type.__name__] = {
                     'state': instance_info.state.value,
+                    'init_duration_ms': round(instance_info.init_duration * 1000, 1)
+                    if instance_info.init_duration is not None else None,
                     'health_status': instance_info.health_status,
                     'uptime': instance_info.uptime,
                     'error_count': instance_info.error_count,
@@ -521,7 +854,10 @@ class ServiceContainer:
                 'running_services': len([i for i in self._instances.values() 
                                        if i.state == ServiceState.RUNNING]),
                 'failed_services': len([i for i in self._instances.values() 
-                                      if i.state == ServiceState.FAILED])
+                                      if i.state == ServiceState.FAILED]),
+                'startup_duration_ms': round(self._startup_duration * 1000, 1)
+                if self._startup_duration is not None else None,
+                'startup_timeline': [dict(entry) for entry in self._startup_timeline]
             }
     
     def register_shutdown_handler(self, handler: Callable) -> None:
@@ -558,7 +894,7 @@ def _configure_default_services(container: ServiceContainer) -> None:
     def create_postgresql_service():
         from config.settings import get_config
         config = get_config()
-        return PostgreSQLService(config.database.database_url)
+        return PostgreSQLService(config.database.database_url, auto_migrate=config.database.auto_migrate)
     
     container.register(
         PostgreSQLService,
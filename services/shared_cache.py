@@ -0,0 +1,609 @@
+"""
+Two-tier cache shared by worker processes.
+
+Each worker used to keep its own quote, query, risk analysis, dashboard and
+session dicts, so every worker warmed its own copy and a session created by one
+worker was unknown to the next. SharedCache keeps that in-process dict as L1 and
+backs it with an L2 every worker reads:
+
+- Redis (REDIS_URL) when it is enabled, or
+- a SQLite file on /dev/shm (SHARED_CACHE_BACKEND=local) for hosts that run
+  several workers without Redis.
+
+Values are stored in L2 in the binary form of utils/codec.py. A write or delete
+publishes an invalidation so the other workers drop their L1 copy and reread L2
+on next use; Redis delivers it by PUBLISH, the local backend through a table its
+workers poll. An L1 copy is also reread once SHARED_CACHE_L1_TTL_SECONDS pass,
+in case an invalidation was missed. Without a backend a SharedCache is a plain
+per-process dict.
+
+SharedSetIndex keeps sets of strings per key (a user's session ids) whose adds
+and removes are single atomic L2 operations, so two workers adding members at
+once cannot drop each other's.
+
+Iteration, len() and clear() see only this worker's L1 copies. Async code uses
+aget()/aset()/adiscard()/adiscard_matching(): L1 is served in place and L2 I/O
+runs on a worker thread, so a slow Redis or a locked SQLite file does not stall
+the event loop.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from utils import codec
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = 'slackoms:cache:invalidate'
+
+
+class RedisCacheBackend:
+    """L2 in Redis; invalidations go out by PUBLISH on one channel."""
+
+    kind = 'redis'
+
+    def __init__(self, client, channel: str = INVALIDATION_CHANNEL):
+        """
+        Args:
+            client: redis.Redis client returning bytes (decode_responses=False)
+            channel: Pub/sub channel carrying invalidations
+        """
+        self.client = client
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._subscribers: Dict[str, List[weakref.WeakMethod]] = {}
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+        self._pubsub = None
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self.client.setex(key, max(1, int(ttl_seconds + 0.999)), value)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(key)
+
+    def delete_matching(self, prefix: str, text: str) -> None:
+        escaped = ''.join('\\' + c if c in '*?[]\\' else c for c in text)
+        keys = list(self.client.scan_iter(match=f"{prefix}*{escaped}*", count=500))
+        if keys:
+            self.client.delete(*keys)
+
+    def add_member(self, key: str, member: str, ttl_seconds: float) -> None:
+        self.client.sadd(key, member)
+        self.client.expire(key, max(1, int(ttl_seconds + 0.999)))
+
+    def remove_member(self, key: str, member: str) -> None:
+        self.client.srem(key, member)
+
+    def members(self, key: str) -> List[str]:
+        return sorted(m.decode() if isinstance(m, bytes) else m for m in self.client.smembers(key))
+
+    def publish(self, namespace: str, key: Optional[str] = None, match: Optional[str] = None) -> None:
+        self.client.publish(self.channel, _invalidation(self.origin, namespace, key, match))
+
+    def subscribe(self, namespace: str, callback: Callable[[Optional[str], Optional[str]], None]) -> None:
+        """Call ``callback(key, match)`` for invalidations other workers publish in ``namespace``."""
+        with self._lock:
+            self._subscribers.setdefault(namespace, []).append(weakref.WeakMethod(callback))
+            if self._listener is None:
+                self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                self._pubsub.subscribe(self.channel)
+                self._listener = threading.Thread(target=self._listen, name='shared-cache-invalidations',
+                                                  daemon=True)
+                self._listener.start()
+
+    def _listen(self) -> None:
+        while True:
+            pubsub = self._pubsub
+            if pubsub is None:
+                return
+            try:
+                message = pubsub.get_message(timeout=1.0)
+            except Exception as e:
+                logger.warning(f"Shared cache invalidation listener error: {e}")
+                time.sleep(1.0)
+                continue
+            if message and message.get('type') == 'message':
+                _dispatch(self, message['data'])
+
+    def close(self) -> None:
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            pubsub.close()
+        self.client.close()
+
+
+class LocalCacheBackend:
+    """L2 in a SQLite file on tmpfs, shared by the workers of one host."""
+
+    kind = 'local'
+
+    # Invalidations older than this are pruned; a poller that fell further behind rereads via the L1 TTL
+    INVALIDATION_RETENTION_SECONDS = 60.0
+
+    def __init__(self, path: str = '', poll_interval_seconds: float = 0.25):
+        """
+        Args:
+            path: SQLite file; empty puts slackoms-cache.sqlite3 in /dev/shm (or the temp directory)
+            poll_interval_seconds: How often the listener thread checks for invalidations
+        """
+        if not path:
+            directory = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+            path = os.path.join(directory, 'slackoms-cache.sqlite3')
+        self.path = path
+        self.poll_interval_seconds = poll_interval_seconds
+        self.origin = uuid.uuid4().hex
+        self._subscribers: Dict[str, List[weakref.WeakMethod]] = {}
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+        self._writes = 0
+        self._published = 0
+
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=OFF')  # tmpfs: nothing to make durable
+        self._conn.execute('CREATE TABLE IF NOT EXISTS entries '
+                           '(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS members (key TEXT NOT NULL, member TEXT NOT NULL, '
+                           'expires_at REAL NOT NULL, PRIMARY KEY (key, member))')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS invalidations '
+                           '(id INTEGER PRIMARY KEY AUTOINCREMENT, message TEXT NOT NULL, at REAL NOT NULL)')
+        self._last_seen = self._conn.execute('SELECT COALESCE(MAX(id), 0) FROM invalidations').fetchone()[0]
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM entries WHERE key = ? AND expires_at > ?',
+                                     (key, time.time())).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)',
+                               (key, value, now + ttl_seconds))
+            self._writes += 1
+            if self._writes % 1000 == 0:
+                self._conn.execute('DELETE FROM entries WHERE expires_at <= ?', (now,))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+
+    def delete_matching(self, prefix: str, text: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE substr(key, 1, ?) = ? AND instr(key, ?) > 0",
+                               (len(prefix), prefix, text))
+
+    def add_member(self, key: str, member: str, ttl_seconds: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO members (key, member, expires_at) VALUES (?, ?, ?)',
+                               (key, member, now + ttl_seconds))
+            self._conn.execute('DELETE FROM members WHERE key = ? AND expires_at <= ?', (key, now))
+
+    def remove_member(self, key: str, member: str) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM members WHERE key = ? AND member = ?', (key, member))
+
+    def members(self, key: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute('SELECT member FROM members WHERE key = ? AND expires_at > ? ORDER BY member',
+                                      (key, time.time())).fetchall()
+        return [row[0] for row in rows]
+
+    def publish(self, namespace: str, key: Optional[str] = None, match: Optional[str] = None) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute('INSERT INTO invalidations (message, at) VALUES (?, ?)',
+                               (_invalidation(self.origin, namespace, key, match), now))
+            self._published += 1
+            if self._published % 100 == 0:
+                self._conn.execute('DELETE FROM invalidations WHERE at < ?',
+                                   (now - self.INVALIDATION_RETENTION_SECONDS,))
+
+    def subscribe(self, namespace: str, callback: Callable[[Optional[str], Optional[str]], None]) -> None:
+        """Call ``callback(key, match)`` for invalidations other workers publish in ``namespace``."""
+        with self._lock:
+            self._subscribers.setdefault(namespace, []).append(weakref.WeakMethod(callback))
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._poll, name='shared-cache-invalidations',
+                                                  daemon=True)
+                self._listener.start()
+
+    def poll(self) -> int:
+        """Apply invalidations published since the last poll; returns how many were read."""
+        with self._lock:
+            rows = self._conn.execute('SELECT id, message FROM invalidations WHERE id > ? ORDER BY id',
+                                      (self._last_seen,)).fetchall()
+        if rows:
+            self._last_seen = rows[-1][0]
+        for _id, message in rows:
+            _dispatch(self, message)
+        return len(rows)
+
+    def _poll(self) -> None:
+        while not self._closed.wait(self.poll_interval_seconds):
+            try:
+                self.poll()
+            except sqlite3.Error as e:
+                logger.warning(f"Shared cache invalidation poll failed: {e}")
+
+    def close(self) -> None:
+        self._closed.set()
+        with self._lock:
+            self._conn.close()
+
+
+def _invalidation(origin: str, namespace: str, key: Optional[str], match: Optional[str]) -> str:
+    return json.dumps({'o': origin, 'n': namespace, 'k': key, 'm': match}, separators=(',', ':'))
+
+
+def _dispatch(backend, message) -> None:
+    """Hand one published invalidation to the backend's subscribers in its namespace."""
+    try:
+        data = json.loads(message)
+    except (TypeError, ValueError):
+        return
+    if data.get('o') == backend.origin:
+        return  # Our own write; our L1 already holds it
+    with backend._lock:
+        callbacks = list(backend._subscribers.get(data.get('n'), ()))
+    for ref in callbacks:
+        callback = ref()
+        if callback is not None:
+            callback(data.get('k'), data.get('m'))
+
+
+class SharedCache(MutableMapping):
+    """
+    Dict-like cache: an in-process L1 in front of an optional shared L2.
+
+    Example:
+        cache = SharedCache('query', ttl_seconds=300, backend=get_shared_cache_backend())
+        cache['trades:U123'] = (trades, time.time())
+        trades, cached_at = cache['trades:U123']  # Any worker
+        cache.discard_matching('U123')  # Drops the entry for every worker
+    """
+
+    def __init__(self, namespace: str, ttl_seconds: float, backend=None,
+                 l1_ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None,
+                 encode: Callable[[Any], bytes] = codec.dumps, decode: Callable[[bytes], Any] = codec.loads):
+        """
+        Args:
+            namespace: Prefix of this cache's keys in L2 and of its invalidations
+            ttl_seconds: L2 expiry of entries stored with ``cache[key] = value``
+            backend: RedisCacheBackend or LocalCacheBackend; None keeps the cache in this process
+            l1_ttl_seconds: Longest an L1 copy is served without rereading L2 (SHARED_CACHE_L1_TTL_SECONDS)
+            max_entries: L1 size; the oldest L1 copies are dropped beyond it (L2 keeps them)
+            encode: Turns a value into L2 bytes
+            decode: Turns L2 bytes back into a value
+        """
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.l1_ttl_seconds = l1_ttl_seconds
+        self.max_entries = max_entries
+        self._encode = encode
+        self._decode = decode
+        self._prefix = f"{namespace}:"
+        self._local: Dict[str, Tuple[Any, float]] = {}  # key -> (value, monotonic time L1 copy expires)
+        self._lock = threading.RLock()
+        self.backend = None
+        self.hits = {'l1': 0, 'l2': 0, 'miss': 0}
+        if backend is not None:
+            self.attach(backend)
+
+    def attach(self, backend) -> None:
+        """Back this cache with a shared L2 and start receiving its invalidations."""
+        if self.l1_ttl_seconds is None:
+            from config.settings import get_config
+            self.l1_ttl_seconds = get_config().shared_cache.l1_ttl_seconds
+        self.backend = backend
+        backend.subscribe(self.namespace, self._invalidated)
+
+    def __getitem__(self, key: str) -> Any:
+        entry = self._fresh_local(key)
+        if entry is not None:
+            return entry[0]
+
+        if self.backend is not None:
+            data = self._backend_call('read', self.backend.get, self._prefix + key)
+            if data is not None:
+                try:
+                    value = self._decode(data)
+                except (codec.CodecError, ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Discarding undecodable shared cache entry {self._prefix}{key}: {e}")
+                    self._backend_call('delete', self.backend.delete, self._prefix + key)
+                else:
+                    self.hits['l2'] += 1
+                    self._keep(key, value)
+                    return value
+
+        with self._lock:
+            self._local.pop(key, None)
+            self.hits['miss'] += 1
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.set(key, value)
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store ``value`` for every worker, expiring from L2 after ``ttl_seconds`` (the cache's TTL by default)."""
+        self._keep(key, value)
+        if self.backend is not None:
+            self._store(key, value, ttl_seconds)
+
+    def _store(self, key: str, value: Any, ttl_seconds: Optional[float]) -> None:
+        try:
+            data = self._encode(value)
+        except (codec.CodecError, AttributeError, TypeError) as e:
+            # Kept by this worker only; the others still drop their older copy below
+            logger.debug(f"Shared cache entry {self._prefix}{key} is not encodable, kept locally: {e}")
+            self._backend_call('delete', self.backend.delete, self._prefix + key)
+        else:
+            self._backend_call('write', self.backend.set, self._prefix + key, data,
+                               ttl_seconds or self.ttl_seconds)
+        self._backend_call('publish', self.backend.publish, self.namespace, key)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            found = self._local.pop(key, None) is not None
+        if self.backend is not None:
+            self._remove(key)
+        elif not found:
+            raise KeyError(key)
+
+    def _remove(self, key: str) -> None:
+        self._backend_call('delete', self.backend.delete, self._prefix + key)
+        self._backend_call('publish', self.backend.publish, self.namespace, key)
+
+    def discard(self, key: str) -> None:
+        """Delete ``key`` if present, for every worker."""
+        try:
+            del self[key]
+        except KeyError:
+            pass
+
+    def discard_matching(self, text: str) -> None:
+        """Delete every key containing ``text``, for every worker."""
+        with self._lock:
+            for key in [k for k in self._local if text in k]:
+                del self._local[key]
+        if self.backend is not None:
+            self._remove_matching(text)
+
+    def _remove_matching(self, text: str) -> None:
+        self._backend_call('delete', self.backend.delete_matching, self._prefix, text)
+        self._backend_call('publish', self.backend.publish, self.namespace, None, text)
+
+    # Async API: L2 I/O off the event loop
+
+    async def aget(self, key: str, default: Any = None) -> Any:
+        """get() for async code: an L1 copy is returned in place, an L2 read runs on a worker thread."""
+        entry = self._fresh_local(key)
+        if entry is not None:
+            return entry[0]
+        if self.backend is None:
+            with self._lock:
+                self.hits['miss'] += 1
+            return default
+        return await asyncio.to_thread(self.get, key, default)
+
+    async def aset(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """set() for async code: L1 is updated at once, the L2 write and invalidation run on a worker thread."""
+        self._keep(key, value)
+        if self.backend is not None:
+            await asyncio.to_thread(self._store, key, value, ttl_seconds)
+
+    async def adiscard(self, key: str) -> None:
+        """discard() for async code."""
+        with self._lock:
+            self._local.pop(key, None)
+        if self.backend is not None:
+            await asyncio.to_thread(self._remove, key)
+
+    async def adiscard_matching(self, text: str) -> None:
+        """discard_matching() for async code."""
+        with self._lock:
+            for key in [k for k in self._local if text in k]:
+                del self._local[key]
+        if self.backend is not None:
+            await asyncio.to_thread(self._remove_matching, text)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._local))
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+    def items(self) -> List[Tuple[str, Any]]:
+        """This worker's L1 copies, as a snapshot."""
+        with self._lock:
+            return [(key, value) for key, (value, _expires) in self._local.items()]
+
+    def values(self) -> List[Any]:
+        """This worker's L1 copies, as a snapshot."""
+        with self._lock:
+            return [value for value, _expires in self._local.values()]
+
+    def clear(self) -> None:
+        """Drop this worker's L1 copies; the shared entries stay for the other workers."""
+        with self._lock:
+            self._local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Lookup counts by tier, for /health."""
+        lookups = sum(self.hits.values())
+        return {
+            'backend': self.backend.kind if self.backend is not None else None,
+            'l1_entries': len(self._local),
+            'l1_hits': self.hits['l1'],
+            'l2_hits': self.hits['l2'],
+            'misses': self.hits['miss'],
+            'hit_rate': round((self.hits['l1'] + self.hits['l2']) / lookups, 3) if lookups else None
+        }
+
+    def _fresh_local(self, key: str) -> Optional[Tuple[Any, float]]:
+        """The L1 entry for ``key`` while it may be served without rereading L2 (counted as an L1 hit)."""
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None and (self.backend is None or time.monotonic() < entry[1]):
+                self.hits['l1'] += 1
+                return entry
+        return None
+
+    def _keep(self, key: str, value: Any) -> None:
+        expires = time.monotonic() + self.l1_ttl_seconds if self.backend is not None else 0.0
+        with self._lock:
+            self._local.pop(key, None)  # Re-insert so dict order is L1 age
+            self._local[key] = (value, expires)
+            if self.max_entries is not None:
+                while len(self._local) > self.max_entries:
+                    del self._local[next(iter(self._local))]
+
+    def _invalidated(self, key: Optional[str], match: Optional[str]) -> None:
+        """Another worker changed ``key`` (or every key containing ``match``)."""
+        with self._lock:
+            if key is not None:
+                self._local.pop(key, None)
+            elif match is not None:
+                for stale in [k for k in self._local if match in k]:
+                    del self._local[stale]
+
+    def _backend_call(self, action: str, fn: Callable, *args) -> Any:
+        # L2 trouble must not fail the request; the worker carries on with its L1
+        try:
+            return fn(*args)
+        except Exception as e:
+            logger.warning(f"Shared cache {action} failed for {self.namespace}: {e}")
+            return None
+
+
+class SharedSetIndex:
+    """
+    Sets of strings by key, shared by the workers; each add or remove is one atomic L2 operation.
+
+    There is no L1: members() always reads L2 (on a worker thread), so it never
+    serves a set another worker has since changed.
+
+    Example:
+        sessions = SharedSetIndex('user_sessions', ttl_seconds=8 * 3600, backend=get_shared_cache_backend())
+        await sessions.add('U123', session_id)
+        await sessions.members('U123')  # Any worker
+    """
+
+    def __init__(self, namespace: str, ttl_seconds: float, backend=None):
+        """
+        Args:
+            namespace: Prefix of this index's keys in L2
+            ttl_seconds: L2 expiry of a member, renewed by adding it again
+            backend: RedisCacheBackend or LocalCacheBackend; None keeps the sets in this process
+        """
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self._prefix = f"{namespace}:"
+        self._local: Dict[str, set] = {}
+        self._lock = threading.Lock()
+
+    async def add(self, key: str, member: str) -> None:
+        if self.backend is None:
+            with self._lock:
+                self._local.setdefault(key, set()).add(member)
+            return
+        await asyncio.to_thread(self._backend_call, 'add', self.backend.add_member,
+                                self._prefix + key, member, self.ttl_seconds)
+
+    async def remove(self, key: str, member: str) -> None:
+        if self.backend is None:
+            with self._lock:
+                members = self._local.get(key)
+                if members is not None:
+                    members.discard(member)
+                    if not members:
+                        del self._local[key]
+            return
+        await asyncio.to_thread(self._backend_call, 'remove', self.backend.remove_member,
+                                self._prefix + key, member)
+
+    async def members(self, key: str) -> List[str]:
+        """The set's members, sorted; empty when the key has none."""
+        if self.backend is None:
+            with self._lock:
+                return sorted(self._local.get(key, ()))
+        return await asyncio.to_thread(self._backend_call, 'read', self.backend.members, self._prefix + key) or []
+
+    def _backend_call(self, action: str, fn: Callable, *args) -> Any:
+        try:
+            return fn(*args)
+        except Exception as e:
+            logger.warning(f"Shared set {action} failed for {self.namespace}: {e}")
+            return None
+
+
+# Process-wide backend shared by every SharedCache
+_backend = None
+_backend_resolved = False
+_backend_lock = threading.Lock()
+
+
+def get_shared_cache_backend():
+    """
+    Get or create the process-wide shared cache backend.
+
+    Returns:
+        RedisCacheBackend, LocalCacheBackend, or None when caches stay per process
+        (SHARED_CACHE_BACKEND=none, or auto without REDIS_ENABLED, or Redis unreachable)
+    """
+    global _backend, _backend_resolved
+
+    if not _backend_resolved:
+        with _backend_lock:
+            if not _backend_resolved:
+                _backend = _create_backend()
+                _backend_resolved = True
+
+    return _backend
+
+
+def _create_backend():
+    from config.settings import get_config
+    config = get_config().shared_cache
+    kind = config.resolved_backend
+
+    if kind == 'redis':
+        try:
+            import redis
+            client = redis.Redis.from_url(config.redis_url, decode_responses=False,
+                                          socket_timeout=0.5, socket_connect_timeout=1.0)
+            client.ping()
+            logger.info("Shared cache tier using Redis")
+            return RedisCacheBackend(client)
+        except Exception as e:
+            logger.warning(f"Shared cache Redis unavailable, caches stay per process: {e}")
+            return None
+
+    if kind == 'local':
+        try:
+            backend = LocalCacheBackend(config.local_path, config.poll_interval_seconds)
+            logger.info(f"Shared cache tier using {backend.path}")
+            return backend
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache file unavailable, caches stay per process: {e}")
+            return None
+
+    return None
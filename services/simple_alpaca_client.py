@@ -12,6 +12,8 @@ from typing import Dict, Any, Optional
 from datetime import datetime
 import base64
 
+from services.profiling import profiled
+
 logger = logging.getLogger(__name__)
 
 class SimpleAlpacaClient:
@@ -32,6 +34,11 @@ class SimpleAlpacaClient:
         
         logger.info(f"SimpleAlpacaClient initialized for {base_url}")
     
+    def is_available(self) -> bool:
+        """Check if the client has credentials configured."""
+        return bool(self.api_key and self.secret_key)
+    
+    @profiled('alpaca.get_account')
     def get_account(self) -> Optional[Dict[str, Any]]:
         """Get account information."""
         try:
@@ -51,6 +58,7 @@ class SimpleAlpacaClient:
             logger.error(f"Error getting account: {e}")
             return None
     
+    @profiled('alpaca.submit_order')
     def submit_order(self, symbol: str, qty: int, side: str, 
                     order_type: str = "market", time_in_force: str = "day") -> Optional[Dict[str, Any]]:
         """Submit a paper trading order."""
@@ -80,6 +88,7 @@ class SimpleAlpacaClient:
             logger.error(f"Error submitting order: {e}")
             return None
     
+    @profiled('alpaca.get_positions')
     def get_positions(self) -> Optional[list]:
         """Get all positions."""
         try:
@@ -99,6 +108,55 @@ class SimpleAlpacaClient:
             logger.error(f"Error getting positions: {e}")
             return None
     
+    @profiled('alpaca.get_asset')
+    def get_asset(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Get a single asset."""
+        try:
+            response = requests.get(
+                f"{self.base_url}/v2/assets/{symbol.upper()}",
+                headers=self.headers,
+                timeout=10
+            )
+            
+            if response.status_code == 200:
+                return response.json()
+            elif response.status_code == 404:
+                return None
+            else:
+                logger.error(f"Failed to get asset {symbol}: {response.status_code} - {response.text}")
+                return None
+                
+        except Exception as e:
+            logger.error(f"Error getting asset {symbol}: {e}")
+            return None
+    
+    @profiled('alpaca.list_assets')
+    def list_assets(self, status: str = "active", asset_class: str = "us_equity") -> Optional[list]:
+        """List all assets (bulk, used to build the local asset universe)."""
+        try:
+            params = {
+                "status": status,
+                "asset_class": asset_class
+            }
+            
+            response = requests.get(
+                f"{self.base_url}/v2/assets",
+                headers=self.headers,
+                params=params,
+                timeout=60
+            )
+            
+            if response.status_code == 200:
+                return response.json()
+            else:
+                logger.error(f"Failed to list assets: {response.status_code} - {response.text}")
+                return None
+                
+        except Exception as e:
+            logger.error(f"Error listing assets: {e}")
+            return None
+    
+    @profiled('alpaca.get_orders')
     def get_orders(self, status: str = "all", limit: int = 50) -> Optional[list]:
         """Get orders."""
         try:
@@ -124,6 +182,7 @@ class SimpleAlpacaClient:
             logger.error(f"Error getting orders: {e}")
             return None
     
+    @profiled('alpaca.is_market_open')
     def is_market_open(self) -> bool:
         """Check if market is open."""
         try:
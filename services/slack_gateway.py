@@ -0,0 +1,502 @@
+"""
+Outbound Slack Web API gateway.
+
+Every Slack call (views.update, views.open, chat.postEphemeral, users.info, ...) goes
+through one SlackGateway instead of leaving directly from whichever listener made it:
+
+- One async client on a pooled aiohttp session, run on the gateway's own event-loop
+  thread, so connections to Slack are reused across requests.
+- A token bucket per API method, sized from Slack's published rate tiers. A burst
+  of views.update calls waits for tokens instead of drawing 429s.
+- On a 429 the method's bucket pauses for the response's Retry-After and the call
+  is retried, up to SLACK_GATEWAY_MAX_RETRIES times.
+- Calls bound to a trigger_id (views.open, views.push) skip the queue: the
+  trigger expires 3s after the user's action, so they are sent at once (still
+  drawing a token) and a 429 fails them instead of waiting out Retry-After.
+- Calls waiting on a bucket leave in priority order: a trade confirmation is sent
+  before a queued quote refresh. The priority comes from ``slack_priority()``,
+  which ProfiledApp (bolt_app.py) sets for each Slack request it dispatches.
+- Per-method latency, queue wait, 429 and error metrics in the shared registry.
+
+Listeners keep using the ``client`` Bolt injects: it is a GatewayWebClient, a
+WebClient whose api_call() submits to the gateway and blocks the listener thread
+until Slack answers, for at most SLACK_GATEWAY_CALL_TIMEOUT (2s by default, inside
+Slack's 3s ack and trigger_id deadlines). Async code awaits
+``get_slack_gateway().call(...)``.
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import aiohttp
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
+from slack_sdk.web.slack_response import SlackResponse
+
+from config.settings import SlackGatewayConfig, get_config
+from services.metrics import MetricsRegistry, get_metrics_registry
+from services.modal_updates import get_modal_coalescer
+from services.profiling import span
+from utils.serializers import json_dumps
+
+logger = logging.getLogger(__name__)
+
+
+class SlackPriority(IntEnum):
+    """Order in which queued calls for the same method are sent (lowest first)."""
+    TRADE_CONFIRMATION = 0  # Trade submissions, fills and their confirmations
+    INTERACTIVE = 1  # Slash commands: views.open must beat the 3s trigger_id expiry
+    NORMAL = 2
+    QUOTE_REFRESH = 3  # Live quote and modal field updates; superseded quickly anyway
+    BACKGROUND = 4  # Events API work such as App Home publishes
+
+
+# Requests per minute for each tier (https://api.slack.com/apis/rate-limits)
+TIER_RATES = {1: 1, 2: 20, 3: 50, 4: 100}
+METHOD_TIERS = {
+    'views.open': 4,
+    'views.update': 4,
+    'views.push': 4,
+    'views.publish': 4,
+    'views.info': 4,
+    'chat.postEphemeral': 4,
+    'users.info': 4,
+    'auth.test': 4,
+    'chat.update': 3,
+    'chat.delete': 3,
+    'conversations.info': 3,
+    'conversations.members': 4,
+}
+DEFAULT_TIER = 3
+# chat.postMessage is outside the tiers: about one message per second per channel
+SPECIAL_RATES = {'chat.postMessage': 60}
+# Methods that consume a trigger_id, which Slack honours for 3 seconds
+TRIGGER_ID_METHODS = frozenset({'views.open', 'views.push', 'dialog.open'})
+
+TRADE_ACTIONS = {'buy_shares', 'sell_shares', 'cancel_trade', 'execute_trade', 'confirm_trade'}
+QUOTE_ACTION_PREFIXES = ('refresh', 'quick_symbol', 'get_market_data', 'symbol_input', 'shares_input',
+                         'gmv_input', 'limit_price_input', 'trade_side_radio', 'order_type_select')
+
+_current_priority: contextvars.ContextVar[SlackPriority] = contextvars.ContextVar(
+    'slack_priority', default=SlackPriority.NORMAL)
+
+
+@contextmanager
+def slack_priority(priority: SlackPriority) -> Iterator[None]:
+    """Send the Slack calls made inside this block at ``priority``."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def request_priority(body: Dict[str, Any]) -> SlackPriority:
+    """Priority for the Slack calls made while handling an incoming Slack request."""
+    request_type = body.get('type')
+    if request_type == 'view_submission':
+        return SlackPriority.TRADE_CONFIRMATION
+    if request_type == 'block_actions' and body.get('actions'):
+        action_id = body['actions'][0].get('action_id', '')
+        if action_id in TRADE_ACTIONS:
+            return SlackPriority.TRADE_CONFIRMATION
+        if action_id.startswith(QUOTE_ACTION_PREFIXES):
+            return SlackPriority.QUOTE_REFRESH
+        return SlackPriority.NORMAL
+    if body.get('command'):
+        return SlackPriority.INTERACTIVE
+    if request_type == 'event_callback':
+        return SlackPriority.BACKGROUND
+    return SlackPriority.NORMAL
+
+
+def is_trigger_bound(api_method: str, kwargs: Dict[str, Any]) -> bool:
+    """Whether a call spends a trigger_id and so cannot wait in a queue."""
+    if api_method in TRIGGER_ID_METHODS:
+        return True
+    return any(isinstance(kwargs.get(part), dict) and 'trigger_id' in kwargs[part]
+               for part in ('json', 'data', 'params'))
+
+
+def method_rate_per_minute(api_method: str) -> float:
+    """Slack's documented rate for a method, in requests per minute."""
+    if api_method in SPECIAL_RATES:
+        return SPECIAL_RATES[api_method]
+    return TIER_RATES[METHOD_TIERS.get(api_method, DEFAULT_TIER)]
+
+
+class _Call:
+    """One queued API call."""
+
+    __slots__ = ('api_method', 'kwargs', 'token', 'priority', 'future', 'enqueued_at', 'attempts',
+                 'trigger_bound')
+
+    def __init__(self, api_method: str, kwargs: Dict[str, Any], token: Optional[str],
+                 priority: SlackPriority, future: asyncio.Future):
+        self.api_method = api_method
+        self.kwargs = kwargs
+        self.token = token
+        self.priority = priority
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        self.attempts = 0
+        self.trigger_bound = is_trigger_bound(api_method, kwargs)
+
+
+class _MethodLane:
+    """Token bucket and priority queue for one API method. Used only on the gateway loop."""
+
+    def __init__(self, api_method: str, per_minute: float, burst_seconds: float):
+        self.api_method = api_method
+        self.rate = per_minute / 60
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.queue: List[Tuple[int, int, _Call]] = []
+        self.ready = asyncio.Event()
+        self.worker: Optional[asyncio.Task] = None
+
+    def push(self, call: _Call, sequence: int) -> None:
+        heapq.heappush(self.queue, (call.priority, sequence, call))
+        self.ready.set()
+
+    def pause(self, seconds: float) -> None:
+        """Hold every call for this method, e.g. for a 429's Retry-After."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+    def take(self) -> None:
+        """Spend a token now, even into debt: queued calls then wait for it to be repaid."""
+        self.seconds_until_token()
+        self.tokens -= 1
+
+    def seconds_until_token(self) -> float:
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+        self.tokens = min(self.capacity, self.tokens + (now - max(self.updated, self.paused_until)) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class SlackGateway:
+    """
+    Paced, prioritized, retrying sender for all outbound Slack Web API calls.
+
+    The gateway starts its event-loop thread and HTTP session on first use.
+    """
+
+    def __init__(self, config: Optional[SlackGatewayConfig] = None, registry: Optional[MetricsRegistry] = None,
+                 token: Optional[str] = None, base_url: Optional[str] = None):
+        config = config or get_config().slack_gateway
+        registry = registry or get_metrics_registry()
+        self.enabled = config.enabled
+        self.max_connections = config.max_connections
+        self.max_retries = config.max_retries
+        self.burst_seconds = config.burst_seconds
+        self.rate_scale = config.rate_scale
+        self.request_timeout = config.request_timeout_seconds
+        self.call_timeout = config.call_timeout_seconds
+        self.token = token or get_config().slack.bot_token
+        self.base_url = base_url or get_config().slack.api_url
+
+        self.latency = registry.histogram(
+            'slack_api_duration_seconds', 'Slack Web API call latency by method', ('method',))
+        self.queue_wait = registry.histogram(
+            'slack_api_queue_wait_seconds', 'Time Slack calls wait for a rate-limit token', ('method', 'priority'))
+        self.rate_limited = registry.counter(
+            'slack_api_rate_limited', 'HTTP 429 responses from Slack by method', ('method',))
+        self.errors = registry.counter(
+            'slack_api_errors', 'Failed Slack Web API calls by method and error', ('method', 'error'))
+        registry.gauge('slack_api_queued_calls', 'Slack calls waiting for a rate-limit token').set_function(
+            self.queued_calls)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._clients: Dict[str, AsyncWebClient] = {}
+        self._lanes: Dict[str, _MethodLane] = {}
+        self._sequence = itertools.count()
+        self._start_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the gateway loop thread if it is not running."""
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            started = threading.Event()
+            self._loop = asyncio.new_event_loop()
+
+            def run() -> None:
+                asyncio.set_event_loop(self._loop)
+                self._loop.call_soon(started.set)
+                self._loop.run_forever()
+
+            self._thread = threading.Thread(target=run, name='slack-gateway', daemon=True)
+            self._thread.start()
+            started.wait()
+            logger.info("Slack gateway started")
+
+    def stop(self) -> None:
+        """Fail queued calls, close the HTTP session and stop the loop thread."""
+        with self._start_lock:
+            if self._loop is None:
+                return
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout=10)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+        logger.info("Slack gateway stopped")
+
+    async def call(self, api_method: str, priority: Optional[SlackPriority] = None,
+                   token: Optional[str] = None, **kwargs) -> Any:
+        """
+        Send an API call through the gateway from any event loop.
+
+        Args:
+            api_method: Slack method name, e.g. ``views.update``
+            priority: Queue priority (defaults to the current ``slack_priority()``)
+            token: Token to send instead of the bot token
+            **kwargs: ``AsyncWebClient.api_call`` arguments (json, data, params, http_verb, ...)
+
+        Returns:
+            AsyncSlackResponse: The validated response
+
+        Raises:
+            SlackApiError: Slack rejected the call (including 429s past the retry limit)
+        """
+        future = self.submit(api_method, priority, token, kwargs)
+        return await asyncio.wrap_future(future)
+
+    def call_sync(self, api_method: str, priority: Optional[SlackPriority] = None,
+                  token: Optional[str] = None, **kwargs) -> Any:
+        """Blocking form of call() for sync code such as Bolt listeners."""
+        future = self.submit(api_method, priority, token, kwargs)
+        try:
+            return future.result(timeout=self.call_timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            self.errors.inc(api_method, 'gateway_timeout')
+            raise
+
+    def submit(self, api_method: str, priority: Optional[SlackPriority], token: Optional[str],
+               kwargs: Dict[str, Any]) -> concurrent.futures.Future:
+        """Queue a call; the returned future resolves with the response."""
+        self.start()
+        priority = _current_priority.get() if priority is None else priority
+        return asyncio.run_coroutine_threadsafe(self._enqueue(api_method, kwargs, token, priority), self._loop)
+
+    def queued_calls(self) -> int:
+        """Calls currently waiting for a token, across all methods."""
+        return sum(len(lane.queue) for lane in list(self._lanes.values()))
+
+    def get_status(self) -> Dict[str, Any]:
+        """Per-method bucket state for health and admin endpoints."""
+        now = time.monotonic()
+        return {
+            'enabled': self.enabled,
+            'running': self._thread is not None and self._thread.is_alive(),
+            'queued_calls': self.queued_calls(),
+            'methods': {
+                name: {
+                    'rate_per_minute': round(lane.rate * 60, 1),
+                    'queued': len(lane.queue),
+                    'paused_for_seconds': round(max(0.0, lane.paused_until - now), 2),
+                    'rate_limited': int(self.rate_limited.value(name))
+                }
+                for name, lane in list(self._lanes.items())
+            }
+        }
+
+    async def _enqueue(self, api_method: str, kwargs: Dict[str, Any], token: Optional[str],
+                       priority: SlackPriority) -> Any:
+        call = _Call(api_method, kwargs, token, priority, self._loop.create_future())
+        lane = self._lane(api_method)
+        if call.trigger_bound:
+            lane.take()
+            self._loop.create_task(self._send(lane, call))
+        else:
+            lane.push(call, next(self._sequence))
+        return await call.future
+
+    def _lane(self, api_method: str) -> _MethodLane:
+        lane = self._lanes.get(api_method)
+        if lane is None:
+            lane = _MethodLane(api_method, method_rate_per_minute(api_method) * self.rate_scale, self.burst_seconds)
+            lane.worker = self._loop.create_task(self._drain(lane))
+            self._lanes[api_method] = lane
+        return lane
+
+    async def _drain(self, lane: _MethodLane) -> None:
+        """Release queued calls for one method as tokens become available, best priority first."""
+        while True:
+            if not lane.queue:
+                lane.ready.clear()
+                await lane.ready.wait()
+                continue
+            wait = lane.seconds_until_token()
+            if wait > 0:
+                # Re-check after the wait: a higher-priority call may have arrived meanwhile
+                await asyncio.sleep(wait)
+                continue
+            lane.tokens -= 1
+            _, _, call = heapq.heappop(lane.queue)
+            if call.future.done():
+                lane.tokens += 1  # Caller gave up (timeout/cancel); don't spend the token
+                continue
+            self._loop.create_task(self._send(lane, call))
+
+    async def _send(self, lane: _MethodLane, call: _Call) -> None:
+        started = time.monotonic()
+        self.queue_wait.observe(started - call.enqueued_at, call.api_method, call.priority.name.lower())
+        try:
+            response = await self._client(call.token).api_call(call.api_method, **call.kwargs)
+        except SlackApiError as e:
+            self.latency.observe(time.monotonic() - started, call.api_method)
+            if e.response.status_code == 429:
+                self.rate_limited.inc(call.api_method)
+                retry_after = _retry_after_seconds(e.response.headers)
+                lane.pause(retry_after)
+                # A trigger_id would expire while waiting out Retry-After
+                if not call.trigger_bound and call.attempts < self.max_retries and not call.future.done():
+                    call.attempts += 1
+                    call.enqueued_at = time.monotonic()
+                    logger.warning(f"Slack rate-limited {call.api_method}; retrying in {retry_after:.1f}s "
+                                   f"(attempt {call.attempts}/{self.max_retries})")
+                    lane.push(call, next(self._sequence))
+                    return
+            self.errors.inc(call.api_method, str(e.response.get('error') or e.response.status_code))
+            if not call.future.done():
+                call.future.set_exception(e)
+        except Exception as e:
+            self.latency.observe(time.monotonic() - started, call.api_method)
+            self.errors.inc(call.api_method, type(e).__name__)
+            if not call.future.done():
+                call.future.set_exception(e)
+        else:
+            self.latency.observe(time.monotonic() - started, call.api_method)
+            if not call.future.done():
+                call.future.set_result(response)
+
+    def _client(self, token: Optional[str]) -> AsyncWebClient:
+        token = token or self.token
+        client = self._clients.get(token)
+        if client is None:
+            if self._session is None:
+                # json_dumps writes pre-rendered Block Kit views (ui/block_templates.py) as-is
+                self._session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=self.max_connections),
+                    timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+                    json_serialize=json_dumps
+                )
+            client = AsyncWebClient(token=token, base_url=self.base_url, session=self._session,
+                                    timeout=self.request_timeout)
+            self._clients[token] = client
+        return client
+
+    async def _shutdown(self) -> None:
+        workers = [lane.worker for lane in self._lanes.values() if lane.worker is not None]
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        for lane in self._lanes.values():
+            for _, _, call in lane.queue:
+                if not call.future.done():
+                    call.future.set_exception(RuntimeError("Slack gateway stopped"))
+            lane.queue.clear()
+        self._lanes.clear()
+        self._clients.clear()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+# Responses carrying the view's new hash, which the modal coalescer needs for its next update
+_VIEW_METHODS = frozenset({'views.open', 'views.update', 'views.push'})
+
+
+def _retry_after_seconds(headers: Any) -> float:
+    """Retry-After from a 429 response, in seconds (Slack sends whole seconds)."""
+    value = None
+    if headers:
+        value = headers.get('Retry-After') or headers.get('retry-after')
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return 1.0
+
+
+class GatewayWebClient(WebClient):
+    """
+    WebClient whose API calls go through the Slack gateway.
+
+    Drop-in for the WebClient Bolt hands to listeners: same methods, same
+    SlackResponse and SlackApiError. File uploads bypass the gateway.
+    """
+
+    def __init__(self, *args, gateway: Optional[SlackGateway] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gateway = gateway
+
+    def api_call(self, api_method: str, *, http_verb: str = 'POST', files: Optional[dict] = None,
+                 data: Optional[dict] = None, params: Optional[dict] = None, json: Optional[dict] = None,
+                 headers: Optional[dict] = None, auth: Optional[dict] = None) -> SlackResponse:
+        with span(f"slack.{api_method}"):
+            gateway = self.gateway or get_slack_gateway()
+            if not gateway.enabled or files or auth:
+                response = super().api_call(api_method, http_verb=http_verb, files=files, data=data,
+                                            params=params, json=json, headers=headers, auth=auth)
+            else:
+                kwargs = {'http_verb': http_verb, 'data': data, 'params': params, 'json': json, 'headers': headers}
+                try:
+                    gateway_response = gateway.call_sync(api_method, token=self.token, **kwargs)
+                except SlackApiError as e:
+                    sync_response = self._to_sync_response(api_method, http_verb, kwargs, e.response)
+                    raise SlackApiError(f"The request to the Slack API failed. (url: {sync_response.api_url})",
+                                        sync_response) from None
+                response = self._to_sync_response(api_method, http_verb, kwargs, gateway_response)
+
+            if api_method in _VIEW_METHODS:
+                get_modal_coalescer().observe(response.get('view'))
+            return response
+
+    def _to_sync_response(self, api_method: str, http_verb: str, kwargs: Dict[str, Any], response) -> SlackResponse:
+        return SlackResponse(
+            client=self,
+            http_verb=http_verb,
+            api_url=f"{self.base_url}{api_method}",
+            req_args={k: v for k, v in kwargs.items() if v is not None and k != 'http_verb'},
+            data=response.data,
+            headers=dict(response.headers),
+            status_code=response.status_code
+        )
+
+
+# Global gateway instance
+_slack_gateway: Optional[SlackGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_slack_gateway() -> SlackGateway:
+    """Get the global Slack gateway."""
+    global _slack_gateway
+    if _slack_gateway is None:
+        with _gateway_lock:
+            if _slack_gateway is None:
+                _slack_gateway = SlackGateway()
+    return _slack_gateway
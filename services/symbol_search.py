@@ -0,0 +1,316 @@
+"""
+In-memory typeahead symbol search.
+
+Backs the Slack ``external_select`` symbol picker. The index is built from the local
+asset universe and answers every keystroke without network access:
+
+- ticker prefix matches (binary search over the sorted symbol array)
+- company-name word prefix matches (binary search over a sorted word list)
+- one-edit typo tolerance on tickers (symmetric-delete lookup table)
+
+Results are ranked by match quality, boosted by how often a symbol is picked
+(popularity) and by the requesting user's recently picked symbols.
+"""
+
+import bisect
+import heapq
+import logging
+import math
+import re
+import threading
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from services.asset_universe import AssetUniverse, get_asset_universe
+
+logger = logging.getLogger(__name__)
+
+# Slack limits for option objects
+SLACK_OPTION_TEXT_LIMIT = 75
+SLACK_MAX_OPTIONS = 100
+
+# Ranking weights
+SCORE_EXACT = 1000.0
+SCORE_SYMBOL_PREFIX = 600.0
+SCORE_NAME_PREFIX = 450.0
+SCORE_NAME_WORD = 350.0
+SCORE_FUZZY = 200.0
+SCORE_RECENT = 250.0
+POPULARITY_WEIGHT = 40.0
+
+RECENT_SYMBOLS_PER_USER = 10
+MAX_TRACKED_USERS = 5000
+_WORD_RE = re.compile(r"[A-Z0-9]+")
+_TICKER_RE = re.compile(r"^[A-Z]{1,5}$")
+_MAX_CHAR = '\uffff'  # Upper bound for prefix range scans
+
+
+@dataclass
+class SymbolSearchResult:
+    """A ranked search hit."""
+    symbol: str
+    name: str
+    exchange: str
+    score: float
+    is_recent: bool = False
+
+    def to_slack_option(self) -> Dict[str, object]:
+        """Convert to a Slack option object."""
+        label = f"{self.symbol} — {self.name}" if self.name else self.symbol
+        if self.is_recent:
+            label = f"🕘 {label}"
+        if len(label) > SLACK_OPTION_TEXT_LIMIT:
+            label = label[:SLACK_OPTION_TEXT_LIMIT - 1] + "…"
+        return {
+            "text": {"type": "plain_text", "text": label},
+            "value": self.symbol
+        }
+
+
+def _deletes(term: str) -> Set[str]:
+    """All strings produced by deleting one character from ``term``."""
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+class SymbolSearchIndex:
+    """
+    Prefix, name-word and typo-tolerant index over ticker symbols and company names.
+
+    Usage:
+        index = SymbolSearchIndex(get_asset_universe())
+        options = index.slack_options("appl", user_id="U123")
+    """
+
+    def __init__(self, universe: Optional[AssetUniverse] = None, popular_symbols: Iterable[str] = ()):
+        """
+        Initialize the index.
+
+        Args:
+            universe: Asset universe to index (rebuilt automatically when it reloads)
+            popular_symbols: Symbols given a starting popularity boost
+        """
+        self.universe = universe
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()  # Serializes rebuilds from the universe
+        self._built_for = None
+
+        self._symbols: List[str] = []
+        self._names: List[str] = []
+        self._exchanges: List[str] = []
+        self._row: Dict[str, int] = {}
+        self._words: List[Tuple[str, int]] = []
+        self._delete_map: Dict[str, List[int]] = {}
+
+        self._popularity: Counter = Counter({s.upper(): 5 for s in popular_symbols})
+        self._recent: 'OrderedDict[str, deque]' = OrderedDict()
+
+    def __len__(self) -> int:
+        self._ensure_built()
+        return len(self._symbols)
+
+    def build(self, entries: Iterable[Tuple[str, str, str]]) -> None:
+        """
+        Build the index from (symbol, name, exchange) tuples.
+
+        Args:
+            entries: Tradable securities to index
+        """
+        rows = sorted({e[0].upper(): e for e in entries}.values(), key=lambda e: e[0].upper())
+        symbols = [e[0].upper() for e in rows]
+        names = [e[1] or '' for e in rows]
+        exchanges = [e[2] or '' for e in rows]
+
+        words: List[Tuple[str, int]] = []
+        delete_map: Dict[str, List[int]] = {}
+        for i, (symbol, name) in enumerate(zip(symbols, names)):
+            for word in set(_WORD_RE.findall(name.upper())):
+                words.append((word, i))
+            for variant in _deletes(symbol) | {symbol}:
+                delete_map.setdefault(variant, []).append(i)
+        words.sort()
+
+        with self._lock:
+            self._symbols = symbols
+            self._names = names
+            self._exchanges = exchanges
+            self._row = {s: i for i, s in enumerate(symbols)}
+            self._words = words
+            self._delete_map = delete_map
+
+        logger.info(f"Symbol search index built: {len(symbols)} symbols, {len(words)} name words")
+
+    def _ensure_built(self) -> None:
+        """Rebuild from the asset universe if it was (re)loaded since the last build."""
+        if self.universe is None:
+            return
+        marker = (self.universe.loaded_at, len(self.universe))
+        if marker == self._built_for:
+            return
+        with self._build_lock:
+            if marker == self._built_for:
+                return
+            self.build((record.symbol, record.name, record.exchange) for record in self.universe.records())
+            # Set only once the build is in place, so concurrent callers wait instead of
+            # searching a stale or empty index
+            self._built_for = marker
+
+    def record_selection(self, user_id: Optional[str], symbol: str) -> None:
+        """
+        Record that a user picked a symbol (feeds popularity and recent lists).
+
+        Args:
+            user_id: Slack user ID (None to only update popularity)
+            symbol: Selected symbol
+        """
+        symbol = symbol.strip().upper()
+        if not symbol:
+            return
+
+        with self._lock:
+            self._popularity[symbol] += 1
+            if not user_id:
+                return
+            recent = self._recent.pop(user_id, None) or deque(maxlen=RECENT_SYMBOLS_PER_USER)
+            if symbol in recent:
+                recent.remove(symbol)
+            recent.appendleft(symbol)
+            self._recent[user_id] = recent
+            while len(self._recent) > MAX_TRACKED_USERS:
+                self._recent.popitem(last=False)
+
+    def get_recent(self, user_id: str) -> List[str]:
+        """Get a user's recently picked symbols, most recent first."""
+        with self._lock:
+            return list(self._recent.get(user_id, ()))
+
+    def _candidates(self, query: str) -> Dict[int, float]:
+        """Match-quality scores for every candidate row."""
+        scores: Dict[int, float] = {}
+
+        def offer(row: int, score: float) -> None:
+            if score > scores.get(row, 0.0):
+                scores[row] = score
+
+        symbols = self._symbols
+
+        # Ticker prefix matches (shorter tickers score higher)
+        start = bisect.bisect_left(symbols, query)
+        end = bisect.bisect_left(symbols, query + _MAX_CHAR, lo=start)
+        for row in range(start, end):
+            symbol = symbols[row]
+            offer(row, SCORE_EXACT if symbol == query else SCORE_SYMBOL_PREFIX - 10 * (len(symbol) - len(query)))
+
+        # Company-name word prefix matches
+        query_words = _WORD_RE.findall(query)
+        if query_words:
+            first = query_words[0]
+            start = bisect.bisect_left(self._words, (first, -1))
+            end = bisect.bisect_left(self._words, (first + _MAX_CHAR, -1), lo=start)
+            for word, row in self._words[start:end]:
+                name = self._names[row].upper()
+                if len(query_words) > 1 and not all(w in name for w in query_words[1:]):
+                    continue
+                score = SCORE_NAME_PREFIX if name.startswith(first) else SCORE_NAME_WORD
+                offer(row, score - (len(word) - len(first)))
+
+        # One-edit typo tolerance on tickers
+        if 2 <= len(query) <= 6:
+            for variant in _deletes(query) | {query}:
+                for row in self._delete_map.get(variant, ()):
+                    offer(row, SCORE_FUZZY)
+
+        return scores
+
+    def search(self, query: str, user_id: Optional[str] = None, limit: int = 20) -> List[SymbolSearchResult]:
+        """
+        Rank symbols for a typeahead query.
+
+        Args:
+            query: Text typed so far (ticker or company name)
+            user_id: Requesting user, for recent-symbol boosting
+            limit: Maximum results
+
+        Returns:
+            Ranked list of SymbolSearchResult
+        """
+        self._ensure_built()
+        query = (query or '').strip().upper()
+        recent = self.get_recent(user_id) if user_id else []
+        recent_set = set(recent)
+
+        if not query:
+            # Empty query: the user's recent picks, then the most popular symbols
+            ordered = recent + [s for s, _ in self._popularity.most_common(limit) if s not in recent_set]
+            return [self._result(self._row[s], 0.0, s in recent_set) for s in ordered if s in self._row][:limit]
+
+        popularity = self._popularity
+        symbols = self._symbols
+        ranked = []
+        for row, score in self._candidates(query).items():
+            symbol = symbols[row]
+            count = popularity.get(symbol)
+            if count:
+                score += POPULARITY_WEIGHT * math.log1p(count)
+            if symbol in recent_set:
+                score += SCORE_RECENT
+            ranked.append((-score, symbol, row))
+
+        # Only materialize the top hits
+        return [
+            self._result(row, -neg_score, symbols[row] in recent_set)
+            for neg_score, _, row in heapq.nsmallest(limit, ranked)
+        ]
+
+    def _result(self, row: int, score: float, is_recent: bool) -> SymbolSearchResult:
+        return SymbolSearchResult(
+            symbol=self._symbols[row],
+            name=self._names[row],
+            exchange=self._exchanges[row],
+            score=score,
+            is_recent=is_recent
+        )
+
+    def slack_options(self, query: str, user_id: Optional[str] = None, limit: int = 20) -> List[Dict[str, object]]:
+        """
+        Search and format results for a Slack ``external_select`` options response.
+
+        Args:
+            query: Text typed so far
+            user_id: Requesting user
+            limit: Maximum options (capped at Slack's 100)
+
+        Returns:
+            List of Slack option objects
+        """
+        results = self.search(query, user_id, min(limit, SLACK_MAX_OPTIONS))
+
+        # Without a loaded universe, still let the user pick a well-formed ticker
+        typed = (query or '').strip().upper()
+        if not results and not self._symbols and _TICKER_RE.match(typed):
+            results = [SymbolSearchResult(symbol=typed, name='', exchange='', score=0.0)]
+
+        return [result.to_slack_option() for result in results]
+
+
+# Global index instance
+_symbol_search_index: Optional[SymbolSearchIndex] = None
+
+
+def get_symbol_search_index() -> SymbolSearchIndex:
+    """
+    Get or create the global SymbolSearchIndex over the shared asset universe.
+
+    Returns:
+        SymbolSearchIndex: Shared typeahead index
+    """
+    global _symbol_search_index
+
+    if _symbol_search_index is None:
+        from config.settings import get_config
+        _symbol_search_index = SymbolSearchIndex(
+            get_asset_universe(),
+            popular_symbols=get_config().trading.supported_symbols
+        )
+
+    return _symbol_search_index
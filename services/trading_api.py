@@ -33,8 +33,12 @@ import structlog
 
 from config.settings import get_config
 from models.trade import Trade, TradeStatus
-from services.market_data import MarketQuote, get_market_data_service
+from services.market_data import MarketQuote, QuotePurpose, get_market_data_service
 from services.alpaca_service import AlpacaService
+from services.pre_trade_checks import (
+    CheckOutcome, PreTradeCheck, PreTradeContext, PreTradeResult,
+    compliance_notes, create_pre_trade_pipeline
+)
 
 
 class TradingError(Exception):
@@ -526,6 +530,14 @@ class TradingAPIService:
         self.daily_trade_count = 0
         self.daily_reset_time = datetime.utcnow().date()
         
+        # Single pre-trade pipeline for limits, symbol restrictions and compliance
+        self.pre_trade_pipeline = create_pre_trade_pipeline(
+            max_quantity=self.position_limits['max_single_order'],
+            max_order_value=self.position_limits['max_order_value'],
+            supported_symbols=self.config.trading.supported_symbols
+        )
+        self.pre_trade_pipeline.register(PreTradeCheck('daily_trade_limit', self._check_daily_trade_limit))
+        
         self.logger.info("TradingAPIService initialized",
                         mock_execution=self.config.trading.mock_execution_enabled,
                         execution_delay=self.config.trading.execution_delay_seconds)
@@ -569,7 +581,7 @@ class TradingAPIService:
         start_time = time.time()
         
         # Validate trade
-        await self._validate_trade(trade)
+        pre_trade = await self._validate_trade(trade)
         
         # Create execution report
         execution_report = ExecutionReport(
@@ -589,11 +601,11 @@ class TradingAPIService:
         
         try:
             # Perform compliance checks
-            await self._perform_compliance_checks(trade, execution_report)
+            await self._perform_compliance_checks(trade, execution_report, pre_trade)
             
             # Get current market data
             market_data_service = await get_market_data_service()
-            market_quote = await market_data_service.get_quote(trade.symbol)
+            market_quote = await market_data_service.get_quote(trade.symbol, purpose=QuotePurpose.EXECUTION)
             
             # Start execution
             execution_report.execution_started_at = datetime.utcnow()
@@ -853,86 +865,73 @@ class TradingAPIService:
         
         return history[:limit]
     
-    async def _validate_trade(self, trade: Trade) -> None:
+    async def _validate_trade(self, trade: Trade) -> PreTradeResult:
         """
-        Validate trade parameters and limits.
+        Validate trade parameters and limits through the pre-trade pipeline.
         
         Args:
             trade: Trade to validate
             
+        Returns:
+            PreTradeResult: Per-check outcomes and timings
+            
         Raises:
             ValueError: If validation fails
         """
-        # Basic validation
-        if not trade.symbol or len(trade.symbol.strip()) == 0:
-            raise ValueError("Trade symbol is required")
-        
-        if trade.quantity == 0:
-            raise ValueError("Trade quantity cannot be zero")
-        
         if trade.price <= 0:
             raise ValueError("Trade price must be positive")
         
-        # Position size limits
-        if abs(trade.quantity) > self.position_limits['max_single_order']:
-            raise ValueError(f"Order quantity {abs(trade.quantity)} exceeds maximum allowed {self.position_limits['max_single_order']}")
-        
-        # Order value limits
-        order_value = abs(trade.quantity * trade.price)
-        if order_value > self.position_limits['max_order_value']:
-            raise ValueError(f"Order value ${order_value:,.2f} exceeds maximum allowed ${self.position_limits['max_order_value']:,.2f}")
-        
-        # Daily trade limits
-        if self.daily_trade_count >= self.position_limits['daily_trade_limit']:
-            raise ValueError(f"Daily trade limit of {self.position_limits['daily_trade_limit']} exceeded")
+        context = PreTradeContext(
+            symbol=trade.symbol,
+            quantity=abs(trade.quantity),
+            side=trade.trade_type.value,
+            price=float(trade.price)
+        )
+        result = await self.pre_trade_pipeline.run(context)
         
-        # Symbol validation (check against supported symbols)
-        if hasattr(self.config.trading, 'supported_symbols'):
-            if trade.symbol.upper() not in self.config.trading.supported_symbols:
-                raise ValueError(f"Symbol {trade.symbol} is not in supported symbols list")
+        if not result.passed:
+            raise ValueError(result.first_error)
         
         self.logger.debug("Trade validation passed", 
                          trade_id=trade.trade_id,
                          symbol=trade.symbol,
                          quantity=trade.quantity,
-                         value=float(order_value))
+                         value=result.data.get('order_value'),
+                         duration_ms=round(result.duration_ms, 3))
+        return result
     
-    async def _perform_compliance_checks(self, trade: Trade, execution_report: ExecutionReport) -> None:
+    def _check_daily_trade_limit(self, context: PreTradeContext) -> CheckOutcome:
+        """Pre-trade check for the daily trade count limit."""
+        if self.daily_trade_count >= self.position_limits['daily_trade_limit']:
+            return CheckOutcome.fail(f"Daily trade limit of {self.position_limits['daily_trade_limit']} exceeded")
+        return CheckOutcome.ok()
+    
+    async def _perform_compliance_checks(
+        self,
+        trade: Trade,
+        execution_report: ExecutionReport,
+        pre_trade: PreTradeResult
+    ) -> None:
         """
-        Perform compliance and regulatory checks.
+        Record compliance and regulatory checks on the execution report.
+        
+        Blocking checks (symbol restrictions, limits) already ran in the pre-trade
+        pipeline; this adds their outcomes and the informational reviews to the audit trail.
         
         Args:
             trade: Trade to check
             execution_report: Execution report to update
-            
-        Raises:
-            ValueError: If compliance checks fail
+            pre_trade: Result of the pre-trade pipeline for this trade
         """
-        compliance_checks = []
-        
-        # Check for wash sale rules (simplified)
-        compliance_checks.append("Wash sale rule check: PASSED")
-        
-        # Check for position limits
-        order_value = abs(trade.quantity * trade.price)
-        if order_value > 100000:  # $100k threshold
-            compliance_checks.append("Large order review: FLAGGED for review")
-        else:
-            compliance_checks.append("Large order review: PASSED")
-        
-        # Check for market hours (simplified)
-        current_hour = datetime.utcnow().hour
-        if 9 <= current_hour <= 16:  # Simplified market hours check
-            compliance_checks.append("Market hours check: PASSED")
-        else:
-            compliance_checks.append("Market hours check: AFTER HOURS TRADING")
+        compliance_checks = compliance_notes(pre_trade.data.get('order_value'))
         
-        # Check for symbol restrictions
-        restricted_symbols = ['RESTRICTED1', 'RESTRICTED2']  # Example restricted symbols
-        if trade.symbol.upper() in restricted_symbols:
-            raise ValueError(f"Trading in symbol {trade.symbol} is restricted")
+        restrictions = pre_trade.get('symbol_restrictions')
+        if restrictions and restrictions.passed:
+            compliance_checks.append("Symbol restriction check: PASSED")
         
-        compliance_checks.append("Symbol restriction check: PASSED")
+        for check in pre_trade.checks:
+            compliance_checks.append(f"Pre-trade {check.name}: {'PASSED' if check.passed else 'FAILED'} "
+                                     f"({check.duration_ms:.2f}ms)")
         
         # Update execution report
         execution_report.compliance_checked = True
@@ -5,12 +5,20 @@ This service manages the assignment of users to specific Alpaca accounts,
 allowing for isolated portfolios and account management.
 """
 
+import asyncio
 import logging
-from typing import Dict, Optional, List, Any
+import threading
+from collections import Counter
+from typing import Dict, Optional, List, Any, Set
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
 
+from config.settings import AssignmentStoreConfig, get_config
+from services.assignment_store import (
+    AssignmentStore, MemoryAssignmentStore, create_assignment_store, read_legacy_assignments
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,6 +39,17 @@ class UserAccountAssignment:
     assigned_by: str
     assignment_reason: str
     is_active: bool = True
+    
+    def to_record(self) -> Dict[str, Any]:
+        """Convert to the dictionary form used by the assignment stores."""
+        return {
+            'user_id': self.user_id,
+            'account_id': self.account_id,
+            'assigned_at': self.assigned_at,
+            'assigned_by': self.assigned_by,
+            'assignment_reason': self.assignment_reason,
+            'is_active': self.is_active
+        }
 
 
 class UserAccountManager:
@@ -43,17 +62,35 @@ class UserAccountManager:
     - Department-based assignment
     - Load balancing across accounts
     - Assignment history tracking
+    
+    Lookups, per-account user lists and load counts are served from in-memory
+    indexes. Changed assignments are written to the assignment store in batches:
+    immediately once ``batch_size`` are pending, otherwise after ``flush_interval_seconds``.
     """
     
-    def __init__(self, database_service=None):
+    def __init__(self, database_service=None, config: Optional[AssignmentStoreConfig] = None,
+                 store: Optional[AssignmentStore] = None):
+        config = config or get_config().assignment_store
         self.database_service = database_service
+        self.store = store or create_assignment_store(config, database_service)
+        self.batch_size = config.batch_size
+        self.flush_interval = config.flush_interval_seconds
+        
         self.assignments: Dict[str, UserAccountAssignment] = {}
+        self._account_users: Dict[str, Set[str]] = {}  # account_id -> active user_ids
+        self._account_load: Counter = Counter()  # account_id -> active user count
         self.assignment_strategy = AccountAssignmentStrategy.LEAST_LOADED
         
-        # Load existing assignments from database on startup
+        # Write batching; _flush_lock serializes writers so batches land in order
+        self._pending: Dict[str, UserAccountAssignment] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        
+        # Load existing assignments from the store on startup
         self._load_assignments_sync()
         
-        logger.info("UserAccountManager initialized")
+        logger.info(f"UserAccountManager initialized ({self.store.name} store)")
     
     async def assign_user_to_account(self, user_id: str, account_id: str, 
                                    assigned_by: str = "system", 
@@ -79,13 +116,12 @@ class UserAccountManager:
                 assignment_reason=reason
             )
             
-            self.assignments[user_id] = assignment
+            self._set_assignment(assignment)
             
-            # Store in database if available
-            if self.database_service:
-                await self._store_assignment_in_database(assignment)
+            if self._queue_write(assignment) >= self.batch_size:
+                await asyncio.to_thread(self.flush)
             
-            logger.info(f"✅ User {user_id} assigned to account {account_id} by {assigned_by}")
+            logger.debug(f"User {user_id} assigned to account {account_id} by {assigned_by}")
             return True
             
         except Exception as e:
@@ -127,7 +163,7 @@ class UserAccountManager:
         # Check if user already has an assignment
         existing_account = self.get_user_account(user_id)
         if existing_account and existing_account in available_accounts:
-            logger.info(f"User {user_id} already assigned to {existing_account}")
+            logger.debug(f"User {user_id} already assigned to {existing_account}")
             return existing_account
         
         # Apply assignment strategy
@@ -188,15 +224,8 @@ class UserAccountManager:
         """
         Assign user using round-robin strategy.
         """
-        # Count assignments per account
-        account_counts = {account_id: 0 for account_id in available_accounts}
-        
-        for assignment in self.assignments.values():
-            if assignment.is_active and assignment.account_id in account_counts:
-                account_counts[assignment.account_id] += 1
-        
-        # Find account with minimum assignments
-        return min(account_counts.keys(), key=lambda x: account_counts[x])
+        # Account with the fewest active users; ties go to the earliest listed
+        return min(available_accounts, key=self._account_load.__getitem__)
     
     def _assign_least_loaded(self, available_accounts: List[str]) -> str:
         """
@@ -221,6 +250,8 @@ class UserAccountManager:
         # Deactivate old assignment
         old_assignment = self.assignments.get(user_id)
         if old_assignment:
+            if old_assignment.is_active:
+                self._unindex(old_assignment)
             old_assignment.is_active = False
             logger.info(f"Deactivated old assignment: {user_id} -> {old_assignment.account_id}")
         
@@ -239,11 +270,7 @@ class UserAccountManager:
         Returns:
             List[str]: List of user IDs assigned to the account
         """
-        return [
-            assignment.user_id
-            for assignment in self.assignments.values()
-            if assignment.account_id == account_id and assignment.is_active
-        ]
+        return list(self._account_users.get(account_id, ()))
     
     def get_assignment_stats(self) -> Dict[str, Any]:
         """
@@ -252,122 +279,121 @@ class UserAccountManager:
         Returns:
             Dict[str, Any]: Assignment statistics
         """
-        active_assignments = [
-            assignment for assignment in self.assignments.values()
-            if assignment.is_active
-        ]
-        
-        account_counts = {}
-        for assignment in active_assignments:
-            account_counts[assignment.account_id] = account_counts.get(assignment.account_id, 0) + 1
-        
         return {
-            'total_assignments': len(active_assignments),
-            'accounts_in_use': len(account_counts),
-            'account_distribution': account_counts,
-            'assignment_strategy': self.assignment_strategy.value
+            'total_assignments': sum(self._account_load.values()),
+            'accounts_in_use': len(self._account_load),
+            'account_distribution': dict(self._account_load),
+            'assignment_strategy': self.assignment_strategy.value,
+            'store': self.store.name,
+            'pending_writes': len(self._pending)
         }
     
-    async def _store_assignment_in_database(self, assignment: UserAccountAssignment) -> None:
+    def _set_assignment(self, assignment: UserAccountAssignment) -> None:
+        """Record an assignment and keep the account indexes in step."""
+        previous = self.assignments.get(assignment.user_id)
+        if previous and previous.is_active:
+            self._unindex(previous)
+        self.assignments[assignment.user_id] = assignment
+        if assignment.is_active:
+            self._account_users.setdefault(assignment.account_id, set()).add(assignment.user_id)
+            self._account_load[assignment.account_id] += 1
+    
+    def _unindex(self, assignment: UserAccountAssignment) -> None:
+        """Remove an active assignment from the account indexes."""
+        users = self._account_users.get(assignment.account_id)
+        if users is None or assignment.user_id not in users:
+            return
+        users.discard(assignment.user_id)
+        self._account_load[assignment.account_id] -= 1
+        if not users:
+            del self._account_users[assignment.account_id]
+            del self._account_load[assignment.account_id]
+    
+    def _queue_write(self, assignment: UserAccountAssignment) -> int:
         """
-        Store assignment in database for persistence.
+        Queue an assignment for the next batch write.
         
-        Args:
-            assignment: Assignment to store
+        Returns:
+            int: Number of writes now pending
         """
-        try:
-            # Simple file-based persistence for now
-            import json
-            import os
-            
-            assignments_file = "user_assignments.json"
-            
-            # Load existing assignments
-            assignments_data = {}
-            if os.path.exists(assignments_file):
-                try:
-                    with open(assignments_file, 'r') as f:
-                        assignments_data = json.load(f)
-                except:
-                    assignments_data = {}
+        if isinstance(self.store, MemoryAssignmentStore):
+            return 0
+        
+        with self._pending_lock:
+            self._pending[assignment.user_id] = assignment
+            if self._flush_timer is None:
+                # Non-daemon, so writes queued by short-lived scripts still land before exit
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.start()
+            return len(self._pending)
+    
+    def flush(self) -> int:
+        """
+        Write pending assignments to the store in one batch.
+        
+        Blocking; async callers run it with ``asyncio.to_thread``.
+        
+        Returns:
+            int: Number of assignments written
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                batch = list(self._pending.values())
+                self._pending = {}
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
             
-            # Add/update assignment
-            assignments_data[assignment.user_id] = {
-                'user_id': assignment.user_id,
-                'account_id': assignment.account_id,
-                'assigned_at': assignment.assigned_at.isoformat(),
-                'assigned_by': assignment.assigned_by,
-                'assignment_reason': assignment.assignment_reason,
-                'is_active': assignment.is_active
-            }
+            if not batch:
+                return 0
             
-            # Save to file
-            with open(assignments_file, 'w') as f:
-                json.dump(assignments_data, f, indent=2)
+            try:
+                self.store.write_batch([assignment.to_record() for assignment in batch])
+            except Exception as e:
+                logger.error(f"Failed to store {len(batch)} assignments: {e}")
+                # Requeue anything not superseded meanwhile; the next assignment or stop() retries
+                with self._pending_lock:
+                    for assignment in batch:
+                        self._pending.setdefault(assignment.user_id, assignment)
+                return 0
             
-            logger.info(f"Assignment stored in database: {assignment.user_id} -> {assignment.account_id}")
-        except Exception as e:
-            logger.error(f"Failed to store assignment in database: {e}")
+            logger.info(f"Stored {len(batch)} user assignments ({self.store.name} store)")
+            return len(batch)
+    
+    def stop(self) -> None:
+        """Flush pending assignments and close the store."""
+        self.flush()
+        self.store.close()
     
     async def load_assignments_from_database(self) -> None:
         """
         Load existing assignments from database.
         """
-        try:
-            import json
-            import os
-            
-            assignments_file = "user_assignments.json"
-            
-            if os.path.exists(assignments_file):
-                with open(assignments_file, 'r') as f:
-                    assignments_data = json.load(f)
-                
-                for user_id, data in assignments_data.items():
-                    assignment = UserAccountAssignment(
-                        user_id=data['user_id'],
-                        account_id=data['account_id'],
-                        assigned_at=datetime.fromisoformat(data['assigned_at']),
-                        assigned_by=data['assigned_by'],
-                        assignment_reason=data['assignment_reason'],
-                        is_active=data['is_active']
-                    )
-                    self.assignments[assignment.user_id] = assignment
-                
-                logger.info(f"User assignments loaded from database: {len(assignments_data)} assignments")
-            else:
-                logger.info("No existing assignments file found")
-        except Exception as e:
-            logger.error(f"Failed to load assignments from database: {e}")
+        await asyncio.to_thread(self._load_assignments_sync)
     
     def _load_assignments_sync(self) -> None:
         """
         Load existing assignments synchronously.
+        
+        An empty store is seeded from the legacy ``user_assignments.json`` file.
         """
         try:
-            import json
-            import os
+            records = self.store.load()
+            source = f"{self.store.name} store"
+            if not records:
+                records = read_legacy_assignments()
+                source = "user_assignments.json"
             
-            assignments_file = "user_assignments.json"
+            for record in records:
+                assignment = UserAccountAssignment(**record)
+                self._set_assignment(assignment)
+                if source == "user_assignments.json":
+                    self._queue_write(assignment)
             
-            if os.path.exists(assignments_file):
-                with open(assignments_file, 'r') as f:
-                    assignments_data = json.load(f)
-                
-                for user_id, data in assignments_data.items():
-                    assignment = UserAccountAssignment(
-                        user_id=data['user_id'],
-                        account_id=data['account_id'],
-                        assigned_at=datetime.fromisoformat(data['assigned_at']),
-                        assigned_by=data['assigned_by'],
-                        assignment_reason=data['assignment_reason'],
-                        is_active=data['is_active']
-                    )
-                    self.assignments[assignment.user_id] = assignment
-                
-                logger.info(f"User assignments loaded: {len(assignments_data)} assignments")
+            if records:
+                logger.info(f"User assignments loaded from {source}: {len(records)} assignments")
             else:
-                logger.info("No existing assignments file found")
+                logger.info("No existing user assignments found")
         except Exception as e:
             logger.error(f"Failed to load assignments: {e}")
     
@@ -18,22 +18,66 @@ logger = logging.getLogger(__name__)
 class ValidationService:
     """Service for validating trade inputs."""
     
-    def __init__(self, alpaca_service=None, market_data_service=None):
+    def __init__(self, alpaca_service=None, market_data_service=None, asset_universe=None):
         """
         Initialize validation service.
         
         Args:
             alpaca_service: Optional AlpacaService for symbol verification
             market_data_service: Optional MarketDataService for fallback
+            asset_universe: Optional AssetUniverse (defaults to the shared universe)
         """
         self.alpaca_service = alpaca_service
         self.market_data_service = market_data_service
+        if asset_universe is None:
+            from services.asset_universe import get_asset_universe
+            asset_universe = get_asset_universe()
+        self.asset_universe = asset_universe
         self.logger = logging.getLogger(__name__)
     
     def validate_ticker_symbol(self, symbol: str) -> Dict[str, Any]:
         """
         Validate ticker symbol format and existence.
         
+        Args:
+            symbol: Stock ticker symbol to validate
+            
+        Returns:
+            dict: {
+                "valid": bool,
+                "error": str or None,
+                "symbol": str (normalized uppercase)
+            }
+        """
+        format_result = self.validate_symbol_format(symbol)
+        if not format_result["valid"]:
+            return format_result
+        
+        symbol = format_result["symbol"]
+        
+        # Answer from the local asset universe when it is loaded (no network)
+        if self.asset_universe.is_loaded:
+            return self.validate_asset(symbol, self.lookup_asset(symbol))
+        
+        # Check if symbol exists via Alpaca (if available)
+        if self.alpaca_service and self.alpaca_service.is_available():
+            try:
+                # Try to get asset info from Alpaca
+                asset_info = self.alpaca_service.get_asset(symbol)
+            except Exception as e:
+                self.logger.warning(f"Alpaca symbol check failed for {symbol}: {e}")
+                return self._unverified_symbol_result(symbol)
+            
+            return self.validate_asset(symbol, asset_info)
+        
+        # If no Alpaca service, accept valid format
+        self.logger.info(f"Symbol validation (format only): {symbol}")
+        return format_result
+    
+    def validate_symbol_format(self, symbol: str) -> Dict[str, Any]:
+        """
+        Validate ticker symbol format only (no network access).
+        
         Args:
             symbol: Stock ticker symbol to validate
             
@@ -63,53 +107,84 @@ class ValidationService:
                 "symbol": symbol
             }
         
-        # Check if symbol exists via Alpaca (if available)
+        return {
+            "valid": True,
+            "error": None,
+            "symbol": symbol
+        }
+    
+    def lookup_asset(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Get asset details, preferring the local asset universe over the broker API.
+        
+        Args:
+            symbol: Normalized ticker symbol
+            
+        Returns:
+            Asset details or None if not found
+        """
+        if self.asset_universe.is_loaded:
+            record = self.asset_universe.get(symbol)
+            return record.to_dict() if record else None
+        
         if self.alpaca_service and self.alpaca_service.is_available():
-            try:
-                # Try to get asset info from Alpaca
-                asset_info = self.alpaca_service.get_asset(symbol)
-                
-                if not asset_info:
-                    return {
-                        "valid": False,
-                        "error": f"Symbol '{symbol}' not found. Please verify the ticker symbol.",
-                        "symbol": symbol
-                    }
-                
-                # Check if asset is tradeable
-                if not asset_info.get('tradable', False):
-                    return {
-                        "valid": False,
-                        "error": f"Symbol '{symbol}' is not currently tradeable.",
-                        "symbol": symbol
-                    }
-                
-                self.logger.info(f"✅ Symbol validation passed: {symbol}")
-                return {
-                    "valid": True,
-                    "error": None,
-                    "symbol": symbol
-                }
-                
-            except Exception as e:
-                self.logger.warning(f"Alpaca symbol check failed for {symbol}: {e}")
-                # If Alpaca fails, accept common format but log warning
-                self.logger.info(f"⚠️ Symbol validation using format only: {symbol}")
-                return {
-                    "valid": True,  # Accept format-valid symbols even if API fails
-                    "error": None,
-                    "symbol": symbol,
-                    "warning": "Could not verify symbol with market data"
-                }
+            return self.alpaca_service.get_asset(symbol)
         
-        # If no Alpaca service, accept valid format
-        self.logger.info(f"Symbol validation (format only): {symbol}")
+        return None
+    
+    def can_lookup_assets(self) -> bool:
+        """Check whether asset lookups have a source (local universe or broker)."""
+        return self.asset_universe.is_loaded or bool(
+            self.alpaca_service and self.alpaca_service.is_available()
+        )
+    
+    def validate_asset(self, symbol: str, asset_info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Validate that an already-fetched asset exists and is tradeable.
+        
+        Args:
+            symbol: Normalized ticker symbol
+            asset_info: Asset details from the broker (None if not found)
+            
+        Returns:
+            dict: {
+                "valid": bool,
+                "error": str or None,
+                "symbol": str
+            }
+        """
+        if not asset_info:
+            return {
+                "valid": False,
+                "error": f"Symbol '{symbol}' not found. Please verify the ticker symbol.",
+                "symbol": symbol
+            }
+        
+        # Check if asset is tradeable
+        if not asset_info.get('tradable', False):
+            return {
+                "valid": False,
+                "error": f"Symbol '{symbol}' is not currently tradeable.",
+                "symbol": symbol
+            }
+        
+        self.logger.info(f"✅ Symbol validation passed: {symbol}")
         return {
             "valid": True,
             "error": None,
             "symbol": symbol
         }
     
+    def _unverified_symbol_result(self, symbol: str) -> Dict[str, Any]:
+        """Accept a format-valid symbol when the broker lookup fails."""
+        self.logger.info(f"⚠️ Symbol validation using format only: {symbol}")
+        return {
+            "valid": True,  # Accept format-valid symbols even if API fails
+            "error": None,
+            "symbol": symbol,
+            "warning": "Could not verify symbol with market data"
+        }
+    
     def validate_quantity(self, quantity: Any, max_limit: int = 10000) -> Dict[str, Any]:
         """
         Validate trade quantity.
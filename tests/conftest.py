@@ -0,0 +1,25 @@
+"""
+Shared pytest configuration.
+
+Latency and throughput benchmarks are marked ``@pytest.mark.benchmark`` and skipped
+by default, since wall-clock budgets depend on the machine running them. Run them
+with ``RUN_BENCHMARKS=1 python -m pytest tests -m benchmark``.
+"""
+
+import os
+
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'benchmark: wall-clock benchmark, skipped unless RUN_BENCHMARKS=1')
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.getenv('RUN_BENCHMARKS', '').lower() in ('1', 'true', 'yes'):
+        return
+    skip_benchmark = pytest.mark.skip(reason='benchmark; set RUN_BENCHMARKS=1 to run')
+    for item in items:
+        if item.get_closest_marker('benchmark'):
+            item.add_marker(skip_benchmark)
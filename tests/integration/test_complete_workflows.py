@@ -19,7 +19,8 @@ from unittest.mock import AsyncMock, MagicMock, patch, call
 import uuid
 
 # Import application components
-from app import create_slack_app, ApplicationMetrics
+from app import create_slack_app
+from bolt_app import ApplicationMetrics
 from listeners.commands import CommandHandler, CommandType, CommandContext
 from listeners.actions import ActionHandler, ActionType, ActionContext
 from services.service_container import ServiceContainer
@@ -0,0 +1 @@
+# End-to-end load-test harness: local Slack, Alpaca and Finnhub stand-ins driving the real app
@@ -0,0 +1,523 @@
+"""
+End-to-end load-test harness for the Slack trading bot.
+
+The harness starts local Slack, Alpaca and Finnhub stand-ins (tests/load/stubs.py) and
+launches the real FastAPI app against them in a separate process. It then replays a
+mix of signed ``/buy``, ``/sell``, ``/positions``, App Home and button traffic at a
+target rate. Arrivals follow a seeded Poisson process that never waits on responses.
+Latency is measured from each request's scheduled send time, so a stalled server
+cannot hide its queueing delay (no coordinated omission).
+
+Each scenario reports:
+- throughput
+- p50/p95/p99 latency, overall and per traffic kind
+- status codes
+- the app's event-loop lag and blocking incidents, from services/loop_monitor.py
+- the calls each stub served
+
+The report is written as JSON so runs can be compared for regressions. With
+--loop-budget-ms, the run fails if any request path blocked the app's event loop for
+longer than the budget. The report then includes the loop thread's stack from each
+offending stall.
+
+Usage:
+    python -m tests.load.harness                              # default scenarios
+    python -m tests.load.harness -s baseline,slow_broker -d 20 -o logs/load/today.json
+    python -m tests.load.harness --baseline logs/load/previous.json
+    python -m tests.load.harness -s baseline -d 10 --loop-budget-ms 100   # CI
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import aiohttp
+
+from tests.fixtures.slack_payloads import (
+    create_app_home_payload,
+    create_button_action_payload,
+    create_slash_command_payload
+)
+from tests.load.stubs import REFERENCE_PRICES, AlpacaStub, FaultProfile, FinnhubStub, SlackStub
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+SIGNING_SECRET = 'load-test-signing-secret-0123456789abcdef'
+CHANNEL_ID = 'C0LOADTEST'
+TEAM_ID = 'T1234567890'
+USER_POOL = [f"U0LOAD{n:03d}" for n in range(50)]
+SYMBOLS = sorted(REFERENCE_PRICES)
+
+DEFAULT_MIX = {'buy': 30, 'sell': 20, 'positions': 20, 'app_home': 15, 'button': 15}
+
+# Allowed growth before compare_reports() flags a regression
+DEFAULT_TOLERANCE = 0.20
+
+# Stalls shorter than this are lag, not blocking incidents, unless a budget is given
+DEFAULT_SLOW_CALLBACK_MS = 100.0
+
+# Blocking incidents (with stacks) kept per scenario in the report
+REPORTED_INCIDENTS = 3
+
+
+@dataclass
+class Scenario:
+    """One traffic pattern plus the stub behaviour it runs against."""
+    name: str
+    rps: float
+    duration_seconds: float = 30.0
+    mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    slack: FaultProfile = field(default_factory=lambda: FaultProfile(latency_ms=40, jitter_ms=20))
+    alpaca: FaultProfile = field(default_factory=lambda: FaultProfile(latency_ms=60, jitter_ms=30))
+    finnhub: FaultProfile = field(default_factory=lambda: FaultProfile(latency_ms=30, jitter_ms=15))
+    warmup_seconds: float = 2.0
+    timeout_seconds: float = 10.0
+    seed: int = 7
+
+    def __post_init__(self):
+        if self.rps <= 0 or self.duration_seconds <= 0:
+            raise ValueError("Scenario rate and duration must be positive")
+        unknown = set(self.mix) - set(TRAFFIC)
+        if unknown:
+            raise ValueError(f"Unknown traffic kinds: {sorted(unknown)}")
+
+
+# Slack request builders: (path, content type, body)
+
+def _command(command: str, text: Callable[[random.Random], str]):
+    def build(rng: random.Random, slack_url: str) -> Tuple[str, str, str]:
+        payload = create_slash_command_payload(
+            command, rng.choice(USER_POOL), CHANNEL_ID, team_id=TEAM_ID, text=text(rng),
+            response_url=f"{slack_url}/hooks/commands/{TEAM_ID}/{rng.getrandbits(32):08x}"
+        )
+        return '/slack/commands', 'application/x-www-form-urlencoded', urlencode(payload)
+    return build
+
+
+def _app_home(rng: random.Random, slack_url: str) -> Tuple[str, str, str]:
+    return '/slack/events', 'application/json', json.dumps(create_app_home_payload(rng.choice(USER_POOL), TEAM_ID))
+
+
+def _button(rng: random.Random, slack_url: str) -> Tuple[str, str, str]:
+    payload = create_button_action_payload('start_trade', rng.choice(USER_POOL), f"V0LOAD{rng.randrange(1000):04d}",
+                                           team_id=TEAM_ID, channel_id=CHANNEL_ID)
+    payload['response_url'] = f"{slack_url}/hooks/actions/{TEAM_ID}/{rng.getrandbits(32):08x}"
+    return '/slack/interactive', 'application/x-www-form-urlencoded', urlencode({'payload': json.dumps(payload)})
+
+
+TRAFFIC: Dict[str, Callable[[random.Random, str], Tuple[str, str, str]]] = {
+    'buy': _command('/buy', lambda rng: f"{rng.choice(SYMBOLS)} {rng.randint(1, 500)}"),
+    'sell': _command('/sell', lambda rng: f"{rng.choice(SYMBOLS)} {rng.randint(1, 200)}"),
+    'positions': _command('/positions', lambda rng: ''),
+    'app_home': _app_home,
+    'button': _button,
+}
+
+SCENARIOS: Dict[str, Scenario] = {
+    'baseline': Scenario('baseline', rps=20),
+    'peak': Scenario('peak', rps=60),
+    'slow_broker': Scenario('slow_broker', rps=20, alpaca=FaultProfile(latency_ms=800, jitter_ms=400)),
+    'flaky_market_data': Scenario('flaky_market_data', rps=20,
+                                  finnhub=FaultProfile(latency_ms=30, jitter_ms=15, error_rate=0.2)),
+    'slack_rate_limited': Scenario('slack_rate_limited', rps=20,
+                                   slack=FaultProfile(latency_ms=40, jitter_ms=20, error_rate=0.1, error_status=429)),
+}
+
+DEFAULT_SCENARIOS = ('baseline', 'peak', 'slow_broker', 'flaky_market_data', 'slack_rate_limited')
+
+
+def sign(body: str, timestamp: str, secret: str = SIGNING_SECRET) -> str:
+    """Slack v0 request signature for body at timestamp."""
+    digest = hmac.new(secret.encode(), f"v0:{timestamp}:{body}".encode(), hashlib.sha256).hexdigest()
+    return f"v0={digest}"
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def summarize_latencies(latencies_ms: List[float]) -> Dict[str, float]:
+    values = sorted(latencies_ms)
+    return {
+        'p50_ms': round(percentile(values, 0.50), 3),
+        'p95_ms': round(percentile(values, 0.95), 3),
+        'p99_ms': round(percentile(values, 0.99), 3),
+        'max_ms': round(values[-1], 3) if values else 0.0,
+        'mean_ms': round(sum(values) / len(values), 3) if values else 0.0
+    }
+
+
+class AppServer:
+    """
+    The real FastAPI app (app.py) in its own process, wired to the stubs.
+
+    The process runs in a scratch directory so its log file, asset universe and
+    SQLite database never touch the working tree.
+    """
+
+    def __init__(self, slack: SlackStub, alpaca: AlpacaStub, finnhub: FinnhubStub,
+                 extra_env: Optional[Dict[str, str]] = None, startup_timeout: float = 120.0,
+                 loop_block_budget_ms: Optional[float] = None):
+        self.slack, self.alpaca, self.finnhub = slack, alpaca, finnhub
+        self.extra_env = extra_env or {}
+        self.loop_block_budget_ms = loop_block_budget_ms
+        self.startup_timeout = startup_timeout
+        self.port: Optional[int] = None
+        self.startup_seconds: Optional[float] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._workdir: Optional[tempfile.TemporaryDirectory] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def log_path(self) -> str:
+        return os.path.join(self._workdir.name, 'server.log')
+
+    def environment(self, workdir: str) -> Dict[str, str]:
+        env = {k: v for k, v in os.environ.items() if not k.startswith(('SLACK_', 'ALPACA_', 'FINNHUB_'))}
+        env.update({
+            'PYTHONPATH': REPO_ROOT + os.pathsep + env.get('PYTHONPATH', ''),
+            'ENVIRONMENT': 'development',
+            'LOG_LEVEL': 'WARNING',
+            'SLACK_BOT_TOKEN': 'xoxb-load-test',
+            'SLACK_SIGNING_SECRET': SIGNING_SECRET,
+            'SLACK_API_URL': f"{self.slack.url}/api/",
+            # Traffic stands in for many workspaces; pace on the stub's injected 429s, not one workspace's tiers
+            'SLACK_GATEWAY_RATE_SCALE': '100',
+            'FINNHUB_API_KEY': 'load-test',
+            'FINNHUB_BASE_URL': f"{self.finnhub.url}/api/v1",
+            'ALPACA_PAPER_ENABLED': 'true',
+            'ALPACA_PAPER_BASE_URL': f"{self.alpaca.url}/paper-api",
+            'ALPACA_PAPER_API_KEY': 'PKLOADTEST',
+            'ALPACA_PAPER_SECRET_KEY': 'load-test-secret',
+            'ALPACA_API_KEY': 'PKLOADTEST',
+            'ALPACA_SECRET_KEY': 'load-test-secret',
+            'DATABASE_URL': f"sqlite:///{os.path.join(workdir, 'load.db')}",
+            'APPROVED_CHANNELS': CHANNEL_ID,
+            'ASSET_UNIVERSE_PATH': os.path.join(workdir, 'asset_universe.json'),
+            'PRICE_HISTORY_DIR': os.path.join(REPO_ROOT, 'data', 'price_history'),
+            'SECTOR_REFERENCE_PATH': os.path.join(REPO_ROOT, 'data', 'reference', 'sector_classification.csv'),
+            'PROFILING_DUMP_DIR': os.path.join(workdir, 'profiles'),
+            'LOOP_MONITOR_INTERVAL_MS': '10',
+            'LOOP_CAPTURE_STACKS': 'true',
+            'LOOP_SLOW_CALLBACK_MS': str(self.loop_block_budget_ms or DEFAULT_SLOW_CALLBACK_MS),
+        })
+        env.update(self.extra_env)
+        return env
+
+    def start(self) -> 'AppServer':
+        self._workdir = tempfile.TemporaryDirectory(prefix='slackoms-load-')
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            self.port = sock.getsockname()[1]
+
+        log = open(self.log_path, 'w')
+        started = time.perf_counter()
+        self._process = subprocess.Popen(
+            [sys.executable, '-m', 'tests.load.serve', '--port', str(self.port)],
+            cwd=self._workdir.name, env=self.environment(self._workdir.name), stdout=log, stderr=log
+        )
+        log.close()
+
+        deadline = started + self.startup_timeout
+        while time.perf_counter() < deadline:
+            if self._process.poll() is not None:
+                raise RuntimeError(f"App exited during startup (code {self._process.returncode}):\n{self.tail_log()}")
+            try:
+                with socket.create_connection(('127.0.0.1', self.port), timeout=0.5):
+                    self.startup_seconds = time.perf_counter() - started
+                    return self
+            except OSError:
+                time.sleep(0.2)
+        self.stop()
+        raise RuntimeError(f"App did not start within {self.startup_timeout:.0f}s")
+
+    def stop(self) -> None:
+        if self._process and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+        if self._workdir:
+            self._workdir.cleanup()
+            self._workdir = None
+
+    def tail_log(self, lines: int = 40) -> str:
+        try:
+            with open(self.log_path, errors='replace') as f:
+                return ''.join(f.readlines()[-lines:])
+        except OSError:
+            return ''
+
+    def __enter__(self) -> 'AppServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class LoadDriver:
+    """Open-loop traffic generator for one scenario against a running AppServer."""
+
+    def __init__(self, server: AppServer, scenario: Scenario):
+        self.server = server
+        self.scenario = scenario
+        self._rng = random.Random(scenario.seed)
+        self._kinds = list(scenario.mix)
+        self._weights = [scenario.mix[k] for k in self._kinds]
+
+    async def run(self) -> Dict[str, Any]:
+        scenario = self.scenario
+        timeout = aiohttp.ClientTimeout(total=scenario.timeout_seconds)
+        connector = aiohttp.TCPConnector(limit=0)
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+            if scenario.warmup_seconds:
+                await self._drive(session, scenario.warmup_seconds)
+            await self._loop_lag(session)  # discard warmup samples
+            for stub in (self.server.slack, self.server.alpaca, self.server.finnhub):
+                stub.reset_stats()
+
+            started = time.perf_counter()
+            samples = await self._drive(session, scenario.duration_seconds)
+            elapsed = time.perf_counter() - started
+            loop_lag = await self._loop_lag(session)
+
+        return self._summarize(samples, elapsed, loop_lag)
+
+    async def _drive(self, session: aiohttp.ClientSession, duration: float) -> List[Tuple[str, float, Any]]:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        scheduled_at = start
+        tasks = []
+        while True:
+            scheduled_at += self._rng.expovariate(self.scenario.rps)
+            if scheduled_at - start >= duration:
+                break
+            kind = self._rng.choices(self._kinds, self._weights)[0]
+            request = TRAFFIC[kind](self._rng, self.server.slack.url)
+            delay = scheduled_at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self._send(session, kind, request, scheduled_at)))
+        return await asyncio.gather(*tasks)
+
+    async def _send(self, session: aiohttp.ClientSession, kind: str, request: Tuple[str, str, str],
+                    scheduled_at: float) -> Tuple[str, float, Any]:
+        path, content_type, body = request
+        timestamp = str(int(time.time()))
+        headers = {'Content-Type': content_type, 'X-Slack-Request-Timestamp': timestamp,
+                   'X-Slack-Signature': sign(body, timestamp)}
+        loop = asyncio.get_running_loop()
+        try:
+            async with session.post(self.server.url + path, data=body.encode(), headers=headers) as response:
+                await response.read()
+                outcome = response.status
+        except asyncio.TimeoutError:
+            outcome = 'timeout'
+        except aiohttp.ClientError as e:
+            outcome = type(e).__name__
+        return kind, (loop.time() - scheduled_at) * 1000, outcome
+
+    async def _loop_lag(self, session: aiohttp.ClientSession) -> Dict[str, Any]:
+        async with session.get(self.server.url + '/__load/loop-lag') as response:
+            return await response.json()
+
+    def _summarize(self, samples: List[Tuple[str, float, Any]], elapsed: float,
+                   loop_window: Dict[str, Any]) -> Dict[str, Any]:
+        by_kind: Dict[str, List[float]] = defaultdict(list)
+        statuses: Dict[str, Counter] = defaultdict(Counter)
+        for kind, latency_ms, outcome in samples:
+            by_kind[kind].append(latency_ms)
+            statuses[kind][str(outcome)] += 1
+
+        def errors(counter: Counter) -> int:
+            return sum(n for outcome, n in counter.items() if not outcome.startswith('2'))
+
+        total = Counter()
+        for counter in statuses.values():
+            total.update(counter)
+
+        lag = sorted(loop_window['lag_ms'])
+        incidents = sorted(loop_window['incidents'], key=lambda incident: incident['duration_ms'], reverse=True)
+        return {
+            'scenario': asdict(self.scenario),
+            'requests': len(samples),
+            'errors': errors(total),
+            'error_rate': round(errors(total) / len(samples), 4) if samples else 0.0,
+            'elapsed_seconds': round(elapsed, 3),
+            'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+            'latency': summarize_latencies([latency for _, latency, _ in samples]),
+            'status_codes': dict(total),
+            'by_kind': {
+                kind: dict(requests=len(latencies), errors=errors(statuses[kind]),
+                           status_codes=dict(statuses[kind]), **summarize_latencies(latencies))
+                for kind, latencies in sorted(by_kind.items())
+            },
+            'event_loop_lag': {
+                'samples': len(lag),
+                'p50_ms': round(percentile(lag, 0.50), 3),
+                'p99_ms': round(percentile(lag, 0.99), 3),
+                'max_ms': round(lag[-1], 3) if lag else 0.0,
+                'blocked': len(incidents),
+                'worst_block_ms': incidents[0]['duration_ms'] if incidents else 0.0,
+                'incidents': incidents[:REPORTED_INCIDENTS]
+            },
+            'upstream': {stub.name: stub.get_stats()
+                         for stub in (self.server.slack, self.server.alpaca, self.server.finnhub)}
+        }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(scenarios: List[Scenario], extra_env: Optional[Dict[str, str]] = None,
+              loop_block_budget_ms: Optional[float] = None) -> Dict[str, Any]:
+    """Run scenarios back to back against one app process and return the report."""
+    slack, alpaca, finnhub = SlackStub().start(), AlpacaStub().start(), FinnhubStub().start()
+    try:
+        with AppServer(slack, alpaca, finnhub, extra_env=extra_env,
+                       loop_block_budget_ms=loop_block_budget_ms) as server:
+            results = {}
+            for scenario in scenarios:
+                slack.faults, alpaca.faults, finnhub.faults = scenario.slack, scenario.alpaca, scenario.finnhub
+                results[scenario.name] = asyncio.run(LoadDriver(server, scenario).run())
+            startup_seconds = server.startup_seconds
+    finally:
+        for stub in (slack, alpaca, finnhub):
+            stub.stop()
+
+    return {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'git_revision': _git_revision(),
+        'host': {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count()},
+        'app_startup_seconds': round(startup_seconds, 3),
+        'loop_block_budget_ms': loop_block_budget_ms,
+        'scenarios': results
+    }
+
+
+def loop_budget_violations(report: Dict[str, Any], budget_ms: float) -> List[str]:
+    """List scenarios in which a request path blocked the app's event loop beyond budget_ms."""
+    violations = []
+    for name, result in report['scenarios'].items():
+        over = [i for i in result['event_loop_lag']['incidents'] if i['duration_ms'] > budget_ms]
+        if over:
+            violation = (f"{name}: event loop blocked for {over[0]['duration_ms']:.1f}ms "
+                         f"(budget {budget_ms:g}ms, {result['event_loop_lag']['blocked']} stall(s))")
+            if over[0].get('stack'):
+                violation += "\n" + ''.join(over[0]['stack'])
+            violations.append(violation)
+    return violations
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any],
+                    tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    List regressions of current against baseline for scenarios present in both.
+
+    A regression is p99 latency or event-loop lag growing, or throughput falling, by
+    more than tolerance, or the error rate rising by more than a percentage point.
+    """
+    regressions = []
+    for name, result in current['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous:
+            continue
+        checks = (
+            ('p99 latency', previous['latency']['p99_ms'], result['latency']['p99_ms'], True),
+            ('event-loop lag p99', previous['event_loop_lag']['p99_ms'], result['event_loop_lag']['p99_ms'], True),
+            ('throughput', previous['throughput_rps'], result['throughput_rps'], False),
+        )
+        for label, before, after, higher_is_worse in checks:
+            if not before:
+                continue
+            change = (after - before) / before
+            if (change > tolerance) if higher_is_worse else (change < -tolerance):
+                regressions.append(f"{name}: {label} {before:g} -> {after:g} ({change:+.0%})")
+        if result['error_rate'] - previous['error_rate'] > 0.01:
+            regressions.append(f"{name}: error rate {previous['error_rate']:.2%} -> {result['error_rate']:.2%}")
+    return regressions
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [f"{'scenario':<20} {'rps':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'errors':>7} {'lag p99':>9} {'blocked':>8}"]
+    for name, result in report['scenarios'].items():
+        latency = result['latency']
+        lines.append(f"{name:<20} {result['throughput_rps']:>7.1f} {latency['p50_ms']:>7.1f}ms "
+                     f"{latency['p95_ms']:>7.1f}ms {latency['p99_ms']:>7.1f}ms {result['errors']:>7} "
+                     f"{result['event_loop_lag']['p99_ms']:>7.1f}ms {result['event_loop_lag']['blocked']:>8}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Run the end-to-end load-test scenarios.')
+    parser.add_argument('-s', '--scenarios', default=','.join(DEFAULT_SCENARIOS),
+                        help=f"comma-separated scenario names ({', '.join(SCENARIOS)})")
+    parser.add_argument('-d', '--duration', type=float, help='override each scenario duration in seconds')
+    parser.add_argument('-r', '--rps-scale', type=float, default=1.0, help='multiply every scenario rate')
+    parser.add_argument('-o', '--output', help='JSON report path (default logs/load/<timestamp>.json)')
+    parser.add_argument('-b', '--baseline', help='previous JSON report to compare against')
+    parser.add_argument('-t', '--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='allowed relative regression before failing (default 0.20)')
+    parser.add_argument('--loop-budget-ms', type=float,
+                        help='fail if any request path blocks the event loop for longer than this')
+    args = parser.parse_args(argv)
+
+    scenarios = []
+    for name in filter(None, (n.strip() for n in args.scenarios.split(','))):
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario {name!r}")
+        scenario = replace(SCENARIOS[name], rps=SCENARIOS[name].rps * args.rps_scale)
+        scenarios.append(replace(scenario, duration_seconds=args.duration) if args.duration else scenario)
+
+    report = run_suite(scenarios, loop_block_budget_ms=args.loop_budget_ms)
+    output = args.output or os.path.join(
+        REPO_ROOT, 'logs', 'load', f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(format_report(report))
+    print(f"\nReport written to {output}")
+
+    failures = []
+    if args.loop_budget_ms:
+        failures += loop_budget_violations(report, args.loop_budget_ms)
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures += compare_reports(json.load(f), report, args.tolerance)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""
+Launch the real FastAPI app for a load test.
+
+Run by the harness as ``python -m tests.load.serve --port N`` with the stub URLs in
+the environment. The app's own event-loop monitor (services/loop_monitor.py), started
+in its lifespan, measures lag and blocking incidents. GET /__load/loop-lag returns
+the lag samples and incidents since the last call.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import uvicorn
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--port', type=int, required=True)
+    args = parser.parse_args()
+
+    from app import fastapi_app
+    from services.loop_monitor import get_loop_monitor
+
+    @fastapi_app.get('/__load/loop-lag')
+    async def loop_lag():
+        return get_loop_monitor().take_window()
+
+    started = time.perf_counter()
+    uvicorn.run(fastapi_app, host='127.0.0.1', port=args.port, log_level='warning', access_log=False)
+    print(f"load-test server stopped after {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,365 @@
+"""
+Local stand-ins for the Slack Web API, Alpaca and Finnhub.
+
+Each stub is a small aiohttp server on 127.0.0.1 running its own event loop in a
+background thread. It answers the endpoints the bot calls with realistic payloads.
+Latency and failures are injected from a FaultProfile, so a scenario can model a
+slow broker or a flaky market-data feed without touching the network.
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+
+
+@dataclass
+class FaultProfile:
+    """Latency and error injection applied to every request a stub serves."""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+
+    def __post_init__(self):
+        if self.latency_ms < 0 or self.jitter_ms < 0:
+            raise ValueError("Stub latency must be non-negative")
+        if not 0.0 <= self.error_rate <= 1.0:
+            raise ValueError("Stub error rate must be between 0.0 and 1.0")
+
+
+class StubServer:
+    """
+    Base class for the stand-in servers.
+
+    Subclasses implement respond(); the base class handles the server thread,
+    request accounting and fault injection.
+    """
+
+    name = 'stub'
+
+    def __init__(self, faults: Optional[FaultProfile] = None, seed: Optional[int] = None):
+        self.faults = faults or FaultProfile()
+        self.requests: Counter = Counter()
+        self.injected_errors = 0
+        self.port: Optional[int] = None
+        self._random = random.Random(seed)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self) -> 'StubServer':
+        """Start serving on an ephemeral port; returns once the socket is bound."""
+        ready = threading.Event()
+        errors = []
+
+        def serve():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._loop.run_until_complete(self._start_site())
+            except Exception as e:
+                errors.append(e)
+                ready.set()
+                return
+            ready.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self._runner.cleanup())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=serve, name=f"{self.name}-stub", daemon=True)
+        self._thread.start()
+        ready.wait(timeout=10)
+        if errors:
+            raise errors[0]
+        return self
+
+    def stop(self) -> None:
+        if self._loop and self._thread and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=10)
+
+    def reset_stats(self) -> None:
+        self.requests.clear()
+        self.injected_errors = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'requests': sum(self.requests.values()),
+            'injected_errors': self.injected_errors,
+            'by_endpoint': dict(self.requests.most_common())
+        }
+
+    async def _start_site(self) -> None:
+        app = web.Application()
+        app.router.add_route('*', '/{path:.*}', self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        path = request.match_info['path']
+        self.requests[self.endpoint(request.method, path)] += 1
+
+        faults = self.faults
+        delay_ms = faults.latency_ms + (self._random.uniform(0, faults.jitter_ms) if faults.jitter_ms else 0.0)
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+        if faults.error_rate and self._random.random() < faults.error_rate:
+            self.injected_errors += 1
+            return self.error_response(faults.error_status)
+
+        return await self.respond(request, path)
+
+    def endpoint(self, method: str, path: str) -> str:
+        """Name a request for the per-endpoint counters."""
+        return f"{method} /{path}"
+
+    def error_response(self, status: int) -> web.Response:
+        headers = {'Retry-After': '1'} if status == 429 else None
+        return web.json_response({'message': 'injected failure'}, status=status, headers=headers)
+
+    async def respond(self, request: web.Request, path: str) -> web.StreamResponse:
+        raise NotImplementedError
+
+
+class SlackStub(StubServer):
+    """
+    Slack Web API stand-in mounted at /api/<method>, plus response_url hooks at /hooks/.
+
+    Point the bot at it with SLACK_API_URL=<url>/api/.
+    """
+
+    name = 'slack'
+
+    def endpoint(self, method: str, path: str) -> str:
+        if path.startswith('hooks/'):
+            return 'response_url'
+        return path.rsplit('/', 1)[-1]
+
+    def error_response(self, status: int) -> web.Response:
+        # Slack signals most failures with HTTP 200 and ok=false; 429 carries Retry-After
+        if status == 429:
+            return web.json_response({'ok': False, 'error': 'ratelimited'}, status=429, headers={'Retry-After': '1'})
+        return web.json_response({'ok': False, 'error': 'internal_error'})
+
+    async def respond(self, request: web.Request, path: str) -> web.StreamResponse:
+        if path.startswith('hooks/'):
+            return web.Response(text='ok')
+
+        method = path.rsplit('/', 1)[-1]
+        params = dict(request.query)
+        if request.content_type == 'application/json':
+            body = await request.read()
+            if body:
+                params.update(json.loads(body))
+        elif request.body_exists:
+            params.update(await request.post())
+
+        payload: Dict[str, Any] = {'ok': True}
+        if method in ('views.open', 'views.push', 'views.update', 'views.publish'):
+            view = params.get('view') or {}
+            if isinstance(view, str):
+                view = json.loads(view)
+            payload['view'] = dict(view, id=params.get('view_id') or f"V{uuid.uuid4().hex[:10].upper()}",
+                                   hash=f"{time.time():.6f}.{uuid.uuid4().hex[:8]}")
+        elif method in ('chat.postMessage', 'chat.postEphemeral', 'chat.update'):
+            payload.update(channel=params.get('channel'), ts=f"{time.time():.6f}", message_ts=f"{time.time():.6f}")
+        elif method == 'users.info':
+            user_id = params.get('user', 'U0000000000')
+            payload['user'] = {
+                'id': user_id, 'name': f"trader.{user_id.lower()}", 'real_name': f"Trader {user_id}",
+                'is_admin': False, 'is_bot': False, 'deleted': False, 'tz': 'America/New_York',
+                'profile': {'email': f"{user_id.lower()}@example.com", 'display_name': f"Trader {user_id}",
+                            'real_name': f"Trader {user_id}", 'title': 'Portfolio Manager'}
+            }
+        elif method == 'conversations.info':
+            channel_id = params.get('channel', 'C0000000000')
+            payload['channel'] = {'id': channel_id, 'name': 'trading-private', 'is_private': True,
+                                  'is_channel': True, 'is_member': True}
+        elif method == 'auth.test':
+            payload.update(url='https://example.slack.com/', team='Load Test', user='slackoms',
+                           team_id='T1234567890', user_id='UBOT000001', bot_id='B1234567890')
+        return web.json_response(payload)
+
+
+# Deterministic reference prices so quotes look plausible across runs
+REFERENCE_PRICES = {
+    'AAPL': 189.50, 'MSFT': 415.20, 'GOOGL': 141.80, 'AMZN': 178.30, 'TSLA': 242.10,
+    'META': 492.60, 'NVDA': 875.40, 'NFLX': 612.90, 'SPY': 512.30, 'JPM': 196.70
+}
+
+
+def reference_price(symbol: str) -> float:
+    return REFERENCE_PRICES.get(symbol.upper(), 50.0 + (sum(map(ord, symbol.upper())) % 400))
+
+
+class FinnhubStub(StubServer):
+    """
+    Finnhub REST stand-in mounted at /api/v1, plus the trades websocket at /ws.
+
+    Point the bot at it with FINNHUB_BASE_URL=<url>/api/v1 and QUOTE_STREAM_WS_URL=<url>/ws.
+    """
+
+    name = 'finnhub'
+    tick_interval = 0.05  # Seconds between trade messages on the websocket
+
+    def __init__(self, faults: Optional[FaultProfile] = None, seed: Optional[int] = None):
+        super().__init__(faults, seed)
+        self.ws_subscriptions: Counter = Counter()  # Subscribe messages received per symbol
+
+    def endpoint(self, method: str, path: str) -> str:
+        return path.replace('api/v1/', '', 1)
+
+    async def respond(self, request: web.Request, path: str) -> web.StreamResponse:
+        endpoint = self.endpoint(request.method, path)
+        symbol = request.query.get('symbol', 'AAPL').upper()
+
+        if endpoint == 'ws':
+            return await self._stream_trades(request)
+
+        if endpoint == 'quote':
+            previous_close = reference_price(symbol)
+            current = round(previous_close * (1 + self._random.uniform(-0.02, 0.02)), 2)
+            return web.json_response({
+                'c': current, 'd': round(current - previous_close, 2),
+                'dp': round((current - previous_close) / previous_close * 100, 4),
+                'h': round(max(current, previous_close) * 1.01, 2), 'l': round(min(current, previous_close) * 0.99, 2),
+                'o': previous_close, 'pc': previous_close, 't': int(time.time())
+            })
+        if endpoint == 'stock/profile2':
+            return web.json_response({
+                'ticker': symbol, 'name': f"{symbol} Inc", 'exchange': 'NASDAQ NMS - GLOBAL MARKET',
+                'country': 'US', 'currency': 'USD', 'finnhubIndustry': 'Technology',
+                'marketCapitalization': 1_000_000.0, 'shareOutstanding': 15_000.0
+            })
+        if endpoint == 'stock/market-status':
+            return web.json_response({'exchange': request.query.get('exchange', 'US'), 'holiday': None,
+                                      'isOpen': True, 'session': 'regular', 'timezone': 'America/New_York',
+                                      't': int(time.time())})
+        if endpoint == 'search':
+            query = request.query.get('q', '').upper()
+            matches = [s for s in REFERENCE_PRICES if s.startswith(query)]
+            return web.json_response({'count': len(matches), 'result': [
+                {'description': f"{s} Inc", 'displaySymbol': s, 'symbol': s, 'type': 'Common Stock'}
+                for s in matches
+            ]})
+        return web.json_response({'error': f"Unknown endpoint {endpoint}"}, status=404)
+
+    async def _stream_trades(self, request: web.Request) -> web.WebSocketResponse:
+        """Send a trade for every subscribed symbol each tick_interval."""
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        symbols = set()
+
+        async def push():
+            while not ws.closed:
+                await asyncio.sleep(self.tick_interval)
+                if symbols:
+                    await ws.send_json({'type': 'trade', 'data': [
+                        {'s': s, 'p': round(reference_price(s) * (1 + self._random.uniform(-0.01, 0.01)), 2),
+                         't': int(time.time() * 1000), 'v': self._random.randint(1, 500)}
+                        for s in sorted(symbols)
+                    ]})
+
+        pusher = asyncio.create_task(push())
+        try:
+            async for message in ws:
+                if message.type != web.WSMsgType.TEXT:
+                    continue
+                payload = json.loads(message.data)
+                if payload.get('type') == 'subscribe':
+                    symbols.add(payload['symbol'])
+                    self.ws_subscriptions[payload['symbol']] += 1
+                elif payload.get('type') == 'unsubscribe':
+                    symbols.discard(payload['symbol'])
+        finally:
+            pusher.cancel()
+        return ws
+
+
+class AlpacaStub(StubServer):
+    """
+    Alpaca paper-trading REST stand-in.
+
+    Routes match on the /v2/... suffix, so the bot can be pointed at
+    ALPACA_PAPER_BASE_URL=<url>/paper-api and still pass its paper-URL safety check.
+    Orders fill immediately and update in-memory positions.
+    """
+
+    name = 'alpaca'
+
+    def __init__(self, faults: Optional[FaultProfile] = None, seed: Optional[int] = None):
+        super().__init__(faults, seed)
+        self.positions: Dict[str, int] = {}
+        self.orders = []
+
+    def endpoint(self, method: str, path: str) -> str:
+        suffix = path[path.find('v2/'):] if 'v2/' in path else path
+        if suffix.startswith('v2/assets/'):
+            suffix = 'v2/assets/{symbol}'
+        return f"{method} /{suffix}"
+
+    def _position(self, symbol: str, qty: int) -> Dict[str, Any]:
+        price = reference_price(symbol)
+        return {
+            'asset_id': str(uuid.uuid5(uuid.NAMESPACE_OID, symbol)), 'symbol': symbol, 'exchange': 'NASDAQ',
+            'asset_class': 'us_equity', 'qty': str(qty), 'side': 'long' if qty >= 0 else 'short',
+            'avg_entry_price': f"{price:.2f}", 'current_price': f"{price:.2f}", 'lastday_price': f"{price:.2f}",
+            'market_value': f"{price * qty:.2f}", 'cost_basis': f"{price * qty:.2f}",
+            'unrealized_pl': '0.00', 'unrealized_plpc': '0.0', 'change_today': '0.0'
+        }
+
+    async def respond(self, request: web.Request, path: str) -> web.StreamResponse:
+        endpoint = self.endpoint(request.method, path)
+
+        if endpoint == 'GET /v2/account':
+            return web.json_response({
+                'id': 'load-test-account', 'account_number': 'PA3LOADTEST1', 'status': 'ACTIVE', 'currency': 'USD',
+                'cash': '100000.00', 'buying_power': '400000.00', 'portfolio_value': '100000.00',
+                'equity': '100000.00', 'last_equity': '100000.00', 'pattern_day_trader': False,
+                'trading_blocked': False, 'account_blocked': False
+            })
+        if endpoint == 'POST /v2/orders':
+            order = await request.json()
+            symbol, qty = order['symbol'].upper(), int(float(order['qty']))
+            self.positions[symbol] = self.positions.get(symbol, 0) + (qty if order['side'] == 'buy' else -qty)
+            filled = {
+                'id': str(uuid.uuid4()), 'client_order_id': str(uuid.uuid4()), 'symbol': symbol,
+                'qty': str(qty), 'filled_qty': str(qty), 'side': order['side'], 'type': order.get('type', 'market'),
+                'time_in_force': order.get('time_in_force', 'day'), 'status': 'filled',
+                'filled_avg_price': f"{reference_price(symbol):.2f}",
+                'submitted_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                'filled_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+            }
+            self.orders.append(filled)
+            return web.json_response(filled)
+        if endpoint == 'GET /v2/orders':
+            return web.json_response(self.orders[-int(request.query.get('limit', 50)):])
+        if endpoint == 'GET /v2/positions':
+            return web.json_response([self._position(s, q) for s, q in self.positions.items() if q])
+        if endpoint == 'GET /v2/assets/{symbol}':
+            symbol = path.rsplit('/', 1)[-1].upper()
+            return web.json_response({'id': str(uuid.uuid5(uuid.NAMESPACE_OID, symbol)), 'symbol': symbol,
+                                      'name': f"{symbol} Inc", 'exchange': 'NASDAQ', 'class': 'us_equity',
+                                      'status': 'active', 'tradable': True, 'fractionable': True})
+        if endpoint == 'GET /v2/assets':
+            return web.json_response([{'symbol': s, 'name': f"{s} Inc", 'exchange': 'NASDAQ', 'class': 'us_equity',
+                                       'status': 'active', 'tradable': True} for s in REFERENCE_PRICES])
+        if endpoint == 'GET /v2/clock':
+            return web.json_response({'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                                      'is_open': True, 'next_open': None, 'next_close': None})
+        return web.json_response({'message': f"Unknown endpoint {endpoint}"}, status=404)
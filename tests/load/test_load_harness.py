@@ -0,0 +1,102 @@
+"""
+Tests for the load-test harness: stub fault injection, report comparison and a short
+end-to-end run of the real app against the stubs.
+"""
+
+import os
+import sys
+import time
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from tests.load.harness import Scenario, compare_reports, loop_budget_violations, run_suite
+from tests.load.stubs import AlpacaStub, FaultProfile, SlackStub
+
+# No request path may hold the app's event loop longer than this during the smoke run
+SMOKE_LOOP_BUDGET_MS = 250.0
+
+
+@pytest.fixture
+def slack_stub():
+    stub = SlackStub(seed=1).start()
+    yield stub
+    stub.stop()
+
+
+class TestStubs:
+    """Stand-ins answer like the real APIs and apply their fault profile."""
+
+    def test_latency_and_errors_injected(self, slack_stub):
+        slack_stub.faults = FaultProfile(latency_ms=50)
+        start = time.perf_counter()
+        response = requests.post(f"{slack_stub.url}/api/views.open", data={'trigger_id': 't', 'view': '{"type": "modal"}'})
+        assert time.perf_counter() - start >= 0.05
+        assert response.json()['ok'] and response.json()['view']['id'].startswith('V')
+
+        slack_stub.faults = FaultProfile(error_rate=1.0, error_status=429)
+        response = requests.post(f"{slack_stub.url}/api/chat.postMessage", data={'channel': 'C1'})
+        assert response.status_code == 429 and response.headers['Retry-After'] == '1'
+        assert slack_stub.get_stats() == {'requests': 2, 'injected_errors': 1,
+                                          'by_endpoint': {'views.open': 1, 'chat.postMessage': 1}}
+
+    def test_alpaca_orders_fill_into_positions(self):
+        stub = AlpacaStub().start()
+        try:
+            base = f"{stub.url}/paper-api/v2"
+            order = requests.post(f"{base}/orders", json={'symbol': 'aapl', 'qty': '10', 'side': 'buy',
+                                                          'type': 'market', 'time_in_force': 'day'}).json()
+            positions = requests.get(f"{base}/positions").json()
+        finally:
+            stub.stop()
+        assert order['status'] == 'filled' and order['symbol'] == 'AAPL'
+        assert [(p['symbol'], p['qty']) for p in positions] == [('AAPL', '10')]
+
+
+def _report(p99_ms, throughput_rps, lag_p99_ms=1.0, error_rate=0.0):
+    return {'scenarios': {'baseline': {
+        'latency': {'p99_ms': p99_ms}, 'throughput_rps': throughput_rps,
+        'event_loop_lag': {'p99_ms': lag_p99_ms}, 'error_rate': error_rate
+    }}}
+
+
+class TestCompareReports:
+    """Regression comparison between two JSON reports."""
+
+    def test_flags_regressions_beyond_tolerance(self):
+        regressions = compare_reports(_report(100, 20), _report(130, 15, lag_p99_ms=5.0, error_rate=0.05))
+        assert len(regressions) == 4
+        assert regressions[0].startswith('baseline: p99 latency 100 -> 130')
+
+    def test_improvements_and_noise_pass(self):
+        assert compare_reports(_report(100, 20), _report(110, 19)) == []
+        assert compare_reports(_report(100, 20), _report(50, 40, lag_p99_ms=0.5)) == []
+        assert compare_reports({'scenarios': {}}, _report(500, 1)) == []
+
+    def test_loop_budget_violations_carry_stack(self):
+        report = {'scenarios': {'baseline': {'event_loop_lag': {'blocked': 2, 'incidents': [
+            {'duration_ms': 240.0, 'stack': ['  File "services/auth.py", line 10, in lookup\n']},
+            {'duration_ms': 60.0, 'stack': None}
+        ]}}}}
+        violations = loop_budget_violations(report, 100)
+        assert len(violations) == 1 and 'blocked for 240.0ms (budget 100ms, 2 stall(s))' in violations[0]
+        assert 'services/auth.py' in violations[0]
+        assert loop_budget_violations(report, 250) == []
+
+
+class TestEndToEnd:
+    """A short scenario against the real FastAPI app."""
+
+    def test_smoke_scenario(self):
+        scenario = Scenario('smoke', rps=10, duration_seconds=2.0, warmup_seconds=0.5)
+        report = run_suite([scenario], loop_block_budget_ms=SMOKE_LOOP_BUDGET_MS)
+        result = report['scenarios']['smoke']
+
+        assert result['requests'] > 5 and result['errors'] == 0
+        assert set(result['by_kind']) <= set(scenario.mix) and len(result['by_kind']) >= 3
+        assert result['latency']['p50_ms'] <= result['latency']['p99_ms'] <= result['latency']['max_ms']
+        assert result['event_loop_lag']['samples'] > 0
+        assert result['upstream']['slack']['requests'] > 0
+        assert loop_budget_violations(report, SMOKE_LOOP_BUDGET_MS) == []
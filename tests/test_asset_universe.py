@@ -0,0 +1,106 @@
+"""
+Tests for the local tradable-asset universe.
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.asset_universe import AssetUniverse
+from services.validation_service import ValidationService
+
+
+ASSETS = [
+    {'symbol': 'AAPL', 'name': 'Apple Inc.', 'exchange': 'NASDAQ', 'tradable': True, 'shortable': True},
+    {'symbol': 'AMZN', 'name': 'Amazon.com Inc.', 'exchange': 'NASDAQ', 'tradable': True},
+    {'symbol': 'AAL', 'name': 'American Airlines Group', 'exchange': 'NASDAQ', 'tradable': True},
+    {'symbol': 'AAXX', 'name': 'Delisted Corp', 'exchange': 'OTC', 'tradable': False},
+    {'symbol': 'IBM', 'name': 'International Business Machines', 'exchange': 'NYSE', 'tradable': True},
+]
+
+
+@pytest.fixture
+def universe(tmp_path):
+    assets = AssetUniverse(str(tmp_path / 'universe.json'))
+    assets.load_assets(ASSETS)
+    return assets
+
+
+class TestAssetUniverse:
+    """Tests for lookups, prefix search and snapshots."""
+
+    def test_lookups(self, universe):
+        assert len(universe) == 5
+        assert universe.is_tradable('aapl')
+        assert not universe.is_tradable('AAXX')
+        assert not universe.is_tradable('NOPE')
+        assert universe.get_exchange('IBM') == 'NYSE'
+        assert universe.get_name('AMZN') == 'Amazon.com Inc.'
+        assert universe.get('AAPL').shortable
+        assert universe.get('NOPE') is None
+
+    def test_prefix_search(self, universe):
+        assert [r.symbol for r in universe.search_prefix('aa')] == ['AAL', 'AAPL']
+        assert [r.symbol for r in universe.search_prefix('AA', tradable_only=False)] == ['AAL', 'AAPL', 'AAXX']
+        assert [r.symbol for r in universe.search_prefix('A', limit=2)] == ['AAL', 'AAPL']
+        assert universe.search_prefix('') == []
+
+    def test_snapshot_round_trip(self, universe):
+        universe.save_snapshot()
+        restored = AssetUniverse(universe.snapshot_path)
+        assert restored.load_snapshot()
+        assert restored.get('IBM') == universe.get('IBM')
+        assert restored.loaded_at == universe.loaded_at
+
+    def test_missing_snapshot(self, tmp_path):
+        assert not AssetUniverse(str(tmp_path / 'missing.json')).load_snapshot()
+
+    def test_refresh_if_stale(self, universe):
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return ASSETS[:2]
+
+        assert not universe.refresh_if_stale(loader, timedelta(hours=24))
+        universe.load_assets(ASSETS, loaded_at=datetime.utcnow() - timedelta(days=2))
+        assert universe.refresh_if_stale(loader, timedelta(hours=24))
+        assert len(calls) == 1
+        assert len(universe) == 2
+        assert os.path.exists(universe.snapshot_path)
+
+    def test_empty_refresh_keeps_universe(self, universe):
+        assert not universe.refresh(lambda: [])
+        assert len(universe) == 5
+
+    @pytest.mark.benchmark
+    def test_lookup_latency_on_large_universe(self):
+        assets = AssetUniverse()
+        assets.load_assets({'symbol': f"S{i:05d}", 'name': f"Company {i}", 'exchange': 'NYSE', 'tradable': True}
+                           for i in range(20000))
+        start = time.perf_counter()
+        for i in range(10000):
+            assert assets.is_tradable(f"S{i:05d}")
+        per_lookup_us = (time.perf_counter() - start) / 10000 * 1e6
+        assert per_lookup_us < 50, f"{per_lookup_us:.2f}us per lookup"
+
+
+class TestValidationWithUniverse:
+    """Symbol validation answers from the universe without the broker."""
+
+    def test_validate_ticker_symbol(self, universe):
+        service = ValidationService(asset_universe=universe)
+        assert service.validate_ticker_symbol('aapl')['valid']
+        assert 'not currently tradeable' in service.validate_ticker_symbol('AAXX')['error']
+        assert 'not found' in service.validate_ticker_symbol('ZZZZ')['error']
+        assert service.lookup_asset('IBM')['exchange'] == 'NYSE'
+
+    def test_falls_back_to_format_only_when_empty(self):
+        service = ValidationService(asset_universe=AssetUniverse())
+        assert not service.can_lookup_assets()
+        assert service.validate_ticker_symbol('ZZZZ')['valid']
@@ -0,0 +1,209 @@
+"""
+Tests and per-render benchmark for precompiled Block Kit templates.
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.settings import SlackGatewayConfig
+from models.user import User, UserProfile, UserRole
+from services.metrics import MetricsRegistry
+from services.slack_gateway import GatewayWebClient, SlackGateway
+from tests.load.stubs import SlackStub
+from ui.block_templates import BlockTemplate, Slot
+from ui.trade_modal_templates import render_instant_trade_modal, render_multi_account_trade_modal
+from ui.trade_widget import TradeWidget, WidgetContext
+from utils.serializers import PrerenderedJSON, json_dumps
+
+
+def _dict_builder_instant_buy_modal(symbol, quantity, price):
+    """The per-render dict builder the instant modal template replaced (benchmark baseline)."""
+    element = {
+        "type": "external_select",
+        "action_id": "symbol_input",
+        "placeholder": {"type": "plain_text", "text": "Search ticker or company (e.g., AAPL, Apple)"},
+        "min_query_length": 1
+    }
+    if symbol:
+        element["initial_option"] = {"text": {"type": "plain_text", "text": symbol.upper()}, "value": symbol.upper()}
+    trigger = {"trigger_actions_on": ["on_enter_pressed", "on_character_entered"]}
+    modal = {
+        "type": "modal",
+        "callback_id": "stock_trade_modal_interactive",
+        "title": {"type": "plain_text", "text": "KEMBot"},
+        "submit": {"type": "plain_text", "text": "Execute Trade"},
+        "close": {"type": "plain_text", "text": "Cancel"},
+        "blocks": [
+            {"type": "input", "block_id": "trade_symbol_block",
+             "label": {"type": "plain_text", "text": "Stock Symbol"}, "element": element},
+            {"type": "section", "text": {"type": "mrkdwn", "text": "*Current Stock Price:* *Loading...*"},
+             "block_id": "current_price_display"},
+            {"type": "divider"},
+            {"type": "input", "block_id": "trade_side_block",
+             "label": {"type": "plain_text", "text": "Trade Action (Buy/Sell)"},
+             "element": {"type": "radio_buttons", "action_id": "trade_side_radio",
+                         "options": [{"value": "buy", "text": {"type": "plain_text", "text": "Buy"}},
+                                     {"value": "sell", "text": {"type": "plain_text", "text": "Sell"}}],
+                         "initial_option": {"value": "buy", "text": {"type": "plain_text", "text": "Buy"}}}},
+            {"type": "input", "block_id": "qty_shares_block",
+             "label": {"type": "plain_text", "text": "Quantity (shares)"},
+             "element": {"type": "number_input", "action_id": "shares_input",
+                         "placeholder": {"type": "plain_text", "text": "Enter shares, and GMV will update"},
+                         "is_decimal_allowed": False, "initial_value": quantity, "dispatch_action_config": trigger},
+             "hint": {"type": "plain_text", "text": "Changes here trigger an automatic GMV calculation."}},
+            {"type": "input", "block_id": "gmv_block",
+             "label": {"type": "plain_text", "text": "Gross Market Value (GMV)"},
+             "element": {"type": "number_input", "action_id": "gmv_input",
+                         "placeholder": {"type": "plain_text", "text": "Enter dollar amount, and shares will update"},
+                         "is_decimal_allowed": True, "dispatch_action_config": trigger},
+             "hint": {"type": "plain_text", "text": "Changes here trigger an automatic Shares calculation."}},
+            {"type": "divider"},
+            {"type": "input", "block_id": "order_type_block", "label": {"type": "plain_text", "text": "Order Type"},
+             "element": {"type": "static_select", "action_id": "order_type_select",
+                         "initial_option": {"text": {"type": "plain_text", "text": "Market"}, "value": "market"},
+                         "options": [{"text": {"type": "plain_text", "text": "Market"}, "value": "market"},
+                                     {"text": {"type": "plain_text", "text": "Limit"}, "value": "limit"},
+                                     {"text": {"type": "plain_text", "text": "Stop"}, "value": "stop"},
+                                     {"text": {"type": "plain_text", "text": "Stop Limit"}, "value": "stop_limit"}]}}
+        ]
+    }
+    if price is not None:
+        modal["blocks"][1]["text"]["text"] = f"*Current Stock Price:* ${price:.2f}"
+        if quantity and quantity.isdigit():
+            modal["blocks"][5]["element"]["initial_value"] = str(int(quantity) * price)
+    return modal
+
+
+def _template_instant_buy_modal(symbol, quantity, price):
+    gmv = str(int(quantity) * price) if quantity.isdigit() else None
+    return render_instant_trade_modal("buy", symbol, quantity, f"*Current Stock Price:* ${price:.2f}", gmv=gmv)
+
+
+class TestBlockTemplate:
+    """Compiling layouts and filling slots."""
+
+    def test_optional_and_spliced_slots_keep_valid_json(self):
+        template = BlockTemplate({
+            "type": "modal",
+            "title": {"type": "plain_text", "text": Slot("title")},
+            "blocks": [Slot("head", splice=True), {"type": "divider"}, Slot("tail", optional=True)],
+            "private_metadata": Slot("metadata", optional=True)
+        })
+
+        bare = json.loads(template.render_json(title='T'))
+        full = json.loads(template.render_json(title='Q "x"', head=[{"a": 1}, {"b": 2}], tail={"c": 3}, metadata='m'))
+
+        assert bare == {"type": "modal", "title": {"type": "plain_text", "text": "T"}, "blocks": [{"type": "divider"}]}
+        assert full['title']['text'] == 'Q "x"' and full['private_metadata'] == 'm'
+        assert full['blocks'] == [{"a": 1}, {"b": 2}, {"type": "divider"}, {"c": 3}]
+        assert template.slot_names == {'title', 'head', 'tail', 'metadata'}
+
+    def test_rejects_layouts_that_could_render_invalid_json(self):
+        with pytest.raises(ValueError):
+            BlockTemplate({"initial_value": Slot("value", optional=True)})
+        with pytest.raises(ValueError):
+            BlockTemplate({"type": "section", "fields": Slot("fields", splice=True)})
+        with pytest.raises(KeyError):
+            BlockTemplate({"type": "section", "text": Slot("text")}).render_json()
+
+    def test_rendered_view_is_written_from_cached_text(self):
+        view = BlockTemplate({"type": "modal", "title": Slot("title")}).render(title="KEMBot")
+        body = {'view_id': 'V1', 'view': view}
+
+        assert isinstance(view, PrerenderedJSON) and view == {"type": "modal", "title": "KEMBot"}
+        assert json_dumps(body) == '{"view_id":"V1","view":' + view.json + '}'
+
+        view['private_metadata'] = 'C1'
+        assert view.json is None
+        assert json.loads(json_dumps(body))['view']['private_metadata'] == 'C1'
+
+
+class TestTradeModalTemplates:
+    """Templates render the same views as the builders they replaced."""
+
+    @pytest.mark.parametrize('symbol,quantity,price', [('aapl', '10', 150.25), ('', '1', 3.0), ('TSLA', 'x', 10.0)])
+    def test_instant_modal_matches_dict_builder(self, symbol, quantity, price):
+        assert _template_instant_buy_modal(symbol, quantity, price) == _dict_builder_instant_buy_modal(symbol, quantity, price)
+
+    def test_instant_sell_modal_and_metadata(self):
+        view = render_instant_trade_modal("sell", "msft", "5", private_metadata="C123")
+
+        assert view['blocks'][3]['element']['initial_option']['value'] == 'sell'
+        assert view['blocks'][1]['text']['text'] == "*Current Stock Price:* *Loading...*"
+        assert 'initial_value' not in view['blocks'][5]['element'] and view['private_metadata'] == 'C123'
+
+    def test_multi_account_modal(self):
+        account_section = {"type": "section", "text": {"type": "mrkdwn", "text": "*Account:* Primary"}}
+        view = render_multi_account_trade_modal("Primary", [account_section, {"type": "divider"}],
+                                                symbol="AAPL", quantity=100, gmv=17500, action="sell")
+        bare = render_multi_account_trade_modal("Account", [])
+
+        assert view['title']['text'] == "Trade - Primary" and view['blocks'][0] == account_section
+        assert [block['block_id'] for block in view['blocks'][2:]] == [
+            'symbol_input', 'quantity_input', 'gmv_input', 'action_select', 'order_type_select']
+        assert view['blocks'][4]['element']['initial_value'] == '17500.00'
+        assert view['blocks'][5]['element']['initial_option']['value'] == 'sell'
+        assert bare['blocks'][0]['block_id'] == 'symbol_input' and 'initial_value' not in bare['blocks'][0]['element']
+
+    def test_trade_widget_modal_shell(self):
+        user = User(user_id='user-1', slack_user_id='U1', role=UserRole.EXECUTION_TRADER,
+                    profile=UserProfile(display_name='Trader', email='u1@example.com', department='Trading'))
+        modal = TradeWidget().create_trade_modal(WidgetContext(user=user, channel_id='C1', trigger_id='t1', symbol='AAPL'))
+
+        assert modal['callback_id'] == 'trade_modal' and modal['notify_on_close'] is True
+        assert modal['blocks'][2]['element']['initial_value'] == 'AAPL'
+        assert json.loads(modal['private_metadata'])['channel_id'] == 'C1'
+
+
+class TestGatewaySerialization:
+    """The gateway sends the rendered text as the view."""
+
+    def test_view_arrives_intact(self):
+        stub = SlackStub(seed=1).start()
+        gateway = SlackGateway(SlackGatewayConfig(), registry=MetricsRegistry(), token='xoxb-test',
+                               base_url=f"{stub.url}/api/")
+        try:
+            client = GatewayWebClient(token='xoxb-test', base_url=f"{stub.url}/api/", gateway=gateway)
+            view = _template_instant_buy_modal('AAPL', '10', 150.25)
+            response = client.views_update(view_id='V1', view=view)
+
+            echoed = {key: value for key, value in response['view'].items() if key not in ('id', 'hash')}
+            assert echoed == view
+        finally:
+            gateway.stop()
+            stub.stop()
+
+
+@pytest.mark.benchmark
+class TestRenderBenchmark:
+    """Per-render time and allocation of a quote redraw, including request encoding."""
+
+    def _measure(self, render, encode, rounds=2000):
+        best = float('inf')
+        for _ in range(5):
+            start = time.perf_counter()
+            for i in range(rounds):
+                encode({'view_id': 'V1', 'view': render('AAPL', str(i % 500 + 1), 150.25)})
+            best = min(best, (time.perf_counter() - start) / rounds)
+
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        encode({'view_id': 'V1', 'view': render('AAPL', '10', 150.25)})
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return best * 1e6, peak
+
+    def test_template_beats_dict_builder(self):
+        builder_us, builder_bytes = self._measure(_dict_builder_instant_buy_modal, json.dumps)
+        template_us, template_bytes = self._measure(_template_instant_buy_modal, json_dumps)
+
+        assert template_us < builder_us, f"template {template_us:.1f}us vs dict builder {builder_us:.1f}us"
+        assert template_bytes < builder_bytes, \
+            f"template {template_bytes}B vs dict builder {builder_bytes}B peak"
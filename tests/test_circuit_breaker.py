@@ -0,0 +1,174 @@
+"""
+Tests for the unified circuit breaker.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import circuit_breaker as circuit_breaker_module
+from services.circuit_breaker import CircuitBreaker, CircuitBreakerOpenError, get_circuit_breaker_states
+from services.metrics import get_metrics_registry
+
+CALL_DELAY = 0.1
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker_module.time, 'monotonic', fake)
+    return fake
+
+
+def _fail():
+    raise ConnectionError('upstream down')
+
+
+class TestConcurrentThroughput:
+    """A closed breaker must not serialize the calls it protects."""
+
+    def test_sync_calls_run_in_parallel(self):
+        breaker = CircuitBreaker('parallel_sync')
+
+        @breaker
+        def fetch():
+            time.sleep(CALL_DELAY)
+            return 'ok'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(fetch())) for _ in range(8)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        assert results == ['ok'] * 8
+        assert elapsed < CALL_DELAY * 3  # eight 0.1s calls, not back to back
+
+    @pytest.mark.asyncio
+    async def test_async_calls_run_concurrently(self):
+        breaker = CircuitBreaker('parallel_async')
+
+        async def fetch(symbol):
+            await asyncio.sleep(CALL_DELAY)
+            return symbol
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(breaker.call(fetch, f"S{i}") for i in range(20)))
+        elapsed = time.perf_counter() - start
+
+        assert results == [f"S{i}" for i in range(20)]
+        assert elapsed < CALL_DELAY * 3
+
+
+class TestStateMachine:
+    """Rolling window, fail-fast and half-open probing."""
+
+    def test_rolling_window_error_rate(self, clock):
+        breaker = CircuitBreaker('window', failure_threshold=5, error_rate_threshold=0.5, window_seconds=10)
+        for _ in range(10):
+            breaker.call(lambda: 'ok')
+        for _ in range(5):
+            with pytest.raises(ConnectionError):
+                breaker.call(_fail)
+        assert breaker.state == 'CLOSED'  # 5 failures, but only a 33% error rate
+
+        clock.now += 11  # successes age out of the window
+        for _ in range(5):
+            with pytest.raises(ConnectionError):
+                breaker.call(_fail)
+        assert breaker.state == 'OPEN'
+        assert breaker.error_rate == 1.0
+
+    def test_open_fails_fast_then_probes(self, clock):
+        breaker = CircuitBreaker('probe', failure_threshold=2, recovery_timeout=30)
+        calls = []
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                breaker.call(_fail)
+
+        with pytest.raises(CircuitBreakerOpenError) as rejected:
+            breaker.call(lambda: calls.append(1))
+        assert calls == []
+        assert rejected.value.retry_after == pytest.approx(30)
+
+        clock.now += 31
+        with pytest.raises(ConnectionError):
+            breaker.call(_fail)  # failed trial re-opens
+        assert breaker.state == 'OPEN'
+
+        clock.now += 31
+        assert breaker.call(lambda: 'recovered') == 'recovered'
+        assert breaker.state == 'CLOSED'
+
+    def test_half_open_limits_trial_calls(self):
+        breaker = CircuitBreaker('trials', failure_threshold=1, recovery_timeout=0.05, half_open_max_calls=2)
+        with pytest.raises(ConnectionError):
+            breaker.call(_fail)
+        time.sleep(0.06)
+
+        release = threading.Event()
+        started = threading.Barrier(3)
+
+        def trial():
+            started.wait()
+            release.wait(2)
+            return 'ok'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(breaker.call(trial))) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        started.wait()
+
+        assert breaker.state == 'HALF_OPEN'
+        with pytest.raises(CircuitBreakerOpenError):
+            breaker.call(lambda: 'third')
+
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert results == ['ok', 'ok']
+        assert breaker.state == 'CLOSED'
+
+    def test_unexpected_exceptions_are_not_failures(self):
+        breaker = CircuitBreaker('expected', failure_threshold=1, expected_exception=ConnectionError)
+        with pytest.raises(ValueError):
+            breaker.call(lambda: int('x'))
+        assert breaker.state == 'CLOSED'
+
+
+class TestMetricsExport:
+    """State is visible in the metrics registry and status reports."""
+
+    def test_state_exported(self):
+        breaker = CircuitBreaker('exported', failure_threshold=1, recovery_timeout=60)
+        with pytest.raises(ConnectionError):
+            breaker.call(_fail)
+        with pytest.raises(CircuitBreakerOpenError):
+            breaker.call(lambda: None)
+
+        exposition = get_metrics_registry().exposition()
+        assert 'slackoms_circuit_breaker_state{service="exported"} 2' in exposition
+        assert 'slackoms_circuit_breaker_error_rate{service="exported"} 1' in exposition
+        assert 'slackoms_circuit_breaker_rejections_total{service="exported"} 1' in exposition
+        assert get_circuit_breaker_states()['exported']['state'] == 'OPEN'
+
+        breaker.reset()
+        assert get_circuit_breaker_states()['exported']['state'] == 'CLOSED'
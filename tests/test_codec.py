@@ -0,0 +1,258 @@
+"""
+Tests and benchmarks for the binary record codec used by quote and query caches.
+"""
+
+import asyncio
+import gc
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import dataclass, fields as dataclass_fields
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.portfolio import POSITION_CODEC, Position
+from models.trade import TRADE_CODEC, Trade, TradeStatus, TradeType
+from services.market_data import QUOTE_CODEC, DataQuality, MarketDataService, MarketQuote, MarketStatus
+from services.risk_analysis import (
+    RISK_ANALYSIS_CODEC, RISK_FACTOR_CODEC, RiskAnalysis, RiskCategory, RiskFactor, RiskLevel
+)
+from utils import codec
+from utils.codec import CodecError, Field, RecordCodec
+
+
+def _quote(symbol='AAPL', price='189.84'):
+    return MarketQuote(symbol=symbol, current_price=Decimal(price), open_price=Decimal('187.15'),
+                       high_price=Decimal('190.32'), low_price=Decimal('186.90'),
+                       previous_close=Decimal('188.01'), volume=48_213_004, market_cap=2_950_000_000_000,
+                       pe_ratio=Decimal('29.4'), timestamp=datetime(2026, 3, 4, 15, 0, 12, 345678),
+                       market_status=MarketStatus.OPEN, exchange='NASDAQ', api_latency_ms=41.7)
+
+
+def _trade(index=0):
+    return Trade(user_id='U12345', symbol='MSFT', quantity=100 + index, trade_type=TradeType.BUY,
+                 price=Decimal('421.91'), status=TradeStatus.EXECUTED, execution_id=f'ex-{index}',
+                 channel_id='C0001', market_data={'bid': Decimal('421.90'), 'ask': Decimal('421.93')},
+                 execution_timestamp=datetime(2026, 3, 4, 15, 1, tzinfo=timezone.utc),
+                 execution_price=Decimal('421.93'), commission=Decimal('1.25'), notes='rebalance')
+
+
+def _position():
+    return Position(user_id='U12345', symbol='NVDA', quantity=40, average_cost=Decimal('812.50'),
+                    current_price=Decimal('890.42'), trade_history=['t-1', 't-2'],
+                    risk_metrics={'beta': Decimal('1.71')}, notes='core')
+
+
+def _analysis():
+    factors = [RiskFactor(RiskCategory.CONCENTRATION, RiskLevel.HIGH, 0.8, 'Single name is 40% of GMV',
+                          'Large drawdown if NVDA gaps', 'Trim to 25%', confidence=0.9),
+               RiskFactor(RiskCategory.VOLATILITY, RiskLevel.MEDIUM, 0.5, '30d vol 48%', 'Wide P&L swings',
+                          'Size down')]
+    return RiskAnalysis(trade_id='t-1', symbol='NVDA', trade_type='buy', quantity=40, price=Decimal('890.42'),
+                        overall_risk_level=RiskLevel.HIGH, overall_risk_score=0.72, risk_factors=factors,
+                        analysis_summary='Concentrated', recommendations=['Trim', 'Hedge'],
+                        generated_at=datetime(2026, 3, 4, 15, 2), analysis_duration_ms=812.0,
+                        regulatory_flags=['large_position'], requires_approval=True, approval_reason='Size')
+
+
+class TestRoundTrip:
+    """Records come back equal, with exact decimals, enums and datetimes."""
+
+    @pytest.mark.parametrize('record_codec, build', [
+        (QUOTE_CODEC, _quote), (TRADE_CODEC, _trade), (POSITION_CODEC, _position),
+        (RISK_ANALYSIS_CODEC, _analysis)
+    ])
+    def test_records_round_trip(self, record_codec, build):
+        original = build()
+        decoded = record_codec.decode(record_codec.encode(original))
+
+        assert decoded == original and decoded is not original
+        assert codec.loads(record_codec.encode(original)) == original
+
+    def test_values_keep_their_types(self):
+        value = {'price': Decimal('0.000100'), 'at': datetime(2026, 3, 4, 10, 0, tzinfo=timezone(timedelta(hours=-5))),
+                 'big': 2 ** 70, 'neg': -40_000, 'ratio': 0.25, 'flags': [True, False, None], 'text': 'é' * 300,
+                 'payload': TRADE_CODEC.encode(_trade())}
+        decoded = codec.loads(codec.dumps(value))
+
+        assert decoded == value
+        assert str(decoded['price']) == '0.000100' and decoded['at'].utcoffset() == timedelta(hours=-5)
+
+    def test_lists_of_records(self):
+        trades = [_trade(i) for i in range(3)]
+        assert codec.loads(codec.dumps(trades)) == trades
+
+    @pytest.mark.parametrize('record_codec', [QUOTE_CODEC, TRADE_CODEC, POSITION_CODEC, RISK_ANALYSIS_CODEC,
+                                              RISK_FACTOR_CODEC])
+    def test_schema_covers_every_field(self, record_codec):
+        assert [f.name for f in record_codec.fields] == [f.name for f in dataclass_fields(record_codec.cls)]
+
+    def test_encoded_quote_is_under_half_the_json_size(self):
+        quote = _quote()
+        assert len(QUOTE_CODEC.encode(quote)) < 0.5 * len(json.dumps(quote.to_dict()).encode())
+
+    def test_corrupt_payloads_rejected(self):
+        data = TRADE_CODEC.encode(_trade())
+
+        with pytest.raises(CodecError):
+            codec.loads(b'{"symbol": "AAPL"}')
+        with pytest.raises(CodecError):
+            codec.loads(data[:-3])
+        with pytest.raises(CodecError):
+            QUOTE_CODEC.decode(data)
+        with pytest.raises(CodecError):
+            codec.dumps({'when': object()})
+
+
+@dataclass
+class QuoteV1:
+    symbol: str
+    price: Decimal
+
+
+@dataclass
+class QuoteV2:
+    symbol: str
+    price: Decimal
+    venue: str = 'XNAS'
+
+
+V1 = RecordCodec(QuoteV1, 250, [Field('symbol'), Field('price')], register=False)
+V2 = RecordCodec(QuoteV2, 250, [Field('symbol'), Field('price'), Field('venue', since=2)], register=False)
+
+
+class TestSchemaEvolution:
+    """Readers and writers one schema version apart share a cache."""
+
+    def test_new_reader_defaults_fields_missing_from_old_payloads(self):
+        decoded = V2.decode(V1.encode(QuoteV1('AAPL', Decimal('1.5'))))
+        assert decoded == QuoteV2('AAPL', Decimal('1.5'), 'XNAS')
+
+    def test_old_reader_skips_fields_it_does_not_know(self):
+        decoded = V1.decode(V2.encode(QuoteV2('AAPL', Decimal('1.5'), 'ARCX')))
+        assert decoded == QuoteV1('AAPL', Decimal('1.5'))
+
+    def test_writer_can_emit_the_previous_version(self):
+        assert V2.version == 2
+        assert V2.encode(QuoteV2('AAPL', Decimal('1.5')), version=1) == V1.encode(QuoteV1('AAPL', Decimal('1.5')))
+
+    def test_later_fields_must_be_appended(self):
+        with pytest.raises(ValueError):
+            RecordCodec(QuoteV2, 251, [Field('venue', since=2), Field('symbol'), Field('price')], register=False)
+
+    def test_quote_cached_before_cache_age_was_added(self):
+        previous = RecordCodec(MarketQuote, QUOTE_CODEC.type_id, QUOTE_CODEC.fields[:-1], register=False)
+        quote = _quote()
+        quote.cache_age_seconds = 12.0
+
+        decoded = QUOTE_CODEC.decode(previous.encode(quote))
+        assert decoded.cache_age_seconds is None
+        assert decoded.current_price == quote.current_price and decoded.timestamp == quote.timestamp
+
+
+class DictRedis:
+    def __init__(self):
+        self.values = {}
+
+    def setex(self, key, seconds, value):
+        self.values[key] = value
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def close(self):
+        pass
+
+
+class TestQuoteRedisCache:
+    """Redis holds codec bytes; JSON entries from before the switch still read."""
+
+    def test_quotes_stored_as_codec_bytes(self):
+        async def run():
+            service = MarketDataService()
+            service.redis_client = DictRedis()
+            await service.warm_cache(_quote())
+            service.memory_cache.clear()
+            return service.redis_client.values['quote:AAPL'], await service._get_cached_quote('AAPL')
+
+        stored, cached = asyncio.run(run())
+        assert codec.is_encoded(stored)
+        assert cached.current_price == Decimal('189.84') and cached.cache_hit
+
+    def test_legacy_json_entry_still_read(self):
+        async def run():
+            service = MarketDataService()
+            service.redis_client = DictRedis()
+            service.redis_client.values['quote:AAPL'] = json.dumps(_quote().to_dict()).encode()
+            return await service._get_cached_quote('AAPL')
+
+        cached = asyncio.run(run())
+        assert cached.current_price == Decimal('189.84') and cached.data_quality == DataQuality.REAL_TIME
+
+
+@pytest.mark.benchmark
+class TestCodecBenchmark:
+    """Encode/decode time and size against the JSON dict round trip it replaces."""
+
+    COUNT = 2000
+
+    @staticmethod
+    def _best_of(*fns, repeat=7):
+        """Best time of each function, run in turns so load changes hit all of them alike."""
+        best = [float('inf')] * len(fns)
+        gc.disable()  # As timeit does: collections triggered by earlier tests' garbage skew the timings
+        try:
+            for _ in range(repeat):
+                for index, fn in enumerate(fns):
+                    started = time.perf_counter()
+                    fn()
+                    best[index] = min(best[index], time.perf_counter() - started)
+        finally:
+            gc.enable()
+        return best
+
+    def _compare(self, label, records, json_encode, json_decode, encode, decode):
+        json_payloads = [json_encode(r) for r in records]
+        payloads = [encode(r) for r in records]
+        json_size = sum(len(p) for p in json_payloads) / len(records)
+        size = sum(len(p) for p in payloads) / len(records)
+
+        json_write, write = self._best_of(lambda: [json_encode(r) for r in records],
+                                          lambda: [encode(r) for r in records])
+        json_read, read = self._best_of(lambda: [json_decode(p) for p in json_payloads],
+                                        lambda: [decode(p) for p in payloads])
+
+        per = 1e6 / len(records)
+        summary = (f"{label}: encode {json_write * per:.1f}us -> {write * per:.1f}us ({json_write / write:.1f}x), "
+                   f"decode {json_read * per:.1f}us -> {read * per:.1f}us ({json_read / read:.1f}x), "
+                   f"size {json_size:.0f}B -> {size:.0f}B ({1 - size / json_size:.0%} smaller)")
+        return json_write / write, json_read / read, size / json_size, summary
+
+    def test_quote_codec_beats_json(self):
+        service = MarketDataService()
+        quotes = [_quote(f"S{i:04d}", f"{100 + i / 100:.2f}") for i in range(self.COUNT)]
+
+        write, read, size, summary = self._compare(
+            'MarketQuote', quotes,
+            lambda q: json.dumps(q.to_dict()).encode(),
+            lambda p: service._dict_to_market_quote(json.loads(p)),
+            QUOTE_CODEC.encode, QUOTE_CODEC.decode)
+        assert read > 1.2 and write > 1.2 and size < 0.5, summary
+
+    def test_trade_list_codec_beats_dict_round_trip(self, monkeypatch):
+        # Trade.__post_init__ logs every construction; keep that out of the from_dict baseline
+        monkeypatch.setattr(logging.getLogger('models.trade'), 'disabled', True)
+        batches = [[_trade(i + j) for j in range(20)] for i in range(self.COUNT // 20)]
+
+        write, read, size, summary = self._compare(
+            'Trade list (query cache)', batches,
+            lambda trades: json.dumps([t.to_dict() for t in trades], default=str).encode(),
+            lambda p: [Trade.from_dict(d) for d in json.loads(p)],
+            codec.dumps, codec.loads)
+        assert read > 1.0 and write > 2 and size < 0.5, summary
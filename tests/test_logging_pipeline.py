@@ -0,0 +1,234 @@
+"""
+Tests and per-request overhead benchmark for the queued, sampled log pipeline.
+"""
+
+import io
+import logging
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.settings import ConfigurationManager, LoggingConfig
+from services.logging_pipeline import LoggingPipeline, SamplingFilter
+from services.metrics import MetricsRegistry
+
+FORMAT = '%(levelname)s %(name)s %(message)s'
+
+
+class BlockingHandler(logging.Handler):
+    """Handler whose writes wait until released, like a stalled disk or terminal."""
+
+    def __init__(self):
+        super().__init__()
+        self.unblock = threading.Event()
+        self.messages = []
+
+    def emit(self, record):
+        self.unblock.wait(timeout=5)
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def log_tree(request):
+    """An isolated logger tree standing in for the root logger, writing to a StringIO."""
+    name = f"pipeline_test.{request.node.name}"
+    root = logging.getLogger(name)
+    root.setLevel(logging.DEBUG)
+    root.propagate = False
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(FORMAT))
+    root.addHandler(handler)
+    yield root, stream
+    for h in list(root.handlers):
+        root.removeHandler(h)
+
+
+def _pipeline(**overrides):
+    return LoggingPipeline(LoggingConfig(**overrides), registry=MetricsRegistry())
+
+
+class TestSampling:
+    """DEBUG records are thinned per logger; everything else passes."""
+
+    def _record(self, name, level=logging.DEBUG):
+        return logging.LogRecord(name, level, __file__, 1, 'msg %s', ('x',), None)
+
+    def test_keeps_one_in_n_by_longest_prefix(self):
+        sampler = SamplingFilter({'listeners': 0.1, 'listeners.commands': 0.5, 'services.quiet': 0.0})
+
+        def kept(name, level=logging.DEBUG, count=100):
+            return sum(sampler.filter(self._record(name, level)) for _ in range(count))
+
+        assert kept('listeners.enhanced_market_actions') == 10
+        assert kept('listeners.commands') == 50
+        assert kept('services.quiet') == 0
+        assert kept('services.quiet', level=logging.INFO) == 100
+        assert kept('services.market_data') == 100
+
+    def test_one_decision_per_record_across_handlers(self, log_tree):
+        root, stream = log_tree
+        second = io.StringIO()
+        extra = logging.StreamHandler(second)
+        root.addHandler(extra)
+        pipeline = _pipeline(async_enabled=False, debug_sample_rates={root.name: 0.5})
+        pipeline.install(root)
+        try:
+            for i in range(10):
+                root.getChild('child').debug("tick %s", i)
+        finally:
+            pipeline.uninstall()
+
+        assert stream.getvalue().count('tick') == second.getvalue().count('tick') == 5
+        assert pipeline.discarded.value('sampled') == 5
+        assert extra.filters == []
+
+    def test_sample_rates_from_environment(self):
+        rates = ConfigurationManager._parse_sample_rates('listeners=0.01, services.market_data=0.1,')
+
+        assert rates == {'listeners': 0.01, 'services.market_data': 0.1}
+        with pytest.raises(ValueError):
+            LoggingConfig(debug_sample_rates={'listeners': 2.0})
+
+
+class TestQueuedPipeline:
+    """Records are written by the listener thread with PII masked."""
+
+    def test_masks_pii_and_restores_handlers(self, log_tree):
+        root, stream = log_tree
+        handlers = list(root.handlers)
+        pipeline = _pipeline()
+        pipeline.install(root)
+
+        assert root.handlers != handlers and pipeline.get_status()['async']
+        root.info("Order for %s from %s", 'trader@example.com', '10.0.0.12')
+        assert pipeline.flush()
+        pipeline.uninstall()
+
+        assert stream.getvalue() == f"INFO {root.name} Order for [EMAIL_REDACTED] from [IP_REDACTED]\n"
+        assert root.handlers == handlers and handlers[0].filters == []
+
+    def test_full_queue_drops_instead_of_blocking(self, log_tree):
+        root, _ = log_tree
+        blocking = BlockingHandler()
+        root.handlers = [blocking]
+        pipeline = _pipeline(queue_size=2)
+        pipeline.install(root)
+        try:
+            start = time.perf_counter()
+            for i in range(50):
+                root.warning("order %s", i)
+            elapsed = time.perf_counter() - start
+        finally:
+            blocking.unblock.set()
+            pipeline.uninstall()
+
+        assert elapsed < 0.5
+        dropped = pipeline.discarded.value('queue_full')
+        assert dropped >= 47 and len(blocking.messages) == 50 - dropped
+
+    def test_formatting_is_left_to_the_listener(self, log_tree):
+        root, stream = log_tree
+        root.setLevel(logging.INFO)
+        formatted = []
+
+        class Quote:
+            def __str__(self):
+                formatted.append(threading.current_thread().name)
+                return 'AAPL 150.25'
+
+        pipeline = _pipeline()
+        pipeline.install(root)
+        try:
+            root.debug("quote %s", Quote())  # Below the level: never formatted
+            shares = ['100']
+            root.info("symbol %s qty %s", 'AAPL', 100)
+            root.info("shares %s", shares)  # Mutable: rendered on the calling thread
+            shares[0] = '999'
+            root.info("quote %s", Quote())
+            pipeline.flush()
+        finally:
+            pipeline.uninstall()
+
+        lines = stream.getvalue().splitlines()
+        assert [line.split(' ', 2)[2] for line in lines] == [
+            'symbol AAPL qty 100', "shares ['100']", 'quote AAPL 150.25']
+        assert formatted == [threading.current_thread().name]
+
+    def test_exceptions_rendered_before_enqueue(self, log_tree):
+        root, stream = log_tree
+        pipeline = _pipeline()
+        pipeline.install(root)
+        try:
+            try:
+                raise RuntimeError("quote feed down")
+            except RuntimeError:
+                root.error("Price fetch failed for %s", 'AAPL', exc_info=True)
+            pipeline.flush()
+        finally:
+            pipeline.uninstall()
+
+        output = stream.getvalue()
+        assert 'Price fetch failed for AAPL' in output and 'RuntimeError: quote feed down' in output
+
+
+@pytest.mark.benchmark
+class TestLoggingOverheadBenchmark:
+    """Caller-side logging cost of one market-data request, before and after."""
+
+    ROUNDS = 2000
+
+    def _request_with_prints(self, log, out, i):
+        # What the quick-symbol handlers did per quote before: terminal prints plus an f-string log
+        price, change, percent = 150.25 + i, 1.5, 0.9
+        print(f"\n🎯 AAPL MARKET DATA FETCHED SUCCESSFULLY!", file=out)
+        print(f"💰 Current Price: ${price}", file=out)
+        print(f"📈 Price Change: ${change}", file=out)
+        print(f"📊 Change %: {percent}%", file=out)
+        print(f"⚡ Data Quality: Real-time", file=out)
+        print(f"🏢 Exchange: NASDAQ", file=out)
+        print("-" * 50, file=out)
+        log.info(f"✅ AAPL real market data displayed for user U{i}")
+
+    def _request_with_pipeline(self, log, out, i):
+        price, change, percent = 150.25 + i, 1.5, 0.9
+        log.debug("🎯 AAPL quote: $%s, change $%s (%s%%)", price, change, percent)
+        log.info("✅ AAPL real market data displayed for user %s", f"U{i}")
+
+    def _measure(self, request, log, out):
+        best = float('inf')
+        for _ in range(3):
+            start = time.perf_counter()
+            for i in range(self.ROUNDS):
+                request(log, out, i)
+            best = min(best, (time.perf_counter() - start) / self.ROUNDS)
+        return best * 1e6
+
+    def test_pipeline_cuts_per_request_overhead(self, log_tree, tmp_path):
+        root, _ = log_tree
+        file_handler = logging.FileHandler(tmp_path / 'bot.log')
+        file_handler.setFormatter(logging.Formatter(FORMAT))
+        root.handlers = [file_handler]
+        root.setLevel(logging.INFO)  # LOG_LEVEL default
+        log = root.getChild('listeners.enhanced_market_actions')
+
+        with open(tmp_path / 'terminal.out', 'w', buffering=1) as terminal:  # Line-buffered like a tty
+            before_us = self._measure(self._request_with_prints, log, terminal)
+
+        pipeline = _pipeline(queue_size=100000)
+        pipeline.install(root)
+        try:
+            after_us = self._measure(self._request_with_pipeline, log, None)
+            assert pipeline.flush(timeout=30)
+        finally:
+            pipeline.uninstall()
+            file_handler.close()
+
+        assert after_us < before_us, \
+            f"queued pipeline {after_us:.1f}us vs prints + sync log {before_us:.1f}us per request"
+        assert pipeline.discarded.value('queue_full') == 0
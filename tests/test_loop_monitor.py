@@ -0,0 +1,93 @@
+"""
+Tests for the event-loop lag monitor and blocking-call detector.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.settings import LoopMonitorConfig
+from services.loop_monitor import EventLoopBlockedError, LoopMonitor, loop_block_budget
+from services.metrics import MetricsRegistry
+
+BLOCK_SECONDS = 0.2
+
+
+def blocking_quote_lookup():
+    """Stands in for a sync requests/boto3/SQLAlchemy call made on the loop."""
+    time.sleep(BLOCK_SECONDS)
+
+
+def _monitor(**overrides):
+    config = dict(interval_ms=5, slow_callback_ms=50, capture_stacks=True)
+    config.update(overrides)
+    return LoopMonitor(LoopMonitorConfig(**config), registry=MetricsRegistry())
+
+
+class TestLoopMonitor:
+    """Lag measurement, incidents and stack snapshots."""
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_recorded_with_stack(self):
+        monitor = _monitor()
+        monitor.start()
+        await asyncio.sleep(0.05)
+        blocking_quote_lookup()
+        await asyncio.sleep(0.05)
+        monitor.stop()
+
+        status = monitor.get_status(include_stacks=True)
+        assert status['blocked_count'] == 1
+        incident = status['recent_incidents'][0]
+        assert incident['duration_ms'] >= BLOCK_SECONDS * 1000 * 0.9
+        assert any('blocking_quote_lookup' in line for line in incident['stack'])
+        assert monitor.lag.snapshot().count > 5
+        assert 'stack' not in monitor.get_status()['recent_incidents'][0]
+
+    @pytest.mark.asyncio
+    async def test_yielding_work_is_not_an_incident(self):
+        monitor = _monitor(capture_stacks=False)
+        monitor.start()
+        await asyncio.get_running_loop().run_in_executor(None, blocking_quote_lookup)
+        window = monitor.take_window()
+        monitor.stop()
+
+        assert window['incidents'] == [] and len(window['lag_ms']) > 5
+        assert monitor.take_window()['lag_ms'] == []
+        monitor.assert_within_budget(50)
+
+    @pytest.mark.asyncio
+    async def test_assert_within_budget_uses_configured_budget(self):
+        monitor = _monitor(capture_stacks=False, block_budget_ms=100)
+        monitor.start()
+        await asyncio.sleep(0.02)
+        blocking_quote_lookup()
+        await asyncio.sleep(0.02)
+        monitor.stop()
+
+        with pytest.raises(EventLoopBlockedError) as error:
+            monitor.assert_within_budget()
+        assert error.value.budget_ms == 100 and len(error.value.incidents) == 1
+        monitor.assert_within_budget(budget_ms=BLOCK_SECONDS * 1000 * 2)
+
+
+class TestLoopBlockBudget:
+    """Test-mode assertion around a request path."""
+
+    @pytest.mark.asyncio
+    async def test_budget_exceeded_fails_with_stack(self):
+        with pytest.raises(EventLoopBlockedError) as error:
+            async with loop_block_budget(50):
+                blocking_quote_lookup()
+        assert 'blocking_quote_lookup' in str(error.value)
+
+    @pytest.mark.asyncio
+    async def test_offloaded_call_passes(self):
+        async with loop_block_budget(50) as monitor:
+            await asyncio.to_thread(blocking_quote_lookup)
+        assert monitor.get_status()['blocked_count'] == 0
@@ -0,0 +1,165 @@
+"""
+Tests and recording-overhead benchmark for the sharded metrics registry.
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.metrics import MetricsRegistry, bucket_index, bucket_upper_bound
+from bolt_app import ApplicationMetrics
+from listeners.commands import CommandMetrics, CommandType
+
+# Hot-path cost of ApplicationMetrics.record_request (histogram append, no lock)
+RECORD_BUDGET_NS = 1000
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry(namespace='test')
+
+
+class TestHistogram:
+    """HDR bucketing and percentile accuracy."""
+
+    def test_bucket_relative_error(self):
+        rng = random.Random(7)
+        for value in [0, 1, 31, 32, 33, 63, 64, 1000, 10 ** 6] + [rng.randrange(2 ** 36) for _ in range(20000)]:
+            index = bucket_index(value)
+            assert bucket_upper_bound(index) >= value
+            assert index == 0 or bucket_upper_bound(index - 1) < value
+            assert bucket_upper_bound(index) <= value * 1.032 + 1
+
+    def test_percentiles_match_exact(self, registry):
+        histogram = registry.histogram('latency_seconds', 'Latency', ('endpoint',))
+        rng = random.Random(1)
+        values = sorted(rng.lognormvariate(-4, 1) for _ in range(20000))
+        for value in values:
+            histogram.observe(value, 'slack_command')
+
+        snapshot = histogram.snapshot('slack_command')
+        assert snapshot.count == len(values)
+        assert snapshot.sum == pytest.approx(sum(values))
+        for percentile in (50, 90, 99, 99.9):
+            exact = values[int(len(values) * percentile / 100) - 1]
+            assert exact <= snapshot.percentile(percentile) <= exact * 1.04 + 1e-6
+
+    def test_threads_record_without_losing_samples(self, registry):
+        histogram = registry.histogram('latency_seconds', 'Latency', ('endpoint',))
+        counter = registry.counter('requests', 'Requests', ('endpoint',))
+        histogram.FLUSH_THRESHOLD = 100  # force drains to race with readers
+        stop = threading.Event()
+
+        def writer():
+            for _ in range(5000):
+                histogram.observe(0.002, 'a')
+                counter.inc('a')
+
+        def reader():
+            while not stop.is_set():
+                histogram.collect()
+
+        readers = [threading.Thread(target=reader) for _ in range(2)]
+        writers = [threading.Thread(target=writer) for _ in range(8)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+        assert histogram.snapshot('a').count == 40000
+        assert counter.value('a') == 40000
+
+
+class TestExposition:
+    """Prometheus text format."""
+
+    def test_histogram_counter_and_gauge(self, registry):
+        histogram = registry.histogram('request_duration_seconds', 'Request latency', ('endpoint',))
+        registry.counter('request_errors', 'Errors', ('endpoint', 'error')).inc('slack_"x"', 'Timeout')
+        registry.gauge('uptime_seconds', 'Uptime').set_function(lambda: 12.5)
+        for value in (0.0004, 0.003, 0.003, 0.2, 45.0):
+            histogram.observe(value, 'slack_command')
+
+        lines = registry.exposition().splitlines()
+        assert '# TYPE test_request_duration_seconds histogram' in lines
+        assert 'test_request_errors_total{endpoint="slack_\\"x\\"",error="Timeout"} 1' in lines
+        assert 'test_uptime_seconds 12.5' in lines
+
+        buckets = [line for line in lines if line.startswith('test_request_duration_seconds_bucket')]
+        counts = [int(line.rsplit(' ', 1)[1]) for line in buckets]
+        assert counts == sorted(counts)
+        assert 'test_request_duration_seconds_bucket{endpoint="slack_command",le="0.001"} 1' in lines
+        assert 'test_request_duration_seconds_bucket{endpoint="slack_command",le="0.005"} 3' in lines
+        assert 'test_request_duration_seconds_bucket{endpoint="slack_command",le="30"} 4' in lines
+        assert 'test_request_duration_seconds_bucket{endpoint="slack_command",le="+Inf"} 5' in lines
+        assert 'test_request_duration_seconds_count{endpoint="slack_command"} 5' in lines
+
+
+class TestMetricsFacades:
+    """ApplicationMetrics and listener metrics on top of the registry."""
+
+    def test_application_metrics_summary(self, registry):
+        metrics = ApplicationMetrics(registry)
+        for _ in range(9):
+            metrics.record_request('slack_command', 0.010)
+        metrics.record_request('slack_action', 0.100, 'SlackApiError')
+
+        summary = metrics.get_metrics()
+        assert summary['total_requests'] == 10
+        assert summary['total_errors'] == 1
+        assert summary['error_rate'] == pytest.approx(0.1)
+        assert summary['average_response_time_ms'] == pytest.approx(19.0)
+        assert 9.9 <= summary['response_time_percentiles_ms']['p50'] <= 10.4
+        assert summary['endpoint_metrics']['slack_action']['errors'] == 1
+        assert summary['error_types'] == {'SlackApiError': 1}
+        assert 'test_request_errors_total{endpoint="slack_action",error="SlackApiError"} 1' in registry.exposition()
+
+    def test_command_metrics(self, registry):
+        metrics = CommandMetrics(registry)
+        metrics.record_command(True, 0.05, command_type=CommandType.TRADE)
+        metrics.record_command(False, 0.15, 'VALIDATION', CommandType.TRADE)
+        metrics.increment('validation_failures')
+
+        assert metrics.commands_processed == 2
+        assert metrics.get_success_rate() == 50.0
+        assert metrics.get_average_response_time() == pytest.approx(100.0)
+        assert metrics.count('validation_failures') == 1
+        assert metrics.error_counts == {'VALIDATION': 1}
+
+
+@pytest.mark.benchmark
+class TestRecordingOverhead:
+    """Per-request recording cost."""
+
+    def test_record_request_cost(self, registry):
+        metrics = ApplicationMetrics(registry)
+        metrics.request_latency.FLUSH_THRESHOLD = 10 ** 9  # measure the append path alone
+        endpoints = ['slack_command', 'slack_action', 'slack_event', 'slack_view_submission']
+        runs = 200_000
+
+        def per_call_ns():
+            batches = []
+            for _ in range(5):
+                start = time.perf_counter_ns()
+                for i in range(runs // 5):
+                    metrics.record_request(endpoints[i & 3], 0.0123)
+                batches.append((time.perf_counter_ns() - start) / (runs // 5))
+            return min(batches)
+
+        hot_ns = per_call_ns()
+        start = time.perf_counter_ns()
+        metrics.request_latency.collect()
+        drain_ns = (time.perf_counter_ns() - start) / runs
+
+        assert metrics.request_count == runs
+        assert hot_ns < RECORD_BUDGET_NS, \
+            f"record_request {hot_ns:.0f}ns per call, bucketing {drain_ns:.0f}ns per sample"
@@ -0,0 +1,192 @@
+"""
+Tests for the modal update coalescer: debouncing per view, hash-based optimistic
+concurrency and view state tracking from interaction payloads.
+"""
+
+import json
+import os
+import sys
+import time
+
+from slack_bolt import BoltRequest
+from slack_bolt.authorization import AuthorizeResult
+from slack_sdk.errors import SlackApiError
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bolt_app import ProfiledApp
+from config.settings import ModalUpdateConfig
+from listeners.interactive_actions import InteractiveActionHandler
+from services.metrics import MetricsRegistry
+from services.modal_updates import ModalUpdateCoalescer, get_modal_coalescer
+
+
+class FakeViewsClient:
+    """Records views.update calls and answers like Slack, with a new hash per update."""
+
+    def __init__(self, delay=0.0, error=None):
+        self.calls = []
+        self.delay = delay
+        self.error = error
+
+    def views_update(self, view_id, view, hash=None):
+        self.calls.append({'view_id': view_id, 'view': view, 'hash': hash})
+        time.sleep(self.delay)
+        if self.error:
+            raise SlackApiError(self.error, {'ok': False, 'error': self.error})
+        return {'ok': True, 'view': {'id': view_id, 'hash': f"h{len(self.calls)}"}}
+
+
+def _coalescer(**overrides):
+    return ModalUpdateCoalescer(ModalUpdateConfig(**overrides), registry=MetricsRegistry())
+
+
+def _view(text):
+    return {'type': 'modal', 'title': {'type': 'plain_text', 'text': text}, 'blocks': []}
+
+
+class TestCoalescing:
+    """Bursts of updates for one view collapse into the newest."""
+
+    def test_burst_sends_only_newest(self):
+        coalescer = _coalescer(debounce_ms=50)
+        client = FakeViewsClient()
+        built = []
+
+        def builder(i):
+            def build():
+                built.append(i)
+                return _view(f"qty {i}")
+            return build
+
+        futures = [coalescer.update(client, 'V1', builder(i)) for i in range(5)]
+        responses = [future.result(timeout=2) for future in futures]
+
+        assert [call['view']['title']['text'] for call in client.calls] == ['qty 4']
+        assert built == [4]
+        assert responses[:4] == [None] * 4 and responses[4]['ok']
+        assert coalescer.outcomes.value('superseded') == 4 and coalescer.outcomes.value('sent') == 1
+
+    def test_one_update_in_flight_per_view(self):
+        coalescer = _coalescer(debounce_ms=0)
+        client = FakeViewsClient(delay=0.2)
+
+        first = coalescer.update(client, 'V1', _view('first'))
+        time.sleep(0.05)  # First send is now in flight
+        second = coalescer.update(client, 'V1', _view('second'))
+        third = coalescer.update(client, 'V1', _view('third'))
+
+        assert first.result(timeout=2)['ok'] and second.result(timeout=2) is None
+        assert third.result(timeout=2)['ok']
+        assert [call['view']['title']['text'] for call in client.calls] == ['first', 'third']
+        assert [call['hash'] for call in client.calls] == [None, 'h1']
+
+    def test_disabled_sends_immediately(self):
+        coalescer = _coalescer(enabled=False)
+        client = FakeViewsClient()
+
+        response = coalescer.update(client, 'V1', _view('now')).result(timeout=0)
+
+        assert response['ok'] and client.calls[0]['hash'] is None
+
+
+class TestOptimisticConcurrency:
+    """Updates carry the latest known hash; conflicts drop the update."""
+
+    def test_hash_from_payload_then_response(self):
+        coalescer = _coalescer(debounce_ms=0)
+        client = FakeViewsClient()
+        coalescer.observe({'id': 'V1', 'hash': 'h0', 'state': {'values': {}}})
+
+        coalescer.update(client, 'V1', _view('a')).result(timeout=2)
+        # A payload generated before our update landed still carries the old hash
+        coalescer.observe({'id': 'V1', 'hash': 'h0', 'state': {'values': {}}})
+        coalescer.update(client, 'V1', _view('b')).result(timeout=2)
+
+        assert [call['hash'] for call in client.calls] == ['h0', 'h1']
+        assert coalescer.get_hash('V1') == 'h2'
+
+    def test_hash_conflict_drops_update(self):
+        coalescer = _coalescer(debounce_ms=0)
+        client = FakeViewsClient(error='hash_conflict')
+        coalescer.observe({'id': 'V1', 'hash': 'h0'})
+
+        assert coalescer.update(client, 'V1', _view('stale')).result(timeout=2) is None
+        assert coalescer.outcomes.value('conflict') == 1 and coalescer.get_hash('V1') is None
+
+        client.error = None
+        coalescer.update(client, 'V1', _view('fresh')).result(timeout=2)
+        assert client.calls[-1]['hash'] is None
+
+    def test_other_errors_fail_the_update(self):
+        coalescer = _coalescer(debounce_ms=0)
+        client = FakeViewsClient(error='not_found')
+
+        assert coalescer.update(client, 'V1', _view('gone')).result(timeout=2) is None
+        assert coalescer.outcomes.value('failed') == 1
+
+
+class TestViewTracking:
+    """View state comes from dispatched payloads instead of views.info."""
+
+    def _app(self):
+        def authorize(enterprise_id, team_id, logger):
+            return AuthorizeResult(enterprise_id=enterprise_id, team_id=team_id,
+                                   bot_token='xoxb-test', bot_id='B1', bot_user_id='UBOT')
+
+        return ProfiledApp(signing_secret='secret', authorize=authorize, process_before_response=True,
+                           request_verification_enabled=False)
+
+    def _dispatch(self, app, body):
+        return app.dispatch(BoltRequest(body=json.dumps(body), headers={'content-type': ['application/json']}))
+
+    def test_payload_state_tracked_until_submission(self):
+        app = self._app()
+        values = {'qty_shares_block': {'shares_input': {'type': 'plain_text_input', 'value': '25'}}}
+        view = {'id': 'VTRACK1', 'hash': 'h5', 'state': {'values': values}, 'callback_id': 'trade_modal'}
+
+        self._dispatch(app, {'type': 'block_actions', 'team': {'id': 'T1'}, 'user': {'id': 'U1'},
+                             'view': view, 'actions': [{'action_id': 'unhandled', 'block_id': 'b'}]})
+        assert get_modal_coalescer().get_values('VTRACK1') == values
+        assert get_modal_coalescer().get_hash('VTRACK1') == 'h5'
+
+        self._dispatch(app, {'type': 'view_submission', 'team': {'id': 'T1'}, 'user': {'id': 'U1'}, 'view': view})
+        assert get_modal_coalescer().get_values('VTRACK1') is None
+
+    def test_shares_input_coalesces_keystrokes(self):
+        handler = InteractiveActionHandler()
+        client = FakeViewsClient()
+        acks = []
+        metadata = json.dumps({'channel_id': 'C1', 'current_price': '100.00'})
+
+        for shares in ['1', '10', '100']:
+            body = {
+                'user': {'id': 'U1', 'name': 'trader'},
+                'view': {'id': 'VSHARES', 'private_metadata': metadata, 'state': {'values': {}}},
+                'actions': [{'action_id': 'shares_input', 'value': shares}]
+            }
+            handler.handle_shares_input(lambda: acks.append(True), body, client)
+        get_modal_coalescer().flush('VSHARES')
+
+        assert len(acks) == 3 and len(client.calls) == 1
+        assert '10000.0' in json.dumps(client.calls[0]['view'])  # GMV for the last keystroke only
+
+    def test_shares_input_keeps_the_typeahead_symbol(self):
+        handler = InteractiveActionHandler()
+        client = FakeViewsClient()
+        values = {'trade_symbol_block': {'symbol_input': {
+            'type': 'external_select',
+            'selected_option': {'text': {'type': 'plain_text', 'text': 'TSLA'}, 'value': 'TSLA'}
+        }}}
+        body = {
+            'user': {'id': 'U1', 'name': 'trader'},
+            'view': {'id': 'VSYMBOL', 'private_metadata': json.dumps({'channel_id': 'C1', 'current_price': '200.00'}),
+                     'state': {'values': values}},
+            'actions': [{'action_id': 'shares_input', 'value': '5'}]
+        }
+        handler.handle_shares_input(lambda: None, body, client)
+        get_modal_coalescer().flush('VSYMBOL')
+
+        view = client.calls[0]['view']
+        assert json.loads(view['private_metadata'])['symbol'] == 'TSLA'
+        assert '"initial_value": "TSLA"' in json.dumps(view)
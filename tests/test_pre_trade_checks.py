@@ -0,0 +1,262 @@
+"""
+Tests for the pre-trade check pipeline.
+"""
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.pre_trade_checks import (
+    CheckOutcome, PreTradeCheck, PreTradeContext, PreTradePipeline,
+    DATA_ACCOUNT, DATA_ASSET, DATA_POSITIONS, DATA_QUOTE,
+    QUANTITY_FIELD, SYMBOL_FIELD, compliance_notes, create_pre_trade_pipeline
+)
+
+
+class CountingFetcher:
+    """Blocking fetcher that records how often it was called."""
+
+    def __init__(self, value, delay: float = 0.0):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, context):
+        with self._lock:
+            self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if isinstance(self.value, Exception):
+            raise self.value
+        return self.value
+
+
+def _fetchers(delay: float = 0.0, **overrides):
+    fetchers = {
+        DATA_ASSET: CountingFetcher({'symbol': 'AAPL', 'tradable': True}, delay),
+        DATA_ACCOUNT: CountingFetcher({'cash': '10000'}, delay),
+        DATA_POSITIONS: CountingFetcher([{'symbol': 'AAPL', 'qty': 5}], delay),
+        DATA_QUOTE: CountingFetcher(150.0, delay),
+    }
+    fetchers.update(overrides)
+    return fetchers
+
+
+class TestPreTradePipeline:
+    """Tests for the standard pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_buy_passes_with_timings(self):
+        fetchers = _fetchers()
+        context = PreTradeContext(' aapl ', '10', 'buy', fetchers=fetchers)
+        result = await create_pre_trade_pipeline().run(context)
+
+        assert result.passed
+        assert result.data['symbol'] == 'AAPL'
+        assert result.data['quantity'] == 10
+        assert result.data['order_value'] == pytest.approx(1500.0)
+        assert result.get('sell_position') is None
+        assert set(result.fetch_timings) == {DATA_ASSET, DATA_ACCOUNT, DATA_QUOTE}
+        assert all(check.duration_ms >= 0 for check in result.checks)
+        assert fetchers[DATA_QUOTE].calls == 1  # shared by order_value and buying_power
+
+    @pytest.mark.asyncio
+    async def test_fetches_run_concurrently(self):
+        fetchers = _fetchers(delay=0.2)
+        start = time.perf_counter()
+        result = await create_pre_trade_pipeline().run(PreTradeContext('AAPL', '10', 'BUY', fetchers=fetchers))
+        elapsed = time.perf_counter() - start
+
+        assert result.passed
+        assert elapsed < 0.5  # three 0.2s fetches, not run one after another
+        assert all(f.calls <= 1 for f in fetchers.values())
+
+    @pytest.mark.asyncio
+    async def test_insufficient_buying_power(self):
+        context = PreTradeContext('AAPL', '100', 'BUY', fetchers=_fetchers())
+        result = await create_pre_trade_pipeline().run(context)
+
+        assert not result.passed
+        assert [c.name for c in result.failed_checks] == ['buying_power']
+        assert 'Insufficient buying power' in result.errors[QUANTITY_FIELD]
+
+    @pytest.mark.asyncio
+    async def test_sell_checks_positions(self):
+        fetchers = _fetchers()
+        result = await create_pre_trade_pipeline().run(PreTradeContext('AAPL', '6', 'SELL', fetchers=fetchers))
+
+        assert not result.passed
+        assert 'only have 5' in result.errors[QUANTITY_FIELD]
+        assert result.get('buying_power') is None
+        assert fetchers[DATA_ACCOUNT].calls == 0
+
+    @pytest.mark.asyncio
+    async def test_invalid_symbol_skips_dependents(self):
+        fetchers = _fetchers()
+        result = await create_pre_trade_pipeline().run(PreTradeContext('123', '10', 'BUY', fetchers=fetchers))
+
+        assert SYMBOL_FIELD in result.errors
+        assert result.get('symbol_tradable').skipped
+        assert result.get('buying_power').skipped
+        assert fetchers[DATA_ASSET].calls == 0
+
+    @pytest.mark.asyncio
+    async def test_untradable_and_restricted_symbols(self):
+        fetchers = _fetchers(**{DATA_ASSET: CountingFetcher({'tradable': False})})
+        result = await create_pre_trade_pipeline().run(PreTradeContext('AAPL', '1', 'BUY', fetchers=fetchers))
+        assert 'not currently tradeable' in result.errors[SYMBOL_FIELD]
+
+        pipeline = create_pre_trade_pipeline(restricted_symbols=['TSLA'])
+        result = await pipeline.run(PreTradeContext('TSLA', '1', 'BUY', price=100.0))
+        assert result.errors[SYMBOL_FIELD] == "Trading in symbol TSLA is restricted"
+
+    @pytest.mark.asyncio
+    async def test_fetch_errors_degrade_to_warnings(self):
+        fetchers = _fetchers(**{
+            DATA_ASSET: CountingFetcher(RuntimeError('broker down')),
+            DATA_QUOTE: CountingFetcher(RuntimeError('no quote')),
+        })
+        result = await create_pre_trade_pipeline().run(PreTradeContext('AAPL', '1', 'BUY', fetchers=fetchers))
+
+        assert result.passed
+        assert "Could not verify symbol with market data" in result.warnings
+
+    @pytest.mark.asyncio
+    async def test_order_value_limit(self):
+        pipeline = create_pre_trade_pipeline(max_order_value=1000.0)
+        result = await pipeline.run(PreTradeContext('AAPL', 20, 'SELL', price=100.0))
+        assert result.first_error == "Order value $2,000.00 exceeds maximum allowed $1,000.00"
+
+
+class TestPipelineRegistration:
+    """Tests for custom check registration."""
+
+    def test_rejects_unknown_dependency(self):
+        pipeline = PreTradePipeline()
+        with pytest.raises(ValueError):
+            pipeline.register(PreTradeCheck('later', lambda ctx: CheckOutcome.ok(), depends_on=('missing',)))
+
+    @pytest.mark.asyncio
+    async def test_check_exception_is_reported(self):
+        def broken(context):
+            raise RuntimeError('boom')
+
+        pipeline = PreTradePipeline([PreTradeCheck('broken_check', broken)])
+        result = await pipeline.run(PreTradeContext('AAPL', 1, 'BUY'))
+        assert not result.passed
+        assert 'broken check' in result.first_error
+
+    def test_compliance_notes_flag_large_orders(self):
+        assert "Large order review: FLAGGED for review" in compliance_notes(250000.0)
+        assert "Large order review: PASSED" in compliance_notes(None)
+
+
+class FakeMultiAlpaca:
+    """Multi-account broker stand-in recording executed trades."""
+
+    def __init__(self, cash='10000'):
+        self.cash = cash
+        self.executed = []
+
+    def get_available_accounts(self):
+        return {'primary': {}}
+
+    def get_account_info(self, account_id):
+        return {'account_name': account_id, 'cash': self.cash, 'buying_power': self.cash}
+
+    def get_positions(self, account_id):
+        return [{'symbol': 'AAPL', 'qty': 5}]
+
+    async def execute_trade(self, **trade):
+        self.executed.append(trade)
+        return None
+
+
+def _submission(symbol='AAPL', shares='10', side='buy'):
+    return {
+        'user': {'id': 'U1'},
+        'view': {'private_metadata': 'C1', 'state': {'values': {
+            'trade_symbol_block': {'symbol_input': {'value': symbol}},
+            'qty_shares_block': {'shares_input': {'value': shares}},
+            'trade_side_block': {'trade_side_radio': {'selected_option': {'value': side}}},
+            'order_type_block': {'order_type_select': {'selected_option': {'value': 'market'}}},
+        }}}
+    }
+
+
+class TestMultiAccountSubmission:
+    """The multi-account trade modal runs the pre-trade pipeline before acking."""
+
+    @pytest.fixture
+    def command(self):
+        from listeners.multi_account_trade_command import MultiAccountTradeCommand
+
+        command = MultiAccountTradeCommand(Mock())
+        command.multi_alpaca = FakeMultiAlpaca()
+        command.user_manager = Mock(get_user_account=Mock(return_value='primary'))
+        command.quote_fetches = []
+
+        async def fetch_quote(ctx):
+            command.quote_fetches.append(ctx.values['symbol'])
+            return 150.0
+
+        command._fetch_quote_price = fetch_quote
+        command._send_error_message = AsyncMock()
+        return command
+
+    @pytest.mark.asyncio
+    async def test_passing_buy_is_acked_and_executed(self, command):
+        ack = Mock()
+        await command.handle_trade_submission(ack, _submission(' aapl '), Mock(), Mock())
+
+        ack.assert_called_once_with(response_action='clear')
+        assert command.quote_fetches == ['AAPL']
+        assert command.multi_alpaca.executed[0]['symbol'] == 'AAPL'
+        assert command.multi_alpaca.executed[0]['qty'] == 10
+
+    @pytest.mark.asyncio
+    async def test_failed_check_returns_field_errors(self, command):
+        command.multi_alpaca.cash = '100'
+        ack = Mock()
+        await command.handle_trade_submission(ack, _submission(), Mock(), Mock())
+
+        assert ack.call_args.kwargs['response_action'] == 'errors'
+        assert 'qty_shares_block' in ack.call_args.kwargs['errors']
+        assert command.multi_alpaca.executed == []
+
+    @pytest.mark.asyncio
+    async def test_sell_does_not_fetch_a_quote(self, command):
+        ack = Mock()
+        await command.handle_trade_submission(ack, _submission(shares='5', side='sell'), Mock(), Mock())
+
+        ack.assert_called_once_with(response_action='clear')
+        assert command.quote_fetches == []
+        assert command.multi_alpaca.executed[0]['side'] == 'sell'
+
+    @pytest.mark.asyncio
+    async def test_sell_fetches_account_alongside_positions(self, command):
+        broker = command.multi_alpaca
+
+        def slow(fetch):
+            def fetch_slowly(account_id):
+                time.sleep(0.2)
+                return fetch(account_id)
+            return fetch_slowly
+
+        broker.get_account_info = slow(broker.get_account_info)
+        broker.get_positions = slow(broker.get_positions)
+
+        ack = Mock()
+        start = time.perf_counter()
+        await command.handle_trade_submission(ack, _submission(shares='5', side='sell'), Mock(), Mock())
+        elapsed = time.perf_counter() - start
+
+        ack.assert_called_once_with(response_action='clear')
+        assert elapsed < 0.35  # two 0.2s fetches, not the account after the checks
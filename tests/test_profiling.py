@@ -0,0 +1,181 @@
+"""
+Tests for request profiling spans, slow-request capture and stack sampling.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from urllib.parse import urlencode
+
+import pytest
+from slack_bolt import BoltRequest
+from slack_bolt.authorization import AuthorizeResult
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.settings import ProfilingConfig
+from services.profiling import Profiler, get_profiler, instrument_engine, profiled, span
+from bolt_app import ProfiledApp, register_middleware
+
+# Cost of a disabled span() plus a @profiled call, per call
+DISABLED_OVERHEAD_BUDGET_NS = 1500
+
+
+@profiled('market_data.get_quote')
+async def fetch_quote(symbol):
+    await asyncio.sleep(0.01)
+    return symbol
+
+
+@profiled('blocks.trade_modal')
+def build_modal():
+    with span('blocks.format'):
+        time.sleep(0.005)
+    return {'type': 'modal'}
+
+
+def busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _profiler(**overrides):
+    settings = dict(enabled=True, sample_rate=1.0, slow_request_count=2)
+    settings.update(overrides)
+    return Profiler(ProfilingConfig(**settings))
+
+
+class TestSpans:
+    """Span recording inside a traced request."""
+
+    def test_breakdown_of_sync_async_and_db_spans(self):
+        profiler = _profiler()
+        engine = create_engine('sqlite:///:memory:')
+        instrument_engine(engine)
+
+        with profiler.request('/buy', 'trigger-1'):
+            build_modal()
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(fetch_quote('AAPL'))
+            finally:
+                loop.close()
+            with engine.connect() as connection:
+                connection.execute(text('SELECT 1'))
+
+        breakdown = profiler.get_recent_requests()[0]
+        totals = {entry['name']: entry for entry in breakdown['span_totals']}
+        assert breakdown['name'] == '/buy' and breakdown['request_id'] == 'trigger-1'
+        assert set(totals) == {'blocks.trade_modal', 'blocks.format', 'market_data.get_quote', 'db.SELECT'}
+        assert totals['market_data.get_quote']['total_ms'] >= 10
+        depths = {entry['name']: entry['depth'] for entry in breakdown['spans']}
+        assert depths['blocks.format'] == 1 and depths['blocks.trade_modal'] == 0
+        top_level = sum(totals[name]['total_ms'] for name in ('blocks.trade_modal', 'market_data.get_quote', 'db.SELECT'))
+        assert breakdown['unaccounted_ms'] == pytest.approx(breakdown['duration_ms'] - top_level, abs=0.1)
+
+    def test_errors_recorded(self):
+        profiler = _profiler()
+        with pytest.raises(ValueError):
+            with profiler.request('/sell'):
+                with span('alpaca.submit_order'):
+                    raise ValueError('rejected')
+
+        breakdown = profiler.get_recent_requests()[0]
+        assert breakdown['error'] == 'ValueError'
+        assert breakdown['spans'][0]['error'] == 'ValueError'
+
+    def test_disabled_and_unsampled_requests_are_not_traced(self):
+        profiler = _profiler(enabled=False)
+        with profiler.request('/buy') as trace:
+            assert trace is None
+            assert span('anything') is span('anything else')  # shared no-op
+
+        profiler.configure(enabled=True, sample_rate=0.0)
+        with profiler.request('/buy') as trace:
+            assert trace is None
+        assert profiler.traced_requests == 0
+
+    @pytest.mark.benchmark
+    def test_disabled_overhead(self):
+        calls = 100_000
+
+        @profiled('noop')
+        def noop():
+            return None
+
+        start = time.perf_counter_ns()
+        for _ in range(calls):
+            with span('noop'):
+                pass
+            noop()
+        per_call = (time.perf_counter_ns() - start) / calls
+        assert per_call < DISABLED_OVERHEAD_BUDGET_NS, f"disabled span + @profiled call: {per_call:.0f}ns"
+
+
+class TestSlowRequests:
+    """Slowest-N retention and collapsed-stack dumps."""
+
+    def test_keeps_slowest_requests(self):
+        profiler = _profiler()
+        for index, delay in enumerate([0.001, 0.03, 0.002, 0.02, 0.001]):
+            with profiler.request('/positions', f"r{index}"):
+                time.sleep(delay)
+
+        slowest = profiler.get_slow_requests()
+        assert [entry['request_id'] for entry in slowest] == ['r1', 'r3']
+        assert len(profiler.get_recent_requests()) == 2
+
+    def test_stack_samples_dumped_for_slowest(self, tmp_path):
+        profiler = _profiler(stack_sampling=True, stack_interval_ms=1, dump_dir=str(tmp_path), slow_request_count=1)
+        try:
+            with profiler.request('/buy', 'slow'):
+                busy_wait(0.1)
+            with profiler.request('/buy', 'slower'):
+                busy_wait(0.2)
+        finally:
+            profiler.shutdown()
+
+        slowest = profiler.get_slow_requests()[0]
+        assert slowest['request_id'] == 'slower' and slowest['stack_samples'] > 10
+        files = os.listdir(tmp_path)
+        assert files == [os.path.basename(slowest['profile_path'])]  # evicted profile removed
+        lines = open(slowest['profile_path']).read().splitlines()
+        assert any('busy_wait (test_profiling.py' in line for line in lines)
+        assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+
+
+class TestBoltDispatch:
+    """Slack requests are traced across middleware and listeners."""
+
+    def test_command_traced_with_listener_spans(self):
+        def authorize(enterprise_id, team_id, logger):
+            return AuthorizeResult(enterprise_id=enterprise_id, team_id=team_id,
+                                   bot_token='xoxb-test', bot_id='B1', bot_user_id='UBOT')
+
+        app = ProfiledApp(signing_secret='secret', authorize=authorize, process_before_response=True,
+                          request_verification_enabled=False)
+        register_middleware(app)
+
+        @app.command('/buy')
+        def buy(ack):
+            build_modal()
+            ack()
+
+        profiler = get_profiler()
+        previous = profiler.get_status()
+        profiler.configure(enabled=True, sample_rate=1.0)
+        try:
+            body = urlencode({'command': '/buy', 'text': 'AAPL', 'user_id': 'U1', 'team_id': 'T1',
+                              'channel_id': 'C1', 'trigger_id': 'trigger-42'})
+            response = app.dispatch(BoltRequest(body=body, headers={'content-type': ['application/x-www-form-urlencoded']}))
+            breakdown = profiler.get_recent_requests()[0]
+        finally:
+            profiler.configure(enabled=previous['enabled'], sample_rate=previous['sample_rate'])
+            profiler.reset()
+
+        assert response.status == 200
+        assert breakdown['name'] == '/buy' and breakdown['request_id'] == 'trigger-42'
+        assert 'blocks.trade_modal' in {entry['name'] for entry in breakdown['span_totals']}
@@ -0,0 +1,329 @@
+"""
+Tests for market-hours-aware quote cache TTLs and stale-while-revalidate serving.
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.settings import MarketDataConfig, get_config
+from services.circuit_breaker import CircuitBreakerOpenError, CircuitState
+from services.market_data import (
+    CacheTTL, DataQuality, MarketDataService, MarketStatus, QuotePurpose, QuoteTTLPolicy,
+    calendar_market_status
+)
+from tests.load.stubs import FaultProfile, FinnhubStub
+
+# Wednesday 4 March 2026, New York is on EST (UTC-5)
+PRE_MARKET = datetime(2026, 3, 4, 13, 0, tzinfo=timezone.utc)
+REGULAR_HOURS = datetime(2026, 3, 4, 15, 0, tzinfo=timezone.utc)
+AFTER_HOURS = datetime(2026, 3, 4, 21, 30, tzinfo=timezone.utc)
+OVERNIGHT = datetime(2026, 3, 5, 2, 0, tzinfo=timezone.utc)
+SATURDAY = datetime(2026, 3, 7, 15, 0, tzinfo=timezone.utc)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.expiries = {}
+
+    def setex(self, key, seconds, value):
+        self.expiries[key] = seconds
+
+    def get(self, key):
+        return None
+
+    def close(self):
+        pass
+
+
+def _config(**overrides):
+    values = dict(finnhub_api_key='test', cache_ttl_seconds=60, cache_stale_seconds=120,
+                  cache_stale_execution_seconds=0, cache_stale_app_home_seconds=1800,
+                  cache_ttl_extended_hours_seconds=300, cache_ttl_closed_seconds=86400)
+    values.update(overrides)
+    return MarketDataConfig(**values)
+
+
+async def _revalidated(service):
+    """Wait for the background refreshes running on the service's revalidation thread."""
+    await asyncio.gather(*(asyncio.wrap_future(future) for future in list(service._revalidations.values())))
+
+
+class TestTTLPolicy:
+    """TTLs follow the US equities session."""
+
+    @pytest.mark.parametrize('now, status', [
+        (PRE_MARKET, MarketStatus.PRE_MARKET),
+        (REGULAR_HOURS, MarketStatus.OPEN),
+        (AFTER_HOURS, MarketStatus.AFTER_HOURS),
+        (OVERNIGHT, MarketStatus.CLOSED),
+        (SATURDAY, MarketStatus.CLOSED),
+        (datetime(2026, 7, 1, 13, 30, tzinfo=timezone.utc), MarketStatus.OPEN),  # 09:30 EDT
+        (datetime(2026, 7, 1, 20, 0, tzinfo=timezone.utc), MarketStatus.AFTER_HOURS),  # 16:00 EDT
+    ])
+    def test_calendar_sessions(self, now, status):
+        assert calendar_market_status(now) == status
+
+    def test_ttl_per_session(self):
+        policy = QuoteTTLPolicy(_config())
+
+        assert policy.ttl(REGULAR_HOURS) == CacheTTL(60, 120)
+        assert policy.ttl(PRE_MARKET) == policy.ttl(AFTER_HOURS) == CacheTTL(300, 120)
+        assert policy.ttl(OVERNIGHT) == policy.ttl(SATURDAY) == CacheTTL(86400, 120)
+        assert policy.ttl(REGULAR_HOURS).max_age_seconds == 180
+
+    def test_stale_window_per_purpose(self):
+        policy = QuoteTTLPolicy(_config())
+
+        assert policy.ttl(REGULAR_HOURS, QuotePurpose.EXECUTION) == CacheTTL(60)
+        assert policy.ttl(REGULAR_HOURS, QuotePurpose.APP_HOME) == CacheTTL(60, 1800)
+        assert policy.retention_seconds(REGULAR_HOURS) == 1860
+        assert policy.retention_seconds(SATURDAY) == 88200
+
+    def test_reported_holiday_closes_the_day(self):
+        policy = QuoteTTLPolicy(_config())
+        policy.observe(MarketStatus.HOLIDAY, REGULAR_HOURS)
+
+        assert policy.market_status(AFTER_HOURS) == MarketStatus.HOLIDAY
+        assert policy.ttl(REGULAR_HOURS) == CacheTTL(86400, 120)
+        assert policy.market_status(REGULAR_HOURS + timedelta(days=1)) == MarketStatus.OPEN
+
+        policy.observe(MarketStatus.OPEN, REGULAR_HOURS)
+        assert policy.market_status(REGULAR_HOURS) == MarketStatus.OPEN
+
+    def test_closed_answer_overnight_changes_nothing(self):
+        policy = QuoteTTLPolicy(_config())
+        policy.observe(MarketStatus.CLOSED, OVERNIGHT)
+
+        assert policy.market_status(OVERNIGHT + timedelta(hours=13)) == MarketStatus.OPEN
+
+    def test_invalid_ttls_rejected(self):
+        with pytest.raises(ValueError):
+            _config(cache_ttl_closed_seconds=0)
+        with pytest.raises(ValueError):
+            _config(cache_stale_seconds=-1)
+        with pytest.raises(ValueError):
+            _config(cache_stale_app_home_seconds=-1)
+
+
+class TestQuoteCaching:
+    """get_quote serves cached quotes for as long as the session allows."""
+
+    @pytest.fixture
+    def finnhub(self, monkeypatch):
+        stub = FinnhubStub(seed=5).start()
+        monkeypatch.setattr(get_config().market_data, 'finnhub_base_url', f"{stub.url}/api/v1")
+        yield stub
+        stub.stop()
+
+    def _service(self, now):
+        service = MarketDataService()
+        service.ttl_policy = QuoteTTLPolicy(_config(), clock=lambda: now)
+        return service
+
+    async def _cached(self, service, age_seconds):
+        quote = await service.get_quote('AAPL')
+        quote.timestamp -= timedelta(seconds=age_seconds)
+        service.memory_cache['AAPL'] = (quote, quote.timestamp)
+        return quote
+
+    def test_closed_market_serves_day_old_quote(self, finnhub):
+        async def run():
+            service = self._service(SATURDAY)
+            try:
+                cached = await self._cached(service, 10 * 3600)
+                assert await service.get_quote('AAPL') is cached
+            finally:
+                await service.cleanup()
+
+        asyncio.run(run())
+        assert finnhub.requests['quote'] == 1
+
+    def test_regular_hours_refetch_after_max_age(self, finnhub):
+        async def run():
+            service = self._service(REGULAR_HOURS)
+            try:
+                cached = await self._cached(service, 181)
+                assert await service.get_quote('AAPL') is not cached
+            finally:
+                await service.cleanup()
+
+        asyncio.run(run())
+        assert finnhub.requests['quote'] == 2
+
+    def test_stale_quote_served_while_one_refresh_runs(self, finnhub):
+        async def run():
+            service = self._service(REGULAR_HOURS)
+            try:
+                cached = await self._cached(service, 90)
+                served = await asyncio.gather(*(service.get_quote('AAPL') for _ in range(5)))
+                assert all(quote.current_price == cached.current_price for quote in served)
+                assert all(quote.data_quality == DataQuality.STALE and quote.cache_age_seconds >= 90
+                           for quote in served)
+                assert cached.data_quality == DataQuality.REAL_TIME
+                assert len(service._revalidations) == 1
+
+                await _revalidated(service)
+                fresh = await service.get_quote('AAPL')
+                assert fresh is not cached and fresh.timestamp > cached.timestamp
+            finally:
+                await service.cleanup()
+
+        asyncio.run(run())
+        assert finnhub.requests['quote'] == 2
+
+    def test_refresh_outlives_the_callers_loop(self, finnhub):
+        # Listeners call get_quote from asyncio.run or a loop closed straight afterwards
+        service = self._service(REGULAR_HOURS)
+        try:
+            cached = asyncio.run(self._cached(service, 90))
+            stale = asyncio.run(service.get_quote('AAPL'))
+            assert stale.data_quality == DataQuality.STALE
+
+            for future in list(service._revalidations.values()):
+                future.result(timeout=5)
+            assert not service._revalidations
+            fresh = asyncio.run(service.get_quote('AAPL'))
+            assert fresh is not cached and fresh.data_quality == DataQuality.REAL_TIME
+        finally:
+            asyncio.run(service.cleanup())
+        assert finnhub.requests['quote'] == 2
+        assert service._revalidation_thread is None
+
+    def test_redis_expiry_follows_session(self, finnhub):
+        async def run(now):
+            service = self._service(now)
+            service.redis_client = FakeRedis()
+            try:
+                await service.get_quote('AAPL')
+            finally:
+                await service.cleanup()
+            return service.redis_client.expiries['quote:AAPL']
+
+        # Kept until App Home, the most lenient caller, would no longer be served them
+        assert asyncio.run(run(REGULAR_HOURS)) == 1860
+        assert asyncio.run(run(AFTER_HOURS)) == 2100
+        assert asyncio.run(run(SATURDAY)) == 88200
+
+
+class TestQuotePurposes:
+    """Each caller gets cached quotes only as stale as it tolerates."""
+
+    @pytest.fixture
+    def finnhub(self, monkeypatch):
+        stub = FinnhubStub(seed=9).start()
+        monkeypatch.setattr(get_config().market_data, 'finnhub_base_url', f"{stub.url}/api/v1")
+        yield stub
+        stub.stop()
+
+    def _service(self):
+        service = MarketDataService()
+        service.ttl_policy = QuoteTTLPolicy(_config(), clock=lambda: REGULAR_HOURS)
+        return service
+
+    async def _cached(self, service, symbol, age_seconds):
+        quote = await service.get_quote(symbol, use_cache=False)
+        quote.timestamp -= timedelta(seconds=age_seconds)
+        service.memory_cache[symbol] = (quote, quote.timestamp)
+        return quote
+
+    def test_execution_never_gets_an_expired_quote(self, finnhub):
+        async def run():
+            service = self._service()
+            try:
+                await self._cached(service, 'AAPL', 90)
+                quote = await service.get_quote('AAPL', purpose=QuotePurpose.EXECUTION)
+                assert quote.data_quality == DataQuality.REAL_TIME and quote.cache_age_seconds is None
+                assert not service._revalidations
+            finally:
+                await service.cleanup()
+
+        asyncio.run(run())
+        assert finnhub.requests['quote'] == 2
+
+    def test_app_home_tolerates_what_display_refetches(self, finnhub):
+        async def run():
+            service = self._service()
+            try:
+                await self._cached(service, 'AAPL', 600)
+                home = await service.get_quote('AAPL', purpose=QuotePurpose.APP_HOME)
+                assert home.data_quality == DataQuality.STALE and home.cache_age_seconds >= 600
+                await _revalidated(service)
+
+                await self._cached(service, 'MSFT', 600)
+                modal = await service.get_quote('MSFT')
+                assert modal.data_quality == DataQuality.REAL_TIME
+            finally:
+                await service.cleanup()
+
+        asyncio.run(run())
+        assert finnhub.requests['quote'] == 4
+
+    def test_open_circuit_serves_cached_quote_within_allowance(self, finnhub):
+        async def run():
+            service = self._service()
+            try:
+                await self._cached(service, 'AAPL', 600)
+                service.circuit_breaker._transition(CircuitState.OPEN)
+
+                home = await service.get_quote('AAPL', purpose=QuotePurpose.APP_HOME)
+                assert home.data_quality == DataQuality.STALE
+                with pytest.raises(CircuitBreakerOpenError):
+                    await service.get_quote('AAPL')
+                with pytest.raises(CircuitBreakerOpenError):
+                    await service.get_quote('AAPL', purpose=QuotePurpose.EXECUTION)
+            finally:
+                service.circuit_breaker.reset()
+                await service.cleanup()
+
+        asyncio.run(run())
+        assert finnhub.requests['quote'] == 1
+
+
+@pytest.mark.benchmark
+class TestModalQuoteLatency:
+    """Median modal quote latency with a slow upstream."""
+
+    SYMBOLS = ['AAPL', 'MSFT', 'TSLA', 'NVDA', 'JPM']
+    ROUNDS = 4
+
+    async def _median_ms(self, purpose):
+        service = MarketDataService()
+        service.ttl_policy = QuoteTTLPolicy(_config(), clock=lambda: REGULAR_HOURS)
+        samples = []
+        try:
+            await service.get_multiple_quotes(self.SYMBOLS, use_cache=False)
+            for _ in range(self.ROUNDS):
+                for quote, _cached_at in list(service.memory_cache.values()):
+                    quote.timestamp -= timedelta(seconds=90)  # Every lookup finds an expired quote
+                for symbol in self.SYMBOLS:
+                    started = time.perf_counter()
+                    await service.get_quote(symbol, purpose=purpose)
+                    samples.append((time.perf_counter() - started) * 1000)
+                await _revalidated(service)
+        finally:
+            await service.cleanup()
+        return statistics.median(samples)
+
+    def test_stale_serving_hides_upstream_latency(self, monkeypatch):
+        medians = {}
+        for latency_ms in (20, 200):
+            stub = FinnhubStub(faults=FaultProfile(latency_ms=latency_ms), seed=4).start()
+            monkeypatch.setattr(get_config().market_data, 'finnhub_base_url', f"{stub.url}/api/v1")
+            try:
+                medians[latency_ms] = (asyncio.run(self._median_ms(QuotePurpose.EXECUTION)),
+                                       asyncio.run(self._median_ms(QuotePurpose.DISPLAY)))
+            finally:
+                stub.stop()
+
+        summary = ', '.join(f"upstream {latency_ms}ms: {blocking:.1f}ms refetching, {stale:.2f}ms stale"
+                            for latency_ms, (blocking, stale) in medians.items())
+        assert medians[200][0] >= 200, summary
+        assert medians[20][1] < 20 and medians[200][1] < 20, summary
@@ -0,0 +1,215 @@
+"""
+Tests and cache hit-rate comparison for the background quote prewarmer.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.settings import QuotePrewarmConfig, get_config
+from services import circuit_breaker
+from services.market_data import MarketDataService, MarketQuote, MarketStatus, QuoteTTLPolicy
+from services.metrics import MetricsRegistry
+from services.quote_prewarmer import QuotePrewarmer
+from tests.load.stubs import FinnhubStub
+
+REGULAR_HOURS = datetime(2026, 3, 4, 15, 0, tzinfo=timezone.utc)  # A Wednesday, 10:00 in New York
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingFetch:
+    """Quote fetch stand-in recording each batch it was asked for."""
+
+    def __init__(self):
+        self.batches = []
+
+    async def __call__(self, symbols):
+        self.batches.append(list(symbols))
+        return {symbol: MarketQuote(symbol=symbol, current_price=Decimal('100')) for symbol in symbols}
+
+
+class MarketStatusStub:
+    """get_market_status() stand-in counting its calls."""
+
+    def __init__(self, status=MarketStatus.OPEN):
+        self.status = status
+        self.checks = 0
+
+    async def __call__(self):
+        self.checks += 1
+        return self.status
+
+
+def _prewarmer(service=None, status=None, held=(), fetch=None, clock=None, **overrides):
+    overrides.setdefault('quick_symbols', ['AAPL', 'TSLA'])
+    return QuotePrewarmer(QuotePrewarmConfig(**overrides), service=service or MarketDataService(),
+                          fetch=fetch or RecordingFetch(), market_status=status or MarketStatusStub(),
+                          held_symbols=lambda: list(held), registry=MetricsRegistry(),
+                          clock=clock or FakeClock())
+
+
+def _age_cache(service, seconds):
+    """Pretend ``seconds`` passed since every cached quote was stored."""
+    for symbol, (quote, cached_at) in list(service.memory_cache.items()):
+        quote.timestamp -= timedelta(seconds=seconds)
+        service.memory_cache[symbol] = (quote, cached_at - timedelta(seconds=seconds))
+
+
+class TestHotSymbols:
+    """Quick picks, positions and watchlists always count; lookups rank symbols."""
+
+    def test_pinned_symbols_and_access_ranking(self):
+        clock = FakeClock()
+        prewarmer = _prewarmer(clock=clock)
+        prewarmer.set_held_symbols(['nvda'])
+        prewarmer.add_watchlist('jpm')
+        for symbol in ['MSFT'] * 3 + ['TSLA'] * 2:
+            prewarmer.record_access(symbol, None)
+
+        assert prewarmer.hot_symbols() == ['MSFT', 'TSLA', 'AAPL', 'JPM', 'NVDA']
+
+        clock.now += 30 * 60  # One half-life: MSFT 1.5, TSLA 1.0
+        prewarmer.record_access('TSLA', None)
+        prewarmer.record_access('TSLA', None)
+        assert prewarmer.hot_symbols()[:2] == ['TSLA', 'MSFT']
+
+        clock.now += 10 * 30 * 60  # Unpinned symbols fade out of the set
+        assert 'MSFT' not in prewarmer.hot_symbols() and 'TSLA' in prewarmer.hot_symbols()
+
+    def test_hot_set_is_capped(self):
+        prewarmer = _prewarmer(max_symbols=3)
+        for symbol in ['META', 'META', 'AMZN']:
+            prewarmer.record_access(symbol, None)
+
+        assert prewarmer.hot_symbols() == ['META', 'AMZN', 'AAPL']
+
+
+class TestRefreshCycle:
+    """Each cycle fetches due symbols, most accessed first, within the budget."""
+
+    def test_cycle_respects_budget_and_skips_fresh_quotes(self):
+        fetch = RecordingFetch()
+        prewarmer = _prewarmer(fetch=fetch, held=['NVDA', 'JPM', 'AMZN'], budget_fraction=0.05)
+        budget = prewarmer.budget_per_cycle
+        assert budget == max(1, int(get_config().market_data.rate_limit_per_minute * 0.05))
+        for _ in range(2):
+            prewarmer.record_access('JPM', None)
+
+        asyncio.run(prewarmer.run_cycle())
+        asyncio.run(prewarmer.run_cycle())
+
+        hot = ['JPM', 'AAPL', 'AMZN', 'NVDA', 'TSLA']
+        assert fetch.batches[0] == hot[:budget]
+        assert fetch.batches[1] == hot[budget:2 * budget]
+        assert set(prewarmer.service.memory_cache) == set(hot[:2 * budget])
+
+    def test_pauses_while_market_closed(self):
+        fetch = RecordingFetch()
+        clock = FakeClock()
+        status = MarketStatusStub(MarketStatus.CLOSED)
+        prewarmer = _prewarmer(fetch=fetch, status=status, clock=clock)
+
+        for _ in range(3):
+            assert asyncio.run(prewarmer.run_cycle()) == 0
+        assert fetch.batches == [] and prewarmer.get_status()['paused_market_closed']
+        assert status.checks == 1  # Reused until the TTL passes
+
+        status.status = MarketStatus.OPEN
+        clock.now += prewarmer.config.market_status_ttl_seconds
+        assert asyncio.run(prewarmer.run_cycle()) == 2
+        assert status.checks == 2 and not prewarmer.paused
+
+    def test_runs_in_background_and_hooks_cache_lookups(self):
+        fetch = RecordingFetch()
+        service = MarketDataService()
+        prewarmer = _prewarmer(service=service, fetch=fetch, interval_seconds=0.05, clock=time.monotonic)
+        prewarmer.start()
+        try:
+            assert service.on_quote_access == prewarmer.record_access
+            deadline = time.monotonic() + 5
+            while 'TSLA' not in service.memory_cache and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            quote = asyncio.run(service.get_quote('TSLA'))
+            assert quote.current_price == Decimal('100')
+            assert prewarmer.lookups.value('prewarmed_hit') == 1
+        finally:
+            prewarmer.stop()
+        assert service.on_quote_access is None and not prewarmer.get_status()['running']
+
+
+    def test_default_fetch_shares_the_app_finnhub_budget_and_breaker(self, monkeypatch):
+        stub = FinnhubStub(seed=1).start()
+        monkeypatch.setattr(get_config().market_data, 'finnhub_base_url', f"{stub.url}/api/v1")
+        service = MarketDataService()
+        prewarmer = QuotePrewarmer(QuotePrewarmConfig(quick_symbols=['AAPL']), service=service,
+                                   market_status=MarketStatusStub(), held_symbols=list,
+                                   registry=MetricsRegistry(), clock=FakeClock())
+
+        async def cycle():
+            try:
+                return await prewarmer.run_cycle(), await prewarmer._get_fetch_service()
+            finally:
+                await prewarmer._close_fetch_service()
+
+        try:
+            fetched, fetch_service = asyncio.run(cycle())
+        finally:
+            stub.stop()
+
+        assert fetched == 1 and fetch_service is not service
+        assert fetch_service.rate_limiter is service.rate_limiter
+        assert fetch_service.circuit_breaker is service.circuit_breaker
+        assert circuit_breaker._breakers['finnhub'] is service.circuit_breaker  # Not replaced by a second one
+
+
+class TestCacheHitRate:
+    """Hit rate of trade modal quote lookups with and without prewarming."""
+
+    WORKLOAD = ['AAPL', 'AAPL', 'TSLA', 'NVDA', 'MSFT', 'AMZN', 'TSLA', 'JPM']
+    ROUNDS = 4
+
+    async def _run(self, prewarm):
+        service = MarketDataService()
+        service.ttl_policy = QuoteTTLPolicy(get_config().market_data, clock=lambda: REGULAR_HOURS)
+        prewarmer = _prewarmer(service=service, fetch=lambda symbols: service.get_multiple_quotes(symbols, use_cache=False),
+                               held=['NVDA', 'JPM'], quick_symbols=['AAPL', 'TSLA', 'MSFT', 'GOOGL'])
+        service.on_quote_access = prewarmer.record_access
+        try:
+            for _ in range(self.ROUNDS):
+                if prewarm:
+                    await prewarmer.run_cycle()
+                for symbol in self.WORKLOAD:
+                    await service.get_quote(symbol)
+                _age_cache(service, 6 * 60)  # Quiet spell longer than regular hours keep quotes
+        finally:
+            await service.cleanup()
+        return prewarmer.hit_rate()
+
+    def test_prewarming_raises_hit_rate(self, monkeypatch):
+        stub = FinnhubStub(seed=3).start()
+        monkeypatch.setattr(get_config().market_data, 'finnhub_base_url', f"{stub.url}/api/v1")
+        try:
+            cold, _ = asyncio.run(self._run(prewarm=False))
+            warm, without = asyncio.run(self._run(prewarm=True))
+        finally:
+            stub.stop()
+
+        assert cold == pytest.approx(2 / 8)
+        # Only AMZN's first lookup misses: it joins the hot set once it has been asked for
+        assert warm == pytest.approx(1 - 1 / (8 * self.ROUNDS))
+        assert without == pytest.approx(cold)
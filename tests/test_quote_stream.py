@@ -0,0 +1,260 @@
+"""
+Tests for the live quote streaming hub: reference-counted upstream subscriptions,
+conflating subscribers, throttled modal refresh and the poll/websocket sources.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import listeners.enhanced_trade_command as enhanced_trade_command
+from config.settings import QuoteStreamConfig, get_config
+from listeners.enhanced_trade_command import EnhancedMarketContext, EnhancedTradeCommand
+from models.user import User, UserProfile, UserRole
+from services.market_data import MarketDataService, MarketQuote
+from services.metrics import MetricsRegistry
+from services.modal_updates import get_modal_coalescer
+from services.quote_stream import (
+    FinnhubWebSocketSource, PollingQuoteSource, QuoteSource, QuoteStreamHub, QuoteTick
+)
+from tests.load.stubs import FinnhubStub
+from tests.test_modal_updates import FakeViewsClient
+
+
+class RecordingSource(QuoteSource):
+    """Upstream stand-in: records subscriptions; tests publish ticks through it."""
+
+    def __init__(self):
+        self.added = []
+        self.removed = []
+        self.publish = None
+
+    def start(self, publish):
+        self.publish = publish
+
+    def add(self, symbol):
+        self.added.append(symbol)
+
+    def remove(self, symbol):
+        self.removed.append(symbol)
+
+    async def stop(self):
+        pass
+
+
+def _hub(source=None, **overrides):
+    return QuoteStreamHub(QuoteStreamConfig(**overrides), source=source or RecordingSource(),
+                          registry=MetricsRegistry())
+
+
+def _settle(hub):
+    """Wait until the hub loop has run everything scheduled so far."""
+    asyncio.run_coroutine_threadsafe(asyncio.sleep(0), hub._loop).result(timeout=2)
+
+
+def _tick(symbol, price):
+    return QuoteTick(symbol, Decimal(str(price)), datetime.utcnow())
+
+
+def _push(hub, *ticks):
+    for tick in ticks:
+        hub._loop.call_soon_threadsafe(hub._source.publish, tick)
+    _settle(hub)
+
+
+def _quote(symbol, price):
+    return MarketQuote(symbol=symbol, current_price=Decimal(str(price)), previous_close=Decimal('100'))
+
+
+@pytest.fixture
+def hub():
+    hub = _hub()
+    yield hub
+    hub.stop()
+
+
+class TestSubscriptions:
+    """One upstream subscription per symbol, fanned out to every subscriber."""
+
+    def test_reference_counted_upstream(self, hub):
+        first, second = hub.subscribe('aapl'), hub.subscribe('AAPL')
+        other = hub.subscribe('TSLA')
+        _settle(hub)
+        assert hub._source.added == ['AAPL', 'TSLA']
+
+        _push(hub, _tick('AAPL', 150))
+        assert first.get(timeout=1).price == second.get(timeout=1).price == Decimal('150')
+        assert other.get(timeout=0.01) is None
+
+        first.close()
+        _settle(hub)
+        assert hub._source.removed == []
+        second.close()
+        other.close()
+        _settle(hub)
+        assert hub._source.removed == ['AAPL', 'TSLA'] and hub.get_status()['symbols'] == {}
+
+    def test_slow_subscriber_gets_only_latest_tick(self, hub):
+        subscription = hub.subscribe('AAPL')
+        _push(hub, _tick('AAPL', 150), _tick('AAPL', 151), _tick('AAPL', 152))
+
+        assert subscription.get(timeout=1).price == Decimal('152')
+        assert subscription.get(timeout=0.01) is None
+        assert hub.conflated.value() == 2 and hub.ticks.value() == 3
+
+    def test_late_subscriber_starts_from_last_tick(self, hub):
+        hub.subscribe('AAPL')
+        _push(hub, _tick('AAPL', 150))
+
+        assert hub.subscribe('AAPL').get(timeout=0).price == Decimal('150')
+
+
+class TestModalWatch:
+    """Auto-refreshing modals are redrawn at most once per refresh interval."""
+
+    def test_redraws_are_throttled_to_newest_tick(self):
+        hub = _hub(modal_refresh_seconds=0.3)
+        client = FakeViewsClient()
+        rendered = []
+
+        def render(tick):
+            rendered.append(tick.price)
+            return {'type': 'modal', 'title': {'type': 'plain_text', 'text': f"AAPL {tick.price}"}, 'blocks': []}
+
+        try:
+            hub.watch_modal('VWATCH1', 'AAPL', render, client)
+            _settle(hub)
+            for price in range(150, 160):
+                _push(hub, _tick('AAPL', price))
+                time.sleep(0.02)
+            time.sleep(0.4)
+            get_modal_coalescer().flush('VWATCH1')
+
+            assert rendered[0] == Decimal('150') and rendered[-1] == Decimal('159')
+            assert len(rendered) <= 3
+            assert client.calls[-1]['view']['title']['text'] == 'AAPL 159'
+
+            hub.unwatch_modal('VWATCH1')
+            _settle(hub)
+            assert hub._source.removed == ['AAPL'] and hub.get_status()['modal_watches'] == 0
+        finally:
+            hub.stop()
+
+    def test_trade_command_session_streams_until_auto_refresh_off(self, hub, monkeypatch):
+        monkeypatch.setattr(enhanced_trade_command, 'get_quote_hub', lambda: hub)
+        hub.modal_refresh_seconds = 0.01
+        command = EnhancedTradeCommand(AsyncMock(), AsyncMock())
+        user = User(user_id='user-1', slack_user_id='U1', role=UserRole.EXECUTION_TRADER,
+                    profile=UserProfile(display_name='Trader', email='u1@example.com', department='Trading'))
+        context = EnhancedMarketContext(user=user, channel_id='C1', trigger_id='t1', symbol='AAPL',
+                                        view_id='VSESSION', current_quote=_quote('AAPL', 150))
+        command.active_sessions['user-1_C1'] = context
+        client = FakeViewsClient()
+
+        asyncio.run(command._start_real_time_updates('user-1_C1', client))
+        _settle(hub)
+        _push(hub, _tick('AAPL', 151.5))
+        time.sleep(0.1)
+        get_modal_coalescer().flush('VSESSION')
+
+        assert context.current_quote.current_price == Decimal('151.5')
+        assert '`$151.50`' in json.dumps(client.calls[-1]['view'])
+
+        context.auto_refresh = False
+        _push(hub, _tick('AAPL', 152))
+        time.sleep(0.1)
+        assert hub.get_status()['modal_watches'] == 0 and hub._source.removed == ['AAPL']
+
+    def test_ticks_wait_for_a_listener_changing_the_session(self, hub, monkeypatch):
+        monkeypatch.setattr(enhanced_trade_command, 'get_quote_hub', lambda: hub)
+        hub.modal_refresh_seconds = 0.01
+        command = EnhancedTradeCommand(AsyncMock(), AsyncMock())
+        user = User(user_id='user-1', slack_user_id='U1', role=UserRole.EXECUTION_TRADER,
+                    profile=UserProfile(display_name='Trader', email='u1@example.com', department='Trading'))
+        context = EnhancedMarketContext(user=user, channel_id='C1', trigger_id='t1', symbol='AAPL',
+                                        view_id='VSESSION', current_quote=_quote('AAPL', 150))
+        command.active_sessions['user-1_C1'] = context
+
+        asyncio.run(command._start_real_time_updates('user-1_C1', FakeViewsClient()))
+        _settle(hub)
+        with context.lock:  # A listener switching the modal to another symbol
+            hub._loop.call_soon_threadsafe(hub._source.publish, _tick('AAPL', 151.5))
+            time.sleep(0.1)
+            assert context.current_quote.current_price == Decimal('150')
+            context.symbol = 'TSLA'
+            context.current_quote = _quote('TSLA', 250)
+        time.sleep(0.1)
+
+        assert context.current_quote.symbol == 'TSLA' and context.current_quote.current_price == Decimal('250')
+        assert hub.get_status()['modal_watches'] == 0
+
+
+class TestSources:
+    """Upstream requests follow the number of distinct symbols, not subscribers."""
+
+    def test_source_must_implement_every_hook(self):
+        class StartOnlySource(QuoteSource):
+            def start(self, publish):
+                pass
+
+        with pytest.raises(TypeError):
+            StartOnlySource()
+
+    def test_shared_poll_fetches_each_symbol_once_per_interval(self):
+        batches = []
+
+        async def fetch(symbols):
+            batches.append(symbols)
+            return {symbol: _quote(symbol, 150) for symbol in symbols}
+
+        hub = _hub(PollingQuoteSource(0.1, fetch=fetch))
+        try:
+            subscriptions = [hub.subscribe(symbol) for symbol in ['AAPL', 'TSLA'] * 10]
+            time.sleep(0.35)
+
+            assert all(batch == ['AAPL', 'TSLA'] for batch in batches[1:])
+            assert 2 <= len(batches) <= 6
+            assert all(subscription.get(timeout=0).price == Decimal('150') for subscription in subscriptions)
+            assert hub.ticks.value() == 2  # Unchanged prices are not republished
+        finally:
+            hub.stop()
+
+    def test_default_poll_shares_the_app_finnhub_budget_and_breaker(self, monkeypatch):
+        stub = FinnhubStub(seed=1).start()
+        monkeypatch.setattr(get_config().market_data, 'finnhub_base_url', f"{stub.url}/api/v1")
+        app_service = MarketDataService()
+        source = PollingQuoteSource(60, app_service=app_service)
+        hub = _hub(source)
+        try:
+            tick = hub.subscribe('AAPL').get(timeout=10)
+
+            assert tick.symbol == 'AAPL' and tick.price > 0
+            assert stub.requests['quote'] == 1
+            assert source._service is not app_service
+            assert source._service.rate_limiter is app_service.rate_limiter
+            assert source._service.circuit_breaker is app_service.circuit_breaker
+        finally:
+            hub.stop()
+            stub.stop()
+
+    def test_websocket_subscribes_once_per_symbol(self):
+        stub = FinnhubStub(seed=1).start()
+        hub = _hub(FinnhubWebSocketSource(f"{stub.url}/ws", 'test-token'))
+        try:
+            subscriptions = [hub.subscribe(symbol) for symbol in ['AAPL', 'AAPL', 'AAPL', 'TSLA', 'TSLA']]
+            ticks = [subscription.get(timeout=5) for subscription in subscriptions]
+
+            assert [tick.symbol for tick in ticks] == ['AAPL', 'AAPL', 'AAPL', 'TSLA', 'TSLA']
+            assert dict(stub.ws_subscriptions) == {'AAPL': 1, 'TSLA': 1}
+        finally:
+            hub.stop()
+            stub.stop()
@@ -0,0 +1,166 @@
+"""
+Tests and per-request overhead microbenchmark for the Slack request warm path.
+"""
+
+import os
+import sys
+import time
+from urllib.parse import urlencode
+
+import ssl
+
+import pytest
+from slack_bolt import App
+from slack_bolt.adapter.aws_lambda import SlackRequestHandler
+from slack_bolt.authorization import AuthorizeResult
+from slack_sdk import WebClient
+from slack_sdk.http_retry import ConnectionErrorRetryHandler
+from slack_sdk.signature import SignatureVerifier
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bolt_app import PrecomputedRequestVerification, PrecomputedSignatureVerifier, gateway_client_middleware
+from services.slack_gateway import GatewayWebClient
+
+SIGNING_SECRET = '8f742231b10e8888abcd99yyyzzz85a5'
+
+# Signature check + Bolt dispatch of a trivial slash command on a warm handler
+WARM_P99_BUDGET_MS = 5.0
+
+
+class LambdaContext:
+    aws_request_id = 'req-1'
+    function_name = 'slack-trading-bot'
+    invoked_function_arn = 'arn:aws:lambda:us-east-1:123456789012:function:slack-trading-bot'
+
+    def get_remaining_time_in_millis(self):
+        return 30000
+
+
+def _signed_event(body: str, timestamp: int = None):
+    timestamp = str(timestamp or int(time.time()))
+    signature = SignatureVerifier(SIGNING_SECRET).generate_signature(timestamp=timestamp, body=body)
+    return {
+        'body': body,
+        'headers': {
+            'content-type': 'application/x-www-form-urlencoded',
+            'x-slack-request-timestamp': timestamp,
+            'x-slack-signature': signature,
+        },
+        'requestContext': {'httpMethod': 'POST'},
+        'isBase64Encoded': False,
+    }
+
+
+def _authorize(enterprise_id, team_id, logger):
+    # Static authorization keeps the tests off the network (no auth.test)
+    return AuthorizeResult(enterprise_id=enterprise_id, team_id=team_id,
+                           bot_token='xoxb-test', bot_id='B1', bot_user_id='UBOT')
+
+
+def _build_app(**kwargs):
+    return App(signing_secret=SIGNING_SECRET, authorize=_authorize, process_before_response=True,
+               request_verification_enabled=False,
+               before_authorize=PrecomputedRequestVerification(SIGNING_SECRET), **kwargs)
+
+
+@pytest.fixture
+def bolt_app():
+    app = _build_app()
+
+    @app.command('/ping')
+    def ping(ack):
+        ack('pong')
+
+    return app
+
+
+COMMAND_BODY = urlencode({
+    'command': '/ping', 'text': '', 'user_id': 'U1', 'team_id': 'T1',
+    'channel_id': 'C1', 'trigger_id': 't1', 'response_url': 'https://hooks.slack.com/x'
+})
+
+
+class TestPrecomputedSignatureVerifier:
+    """The precomputed verifier must agree with slack_sdk's."""
+
+    def test_matches_stock_signatures(self):
+        stock = SignatureVerifier(SIGNING_SECRET)
+        fast = PrecomputedSignatureVerifier(SIGNING_SECRET)
+        for body in ('', 'token=x&text=héllo', b'{"type":"event_callback"}'):
+            assert fast.generate_signature(timestamp='1531420618', body=body) == \
+                stock.generate_signature(timestamp='1531420618', body=body)
+
+    def test_rejects_bad_and_stale_signatures(self):
+        fast = PrecomputedSignatureVerifier(SIGNING_SECRET)
+        now = str(int(time.time()))
+        good = fast.generate_signature(timestamp=now, body='a=1')
+        assert fast.is_valid('a=1', now, good)
+        assert not fast.is_valid('a=2', now, good)
+        stale = str(int(time.time()) - 600)
+        assert not fast.is_valid('a=1', stale, fast.generate_signature(timestamp=stale, body='a=1'))
+
+
+class TestGatewayClientMiddleware:
+    """Listeners get a GatewayWebClient that keeps the app client's settings."""
+
+    def test_listener_client_keeps_transport_settings(self):
+        ssl_context = ssl.create_default_context()
+        retry_handler = ConnectionErrorRetryHandler()
+        app = _build_app(client=WebClient(ssl=ssl_context, proxy='http://proxy:3128',
+                                          retry_handlers=[retry_handler]))
+        app.use(gateway_client_middleware)
+        seen = {}
+
+        @app.command('/ping')
+        def ping(ack, client):
+            seen['client'] = client
+            ack()
+
+        assert SlackRequestHandler(app).handle(_signed_event(COMMAND_BODY), LambdaContext())['statusCode'] == 200
+        client = seen['client']
+        assert isinstance(client, GatewayWebClient)
+        assert client.token == 'xoxb-test'
+        assert client.ssl is ssl_context
+        assert client.proxy == 'http://proxy:3128'
+        assert client.retry_handlers == [retry_handler]
+
+
+class TestWarmPathOverhead:
+    """Per-request overhead of the Lambda adapter path."""
+
+    def test_unsigned_request_rejected(self, bolt_app):
+        event = _signed_event(COMMAND_BODY)
+        event['headers']['x-slack-signature'] = 'v0=' + '0' * 64
+        assert SlackRequestHandler(bolt_app).handle(event, LambdaContext())['statusCode'] == 401
+
+    def test_warm_handler_serves_repeated_requests(self, bolt_app):
+        context = LambdaContext()
+        event = _signed_event(COMMAND_BODY)
+        warm_handler = SlackRequestHandler(bolt_app)
+        for _ in range(3):
+            assert warm_handler.handle(dict(event), context)['body'] == 'pong'
+
+    @pytest.mark.benchmark
+    def test_per_request_overhead(self, bolt_app):
+        context = LambdaContext()
+        event = _signed_event(COMMAND_BODY)
+        warm_handler = SlackRequestHandler(bolt_app)
+        assert warm_handler.handle(dict(event), context)['body'] == 'pong'
+
+        def measure(handle, runs=300):
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                response = handle(dict(event), context)
+                timings.append((time.perf_counter() - start) * 1000)
+                assert response['statusCode'] == 200
+            timings.sort()
+            return timings[len(timings) // 2], timings[int(len(timings) * 0.99)]
+
+        # Previous behaviour: a new adapter for every invocation
+        cold_p50, cold_p99 = measure(lambda e, c: SlackRequestHandler(bolt_app).handle(e, c))
+        warm_p50, warm_p99 = measure(warm_handler.handle)
+        assert warm_p99 < WARM_P99_BUDGET_MS, (
+            f"warm p50={warm_p50:.3f}ms p99={warm_p99:.3f}ms | "
+            f"new handler per request p50={cold_p50:.3f}ms p99={cold_p99:.3f}ms")
@@ -0,0 +1,186 @@
+"""
+Tests for the price history store and the vectorized risk engine.
+"""
+
+import os
+import sys
+from datetime import date, timedelta
+from decimal import Decimal
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.price_history import PriceHistoryStore, PriceHistoryError
+from services.risk_engine import RiskEngine
+
+
+def _synthetic_history(days: int = 300, seed: int = 7):
+    """Generate correlated daily closes for three stocks and a benchmark."""
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0004, 0.01, days)
+    idio = rng.normal(0.0, 0.008, (days, 3))
+    betas = np.array([1.2, 0.8, 1.0])
+    returns = np.column_stack([market[:, None] * betas + idio, market])
+    closes = 100.0 * np.cumprod(1.0 + returns, axis=0)
+    start = date(2024, 1, 1)
+    dates = [start + timedelta(days=i) for i in range(days)]
+    return dates, ['AAPL', 'MSFT', 'TSLA', 'SPY'], closes
+
+
+@pytest.fixture
+def store(tmp_path):
+    dates, symbols, closes = _synthetic_history()
+    history = PriceHistoryStore(str(tmp_path / 'history'))
+    history.write(dates, symbols, closes)
+    return history
+
+
+class TestPriceHistoryStore:
+    """Tests for the memory-mapped close store."""
+
+    def test_write_maps_columnar_files(self, store):
+        assert store.is_loaded
+        assert store.symbols == ['AAPL', 'MSFT', 'TSLA', 'SPY']
+        assert isinstance(store._closes, np.memmap)
+        assert store._closes.flags['F_CONTIGUOUS']
+
+    def test_reload_from_disk(self, store):
+        reopened = PriceHistoryStore(store.directory)
+        assert reopened.load()
+        assert reopened.last_date == store.last_date
+
+    def test_rewrite_leaves_mapped_dataset_intact(self, store):
+        reader = PriceHistoryStore(store.directory)
+        reader.load()
+        mapped = np.array(reader._closes)
+
+        dates, symbols, closes = _synthetic_history(seed=11)
+        store.write(dates, symbols, closes)
+
+        np.testing.assert_array_equal(reader._closes, mapped)
+        assert not np.array_equal(store._closes, mapped)
+        assert not [name for name in os.listdir(store.directory) if name.endswith('.tmp')]
+
+    def test_get_closes_aligns_unknown_symbols(self, store):
+        dates, closes = store.get_closes(['MSFT', 'ZZZZ'], lookback=10)
+        assert closes.shape == (10, 2)
+        assert np.isnan(closes[:, 1]).all()
+        assert not np.isnan(closes[:, 0]).any()
+        assert len(dates) == 10
+
+    def test_import_long_csv(self, tmp_path):
+        csv_path = tmp_path / 'closes.csv'
+        csv_path.write_text(
+            "date,symbol,close\n"
+            "2024-01-02,AAPL,185.0\n"
+            "2024-01-02,SPY,470.0\n"
+            "2024-01-03,AAPL,184.0\n"
+            "2024-01-03,SPY,468.5\n"
+        )
+        history = PriceHistoryStore(str(tmp_path / 'long'))
+        history.import_csv(str(csv_path))
+
+        _, closes = history.get_closes(['AAPL', 'SPY'], lookback=5)
+        np.testing.assert_allclose(closes, [[185.0, 470.0], [184.0, 468.5]])
+        assert history.last_date == date(2024, 1, 3)
+
+    def test_import_wide_csv_with_gaps(self, tmp_path):
+        csv_path = tmp_path / 'wide.csv'
+        csv_path.write_text(
+            "date,AAPL,MSFT\n"
+            "2024-01-03,184.0,\n"
+            "2024-01-02,185.0,370.0\n"
+        )
+        history = PriceHistoryStore(str(tmp_path / 'wide'))
+        history.import_csv(str(csv_path))
+
+        _, closes = history.get_closes(['AAPL', 'MSFT'], lookback=5)
+        assert closes[0, 0] == 185.0
+        assert np.isnan(closes[1, 1])
+
+    def test_rejects_mismatched_shape(self, tmp_path):
+        history = PriceHistoryStore(str(tmp_path / 'bad'))
+        with pytest.raises(PriceHistoryError):
+            history.write([date(2024, 1, 1)], ['AAPL', 'MSFT'], np.ones((1, 3)))
+
+
+class TestRiskEngine:
+    """Tests for VaR, beta, volatility and correlation."""
+
+    def test_matches_reference_calculation(self, store):
+        engine = RiskEngine(store, confidence=0.95, lookback_days=252)
+        exposures = {'AAPL': 50000.0, 'MSFT': -20000.0}
+        metrics = engine.compute(exposures, benchmark_symbol='SPY')
+
+        _, closes = store.get_closes(['AAPL', 'MSFT', 'SPY'], 253)
+        returns = closes[1:] / closes[:-1] - 1.0
+        weights = np.array([50000.0, -20000.0])
+        pnl = returns[:, :2] @ weights
+        cov = np.cov(returns[:, :2], rowvar=False)
+
+        expected_hist = -np.quantile(pnl, 0.05)
+        expected_param = NormalDist().inv_cdf(0.95) * np.sqrt(weights @ cov @ weights)
+
+        assert metrics.observations == 252
+        assert metrics.historical_var == pytest.approx(expected_hist)
+        assert metrics.parametric_var == pytest.approx(expected_param)
+        assert metrics.gross_exposure == pytest.approx(70000.0)
+        assert metrics.net_exposure == pytest.approx(30000.0)
+        assert np.allclose(np.diag(metrics.correlation_matrix), 1.0)
+
+    def test_benchmark_has_unit_beta(self, store):
+        engine = RiskEngine(store)
+        metrics = engine.compute({'SPY': 10000.0}, benchmark_symbol='SPY')
+        assert metrics.beta == pytest.approx(1.0)
+        assert metrics.position_betas['SPY'] == pytest.approx(1.0)
+
+    def test_recovers_position_betas(self, store):
+        engine = RiskEngine(store)
+        metrics = engine.compute({'AAPL': 1.0, 'MSFT': 1.0}, benchmark_symbol='SPY')
+        assert metrics.position_betas['AAPL'] > metrics.position_betas['MSFT']
+        assert 0 < metrics.volatility < 1
+
+    def test_horizon_scaling(self, store):
+        one_day = RiskEngine(store, horizon_days=1).compute({'AAPL': 1000.0})
+        ten_day = RiskEngine(store, horizon_days=10).compute({'AAPL': 1000.0})
+        assert ten_day.parametric_var == pytest.approx(one_day.parametric_var * np.sqrt(10))
+
+    def test_statistics_cached_per_trading_day(self, store):
+        engine = RiskEngine(store)
+        engine.compute({'AAPL': 1000.0, 'TSLA': 500.0})
+        first = engine.get_statistics(('AAPL', 'TSLA'), 'SPY')
+        engine.compute({'AAPL': 9000.0, 'TSLA': -500.0})
+        assert engine.get_statistics(('AAPL', 'TSLA'), 'SPY') is first
+
+        # Appending a new trading day invalidates the cache
+        dates, symbols, closes = _synthetic_history(days=301)
+        store.write(dates, symbols, closes)
+        assert engine.get_statistics(('AAPL', 'TSLA'), 'SPY') is not first
+
+    def test_rewriting_same_days_invalidates_cache(self, store, tmp_path):
+        engine = RiskEngine(store)
+        first = engine.get_statistics(('AAPL', 'TSLA'), 'SPY')
+
+        # Corrected closes for the same trading days
+        dates, symbols, closes = _synthetic_history(seed=8)
+        store.write(dates, symbols, closes)
+        corrected = engine.get_statistics(('AAPL', 'TSLA'), 'SPY')
+        assert corrected is not first and store.last_date == dates[-1]
+
+        csv_path = tmp_path / 'closes.csv'
+        csv_path.write_text('date,' + ','.join(symbols) + '\n' + ''.join(
+            f"{day.isoformat()},{','.join(str(v) for v in row)}\n" for day, row in zip(dates, closes * 2)))
+        store.import_csv(str(csv_path))
+        assert engine.get_statistics(('AAPL', 'TSLA'), 'SPY') is not corrected
+
+    def test_unknown_symbols_reported(self, store):
+        metrics = RiskEngine(store).compute({'AAPL': 1000.0, 'NOPE': 500.0})
+        assert metrics.symbols == ['AAPL']
+        assert metrics.missing_symbols == ['NOPE']
+
+    def test_no_history_returns_none(self, tmp_path):
+        engine = RiskEngine(PriceHistoryStore(str(tmp_path / 'empty')))
+        assert engine.compute({'AAPL': Decimal('1000')}) is None
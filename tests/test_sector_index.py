@@ -0,0 +1,172 @@
+"""
+Tests for the sector classification index and incremental exposure tracker.
+"""
+
+import os
+import sys
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.portfolio import Portfolio, Position
+from services.sector_index import SectorIndex, UNCLASSIFIED
+
+
+@pytest.fixture
+def index(tmp_path):
+    csv_path = tmp_path / 'sectors.csv'
+    csv_path.write_text(
+        "symbol,sector,industry,market_cap\n"
+        "AAPL,Technology,Consumer Electronics,3400000000000\n"
+        "MSFT,Technology,Software,3100000000000\n"
+        "XOM,Energy,Oil & Gas,450000000000\n"
+        "JNJ,Healthcare,Pharmaceuticals,5000000000\n"
+        "SPY,Funds,Index ETF,\n"
+    )
+    sector_index = SectorIndex()
+    sector_index.load_csv(str(csv_path))
+    return sector_index
+
+
+def _portfolio(*holdings):
+    portfolio = Portfolio(user_id='U123', portfolio_id='P1', name='Test')
+    for symbol, quantity, price in holdings:
+        portfolio.add_position(Position(
+            user_id='U123',
+            symbol=symbol,
+            quantity=quantity,
+            average_cost=Decimal(str(price)),
+            current_price=Decimal(str(price))
+        ))
+    return portfolio
+
+
+class TestSectorIndex:
+    """Tests for classification lookups."""
+
+    def test_load_and_classify(self, index):
+        assert len(index) == 5
+        classification = index.classify('aapl')
+        assert classification.sector == 'Technology'
+        assert classification.industry == 'Consumer Electronics'
+        assert classification.market_cap_bucket == 'mega'
+        assert index.classify('JNJ').market_cap_bucket == 'mid'
+
+    def test_blank_market_cap_and_unknown_symbol(self, index):
+        assert index.classify('SPY').market_cap is None
+        unknown = index.classify('ZZZZ')
+        assert unknown.sector == UNCLASSIFIED
+        assert index.get_sector('ZZZZ') == UNCLASSIFIED
+
+    def test_sector_names_are_interned(self, index):
+        assert sorted(index.sectors) == ['Energy', 'Funds', 'Healthcare', 'Technology']
+
+
+class TestSectorExposureTracker:
+    """Tests for incremental sector exposure and concentration checks."""
+
+    def test_rebuild_weights(self, index):
+        portfolio = _portfolio(('AAPL', 100, 200), ('XOM', 100, 100))
+        weights = index.get_tracker(portfolio).get_sector_weights()
+        assert list(weights) == ['Technology', 'Energy']
+        assert weights['Technology'] == pytest.approx(2 / 3)
+
+    def test_check_trade(self, index):
+        tracker = index.get_tracker(_portfolio(('AAPL', 100, 200), ('XOM', 100, 100)))
+
+        buy = tracker.check_trade('MSFT', 10000.0, limit=0.5)
+        assert buy.current_weight == pytest.approx(2 / 3)
+        assert buy.new_weight == pytest.approx(30000 / 40000)
+        assert buy.exceeds_limit
+        assert buy.risk_level == 'high'
+
+        sell = tracker.check_trade('AAPL', -20000.0, limit=0.5)
+        assert sell.new_weight == 0.0
+        assert sell.weight_change == pytest.approx(-2 / 3)
+
+    def test_first_trade_weighed_against_capital(self, index):
+        portfolio = _portfolio()  # $100k cash, no positions
+        tracker = index.get_tracker(portfolio)
+
+        first = tracker.check_trade('AAPL', 10000.0, limit=0.25, capital=float(portfolio.total_value))
+        assert first.current_weight == 0.0
+        assert first.new_weight == pytest.approx(0.10)
+        assert not first.exceeds_limit
+
+        assert tracker.check_trade('AAPL', 30000.0, limit=0.25, capital=100000.0).exceeds_limit
+        assert tracker.check_trade('AAPL', 10000.0, limit=0.25).new_weight == 1.0  # Gross exposure only
+
+    def test_weights_against_capital(self, index):
+        tracker = index.get_tracker(_portfolio(('AAPL', 100, 200), ('XOM', 100, 100)))
+        assert tracker.get_sector_weights(capital=150000.0) == {
+            'Technology': pytest.approx(20000 / 150000), 'Energy': pytest.approx(10000 / 150000)}
+
+    def test_incremental_update_matches_rebuild(self, index):
+        tracker = index.get_tracker(_portfolio(('AAPL', 100, 200)))
+        tracker.update_position('JNJ', 5000.0)
+        tracker.update_position('AAPL', 0)
+        assert tracker.get_sector_weights() == {'Healthcare': pytest.approx(1.0)}
+        assert tracker.gross_exposure == pytest.approx(5000.0)
+
+    def test_tracker_reused_until_portfolio_changes(self, index):
+        portfolio = _portfolio(('AAPL', 100, 200))
+        tracker = index.get_tracker(portfolio)
+        tracker.update_position('XOM', 1000.0)
+
+        assert index.get_tracker(portfolio) is tracker
+        assert 'Energy' in tracker.get_sector_weights()
+
+        portfolio.last_updated += timedelta(seconds=1)
+        assert 'Energy' not in index.get_tracker(portfolio).get_sector_weights()
+
+    def test_fills_and_reprices_update_tracker_in_place(self, index):
+        portfolio = _portfolio(('AAPL', 100, 200))
+        tracker = index.get_tracker(portfolio)
+        tracker.rebuild = Mock(side_effect=AssertionError("rebuilt"))
+
+        portfolio.add_position(Position(user_id='U123', symbol='XOM', quantity=100,
+                                        average_cost=Decimal('100'), current_price=Decimal('100')))
+        portfolio.update_position_price('AAPL', Decimal('300'))
+        portfolio.execute_trade('AAPL', -100, Decimal('300'), 'T1')
+
+        assert index.get_tracker(portfolio) is tracker
+        assert tracker.synced_at == portfolio.last_updated
+        assert tracker.get_sector_weights() == {'Energy': pytest.approx(1.0)}
+        assert tracker.gross_exposure == pytest.approx(10000.0)
+
+    def test_least_recently_used_trackers_dropped(self, index):
+        index.max_trackers = 2
+        portfolios = [Portfolio(user_id='U123', portfolio_id=f"P{i}", name='Test') for i in range(3)]
+        first = index.get_tracker(portfolios[0])
+        index.get_tracker(portfolios[1])
+        assert index.get_tracker(portfolios[0]) is first
+
+        index.get_tracker(portfolios[2])
+        assert list(index._trackers) == ['P0', 'P2']
+
+
+class TestDashboardSectorAnalysis:
+    """The dashboard flags sectors against the risk service's sector limit."""
+
+    def test_flags_use_context_sector_limit(self, index, monkeypatch):
+        from models.user import User, UserProfile, UserRole, UserStatus
+        from ui import dashboard as dashboard_module
+        monkeypatch.setattr(dashboard_module, 'get_sector_index', lambda: index)
+        user = User(user_id='U123', slack_user_id='U123', role=UserRole.EXECUTION_TRADER,
+                    profile=UserProfile(display_name='Trader', email='t@example.com', department='Trading'),
+                    status=UserStatus.ACTIVE)
+        portfolio = _portfolio(('AAPL', 100, 200), ('XOM', 100, 100))  # 20% and 10% of $130k
+
+        def render(**context):
+            blocks = dashboard_module.Dashboard()._build_sector_analysis(
+                dashboard_module.DashboardContext(user=user, portfolio=portfolio, **context))
+            return blocks[0]['text']['text']
+
+        assert '⚠️' not in render()  # 25% default
+        flagged = render(risk_thresholds={'sector_limit': 0.12})
+        assert 'Technology' in flagged and flagged.count('⚠️') == 1
+
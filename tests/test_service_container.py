@@ -0,0 +1,271 @@
+"""
+Tests for dependency-aware concurrent startup in the service container.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.service_container import CircularDependencyError, ServiceContainer, ServiceState
+
+INIT_DELAY = 0.2
+
+
+class SlowService:
+    """Blocking constructor, standing in for network-bound initialization."""
+    delay = INIT_DELAY
+
+    def __init__(self, *dependencies):
+        self.dependencies = dependencies
+        time.sleep(self.delay)
+
+
+class MarketData(SlowService):
+    pass
+
+
+class Alpaca(SlowService):
+    pass
+
+
+class MultiAlpaca(SlowService):
+    pass
+
+
+class RiskAnalysis(SlowService):
+    pass
+
+
+class Database(SlowService):
+    pass
+
+
+class Accounts(SlowService):
+    pass
+
+
+class Hanging(SlowService):
+    delay = 1.0
+
+
+class Broken:
+    def __init__(self):
+        raise RuntimeError('broker unreachable')
+
+
+class NeedsBroken:
+    def __init__(self, broken):
+        self.broken = broken
+
+
+class AsyncInit:
+    def __init__(self):
+        self.loop = None
+
+    async def initialize(self):
+        await asyncio.sleep(0)
+        self.loop = asyncio.get_running_loop()
+
+
+def _timeline(container):
+    return {entry['service']: entry for entry in container.get_service_status()['startup_timeline']}
+
+
+class TestConcurrentStartup:
+    """start_all_services builds a DAG and starts independent services in parallel."""
+
+    @pytest.mark.asyncio
+    async def test_independent_services_start_concurrently(self):
+        container = ServiceContainer()
+        for service_type in (MarketData, Alpaca, MultiAlpaca, RiskAnalysis):
+            container.register(service_type)
+
+        start = time.perf_counter()
+        await container.start_all_services()
+        elapsed = time.perf_counter() - start
+        status = container.get_service_status()
+        await container.stop_all_services()
+
+        assert elapsed < INIT_DELAY * 2  # four 0.2s initializations, not back to back
+        assert status['running_services'] == 4
+        assert all(s['init_duration_ms'] >= INIT_DELAY * 1000 * 0.9 for s in status['services'].values())
+        assert status['startup_duration_ms'] < INIT_DELAY * 2 * 1000
+
+    @pytest.mark.asyncio
+    async def test_dependencies_start_first_and_are_shared(self):
+        container = ServiceContainer()
+        container.register(Accounts, dependencies=[Database], startup_priority=5)
+        container.register(Database, startup_priority=50)
+        container.register(MarketData)
+
+        await container.start_all_services()
+        accounts, database_service = container.get(Accounts), container.get(Database)
+        await container.stop_all_services()
+
+        timeline = _timeline(container)
+        database = timeline['Database']
+        assert timeline['Accounts']['dependencies'] == ['Database']
+        assert timeline['Accounts']['start_offset_ms'] >= database['start_offset_ms'] + database['duration_ms'] - 1
+        assert timeline['MarketData']['start_offset_ms'] < database['duration_ms']
+        assert accounts.dependencies[0] is database_service
+
+    @pytest.mark.asyncio
+    async def test_timeout_and_failure_skip_dependents_only(self):
+        container = ServiceContainer(startup_timeout=5.0)
+        container.register(Hanging, startup_timeout=0.05)
+        container.register(Accounts, dependencies=[Hanging])
+        container.register(Broken)
+        container.register(NeedsBroken, dependencies=[Broken])
+        container.register(MarketData)
+
+        await container.start_all_services()
+        await container.stop_all_services()
+
+        timeline = _timeline(container)
+        assert timeline['Hanging']['status'] == 'timeout'
+        assert timeline['Accounts']['status'] == 'skipped'
+        assert timeline['Broken']['status'] == 'failed'
+        assert 'broker unreachable' in timeline['Broken']['error']
+        assert timeline['NeedsBroken']['status'] == 'skipped'
+        assert timeline['MarketData']['status'] == 'running'
+
+    @pytest.mark.asyncio
+    async def test_cycle_rejected_before_starting(self):
+        container = ServiceContainer()
+        container.register(Database, dependencies=[Accounts])
+        container.register(Accounts, dependencies=[Database])
+
+        with pytest.raises(CircularDependencyError):
+            await container.start_all_services()
+        assert container.get_service_status()['services'] == {}
+
+    @pytest.mark.asyncio
+    async def test_async_initialize_runs_on_application_loop(self):
+        container = ServiceContainer()
+        container.register(AsyncInit)
+
+        await container.start_all_services()
+        service = container.get(AsyncInit)
+        await container.stop_all_services()
+
+        assert service.loop is asyncio.get_running_loop()
+
+
+class TestConcurrentGet:
+    """Lazy get() from many threads constructs a service once."""
+
+    def test_single_construction_under_contention(self):
+        container = ServiceContainer()
+        container.register(Database)
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(container.get(Database))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(r) for r in results}) == 1
+        assert container.get_service_status()['services']['Database']['state'] == ServiceState.RUNNING.value
+
+
+
+class Probe:
+    """Service whose sync health check blocks, like Postgres ``SELECT 1``."""
+
+    def __init__(self):
+        self.checks = 0
+
+    def health_check(self, delay):
+        self.checks += 1
+        time.sleep(delay)
+        return True
+
+
+class SlowProbe(Probe):
+    pass
+
+
+class FailingProbe(Probe):
+    pass
+
+
+async def _start_unmonitored(container):
+    """Start services but drive health check rounds by hand."""
+    await container.start_all_services()
+    await container._stop_health_monitoring()
+
+
+class TestHealthChecks:
+    """Health checks run concurrently off the event loop and are served from a cache."""
+
+    @pytest.mark.asyncio
+    async def test_checks_run_concurrently_off_the_loop(self):
+        container = ServiceContainer()
+        for service_type in (Probe, SlowProbe, FailingProbe):
+            container.register(service_type, health_check=lambda s: s.health_check(INIT_DELAY))
+        await _start_unmonitored(container)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        snapshot = await container.refresh_health()
+        elapsed = time.perf_counter() - start
+        ticker_task.cancel()
+        await container.stop_all_services()
+
+        assert elapsed < INIT_DELAY * 2  # three 0.2s checks, not back to back
+        assert ticks >= 5  # the loop kept running while the checks blocked
+        assert snapshot['healthy'] and not snapshot['stale']
+        assert all(s['latency_ms'] >= INIT_DELAY * 1000 * 0.9 for s in snapshot['services'].values())
+
+    @pytest.mark.asyncio
+    async def test_deadline_marks_unhealthy_without_stacking_checks(self):
+        container = ServiceContainer()
+        container.register(SlowProbe, health_check=lambda s: s.health_check(0.5), health_check_timeout=0.05)
+        container.register(FailingProbe, health_check=lambda s: False)
+        await _start_unmonitored(container)
+
+        start = time.perf_counter()
+        first = await container.refresh_health()
+        second = await container.refresh_health()
+        elapsed = time.perf_counter() - start
+        probe = container.get(SlowProbe)
+        await container.stop_all_services()
+
+        assert elapsed < 0.3
+        assert not first['healthy']
+        assert 'deadline' in first['services']['SlowProbe']['error']
+        assert 'still running' in second['services']['SlowProbe']['error']
+        assert probe.checks == 1
+        assert first['services']['FailingProbe']['error'] == 'Health check returned unhealthy'
+
+    @pytest.mark.asyncio
+    async def test_snapshot_reads_cache_only(self):
+        container = ServiceContainer()
+        container.register(Probe, health_check=lambda s: s.health_check(0))
+        await _start_unmonitored(container)
+        assert container.get_health_snapshot()['stale']  # no round has run yet
+
+        await container.refresh_health()
+        probe = container.get(Probe)
+        for _ in range(100):
+            snapshot = container.get_health_snapshot()
+        assert probe.checks == 1
+        assert snapshot['services']['Probe']['healthy'] and not snapshot['stale']
+
+        container._last_health_run -= container._health_check_interval * 3
+        assert container.get_health_snapshot()['stale']
+        await container.stop_all_services()
@@ -0,0 +1,372 @@
+"""
+Tests for the cross-worker shared cache tier, including several worker processes sharing it.
+"""
+
+import asyncio
+import fnmatch
+import multiprocessing
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.settings import SharedCacheConfig
+from services.shared_cache import LocalCacheBackend, RedisCacheBackend, SharedCache, SharedSetIndex
+from utils import codec
+
+SYMBOLS = [f"S{i:03d}" for i in range(24)]
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / 'shared-cache.sqlite3')
+
+
+def _workers(path, count=2, **kwargs):
+    """Caches of ``count`` simulated workers, each with its own backend connection to one file."""
+    backends = [LocalCacheBackend(path, poll_interval_seconds=60) for _ in range(count)]
+    caches = [SharedCache('query', ttl_seconds=60, backend=backend, l1_ttl_seconds=30, **kwargs)
+              for backend in backends]
+    return backends, caches
+
+
+class TestSharedCache:
+    """L1 copies in front of one L2, kept coherent by invalidations."""
+
+    def test_entry_written_by_one_worker_read_by_another(self, cache_path):
+        _, (first, second) = _workers(cache_path)
+        first['trades:U1'] = ([Decimal('1.50'), b'\xb7raw'], 1700000000.0)
+
+        assert second['trades:U1'] == [[Decimal('1.50'), b'\xb7raw'], 1700000000.0]
+        assert second.stats()['l2_hits'] == 1
+        assert second['trades:U1'] and second.stats()['l1_hits'] == 1
+
+    def test_writes_and_deletes_invalidate_other_workers(self, cache_path):
+        (_, second_backend), (first, second) = _workers(cache_path)
+        first['positions:U1'] = 'v1'
+        assert second['positions:U1'] == 'v1'
+
+        first['positions:U1'] = 'v2'
+        assert second['positions:U1'] == 'v1'  # Until the invalidation arrives
+        second_backend.poll()
+        assert second['positions:U1'] == 'v2'
+
+        del first['positions:U1']
+        second_backend.poll()
+        assert 'positions:U1' not in second and 'positions:U1' not in first
+
+    def test_discard_matching_reaches_every_worker(self, cache_path):
+        (_, second_backend), (first, second) = _workers(cache_path)
+        keys = ('get_user_trades:user_id:U1:limit:50', 'get_user_trades:user_id:U2', 'get_trade:U1')
+        for key in keys:
+            first[key] = 1
+        second_backend.poll()
+        for key in keys:
+            second[key]  # Copy into the second worker's L1
+
+        first.discard_matching('get_user_trades:user_id:U1')
+        second_backend.poll()
+        assert sorted(second) == ['get_trade:U1', 'get_user_trades:user_id:U2']
+        assert 'get_user_trades:user_id:U1:limit:50' not in second
+
+    def test_l1_copy_rereads_l2_after_its_ttl(self, cache_path):
+        (_, second_backend), (first, second) = _workers(cache_path)
+        second.l1_ttl_seconds = 0.0
+        first['k'] = 1
+        assert second['k'] == 1
+        first.backend.set('query:k', codec.dumps(2), 60)  # A change whose invalidation was missed
+
+        assert first['k'] == 1 and second['k'] == 2
+
+    def test_unencodable_values_stay_with_their_worker(self, cache_path):
+        _, (first, second) = _workers(cache_path)
+        session = Mock()
+        first['session'] = session
+
+        assert first['session'] is session
+        assert 'session' not in second
+
+    def test_l1_is_bounded_and_l2_keeps_evicted_entries(self, cache_path):
+        _, (first,) = _workers(cache_path, count=1, max_entries=2)
+        for key in ('a', 'b', 'c'):
+            first[key] = key
+
+        assert sorted(first) == ['b', 'c']
+        assert first['a'] == 'a' and sorted(first) == ['a', 'c']
+
+    def test_clear_keeps_other_workers_entries(self, cache_path):
+        _, (first, second) = _workers(cache_path)
+        first['k'] = 1
+        first.clear()
+
+        assert len(first) == 0 and second['k'] == 1
+
+    def test_without_backend_is_a_plain_dict(self):
+        cache = SharedCache('quote', ttl_seconds=60)
+        cache['AAPL'] = 1
+
+        assert cache['AAPL'] == 1 and list(cache.items()) == [('AAPL', 1)]
+        assert cache.get('MSFT') is None and cache.pop('AAPL') == 1
+        with pytest.raises(KeyError):
+            del cache['AAPL']
+
+    def test_backend_failure_falls_back_to_l1(self):
+        backend = Mock(kind='redis')
+        backend.get.side_effect = backend.set.side_effect = backend.publish.side_effect = OSError('down')
+        cache = SharedCache('quote', ttl_seconds=60, backend=backend, l1_ttl_seconds=30)
+
+        cache['AAPL'] = 1
+        assert cache['AAPL'] == 1 and cache.get('MSFT') is None
+
+    def test_async_api_keeps_l2_io_off_the_event_loop(self, cache_path):
+        (first_backend, _), (first, second) = _workers(cache_path)
+        loop_threads, io_threads = [], []
+        read = first_backend.get
+
+        def recording_read(key):
+            io_threads.append(threading.get_ident())
+            return read(key)
+
+        first_backend.get = recording_read
+
+        async def run():
+            loop_threads.append(threading.get_ident())
+            await second.aset('positions:U1', 'v1')
+            assert await first.aget('positions:U1') == 'v1'  # Read from L2
+            assert await first.aget('positions:U1') == 'v1'  # L1 copy, no read
+            assert await first.aget('missing', 'default') == 'default'
+            await second.adiscard_matching('U1')
+            assert await second.aget('positions:U1') is None
+
+        asyncio.run(run())
+
+        assert len(io_threads) == 2 and loop_threads[0] not in io_threads
+        assert first.stats()['l1_hits'] == 1 and first.stats()['l2_hits'] == 1
+
+    def test_backend_selection(self):
+        assert SharedCacheConfig().resolved_backend == 'none'
+        assert SharedCacheConfig(redis_enabled=True).resolved_backend == 'redis'
+        assert SharedCacheConfig(backend='local', redis_enabled=True).resolved_backend == 'local'
+        with pytest.raises(ValueError):
+            SharedCacheConfig(backend='memcached')
+
+
+class TestSharedSetIndex:
+    """Set members added by several workers at once are all kept."""
+
+    async def _add_concurrently(self, indexes):
+        await asyncio.gather(*(index.add('U1', f"session-{i}-{n}")
+                               for i, index in enumerate(indexes) for n in range(10)))
+
+    def test_concurrent_adds_from_workers_are_kept(self, cache_path):
+        backends = [LocalCacheBackend(cache_path, poll_interval_seconds=60) for _ in range(3)]
+        indexes = [SharedSetIndex('user_sessions', ttl_seconds=60, backend=backend) for backend in backends]
+        asyncio.run(self._add_concurrently(indexes))
+
+        assert len(asyncio.run(indexes[0].members('U1'))) == 30
+        asyncio.run(indexes[1].remove('U1', 'session-0-0'))
+        assert 'session-0-0' not in asyncio.run(indexes[2].members('U1'))
+        assert asyncio.run(indexes[2].members('U2')) == []
+
+    def test_redis_sets(self):
+        client = FakeRedisClient()
+        indexes = [SharedSetIndex('user_sessions', ttl_seconds=60, backend=RedisCacheBackend(client))
+                   for _ in range(2)]
+        asyncio.run(self._add_concurrently(indexes))
+
+        assert len(client.values['user_sessions:U1']) == 20
+        asyncio.run(indexes[0].remove('U1', 'session-1-0'))
+        assert asyncio.run(indexes[1].members('U1')) == sorted(
+            f"session-{i}-{n}" for i in range(2) for n in range(10) if (i, n) != (1, 0))
+
+    def test_without_backend(self):
+        index = SharedSetIndex('user_sessions', ttl_seconds=60)
+        asyncio.run(index.add('U1', 'b'))
+        asyncio.run(index.add('U1', 'a'))
+        asyncio.run(index.remove('U1', 'b'))
+
+        assert asyncio.run(index.members('U1')) == ['a'] and index._local == {'U1': {'a'}}
+
+
+class FakePubSub:
+    def __init__(self):
+        self.messages = queue.Queue()
+
+    def subscribe(self, channel):
+        pass
+
+    def get_message(self, timeout):
+        try:
+            return self.messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        pass
+
+
+class FakeRedisClient:
+    """One Redis shared by every backend built on it."""
+
+    def __init__(self):
+        self.values = {}
+        self.subscribers = []
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def setex(self, key, seconds, value):
+        self.values[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    def sadd(self, key, member):
+        self.values.setdefault(key, set()).add(member.encode())
+
+    def srem(self, key, member):
+        self.values.get(key, set()).discard(member.encode())
+
+    def smembers(self, key):
+        return set(self.values.get(key, ()))
+
+    def expire(self, key, seconds):
+        pass
+
+    def scan_iter(self, match, count):
+        pattern = re.sub(r'\\(.)', r'[\1]', match)  # Redis escapes with a backslash, fnmatch with []
+        return [key for key in self.values if fnmatch.fnmatchcase(key, pattern)]
+
+    def publish(self, channel, message):
+        for pubsub in self.subscribers:
+            pubsub.messages.put({'type': 'message', 'data': message.encode()})
+
+    def pubsub(self, ignore_subscribe_messages):
+        pubsub = FakePubSub()
+        self.subscribers.append(pubsub)
+        return pubsub
+
+    def close(self):
+        pass
+
+
+class TestRedisBackend:
+    """Redis holds the entries; invalidations travel over one pub/sub channel."""
+
+    def test_entries_and_invalidations(self):
+        client = FakeRedisClient()
+        writer, reader = RedisCacheBackend(client), RedisCacheBackend(client)
+        first = SharedCache('dashboard', ttl_seconds=60, backend=writer, l1_ttl_seconds=30)
+        second = SharedCache('dashboard', ttl_seconds=60, backend=reader, l1_ttl_seconds=30)
+        try:
+            first['U1'] = {'blocks': []}
+            assert codec.loads(client.values['dashboard:U1']) == {'blocks': []}
+            assert second['U1'] == {'blocks': []}
+
+            first.discard('U1')
+            deadline = time.monotonic() + 5
+            while 'U1' in second._local and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert 'U1' not in second._local and 'U1' not in second
+        finally:
+            writer.close()
+            reader.close()
+
+    def test_pattern_delete_escapes_glob_characters(self):
+        client = FakeRedisClient()
+        client.values = {'query:get_trade:[U1]': b'', 'query:get_trade:xU1]': b''}
+        RedisCacheBackend(client).delete_matching('query:', '[U1]')
+
+        assert list(client.values) == ['query:get_trade:xU1]']
+
+
+def _worker(index, barrier, results, session_ids):
+    """One app worker process: looks up quotes and checks sessions through the real services."""
+    from models.user import Permission, User, UserProfile, UserRole, UserStatus
+    from services.auth import AuthService
+    from services.market_data import MarketDataService, MarketQuote
+
+    async def run():
+        market_data = MarketDataService()
+        await market_data.initialize()  # Attaches the shared tier when the quote Redis is absent
+        auth = AuthService(database_service=None, slack_client=object())
+        hits = lookups = 0
+        try:
+            for symbol in random.Random(index).sample(SYMBOLS, len(SYMBOLS)):
+                lookups += 1
+                if await market_data._get_cached_quote(symbol) is not None:
+                    hits += 1
+                else:
+                    await asyncio.sleep(0.005)  # Upstream fetch
+                    await market_data.warm_cache(MarketQuote(symbol=symbol, current_price=Decimal('100')))
+
+            barrier.wait()
+            if index == 0:
+                user = User(user_id=str(uuid.uuid4()), slack_user_id='U0', role=UserRole.EXECUTION_TRADER,
+                            profile=UserProfile(display_name='Trader', email='t@example.com',
+                                                department='Trading'), status=UserStatus.ACTIVE)
+                session = await auth._create_or_update_session(user, 'T1', 'C1')
+                session_ids.put(session.session_id)
+                session_ids.put(session.session_id)
+            barrier.wait()
+            seen = after_logout = None
+            if index > 0:
+                session = await auth.get_session(session_ids.get(timeout=10))
+                seen = session is not None and Permission.EXECUTE_TRADES in session.permissions
+            barrier.wait()
+            if index == 1 and seen:
+                await auth._cleanup_session(session.session_id)  # Logged out on this worker
+            barrier.wait()
+            if index == 2:
+                time.sleep(0.5)  # Two invalidation polls
+                after_logout = seen and await auth.get_session(session.session_id) is not None
+        finally:
+            await market_data.cleanup()
+        results.put((index, hits, lookups, seen, after_logout))
+
+    asyncio.run(run())
+
+
+class TestMultipleWorkers:
+    """Quote hit rate and sessions across worker processes, with and without the shared tier."""
+
+    WORKERS = 3
+
+    def _run(self, monkeypatch, tmp_path, backend):
+        monkeypatch.setenv('SHARED_CACHE_BACKEND', backend)
+        monkeypatch.setenv('SHARED_CACHE_PATH', str(tmp_path / f'{backend}.sqlite3'))
+        monkeypatch.setenv('SHARED_CACHE_POLL_SECONDS', '0.1')
+        context = multiprocessing.get_context('spawn')
+        barrier, results, session_ids = context.Barrier(self.WORKERS), context.Queue(), context.Queue()
+        workers = [context.Process(target=_worker, args=(i, barrier, results, session_ids))
+                   for i in range(self.WORKERS)]
+        for worker in workers:
+            worker.start()
+        outcome = sorted(results.get(timeout=120) for _ in workers)
+        for worker in workers:
+            worker.join(timeout=10)
+        return outcome
+
+    def test_workers_share_quotes_and_sessions(self, monkeypatch, tmp_path):
+        per_process = self._run(monkeypatch, tmp_path, 'none')
+        shared = self._run(monkeypatch, tmp_path, 'local')
+
+        assert all(hits == 0 for _i, hits, _lookups, _seen, _after in per_process)
+        shared_fetches = sum(lookups - hits for _i, hits, lookups, _seen, _after in shared)
+        assert shared_fetches < 2 * len(SYMBOLS), f"{shared_fetches} upstream fetches for {len(SYMBOLS)} symbols"
+
+        # A session created on worker 0 is valid on the others until worker 1 logs it out
+        assert [seen for _i, _h, _l, seen, _after in per_process[1:]] == [False, False]
+        assert [seen for _i, _h, _l, seen, _after in shared[1:]] == [True, True]
+        assert shared[2][4] is False
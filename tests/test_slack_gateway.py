@@ -0,0 +1,209 @@
+"""
+Tests for the outbound Slack gateway: pacing, Retry-After retries, priorities and
+listener routing, against the local Slack stand-in from the load-test harness.
+"""
+
+import os
+import sys
+import threading
+import time
+from urllib.parse import urlencode
+
+import pytest
+from slack_bolt import BoltRequest
+from slack_bolt.authorization import AuthorizeResult
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.slack_response import SlackResponse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bolt_app import ProfiledApp, gateway_client_middleware
+from config.settings import SlackGatewayConfig
+from services.metrics import MetricsRegistry
+from services.slack_gateway import (
+    GatewayWebClient, SlackGateway, SlackPriority, _current_priority, request_priority
+)
+from tests.load.stubs import FaultProfile, SlackStub
+
+
+@pytest.fixture
+def slack_stub():
+    stub = SlackStub(seed=1).start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def make_gateway(slack_stub):
+    gateways = []
+
+    def make(**overrides):
+        gateway = SlackGateway(SlackGatewayConfig(**overrides), registry=MetricsRegistry(),
+                               token='xoxb-test', base_url=f"{slack_stub.url}/api/")
+        gateways.append(gateway)
+        return gateway
+
+    yield make
+    for gateway in gateways:
+        gateway.stop()
+
+
+def _view(text):
+    return {'type': 'modal', 'title': {'type': 'plain_text', 'text': text}, 'blocks': []}
+
+
+class TestGatewayClient:
+    """GatewayWebClient is a drop-in WebClient."""
+
+    def test_calls_return_sync_responses(self, make_gateway, slack_stub):
+        gateway = make_gateway()
+        client = GatewayWebClient(token='xoxb-test', base_url=f"{slack_stub.url}/api/", gateway=gateway)
+
+        response = client.views_update(view_id='V123', view=_view('Quote'))
+        ephemeral = client.chat_postEphemeral(channel='C1', user='U1', text='filled')
+
+        assert isinstance(response, SlackResponse)
+        assert response['view']['id'] == 'V123' and ephemeral['channel'] == 'C1'
+        assert gateway.latency.snapshot('views.update').count == 1
+        assert slack_stub.get_stats()['by_endpoint'] == {'views.update': 1, 'chat.postEphemeral': 1}
+
+    def test_disabled_gateway_sends_directly(self, make_gateway, slack_stub):
+        gateway = make_gateway(enabled=False)
+        client = GatewayWebClient(token='xoxb-test', base_url=f"{slack_stub.url}/api/", gateway=gateway)
+
+        assert client.users_info(user='U1')['user']['id'] == 'U1'
+        assert gateway.get_status()['methods'] == {}
+
+
+class TestRateLimiting:
+    """Token buckets and Retry-After handling."""
+
+    def test_bucket_paces_bursts(self, make_gateway):
+        # views.update is tier 4 (100/min); scaled to 10/s with a one-call burst
+        gateway = make_gateway(rate_scale=6, burst_seconds=0.1)
+        start = time.perf_counter()
+        futures = [gateway.submit('views.update', None, None, {'json': {'view_id': f"V{i}"}}) for i in range(5)]
+        for future in futures:
+            future.result(timeout=5)
+
+        assert time.perf_counter() - start >= 0.35
+        assert gateway.queue_wait.snapshot('views.update', 'normal').count == 5
+
+    def test_retry_after_honoured_then_succeeds(self, make_gateway, slack_stub):
+        gateway = make_gateway()
+        slack_stub.faults = FaultProfile(error_rate=1.0, error_status=429)
+        threading.Timer(0.2, lambda: setattr(slack_stub, 'faults', FaultProfile())).start()
+
+        start = time.perf_counter()
+        response = gateway.call_sync('chat.postEphemeral', json={'channel': 'C1', 'user': 'U1', 'text': 'hi'})
+
+        assert response['ok'] and time.perf_counter() - start >= 0.9  # stub sends Retry-After: 1
+        assert gateway.rate_limited.value('chat.postEphemeral') == 1
+        assert slack_stub.get_stats()['requests'] == 2
+
+    def test_gives_up_after_max_retries(self, make_gateway, slack_stub):
+        gateway = make_gateway(max_retries=0)
+        slack_stub.faults = FaultProfile(error_rate=1.0, error_status=429)
+        client = GatewayWebClient(token='xoxb-test', base_url=f"{slack_stub.url}/api/", gateway=gateway)
+
+        with pytest.raises(SlackApiError) as error:
+            client.views_open(trigger_id='t', view=_view('Trade'))
+
+        assert error.value.response.status_code == 429 and error.value.response['error'] == 'ratelimited'
+        assert gateway.errors.value('views.open', 'ratelimited') == 1
+        assert gateway.get_status()['methods']['views.open']['paused_for_seconds'] > 0
+
+
+class TestTriggerDeadlines:
+    """Calls holding a trigger_id never queue, and sync callers give up before Slack's deadlines."""
+
+    def test_trigger_bound_calls_skip_an_empty_bucket(self, make_gateway, slack_stub):
+        # views.open scaled to one call a minute: queued calls would wait far past the trigger's 3s
+        gateway = make_gateway(rate_scale=0.01, burst_seconds=1)
+        client = GatewayWebClient(token='xoxb-test', base_url=f"{slack_stub.url}/api/", gateway=gateway)
+
+        start = time.perf_counter()
+        for i in range(3):
+            client.views_open(trigger_id=f"t{i}", view=_view('Trade'))
+
+        assert time.perf_counter() - start < 1.5
+        assert slack_stub.get_stats()['by_endpoint'] == {'views.open': 3}
+
+    def test_trigger_bound_call_is_not_retried_after_429(self, make_gateway, slack_stub):
+        gateway = make_gateway(max_retries=3)
+        slack_stub.faults = FaultProfile(error_rate=1.0, error_status=429)
+
+        start = time.perf_counter()
+        with pytest.raises(SlackApiError):
+            gateway.call_sync('views.open', json={'trigger_id': 't', 'view': _view('Trade')})
+
+        assert time.perf_counter() - start < 0.9  # Not held for the stub's Retry-After: 1
+        assert slack_stub.get_stats()['requests'] == 1
+
+    def test_sync_wait_is_capped(self, make_gateway):
+        gateway = make_gateway(rate_scale=0.01, burst_seconds=1, call_timeout_seconds=0.3)
+        gateway.call_sync('views.update', json={'view_id': 'V1'})  # Spends the only token
+
+        start = time.perf_counter()
+        with pytest.raises(TimeoutError):
+            gateway.call_sync('views.update', json={'view_id': 'V2'})
+
+        assert time.perf_counter() - start < 1.0
+        assert gateway.errors.value('views.update', 'gateway_timeout') == 1
+        assert SlackGatewayConfig().call_timeout_seconds < 3
+
+
+class TestPriorities:
+    """Queued trade confirmations go out before queued quote refreshes."""
+
+    def test_trade_confirmation_overtakes_quote_refreshes(self, make_gateway):
+        gateway = make_gateway(rate_scale=6, burst_seconds=0.1)
+        completed = []
+
+        def submit(name, priority):
+            future = gateway.submit('views.update', priority, None, {'json': {'view_id': name}})
+            future.add_done_callback(lambda _: completed.append(name))
+            return future
+
+        futures = [submit(f"quote{i}", SlackPriority.QUOTE_REFRESH) for i in range(3)]
+        futures[0].result(timeout=5)  # The bucket is now empty and the other refreshes are queued
+        futures.append(submit('trade', SlackPriority.TRADE_CONFIRMATION))
+        for future in futures:
+            future.result(timeout=5)
+
+        assert completed == ['quote0', 'trade', 'quote1', 'quote2']
+
+    def test_request_priority_classification(self):
+        def action(action_id):
+            return {'type': 'block_actions', 'actions': [{'action_id': action_id}]}
+
+        assert request_priority({'type': 'view_submission'}) == SlackPriority.TRADE_CONFIRMATION
+        assert request_priority(action('buy_shares')) == SlackPriority.TRADE_CONFIRMATION
+        assert request_priority(action('quick_symbol_aapl')) == SlackPriority.QUOTE_REFRESH
+        assert request_priority(action('shares_input')) == SlackPriority.QUOTE_REFRESH
+        assert request_priority({'command': '/buy'}) == SlackPriority.INTERACTIVE
+        assert request_priority({'type': 'event_callback'}) == SlackPriority.BACKGROUND
+
+    def test_listeners_get_gateway_client_and_request_priority(self):
+        def authorize(enterprise_id, team_id, logger):
+            return AuthorizeResult(enterprise_id=enterprise_id, team_id=team_id,
+                                   bot_token='xoxb-test', bot_id='B1', bot_user_id='UBOT')
+
+        app = ProfiledApp(signing_secret='secret', authorize=authorize, process_before_response=True,
+                          request_verification_enabled=False)
+        app.use(gateway_client_middleware)
+        seen = {}
+
+        @app.command('/buy')
+        def buy(ack, client):
+            seen.update(client=client, priority=_current_priority.get())
+            ack()
+
+        body = urlencode({'command': '/buy', 'text': 'AAPL', 'user_id': 'U1', 'team_id': 'T1',
+                          'channel_id': 'C1', 'trigger_id': 'trigger-1'})
+        response = app.dispatch(BoltRequest(body=body, headers={'content-type': ['application/x-www-form-urlencoded']}))
+
+        assert response.status == 200
+        assert isinstance(seen['client'], GatewayWebClient) and seen['client'].token == 'xoxb-test'
+        assert seen['priority'] == SlackPriority.INTERACTIVE
+        assert _current_priority.get() == SlackPriority.NORMAL
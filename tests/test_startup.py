@@ -0,0 +1,148 @@
+"""
+Cold-start tests: lazy service construction and the Lambda entry import budget.
+
+The import benchmark runs ``python -X importtime`` in a fresh interpreter, the same
+way a Lambda init phase imports the handler module. Its time budget only applies with
+RUN_BENCHMARKS=1.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import inspect
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.postgresql_service import PostgreSQLService
+from services.service_container import LazyService, ServiceContainer
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Cumulative import time of lambda_entry: measured 0.15-0.2s here now that the listeners
+# load on the first event, versus 2.5-3.2s for the eager app.py import. The budget leaves
+# headroom for slower CI hosts.
+LAMBDA_IMPORT_BUDGET_MS = 1000.0
+
+# Modules the Slack Lambda adapter never needs
+WEB_STACK_MODULES = ('fastapi', 'uvicorn', 'slack_bolt.adapter.socket_mode', 'slack_bolt.adapter.fastapi')
+
+# Loaded with the listeners on the first event rather than by the init phase import; boto3
+# is missing here because the Bolt Lambda adapter itself imports it
+LISTENER_DEPENDENCIES = ('aiohttp', 'prometheus_client', 'sqlalchemy', 'numpy', 'redis', 'listeners')
+
+
+def _run_cold(code: str) -> subprocess.CompletedProcess:
+    """Run code in a fresh interpreter configured like a Lambda execution environment."""
+    env = dict(os.environ)
+    env.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+    env.setdefault('ALPACA_API_KEY', 'test')
+    env.setdefault('ALPACA_SECRET_KEY', 'test')
+    env.setdefault('FINNHUB_API_KEY', 'test')
+    env['AWS_LAMBDA_FUNCTION_NAME'] = 'slack-trading-bot-test'
+    env.pop('LAZY_STARTUP', None)
+    env.pop('DB_AUTO_MIGRATE', None)
+    env.pop('MODAL_UPDATE_COALESCING', None)
+    env.pop('LOG_ASYNC', None)
+    return subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+
+
+def _parse_importtime(stderr: str):
+    """Map module name -> (self_us, cumulative_us) from -X importtime output."""
+    profile = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+@pytest.fixture(scope='module')
+def lambda_cold_start():
+    result = _run_cold(
+        "import json, sys, lambda_entry\n"
+        "imported = sorted(sys.modules)\n"
+        "from config.settings import get_config\n"
+        "from services.service_container import get_container\n"
+        "print(json.dumps({'imported': imported,"
+        " 'handler': lambda_entry.get_slack_handler() is not None,"
+        " 'services': get_container().get_service_status()['services'],"
+        " 'modal_coalescing': get_config().modal_updates.enabled,"
+        " 'log_async': get_config().log_pipeline.async_enabled}))"
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    return json.loads(result.stdout.strip().splitlines()[-1]), _parse_importtime(result.stderr)
+
+
+class TestLambdaColdStart:
+    """Import budget and laziness of the Lambda entry point."""
+
+    @pytest.mark.benchmark
+    def test_import_within_budget(self, lambda_cold_start):
+        _, profile = lambda_cold_start
+        cumulative_ms = profile['lambda_entry'][1] / 1000
+        slowest = sorted(profile.items(), key=lambda item: item[1][0], reverse=True)[:5]
+        assert cumulative_ms < LAMBDA_IMPORT_BUDGET_MS, (
+            f"lambda_entry import: {cumulative_ms:.0f}ms; "
+            f"slowest self times: {[(name, round(t[0] / 1000)) for name, t in slowest]}")
+
+    def test_web_stack_not_imported(self, lambda_cold_start):
+        _, profile = lambda_cold_start
+        assert [m for m in WEB_STACK_MODULES if m in profile] == []
+
+    def test_listener_dependencies_not_imported(self, lambda_cold_start):
+        status, _ = lambda_cold_start
+        assert [m for m in LISTENER_DEPENDENCIES if m in status['imported']] == []
+
+    def test_no_services_constructed(self, lambda_cold_start):
+        status, _ = lambda_cold_start
+        assert status['handler']
+        assert status['services'] == {}
+
+    def test_no_background_flush_by_default(self, lambda_cold_start):
+        # Work left to a timer or writer thread is frozen with the process after the response
+        status, _ = lambda_cold_start
+        assert status['modal_coalescing'] is False
+        assert status['log_async'] is False
+
+
+class Widget:
+    instances = 0
+
+    def __init__(self):
+        Widget.instances += 1
+        self.name = 'widget'
+
+
+class TestLazyServices:
+    """Lazy proxies and deferred migrations."""
+
+    def test_lazy_proxy_constructs_on_first_use(self):
+        container = ServiceContainer()
+        container.register(Widget, auto_start=False)
+        container.lazy_startup = True
+        Widget.instances = 0
+
+        proxy = container.resolve(Widget)
+        assert isinstance(proxy, LazyService)
+        assert Widget.instances == 0
+
+        assert proxy.name == 'widget'
+        assert proxy.name == 'widget'
+        assert Widget.instances == 1
+
+        container.lazy_startup = False
+        assert container.resolve(Widget) is container.get(Widget)
+
+    def test_database_skips_migrations_when_disabled(self, tmp_path):
+        service = PostgreSQLService(f"sqlite:///{tmp_path / 'bot.db'}", auto_migrate=False)
+        assert inspect(service.engine).get_table_names() == []
+
+        service.create_tables()
+        assert 'trades' in inspect(service.engine).get_table_names()
@@ -0,0 +1,204 @@
+"""
+Tests and latency benchmark for the typeahead symbol search index.
+"""
+
+import json
+import os
+import random
+import string
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from slack_bolt import App, BoltRequest
+from slack_bolt.authorization import AuthorizeResult
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.asset_universe import AssetUniverse
+from listeners.interactive_actions import InteractiveActionHandler
+from services import symbol_search
+from services.symbol_search import SLACK_OPTION_TEXT_LIMIT, SymbolSearchIndex
+
+# Slack requires options responses within 3 seconds; keep typeahead far below that
+P99_BUDGET_MS = 25.0
+
+
+ASSETS = [
+    {'symbol': 'AAPL', 'name': 'Apple Inc.', 'exchange': 'NASDAQ', 'tradable': True},
+    {'symbol': 'APLE', 'name': 'Apple Hospitality REIT Inc.', 'exchange': 'NYSE', 'tradable': True},
+    {'symbol': 'AMZN', 'name': 'Amazon.com Inc.', 'exchange': 'NASDAQ', 'tradable': True},
+    {'symbol': 'MSFT', 'name': 'Microsoft Corporation', 'exchange': 'NASDAQ', 'tradable': True},
+    {'symbol': 'MS', 'name': 'Morgan Stanley', 'exchange': 'NYSE', 'tradable': True},
+    {'symbol': 'GOOGL', 'name': 'Alphabet Inc. Class A', 'exchange': 'NASDAQ', 'tradable': True},
+    {'symbol': 'DEAD', 'name': 'Delisted Holdings', 'exchange': 'OTC', 'tradable': False},
+]
+
+
+@pytest.fixture
+def index():
+    universe = AssetUniverse()
+    universe.load_assets(ASSETS)
+    return SymbolSearchIndex(universe)
+
+
+def _symbols(results):
+    return [r.symbol for r in results]
+
+
+class TestSymbolSearchIndex:
+    """Tests for ranking and personalization."""
+
+    def test_exact_ticker_ranks_first(self, index):
+        assert _symbols(index.search('ms'))[:2] == ['MS', 'MSFT']
+
+    def test_company_name_search(self, index):
+        assert _symbols(index.search('apple'))[:2] == ['AAPL', 'APLE']
+        assert _symbols(index.search('alphabet class')) == ['GOOGL']
+        assert _symbols(index.search('stanley')) == ['MS']
+
+    def test_typo_tolerance(self, index):
+        assert 'MSFT' in _symbols(index.search('MSFY'))
+        assert 'AMZN' in _symbols(index.search('AMXN'))
+
+    def test_non_tradable_excluded(self, index):
+        assert 'DEAD' not in _symbols(index.search('dea'))
+
+    def test_popularity_boost(self, index):
+        assert _symbols(index.search('ap'))[0] == 'APLE'
+        for _ in range(50):
+            index.record_selection(None, 'AAPL')
+        assert _symbols(index.search('ap'))[0] == 'AAPL'
+
+    def test_recent_symbols_per_user(self, index):
+        index.record_selection('U1', 'AMZN')
+        index.record_selection('U1', 'MSFT')
+        assert index.get_recent('U1') == ['MSFT', 'AMZN']
+        assert index.get_recent('U2') == []
+
+        results = index.search('', user_id='U1')
+        assert _symbols(results)[:2] == ['MSFT', 'AMZN']
+        assert results[0].is_recent
+
+    def test_slack_options_format(self, index):
+        options = index.slack_options('aapl')
+        assert options[0] == {"text": {"type": "plain_text", "text": "AAPL — Apple Inc."}, "value": "AAPL"}
+
+        universe = AssetUniverse()
+        universe.load_assets([{'symbol': 'LONG', 'name': 'X' * 200, 'tradable': True}])
+        label = SymbolSearchIndex(universe).slack_options('LONG')[0]["text"]["text"]
+        assert len(label) == SLACK_OPTION_TEXT_LIMIT
+
+    def test_empty_universe_offers_typed_ticker(self):
+        index = SymbolSearchIndex(AssetUniverse())
+        assert index.slack_options('tsla') == [
+            {"text": {"type": "plain_text", "text": "TSLA"}, "value": "TSLA"}
+        ]
+        assert index.slack_options('not a ticker') == []
+
+    def test_rebuilds_when_universe_reloads(self, index):
+        assert 'NVDA' not in _symbols(index.search('nvda'))
+        index.universe.load_assets(ASSETS + [{'symbol': 'NVDA', 'name': 'NVIDIA Corporation', 'tradable': True}],
+                                   loaded_at=datetime.utcnow() + timedelta(seconds=1))
+        assert _symbols(index.search('nvda'))[0] == 'NVDA'
+
+    def test_search_waits_for_an_in_progress_build(self, index):
+        build_started = threading.Event()
+        original_build = index.build
+
+        def slow_build(entries):
+            build_started.set()
+            time.sleep(0.1)
+            original_build(entries)
+
+        index.build = slow_build
+        builder = threading.Thread(target=len, args=(index,))
+        builder.start()
+        assert build_started.wait(timeout=5)
+        assert _symbols(index.search('aapl'))[0] == 'AAPL'
+        builder.join()
+
+
+class TestSelectionRecording:
+    """Typeahead picks reach the index through the listener Bolt actually runs."""
+
+    def test_symbol_pick_dispatch_records_selection(self, index, monkeypatch):
+        monkeypatch.setattr(symbol_search, '_symbol_search_index', index)
+
+        def authorize(enterprise_id, team_id, logger):
+            return AuthorizeResult(enterprise_id=enterprise_id, team_id=team_id,
+                                   bot_token='xoxb-test', bot_id='B1', bot_user_id='UBOT')
+
+        app = App(signing_secret='secret', authorize=authorize, process_before_response=True,
+                  request_verification_enabled=False)
+        InteractiveActionHandler().register_handlers(app)
+        body = {
+            'type': 'block_actions', 'team': {'id': 'T1'}, 'user': {'id': 'U1'},
+            'view': {'id': 'VPICK', 'state': {'values': {}}},
+            'actions': [{'action_id': 'symbol_input', 'block_id': 'trade_symbol_block', 'type': 'external_select',
+                         'selected_option': {'text': {'type': 'plain_text', 'text': 'MSFT'}, 'value': 'MSFT'}}]
+        }
+        app.dispatch(BoltRequest(body=json.dumps(body), headers={'content-type': ['application/json']}))
+
+        assert index.get_recent('U1') == ['MSFT']
+        assert index.search('', user_id='U1')[0].symbol == 'MSFT'
+
+
+def _synthetic_universe(size: int = 10000, seed: int = 42):
+    """Random tickers and multi-word company names."""
+    rng = random.Random(seed)
+    words = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))).title()
+             for _ in range(3000)]
+    suffixes = ['Inc.', 'Corp.', 'Holdings', 'Group', 'Technologies', 'Trust', 'Ltd.']
+
+    symbols = set()
+    while len(symbols) < size:
+        symbols.add(''.join(rng.choice(string.ascii_uppercase) for _ in range(rng.randint(1, 5))))
+
+    return [
+        {
+            'symbol': symbol,
+            'name': f"{' '.join(rng.sample(words, rng.randint(1, 3)))} {rng.choice(suffixes)}",
+            'exchange': rng.choice(['NYSE', 'NASDAQ', 'ARCA']),
+            'tradable': True
+        }
+        for symbol in sorted(symbols)
+    ]
+
+
+@pytest.mark.benchmark
+class TestSymbolSearchBenchmark:
+    """Typeahead latency on a 10k-symbol universe."""
+
+    def test_p99_latency_10k_universe(self):
+        assets = _synthetic_universe()
+        universe = AssetUniverse()
+        universe.load_assets(assets)
+        index = SymbolSearchIndex(universe, popular_symbols=[a['symbol'] for a in assets[:50]])
+        for asset in assets[::97]:
+            index.record_selection('U1', asset['symbol'])
+
+        rng = random.Random(7)
+        queries = []
+        for asset in rng.sample(assets, 400):
+            symbol, name = asset['symbol'], asset['name']
+            queries.append(symbol[:rng.randint(1, len(symbol))])              # ticker prefix
+            queries.append(name.split()[0][:rng.randint(2, 5)])                # name word prefix
+            if len(symbol) >= 3:
+                queries.append(symbol[:-1] + rng.choice(string.ascii_uppercase))  # typo
+
+        assert len(index) == 10000
+        index.slack_options('warmup', user_id='U1')
+
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            index.slack_options(query, user_id='U1')
+            timings.append((time.perf_counter() - start) * 1000)
+
+        timings.sort()
+        p50 = timings[len(timings) // 2]
+        p99 = timings[int(len(timings) * 0.99)]
+        assert p99 < P99_BUDGET_MS, f"{len(timings)} queries, p50={p50:.3f}ms p99={p99:.3f}ms"
@@ -0,0 +1,159 @@
+"""
+Tests for user-to-account assignment: in-memory indexes, batched writes and the
+database and append-only log stores.
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.settings import AssignmentStoreConfig
+from services.assignment_store import DatabaseAssignmentStore, LogAssignmentStore
+from services.postgresql_service import PostgreSQLService
+from services.user_account_manager import AccountAssignmentStrategy, UserAccountManager
+
+ACCOUNTS = ['primary', 'account_1', 'account_2', 'account_3']
+
+
+@pytest.fixture(autouse=True)
+def no_legacy_file(tmp_path, monkeypatch):
+    """Run from an empty directory so the repo's user_assignments.json is not imported."""
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture
+def database(tmp_path):
+    return PostgreSQLService(f"sqlite:///{tmp_path / 'assignments.db'}")
+
+
+def _manager(backend='memory', database_service=None, **overrides):
+    config = AssignmentStoreConfig(backend=backend, **overrides)
+    return UserAccountManager(database_service, config=config)
+
+
+class TestAssignmentIndexes:
+    """Lookups and load balancing come from the indexes, not scans."""
+
+    @pytest.mark.asyncio
+    async def test_least_loaded_spreads_evenly(self):
+        manager = _manager()
+        for i in range(10):
+            await manager.auto_assign_user(f"U{i}", ACCOUNTS)
+
+        stats = manager.get_assignment_stats()
+        assert stats['total_assignments'] == 10
+        assert stats['account_distribution'] == {'primary': 3, 'account_1': 3, 'account_2': 2, 'account_3': 2}
+        assert sorted(manager.get_account_users('account_3')) == ['U3', 'U7']
+
+    @pytest.mark.asyncio
+    async def test_reassignment_moves_user_between_indexes(self):
+        manager = _manager()
+        await manager.assign_user_to_account('U1', 'primary')
+        await manager.assign_user_to_account('U2', 'primary')
+        await manager.reassign_user('U1', 'account_1', 'admin', 'desk move')
+        await manager.assign_user_to_account('U2', 'account_1')
+
+        assert manager.get_user_account('U1') == 'account_1'
+        assert manager.get_account_users('primary') == []
+        assert sorted(manager.get_account_users('account_1')) == ['U1', 'U2']
+        assert manager.get_assignment_stats()['account_distribution'] == {'account_1': 2}
+
+    @pytest.mark.asyncio
+    async def test_auto_assign_ten_thousand_users_with_database(self, database):
+        manager = _manager('database', database, batch_size=1000)
+        manager.set_assignment_strategy(AccountAssignmentStrategy.ROUND_ROBIN)
+
+        start = time.perf_counter()
+        for i in range(10_000):
+            await manager.auto_assign_user(f"U{i:05d}", ACCOUNTS)
+        manager.flush()
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 1.0
+        assert set(manager.get_assignment_stats()['account_distribution'].values()) == {2500}
+        assert len(database.get_account_assignments()) == 10_000
+
+
+class TestBatchedWrites:
+    """Pending assignments reach the store in batches and survive a restart."""
+
+    @pytest.mark.asyncio
+    async def test_database_round_trip(self, database):
+        manager = _manager('database', database, batch_size=3, flush_interval_seconds=60)
+        await manager.assign_user_to_account('U1', 'primary')
+        await manager.assign_user_to_account('U2', 'account_1')
+        assert database.get_account_assignments() == []
+
+        await manager.assign_user_to_account('U3', 'account_1')
+        assert len(database.get_account_assignments()) == 3
+
+        await manager.reassign_user('U1', 'account_2', 'admin', 'rebalance')
+        manager.stop()
+
+        reloaded = _manager('database', database)
+        assert reloaded.get_user_account('U1') == 'account_2'
+        assert reloaded.get_assignment_stats()['account_distribution'] == {'account_1': 2, 'account_2': 1}
+        assert reloaded.assignments['U1'].assigned_at.tzinfo is not None
+
+    @pytest.mark.asyncio
+    async def test_flush_interval_writes_without_reaching_batch_size(self, tmp_path):
+        manager = _manager('log', log_path=str(tmp_path / 'log.jsonl'), flush_interval_seconds=0.05)
+        await manager.assign_user_to_account('U1', 'primary')
+        time.sleep(0.3)
+
+        assert manager.get_assignment_stats()['pending_writes'] == 0
+        assert [record['user_id'] for record in LogAssignmentStore(str(tmp_path / 'log.jsonl')).load()] == ['U1']
+        manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_store_failure_keeps_writes_pending(self):
+        class UnavailableDatabase:
+            def get_account_assignments(self):
+                return []
+
+            def upsert_account_assignments(self, records):
+                raise ConnectionError("database unavailable")
+
+        manager = UserAccountManager(config=AssignmentStoreConfig(flush_interval_seconds=60),
+                                     store=DatabaseAssignmentStore(UnavailableDatabase()))
+        await manager.assign_user_to_account('U1', 'primary')
+
+        assert manager.flush() == 0
+        assert manager.get_assignment_stats()['pending_writes'] == 1
+        assert manager.get_user_account('U1') == 'primary'
+
+
+class TestLogStore:
+    """Append-only log replay, compaction and legacy import."""
+
+    @pytest.mark.asyncio
+    async def test_replay_keeps_last_record_and_compacts(self, tmp_path):
+        path = str(tmp_path / 'data' / 'assignments.log')
+        manager = _manager('log', log_path=path, batch_size=1)
+        for account in ['primary', 'account_1', 'account_2']:
+            await manager.assign_user_to_account('U1', account)
+        manager.stop()
+        with open(path) as f:
+            assert len(f.readlines()) == 3
+
+        reloaded = _manager('log', log_path=path)
+        assert reloaded.get_user_account('U1') == 'account_2'
+        with open(path) as f:
+            assert len(f.readlines()) == 1
+        reloaded.stop()
+
+    def test_empty_store_imports_legacy_json(self, tmp_path):
+        with open('user_assignments.json', 'w') as f:
+            f.write('{"U1": {"user_id": "U1", "account_id": "primary", '
+                    '"assigned_at": "2025-10-16T22:54:40+00:00", "assigned_by": "admin_script", '
+                    '"assignment_reason": "manual", "is_active": true}}')
+        path = str(tmp_path / 'assignments.log')
+
+        manager = _manager('log', log_path=path)
+        assert manager.get_user_account('U1') == 'primary'
+        manager.stop()
+        assert [record['account_id'] for record in LogAssignmentStore(path).load()] == ['primary']
@@ -0,0 +1,145 @@
+"""
+Precompiled Block Kit templates.
+
+A template is built once from a layout: the Block Kit structure with Slot
+markers where per-render values go. Compiling encodes everything static into
+JSON text fragments, so rendering is a join of those fragments with the slot
+values encoded in between.
+
+Rendered views are PrerenderedJSON dicts (utils/serializers.py): the Slack
+gateway writes their cached text into the request body instead of encoding
+the modal again, which is where most of the cost of a redraw used to go.
+
+    TEMPLATE = BlockTemplate({
+        "type": "modal",
+        "title": {"type": "plain_text", "text": Slot("title")},
+        "blocks": [Slot("account_blocks", splice=True), {"type": "divider"}],
+        "private_metadata": Slot("private_metadata", optional=True),
+    })
+    view = TEMPLATE.render(title="KEMBot", account_blocks=[], private_metadata=None)
+"""
+
+from typing import Any, Dict, FrozenSet, List, Tuple, Union
+
+from utils.serializers import PrerenderedJSON, json_dumps
+
+
+class Slot:
+    """
+    Placeholder for a per-render value in a template layout.
+
+    An optional slot rendered with None leaves out its key (in an object) or
+    item (in a list). A splice slot takes a list whose items are inserted into
+    the enclosing list; an empty list inserts nothing.
+    """
+
+    __slots__ = ('name', 'optional', 'splice')
+
+    def __init__(self, name: str, optional: bool = False, splice: bool = False):
+        self.name = name
+        self.optional = optional
+        self.splice = splice
+
+    @property
+    def omittable(self) -> bool:
+        return self.optional or self.splice
+
+    def __repr__(self) -> str:
+        return f"Slot({self.name!r})"
+
+
+class _SlotRef:
+    """A compiled slot: the slot plus the text written around its value when present."""
+
+    __slots__ = ('name', 'optional', 'splice', 'prefix', 'suffix')
+
+    def __init__(self, slot: Slot, prefix: str = '', suffix: str = ''):
+        self.name = slot.name
+        self.optional = slot.optional
+        self.splice = slot.splice
+        self.prefix = prefix
+        self.suffix = suffix
+
+
+class BlockTemplate:
+    """An immutable, precompiled Block Kit layout with named slots."""
+
+    def __init__(self, layout: Union[Dict[str, Any], List[Any]]):
+        parts: List[Union[str, _SlotRef]] = []
+        _compile(layout, parts)
+        self._parts: Tuple[Union[str, _SlotRef], ...] = tuple(_merge_static(parts))
+        self.slot_names: FrozenSet[str] = frozenset(part.name for part in self._parts if isinstance(part, _SlotRef))
+
+    def render_json(self, **values: Any) -> str:
+        """Render to JSON text. Required slots must be given; optional ones default to None."""
+        out = []
+        for part in self._parts:
+            if part.__class__ is str:
+                out.append(part)
+                continue
+            if part.splice:
+                items = values.get(part.name)
+                if items:
+                    out.append(part.prefix + ','.join(json_dumps(item) for item in items) + part.suffix)
+            elif part.optional:
+                value = values.get(part.name)
+                if value is not None:
+                    out.append(part.prefix + json_dumps(value) + part.suffix)
+            else:
+                out.append(part.prefix + json_dumps(values[part.name]) + part.suffix)
+        return ''.join(out)
+
+    def render(self, **values: Any) -> PrerenderedJSON:
+        """Render to a dict that carries its JSON text to the Slack gateway."""
+        return PrerenderedJSON(self.render_json(**values))
+
+
+def _compile(node: Any, parts: List[Union[str, _SlotRef]]) -> None:
+    if isinstance(node, Slot):
+        if node.omittable:
+            raise ValueError(f"{node!r} can only be optional or spliced inside an object or list")
+        parts.append(_SlotRef(node))
+    elif isinstance(node, dict):
+        entries = [(json_dumps(str(key)) + ':', value) for key, value in node.items()]
+        _compile_container('{', '}', entries, parts, allow_splice=False)
+    elif isinstance(node, (list, tuple)):
+        _compile_container('[', ']', [('', item) for item in node], parts, allow_splice=True)
+    else:
+        parts.append(json_dumps(node))
+
+
+def _compile_container(open_: str, close: str, entries: List[Tuple[str, Any]],
+                       parts: List[Union[str, _SlotRef]], allow_splice: bool) -> None:
+    """
+    Compile an object or list. Omittable entries carry their own comma: before
+    them when a required entry precedes, otherwise after them (a required entry
+    must follow), so the output stays valid whichever of them are left out.
+    """
+    required = [not (isinstance(value, Slot) and value.omittable) for _, value in entries]
+    if entries and not any(required):
+        raise ValueError("A template object or list needs at least one entry that is always present")
+
+    parts.append(open_)
+    for i, (key, value) in enumerate(entries):
+        required_before = any(required[:i])
+        if required[i]:
+            parts.append((',' if required_before else '') + key)
+            _compile(value, parts)
+        elif value.splice and not allow_splice:
+            raise ValueError(f"{value!r} is spliced but is not inside a list")
+        elif required_before:
+            parts.append(_SlotRef(value, prefix=',' + key))
+        else:
+            parts.append(_SlotRef(value, prefix=key, suffix=','))
+    parts.append(close)
+
+
+def _merge_static(parts: List[Union[str, _SlotRef]]) -> List[Union[str, _SlotRef]]:
+    """Join adjacent static fragments so rendering appends as few strings as possible."""
+    merged: List[Union[str, _SlotRef]] = []
+    for part in parts:
+        if isinstance(part, str) and merged and isinstance(merged[-1], str):
+            merged[-1] += part
+        else:
+            merged.append(part)
+    return merged
@@ -23,6 +23,9 @@ from models.portfolio import Portfolio, Position, PortfolioStatus
 from models.user import User, UserRole, Permission
 from models.trade import Trade, TradeStatus, RiskLevel
 from services.market_data import MarketQuote, MarketStatus
+from services.risk_analysis import RISK_THRESHOLDS
+from services.sector_index import get_sector_index
+from services.profiling import profiled
 from utils.formatters import (
     format_money, format_percent, 
     format_date
@@ -108,10 +111,15 @@ class DashboardContext:
     show_risk_metrics: bool = True
     compact_view: bool = False
     
+    # Risk limits the sections flag against (RiskAnalysisService.risk_thresholds)
+    risk_thresholds: Dict[str, float] = None
+    
     def __post_init__(self):
         """Initialize default values."""
         if self.market_quotes is None:
             self.market_quotes = {}
+        if self.risk_thresholds is None:
+            self.risk_thresholds = dict(RISK_THRESHOLDS)
         if self.recent_trades is None:
             self.recent_trades = []
         if self.performance_data is None:
@@ -169,6 +177,7 @@ class Dashboard:
         
         self.logger.info("Dashboard initialized with role-based customizations")
     
+    @profiled('blocks.app_home_view')
     def create_app_home_view(self, context: DashboardContext) -> Dict[str, Any]:
         """
         Create comprehensive App Home tab view.
@@ -1211,13 +1220,32 @@ class Dashboard:
         """Build sector allocation analysis."""
         blocks = []
         
-        # This would require sector data from market data service
-        # For now, return placeholder
+        tracker = get_sector_index().get_tracker(context.portfolio)
+        sector_weights = tracker.get_sector_weights(float(context.portfolio.total_value))
+        
+        if not sector_weights:
+            blocks.append({
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": "*🏭 Sector Analysis*\n_No open positions to classify._"
+                }
+            })
+            return blocks
+        
+        sector_limit = context.risk_thresholds['sector_limit']
+        sector_text = "*🏭 Sector Analysis*\n"
+        for sector, weight in list(sector_weights.items())[:8]:
+            bar_length = int(weight * 20)
+            bar = "█" * bar_length + "░" * (20 - bar_length)
+            flag = " ⚠️" if weight > sector_limit else ""
+            sector_text += f"`{bar}` {sector}: {format_percent(weight, show_sign=False)}{flag}\n"
+        
         blocks.append({
             "type": "section",
             "text": {
                 "type": "mrkdwn",
-                "text": "*🏭 Sector Analysis*\n_Sector allocation data will be available with enhanced market data integration._"
+                "text": sector_text.strip()
             }
         })
         
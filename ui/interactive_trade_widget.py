@@ -16,6 +16,7 @@ import json
 from models.trade import TradeType
 from models.user import User
 from services.market_data import MarketQuote
+from services.profiling import profiled
 from utils.formatters import format_money
 
 logger = logging.getLogger(__name__)
@@ -74,6 +75,7 @@ class InteractiveTradeWidget:
         
         self.logger.info("InteractiveTradeWidget initialized")
     
+    @profiled('blocks.interactive_modal')
     def create_interactive_modal(self, context: InteractiveTradeContext) -> Dict[str, Any]:
         """
         Create advanced interactive trade modal.
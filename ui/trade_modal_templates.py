@@ -0,0 +1,224 @@
+"""
+Block Kit templates for the trade modals.
+
+The instant /buy and /sell modals are redrawn on every quantity keystroke and
+price update, and the multi-account trade modal on every open. Their layouts are
+compiled once here (ui/block_templates.py); the listeners only supply the
+symbol, quantity, price, GMV and account values.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from ui.block_templates import BlockTemplate, Slot
+from utils.serializers import PrerenderedJSON
+
+PRICE_LOADING_TEXT = "*Current Stock Price:* *Loading...*"
+
+_TRIGGER_ON_INPUT = {"trigger_actions_on": ["on_enter_pressed", "on_character_entered"]}
+
+
+def _plain(text: Any) -> Dict[str, Any]:
+    return {"type": "plain_text", "text": text}
+
+
+def _option(text: str, value: str) -> Dict[str, Any]:
+    return {"text": _plain(text), "value": value}
+
+
+def _instant_trade_layout(side: str) -> Dict[str, Any]:
+    side_option = {"value": side, "text": _plain(side.capitalize())}
+    return {
+        "type": "modal",
+        "callback_id": "stock_trade_modal_interactive",
+        "title": _plain("KEMBot"),
+        "submit": _plain("Execute Trade"),
+        "close": _plain("Cancel"),
+        "blocks": [
+            {
+                "type": "input",
+                "block_id": "trade_symbol_block",
+                "label": _plain("Stock Symbol"),
+                "element": {
+                    "type": "external_select",
+                    "action_id": "symbol_input",
+                    "placeholder": _plain("Search ticker or company (e.g., AAPL, Apple)"),
+                    "min_query_length": 1,
+                    "initial_option": Slot("symbol_option", optional=True)
+                }
+            },
+            {
+                "type": "section",
+                "text": {"type": "mrkdwn", "text": Slot("price_text")},
+                "block_id": "current_price_display"
+            },
+            {"type": "divider"},
+            {
+                "type": "input",
+                "block_id": "trade_side_block",
+                "label": _plain("Trade Action (Buy/Sell)"),
+                "element": {
+                    "type": "radio_buttons",
+                    "action_id": "trade_side_radio",
+                    "options": [
+                        {"value": "buy", "text": _plain("Buy")},
+                        {"value": "sell", "text": _plain("Sell")}
+                    ],
+                    "initial_option": side_option
+                }
+            },
+            {
+                "type": "input",
+                "block_id": "qty_shares_block",
+                "label": _plain("Quantity (shares)"),
+                "element": {
+                    "type": "number_input",
+                    "action_id": "shares_input",
+                    "placeholder": _plain("Enter shares, and GMV will update"),
+                    "is_decimal_allowed": False,
+                    "initial_value": Slot("quantity"),
+                    "dispatch_action_config": _TRIGGER_ON_INPUT
+                },
+                "hint": _plain("Changes here trigger an automatic GMV calculation.")
+            },
+            {
+                "type": "input",
+                "block_id": "gmv_block",
+                "label": _plain("Gross Market Value (GMV)"),
+                "element": {
+                    "type": "number_input",
+                    "action_id": "gmv_input",
+                    "placeholder": _plain("Enter dollar amount, and shares will update"),
+                    "is_decimal_allowed": True,
+                    "dispatch_action_config": _TRIGGER_ON_INPUT,
+                    "initial_value": Slot("gmv", optional=True)
+                },
+                "hint": _plain("Changes here trigger an automatic Shares calculation.")
+            },
+            {"type": "divider"},
+            {
+                "type": "input",
+                "block_id": "order_type_block",
+                "label": _plain("Order Type"),
+                "element": {
+                    "type": "static_select",
+                    "action_id": "order_type_select",
+                    "initial_option": _option("Market", "market"),
+                    "options": [
+                        _option("Market", "market"),
+                        _option("Limit", "limit"),
+                        _option("Stop", "stop"),
+                        _option("Stop Limit", "stop_limit")
+                    ]
+                }
+            }
+        ],
+        "private_metadata": Slot("private_metadata", optional=True)
+    }
+
+
+INSTANT_TRADE_TEMPLATES = {
+    "buy": BlockTemplate(_instant_trade_layout("buy")),
+    "sell": BlockTemplate(_instant_trade_layout("sell"))
+}
+
+
+def render_instant_trade_modal(side: str, symbol: str = "", quantity: str = "1",
+                               price_text: str = PRICE_LOADING_TEXT, gmv: Optional[str] = None,
+                               private_metadata: Optional[str] = None) -> PrerenderedJSON:
+    """Render the instant /buy or /sell modal."""
+    symbol_option = None
+    if symbol:
+        symbol_option = {"text": _plain(symbol.upper()), "value": symbol.upper()}
+    return INSTANT_TRADE_TEMPLATES[side].render(
+        symbol_option=symbol_option,
+        price_text=price_text,
+        quantity=quantity,
+        gmv=gmv,
+        private_metadata=private_metadata
+    )
+
+
+MULTI_ACCOUNT_TRADE_TEMPLATE = BlockTemplate({
+    "type": "modal",
+    "callback_id": "trade_form_submission",
+    "title": _plain(Slot("title")),
+    "submit": _plain("Execute Trade"),
+    "close": _plain("Cancel"),
+    "blocks": [
+        Slot("account_blocks", splice=True),
+        {
+            "type": "input",
+            "block_id": "symbol_input",
+            "element": {
+                "type": "plain_text_input",
+                "action_id": "symbol",
+                "placeholder": _plain("e.g., AAPL, TSLA, MSFT"),
+                "initial_value": Slot("symbol", optional=True)
+            },
+            "label": _plain("Stock Symbol")
+        },
+        {
+            "type": "input",
+            "block_id": "quantity_input",
+            "element": {
+                "type": "plain_text_input",
+                "action_id": "quantity",
+                "placeholder": _plain("e.g., 100"),
+                "initial_value": Slot("quantity", optional=True)
+            },
+            "label": _plain("Quantity (shares)")
+        },
+        {
+            "type": "input",
+            "block_id": "gmv_input",
+            "element": {
+                "type": "plain_text_input",
+                "action_id": "gmv",
+                "placeholder": _plain("e.g., 17500.00"),
+                "initial_value": Slot("gmv", optional=True)
+            },
+            "label": _plain("GMV (Gross Monetary Value)")
+        },
+        {
+            "type": "input",
+            "block_id": "action_select",
+            "element": {
+                "type": "static_select",
+                "action_id": "action",
+                "placeholder": _plain("Select trade action"),
+                "options": [_option("Buy", "buy"), _option("Sell", "sell")],
+                "initial_option": Slot("action_option", optional=True)
+            },
+            "label": _plain("Action")
+        },
+        {
+            "type": "input",
+            "block_id": "order_type_select",
+            "element": {
+                "type": "static_select",
+                "action_id": "order_type",
+                "placeholder": _plain("Select order type"),
+                "initial_option": _option("Market Order", "market"),
+                "options": [_option("Market Order", "market"), _option("Limit Order", "limit")]
+            },
+            "label": _plain("Order Type")
+        }
+    ]
+})
+
+
+def render_multi_account_trade_modal(account_name: str, account_blocks: List[Dict[str, Any]],
+                                     symbol: Optional[str] = None, quantity: Optional[int] = None,
+                                     gmv: Optional[float] = None, action: Optional[str] = None) -> PrerenderedJSON:
+    """Render the multi-account trade modal; ``account_blocks`` go above the form."""
+    action_option = None
+    if action:
+        action_option = _option("Buy" if action == "buy" else "Sell", action)
+    return MULTI_ACCOUNT_TRADE_TEMPLATE.render(
+        title=f"Trade - {account_name}",
+        account_blocks=account_blocks,
+        symbol=symbol or None,
+        quantity=str(quantity) if quantity else None,
+        gmv=f"{gmv:.2f}" if gmv else None,
+        action_option=action_option
+    )
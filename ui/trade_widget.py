@@ -22,6 +22,8 @@ from models.trade import Trade, TradeType, RiskLevel
 from models.user import User, UserRole, Permission
 from services.market_data import MarketQuote, MarketStatus, DataQuality
 from services.risk_analysis import RiskAnalysis, RiskFactor, RiskCategory
+from services.profiling import profiled
+from ui.block_templates import BlockTemplate, Slot
 from utils.formatters import format_money, format_percent
 
 def format_number(value):
@@ -29,6 +31,20 @@ def format_number(value):
     return f"{value:,}"
 from utils.validators import validate_symbol, validate_trade_input, validate_quantity, validate_price
 
+
+# Modal shell shared by every trade widget state; only the blocks and labels vary
+_TRADE_MODAL_TEMPLATE = BlockTemplate({
+    "type": "modal",
+    "callback_id": "trade_modal",
+    "title": {"type": "plain_text", "text": Slot("title")},
+    "blocks": Slot("blocks"),
+    "close": {"type": "plain_text", "text": "Cancel"},
+    "private_metadata": Slot("private_metadata"),
+    "submit": {"type": "plain_text", "text": Slot("submit_text")},
+    "notify_on_close": Slot("notify_on_close", optional=True)
+})
+
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -161,6 +177,7 @@ class TradeWidget:
         
         self.logger.info("TradeWidget initialized with role-based customizations")
     
+    @profiled('blocks.trade_modal')
     def create_trade_modal(self, context: WidgetContext) -> Dict[str, Any]:
         """
         Create comprehensive trade modal based on current context and state.
@@ -175,44 +192,30 @@ class TradeWidget:
             # Determine modal configuration based on state and theme
             modal_config = self._get_modal_config(context)
             
-            # Build modal structure
-            modal = {
-                "type": "modal",
-                "callback_id": "trade_modal",
-                "title": {
-                    "type": "plain_text",
-                    "text": modal_config['title']
-                },
-                "blocks": self._build_modal_blocks(context),
-                "close": {
-                    "type": "plain_text",
-                    "text": "Cancel"
-                },
-                "private_metadata": json.dumps({
+            blocks = self._build_modal_blocks(context)
+            
+            # Fill the precompiled modal shell; submit button is required when input blocks are present
+            modal = _TRADE_MODAL_TEMPLATE.render(
+                title=modal_config['title'],
+                blocks=blocks,
+                private_metadata=json.dumps({
                     "user_id": context.user.user_id,
                     "channel_id": context.channel_id,
                     "state": context.state.value,
                     "theme": context.theme.value,
                     "timestamp": datetime.utcnow().isoformat()
-                })
-            }
-            
-            # Add submit button - required when input blocks are present
-            modal["submit"] = {
-                "type": "plain_text",
-                "text": modal_config['submit_text'] if self._should_show_submit_button(context) else "Continue"
-            }
-            
-            # Add notification text for accessibility
-            if self.accessibility_enabled:
-                modal["notify_on_close"] = True
+                }),
+                submit_text=modal_config['submit_text'] if self._should_show_submit_button(context) else "Continue",
+                # Add notification text for accessibility
+                notify_on_close=True if self.accessibility_enabled else None
+            )
             
             self.logger.info(
                 f"Trade modal created | "
                 f"User: {context.user.user_id} | "
                 f"State: {context.state.value} | "
                 f"Theme: {context.theme.value} | "
-                f"Blocks: {len(modal['blocks'])}"
+                f"Blocks: {len(blocks)}"
             )
             
             return modal
@@ -293,6 +296,7 @@ class TradeWidget:
             context.errors['risk_analysis'] = f"Risk analysis failed: {str(e)}"
             return self.create_trade_modal(context)
     
+    @profiled('blocks.confirmation_modal')
     def create_confirmation_modal(self, context: WidgetContext) -> Dict[str, Any]:
         """
         Create high-risk trade confirmation modal.
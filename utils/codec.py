@@ -0,0 +1,464 @@
+"""
+Compact, versioned binary encoding for cached records.
+
+Quotes, trades, positions and risk analyses are cached as bytes instead of JSON
+dicts. A payload is a magic byte followed by one tagged value. A record value
+carries its type id, schema version and field count, then its field values in
+schema order. Decimals keep their exact digits and datetimes their UTC offset.
+
+Schemas evolve by appending fields. A reader fills fields missing from an older
+payload with the dataclass defaults and skips trailing fields written by a newer
+schema, so workers on both sides of a deploy can share one cache. Fields are
+never removed or reordered; a retired field keeps its slot.
+"""
+
+import struct
+from dataclasses import MISSING, dataclass, fields as dataclass_fields
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+MAGIC = b'\xb7'
+
+# Value tags
+_NONE, _FALSE, _TRUE = 0, 1, 2
+_INT8, _INT32, _INT64, _BIGINT = 3, 4, 5, 6
+_FLOAT = 7
+_STR8, _STR32 = 8, 9
+_DECIMAL = 10
+_DATETIME, _DATETIME_TZ = 11, 12
+_LIST, _DICT = 13, 14
+_RECORD = 15
+_BYTES = 16
+
+_B = struct.Struct('>B')
+_b = struct.Struct('>b')
+_I = struct.Struct('>I')
+_i = struct.Struct('>i')
+_q = struct.Struct('>q')
+_d = struct.Struct('>d')
+_RECORD_HEADER = struct.Struct('>BBB')  # type id, schema version, field count
+_DATETIME_FIELDS = struct.Struct('>HBBBBBI')  # year ... microsecond
+_DATETIME_TZ_FIELDS = struct.Struct('>HBBBBBIh')  # ... plus UTC offset in minutes
+_UTC_OFFSETS: Dict[int, timezone] = {0: timezone.utc}
+
+# Errors a truncated or corrupt payload raises while being read
+_CORRUPT = (IndexError, KeyError, struct.error, UnicodeDecodeError, ArithmeticError)
+
+# Registered record codecs, by type id and by class
+_BY_TYPE: Dict[int, 'RecordCodec'] = {}
+_BY_CLASS: Dict[type, 'RecordCodec'] = {}
+
+
+class CodecError(ValueError):
+    """Raised when a value cannot be encoded or a payload cannot be decoded."""
+
+
+@dataclass(frozen=True)
+class Field:
+    """One slot of a record schema."""
+    name: str
+    enum: Optional[Type[Enum]] = None  # Stored as the member's value
+    since: int = 1  # Schema version that added the field
+
+
+class RecordCodec:
+    """
+    Binary schema for one dataclass.
+
+    Decoding builds the instance without calling __init__: cached records were
+    validated when first built, and skipping __post_init__ keeps cache hits cheap.
+
+    Example:
+        QUOTE_CODEC = RecordCodec(MarketQuote, 1, [Field('symbol'), Field('current_price'), ...])
+        data = QUOTE_CODEC.encode(quote)
+        quote = QUOTE_CODEC.decode(data)
+    """
+
+    def __init__(self, cls: type, type_id: int, fields: Sequence[Field], register: bool = True):
+        """
+        Initialize record codec.
+
+        Args:
+            cls: Dataclass the schema describes
+            type_id: Identifier written into each payload (0-255, unique per registered codec)
+            fields: Field slots in wire order; new fields go at the end with a higher ``since``
+            register: Make records of ``cls`` encodable inside other values and decodable by loads()
+        """
+        if not 0 <= type_id <= 255:
+            raise ValueError("Record type id must fit in one byte")
+        if len(fields) > 255:
+            raise ValueError("A record schema holds at most 255 fields")
+        if any(later.since < earlier.since for earlier, later in zip(fields, fields[1:])):
+            raise ValueError("Fields added by a later schema version must come last")
+
+        self.cls = cls
+        self.type_id = type_id
+        self.fields: Tuple[Field, ...] = tuple(fields)
+        self.version = max((f.since for f in self.fields), default=1)
+        self._names = [f.name for f in self.fields]
+        self._enums = [f.enum for f in self.fields]
+        self._enum_members = [(f.name, f.enum._value2member_map_) for f in self.fields if f.enum is not None]
+        self._unwritten = bool({f.name for f in dataclass_fields(cls)} - set(self._names))
+        self._defaults: Dict[int, List[Tuple[str, Any, Any]]] = {}
+        self._read_current = self._compile_reader()
+
+        if register:
+            existing = _BY_TYPE.get(type_id)
+            if existing is not None and existing.cls is not cls:
+                raise ValueError(f"Record type id {type_id} is already used by {existing.cls.__name__}")
+            _BY_TYPE[type_id] = self
+            _BY_CLASS[cls] = self
+
+    def encode(self, obj: Any, version: Optional[int] = None) -> bytes:
+        """
+        Encode one record.
+
+        Args:
+            obj: Instance of the codec's dataclass
+            version: Write this older schema version instead of the current one
+
+        Returns:
+            bytes: Payload for decode() or loads()
+        """
+        out = bytearray(MAGIC)
+        self._write(obj, out, self.version if version is None else version)
+        return bytes(out)
+
+    def decode(self, data: bytes) -> Any:
+        """
+        Decode one record written by any version of this schema.
+
+        Raises:
+            CodecError: If the payload is not a record of this type
+        """
+        buf = _payload(data)
+        if buf[1] != _RECORD or buf[2] != self.type_id:
+            raise CodecError(f"Payload is not a {self.cls.__name__} record")
+        try:
+            value, pos = self._read(buf, 2)
+        except _CORRUPT as e:
+            raise CodecError(f"Truncated or corrupt payload: {e!r}") from e
+        if pos != len(buf):
+            raise CodecError("Trailing bytes after record")
+        return value
+
+    def _write(self, obj: Any, out: bytearray, version: int) -> None:
+        if version == self.version:
+            names, enums = self._names, self._enums
+        else:
+            slots = [f for f in self.fields if f.since <= version]
+            names, enums = [f.name for f in slots], [f.enum for f in slots]
+        out.append(_RECORD)
+        out += _RECORD_HEADER.pack(self.type_id, version, len(names))
+        values = obj.__dict__
+        for name, enum in zip(names, enums):
+            value = values[name]
+            if enum is not None and value is not None:
+                value = value.value
+            _write(value, out)
+
+    def _read(self, buf: bytes, pos: int) -> Tuple[Any, int]:
+        _, _version, count = _RECORD_HEADER.unpack_from(buf, pos)
+        pos += 3
+        if count == len(self._names):
+            return self._read_current(buf, pos)
+        # Payload from an older or newer schema version
+        names = self._names[:count] if count < len(self._names) else self._names
+        values = {}
+        readers = _READERS
+        # Strings, decimals and None make up most fields; read them inline
+        for name in names:
+            tag = buf[pos]
+            if tag == _STR8:
+                end = pos + 2 + buf[pos + 1]
+                values[name] = buf[pos + 2:end].decode('utf-8')
+                pos = end
+            elif tag == _DECIMAL:
+                end = pos + 2 + buf[pos + 1]
+                values[name] = Decimal(buf[pos + 2:end].decode('ascii'))
+                pos = end
+            elif tag == _NONE:
+                values[name] = None
+                pos += 1
+            else:
+                values[name], pos = readers[tag](buf, pos + 1)
+        for _ in range(count - len(names)):
+            _, pos = readers[buf[pos]](buf, pos + 1)  # Written by a newer schema
+        for name, members in self._enum_members:
+            value = values.get(name)
+            if value is not None:
+                values[name] = members[value]
+        if count < len(self._names) or self._unwritten:
+            for name, default, factory in self._missing(min(count, len(self._names))):
+                values[name] = factory() if factory is not MISSING else default
+        obj = self.cls.__new__(self.cls)
+        obj.__dict__.update(values)
+        return obj, pos
+
+    def _compile_reader(self) -> Callable[[bytes, int], Tuple[Any, int]]:
+        """
+        Build a reader for payloads holding exactly this schema's fields.
+
+        Like dataclasses' generated __init__, the reader is straight-line code with
+        one block per field; cache hits then skip the generic per-field loop.
+        """
+        lines = ['def read(buf, pos):']
+        namespace = {'READERS': _READERS, 'Decimal': Decimal, 'cls': self.cls, 'new': self.cls.__new__,
+                     'MISSING': MISSING, 'missing': self._missing(len(self.fields))}
+        for index, f in enumerate(self.fields):
+            value = f'v{index}'
+            lines += [
+                '    tag = buf[pos]',
+                f'    if tag == {_STR8}:',
+                '        end = pos + 2 + buf[pos + 1]',
+                f"        {value} = buf[pos + 2:end].decode('utf-8')",
+                '        pos = end',
+                f'    elif tag == {_DECIMAL}:',
+                '        end = pos + 2 + buf[pos + 1]',
+                f"        {value} = Decimal(buf[pos + 2:end].decode('ascii'))",
+                '        pos = end',
+                f'    elif tag == {_NONE}:',
+                f'        {value} = None',
+                '        pos += 1',
+                '    else:',
+                f'        {value}, pos = READERS[tag](buf, pos + 1)',
+            ]
+            if f.enum is not None:
+                namespace[f'members{index}'] = f.enum._value2member_map_
+                lines.append(f'    if {value} is not None: {value} = members{index}[{value}]')
+        entries = ', '.join(f'{f.name!r}: v{index}' for index, f in enumerate(self.fields))
+        lines += ['    obj = new(cls)', f'    values = obj.__dict__ = {{{entries}}}']
+        if self._unwritten:
+            lines += ['    for name, default, factory in missing:',
+                      '        values[name] = factory() if factory is not MISSING else default']
+        lines.append('    return obj, pos')
+        exec('\n'.join(lines), namespace)
+        return namespace['read']
+
+    def _missing(self, known: int) -> List[Tuple[str, Any, Any]]:
+        """Dataclass fields an older payload holding ``known`` slots leaves unset."""
+        missing = self._defaults.get(known)
+        if missing is None:
+            present = set(self._names[:known])
+            missing = []
+            for f in dataclass_fields(self.cls):
+                if f.name in present:
+                    continue
+                if f.default is MISSING and f.default_factory is MISSING:
+                    raise CodecError(f"{self.cls.__name__}.{f.name} is missing from the payload and has no default")
+                missing.append((f.name, f.default, f.default_factory))
+            self._defaults[known] = missing
+        return missing
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode a value: None, bool, int, float, str, bytes, Decimal, datetime, lists,
+    dicts and instances of registered record classes, nested in any combination.
+
+    Raises:
+        CodecError: If the value holds an unsupported type
+    """
+    out = bytearray(MAGIC)
+    _write(value, out)
+    return bytes(out)
+
+
+def loads(data: bytes) -> Any:
+    """
+    Decode a payload written by dumps() or RecordCodec.encode().
+
+    Raises:
+        CodecError: If the payload is malformed or holds an unknown record type
+    """
+    buf = _payload(data)
+    value, pos = _read(buf, 1)
+    if pos != len(buf):
+        raise CodecError("Trailing bytes after value")
+    return value
+
+
+def is_encoded(data: Any) -> bool:
+    """Whether ``data`` looks like a payload of this codec rather than, say, legacy JSON."""
+    return isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:1]) == MAGIC
+
+
+def _payload(data: bytes) -> bytes:
+    if type(data) is not bytes:
+        data = bytes(data) if isinstance(data, (bytearray, memoryview)) else b''
+    if data[:1] != MAGIC or len(data) < 2:
+        raise CodecError("Not a binary codec payload")
+    return data
+
+
+def _write(value: Any, out: bytearray) -> None:
+    kind = type(value)
+    if value is None:
+        out.append(_NONE)
+    elif kind is bool:
+        out.append(_TRUE if value else _FALSE)
+    elif kind is int:
+        if -128 <= value <= 127:
+            out.append(_INT8)
+            out += _b.pack(value)
+        elif -2 ** 31 <= value < 2 ** 31:
+            out.append(_INT32)
+            out += _i.pack(value)
+        elif -2 ** 63 <= value < 2 ** 63:
+            out.append(_INT64)
+            out += _q.pack(value)
+        else:
+            _write_text(_BIGINT, str(value), out)
+    elif kind is str:
+        encoded = value.encode('utf-8')
+        if len(encoded) < 256:
+            out.append(_STR8)
+            out += _B.pack(len(encoded))
+        else:
+            out.append(_STR32)
+            out += _I.pack(len(encoded))
+        out += encoded
+    elif kind is bytes:
+        out.append(_BYTES)
+        out += _I.pack(len(value))
+        out += value
+    elif kind is Decimal:
+        _write_text(_DECIMAL, str(value), out)
+    elif kind is float:
+        out.append(_FLOAT)
+        out += _d.pack(value)
+    elif kind is datetime:
+        offset = value.utcoffset()
+        if offset is None:
+            out.append(_DATETIME)
+            out += _DATETIME_FIELDS.pack(value.year, value.month, value.day, value.hour, value.minute,
+                                         value.second, value.microsecond)
+        else:
+            out.append(_DATETIME_TZ)
+            out += _DATETIME_TZ_FIELDS.pack(value.year, value.month, value.day, value.hour, value.minute,
+                                            value.second, value.microsecond, offset // timedelta(minutes=1))
+    elif kind is list or kind is tuple:
+        out.append(_LIST)
+        out += _I.pack(len(value))
+        for item in value:
+            _write(item, out)
+    elif kind is dict:
+        out.append(_DICT)
+        out += _I.pack(len(value))
+        for key, item in value.items():
+            _write(key, out)
+            _write(item, out)
+    elif kind in _BY_CLASS:
+        codec = _BY_CLASS[kind]
+        codec._write(value, out, codec.version)
+    elif isinstance(value, Enum):
+        _write(value.value, out)
+    else:
+        raise CodecError(f"Cannot encode values of type {kind.__name__}")
+
+
+def _write_text(tag: int, text: str, out: bytearray) -> None:
+    encoded = text.encode('ascii')
+    if len(encoded) > 255:
+        raise CodecError(f"Number too long to encode: {text[:20]}...")
+    out.append(tag)
+    out += _B.pack(len(encoded))
+    out += encoded
+
+
+def _read(buf: bytes, pos: int) -> Tuple[Any, int]:
+    try:
+        return _READERS[buf[pos]](buf, pos + 1)
+    except _CORRUPT as e:
+        raise CodecError(f"Truncated or corrupt payload: {e!r}") from e
+
+
+def _read_str8(buf: bytes, pos: int) -> Tuple[str, int]:
+    end = pos + 1 + buf[pos]
+    return buf[pos + 1:end].decode('utf-8'), end
+
+
+def _read_str32(buf: bytes, pos: int) -> Tuple[str, int]:
+    end = pos + 4 + _I.unpack_from(buf, pos)[0]
+    return buf[pos + 4:end].decode('utf-8'), end
+
+
+def _read_bytes(buf: bytes, pos: int) -> Tuple[bytes, int]:
+    end = pos + 4 + _I.unpack_from(buf, pos)[0]
+    return buf[pos + 4:end], end
+
+
+def _read_decimal(buf: bytes, pos: int) -> Tuple[Decimal, int]:
+    end = pos + 1 + buf[pos]
+    return Decimal(buf[pos + 1:end].decode('ascii')), end
+
+
+def _read_bigint(buf: bytes, pos: int) -> Tuple[int, int]:
+    end = pos + 1 + buf[pos]
+    return int(buf[pos + 1:end]), end
+
+
+def _read_datetime(buf: bytes, pos: int) -> Tuple[datetime, int]:
+    return datetime(*_DATETIME_FIELDS.unpack_from(buf, pos)), pos + 11
+
+
+def _read_datetime_tz(buf: bytes, pos: int) -> Tuple[datetime, int]:
+    year, month, day, hour, minute, second, micro, offset = _DATETIME_TZ_FIELDS.unpack_from(buf, pos)
+    tz = _UTC_OFFSETS.get(offset)
+    if tz is None:
+        tz = _UTC_OFFSETS.setdefault(offset, timezone(timedelta(minutes=offset)))
+    return datetime(year, month, day, hour, minute, second, micro, tz), pos + 13
+
+
+def _read_list(buf: bytes, pos: int) -> Tuple[list, int]:
+    count = _I.unpack_from(buf, pos)[0]
+    pos += 4
+    items = []
+    for _ in range(count):
+        item, pos = _READERS[buf[pos]](buf, pos + 1)
+        items.append(item)
+    return items, pos
+
+
+def _read_dict(buf: bytes, pos: int) -> Tuple[dict, int]:
+    count = _I.unpack_from(buf, pos)[0]
+    pos += 4
+    result = {}
+    for _ in range(count):
+        key, pos = _READERS[buf[pos]](buf, pos + 1)
+        result[key], pos = _READERS[buf[pos]](buf, pos + 1)
+    return result, pos
+
+
+def _read_record(buf: bytes, pos: int) -> Tuple[Any, int]:
+    codec = _BY_TYPE.get(buf[pos])
+    if codec is None:
+        raise CodecError(f"Unknown record type id {buf[pos]}")
+    return codec._read(buf, pos)
+
+
+def _read_unknown(buf: bytes, pos: int) -> Tuple[Any, int]:
+    raise CodecError(f"Unknown value tag {buf[pos - 1]}")
+
+
+# Reader for each value tag, indexed by tag
+_READERS = [_read_unknown] * 256
+_READERS[_NONE] = lambda buf, pos: (None, pos)
+_READERS[_FALSE] = lambda buf, pos: (False, pos)
+_READERS[_TRUE] = lambda buf, pos: (True, pos)
+_READERS[_INT8] = lambda buf, pos: (_b.unpack_from(buf, pos)[0], pos + 1)
+_READERS[_INT32] = lambda buf, pos: (_i.unpack_from(buf, pos)[0], pos + 4)
+_READERS[_INT64] = lambda buf, pos: (_q.unpack_from(buf, pos)[0], pos + 8)
+_READERS[_BIGINT] = _read_bigint
+_READERS[_FLOAT] = lambda buf, pos: (_d.unpack_from(buf, pos)[0], pos + 8)
+_READERS[_STR8] = _read_str8
+_READERS[_STR32] = _read_str32
+_READERS[_DECIMAL] = _read_decimal
+_READERS[_DATETIME] = _read_datetime
+_READERS[_DATETIME_TZ] = _read_datetime_tz
+_READERS[_LIST] = _read_list
+_READERS[_DICT] = _read_dict
+_READERS[_RECORD] = _read_record
+_READERS[_BYTES] = _read_bytes
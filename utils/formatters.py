@@ -853,6 +853,17 @@ def mask_pii_data(data: Dict[str, Any]) -> Dict[str, Any]:
     return masked_data
 
 
+# Common PII patterns to remove/mask in log messages, compiled once
+_PII_PATTERNS = [
+    (re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'), '[EMAIL_REDACTED]'),
+    (re.compile(r'\b\d{3}-\d{2}-\d{4}\b'), '[SSN_REDACTED]'),
+    (re.compile(r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b'), '[CARD_REDACTED]'),
+    (re.compile(r'\+?1?[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'), '[PHONE_REDACTED]'),
+    (re.compile(r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b'), '[IP_REDACTED]')
+]
+_PII_HINT = re.compile(r'[@\d]')
+
+
 def sanitize_log_data(log_message: str) -> str:
     """
     Sanitize log data to remove PII.
@@ -863,18 +874,13 @@ def sanitize_log_data(log_message: str) -> str:
     Returns:
         Sanitized log message
     """
-    # Common PII patterns to remove/mask
-    patterns = [
-        (r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', '[EMAIL_REDACTED]'),
-        (r'\b\d{3}-\d{2}-\d{4}\b', '[SSN_REDACTED]'),
-        (r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', '[CARD_REDACTED]'),
-        (r'\+?1?[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', '[PHONE_REDACTED]'),
-        (r'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b', '[IP_REDACTED]')
-    ]
+    # Every pattern needs an "@" or a digit; most log lines have neither
+    if not _PII_HINT.search(log_message):
+        return log_message
     
     sanitized = log_message
-    for pattern, replacement in patterns:
-        sanitized = re.sub(pattern, replacement, sanitized)
+    for pattern, replacement in _PII_PATTERNS:
+        sanitized = pattern.sub(replacement, sanitized)
     
     return sanitized
 
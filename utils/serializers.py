@@ -1,5 +1,5 @@
 """
-Database serialization utilities for DynamoDB compatibility.
+Serialization utilities: DynamoDB compatibility and fast JSON encoding.
 """
 
 import json
@@ -9,6 +9,11 @@ from typing import Any, Dict, List, Union
 from dataclasses import asdict, is_dataclass
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is used without it
+    orjson = None
+
 
 class DynamoDBSerializer:
     """Handles serialization/deserialization for DynamoDB compatibility."""
@@ -162,4 +167,76 @@ def enum_to_dynamodb(enum_value: Enum) -> str:
 
 def decimal_to_dynamodb(decimal_value: Union[float, int, str]) -> Decimal:
     """Convert number to DynamoDB Decimal."""
-    return Decimal(str(decimal_value))
\ No newline at end of file
+    return Decimal(str(decimal_value))
+
+# Fast JSON for Slack request bodies and Block Kit templates
+class PrerenderedJSON(dict):
+    """
+    A dict that keeps the JSON text it was parsed from.
+    
+    json_dumps() writes the text as-is instead of encoding the dict again.
+    Setting or removing a top-level key drops the text; nested blocks must not
+    be modified in place (render again instead).
+    """
+    
+    __slots__ = ('json',)
+    
+    def __init__(self, text: str):
+        super().__init__(json_loads(text))
+        self.json = text
+    
+    def __setitem__(self, key, value):
+        self.json = None
+        super().__setitem__(key, value)
+    
+    def __delitem__(self, key):
+        self.json = None
+        super().__delitem__(key)
+    
+    def update(self, *args, **kwargs):
+        self.json = None
+        super().update(*args, **kwargs)
+    
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self.json = None
+        return super().setdefault(key, default)
+    
+    def pop(self, *args):
+        self.json = None
+        return super().pop(*args)
+    
+    def popitem(self):
+        self.json = None
+        return super().popitem()
+    
+    def clear(self):
+        self.json = None
+        super().clear()
+
+
+def json_dumps(obj: Any) -> str:
+    """
+    Compact JSON text, using orjson when installed.
+    
+    PrerenderedJSON values, on their own or as values of a top-level dict such
+    as a Slack request body, are written from their cached text.
+    """
+    if isinstance(obj, PrerenderedJSON) and obj.json is not None:
+        return obj.json
+    if isinstance(obj, dict) and any(isinstance(value, PrerenderedJSON) for value in obj.values()):
+        return '{' + ','.join(f"{_encode(str(key))}:{json_dumps(value)}" for key, value in obj.items()) + '}'
+    return _encode(obj)
+
+
+def json_loads(text: Union[str, bytes]) -> Any:
+    """Parse JSON text, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _encode(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)